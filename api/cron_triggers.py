@@ -5,18 +5,30 @@ QStash sends HTTP POST requests on a schedule, which this endpoint
 executes synchronously. This eliminates the need for Celery workers
 polling Redis continuously.
 
-For long-running tasks, QStash workflows are used to chain execution.
+Long-running tasks are resumable (see api.task_runner): each request runs
+one time-boxed slice, checkpoints its cursor and answers "continue", and a
+follow-up message is published to QStash so the next slice picks up where
+this one stopped.
+
+With CRON_TASK_BACKEND = "worker" the endpoint only enqueues a job (see
+api.job_queue) and returns immediately; `manage.py run_cron_worker` runs it.
 """
 import logging
 import traceback
 import uuid
-from importlib import import_module
+from datetime import timedelta
 
+from django.db.models import Avg, Count, Max, Q, Sum
 from django.http import JsonResponse
+from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 from django.conf import settings
 
+from api import job_queue
+from api.models import CronTaskRun, CronTaskState
+from api.task_runner import is_resumable, resolve_task, run_task
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,19 +93,72 @@ def execute_task_sync(task_path: str, *args, **kwargs):
     Returns:
         The result of the task function
     """
-    module_path, func_name = task_path.rsplit('.', 1)
-    module = import_module(module_path)
-    func = getattr(module, func_name)
+    func = resolve_task(task_path)
     
     # Call the function directly (not .delay())
     return func(*args, **kwargs)
 
 
+def schedule_continuation(request, task_name: str, execution_id: str) -> bool:
+    """
+    Ask QStash to call this task again so its next slice runs promptly.
+
+    Without QSTASH_TOKEN the task simply resumes on its next scheduled
+    trigger. Returns True if a follow-up message was published.
+    """
+    token = getattr(settings, 'QSTASH_TOKEN', None)
+    if not token:
+        return False
+    try:
+        from qstash import QStash
+    except ImportError:
+        logger.error("qstash package not installed - cannot schedule continuation")
+        return False
+
+    try:
+        QStash(token).message.publish_json(
+            url=request.build_absolute_uri(),
+            body={"continuation_of": execution_id},
+            deduplication_id=f"{task_name}-{execution_id}",
+        )
+        return True
+    except Exception as e:
+        logger.error(f"[{execution_id}] Failed to schedule continuation for {task_name}: {e}")
+        return False
+
+
+def _run_response(task_name: str, task_path: str, execution_id: str, run, request) -> JsonResponse:
+    """Shape the JSON answer for a slice run by run_task()."""
+    if run is None:
+        # Another slice holds the lease; 200 so QStash doesn't retry
+        return JsonResponse({
+            "status": "busy",
+            "task_name": task_name,
+            "execution_id": execution_id,
+        })
+
+    body = {
+        "status": run.status,
+        "task_name": task_name,
+        "task_path": task_path,
+        "execution_id": execution_id,
+        "run_id": str(run.run_id),
+        "slice": run.slice_number,
+        "duration_ms": run.duration_ms,
+        "items_processed": run.items_processed,
+        "result": run.result or None,
+    }
+    if run.status == CronTaskRun.STATUS_CONTINUE:
+        body["continuation_scheduled"] = schedule_continuation(request, task_name, execution_id)
+        return JsonResponse(body, status=202)
+    return JsonResponse(body)
+
+
 # Map of URL-safe task names to task module paths
 # Tasks are executed synchronously - no Celery queue involved
 TASK_MAP = {
     # Meal/embedding tasks
-    "update_embeddings": "meals.meal_embedding.update_embeddings",
+    "update_embeddings": "meals.meal_embedding.update_embeddings_task",
     "submit_weekly_meal_plan_batch": "meals.tasks.submit_weekly_meal_plan_batch",
     "poll_incomplete_meal_plan_batches": "meals.tasks.poll_incomplete_meal_plan_batches",
     "cleanup_old_meal_plans_and_meals": "meals.tasks.cleanup_old_meal_plans_and_meals",
@@ -103,6 +168,10 @@ TASK_MAP = {
     "process_chef_meal_price_adjustments": "meals.tasks.process_chef_meal_price_adjustments",
     "sync_service_tier_prices": "chef_services.tasks.sync_pending_service_tiers",
     
+    # Chef dashboard tasks
+    "reconcile_chef_daily_metrics": "chefs.services.dashboard_metrics.reconcile_chef_daily_metrics",
+    "purge_stale_estimates": "chefs.resource_planning.services.purge_stale_estimates",
+    
     # Cleanup tasks
     "cleanup_expired_sessions": "customer_dashboard.tasks.cleanup_expired_sessions",
 }
@@ -115,7 +184,8 @@ def trigger_task(request, task_name):
     Execute a registered task synchronously.
     
     QStash calls this endpoint on a schedule. We verify the signature,
-    then execute the task directly (no Celery queue).
+    then execute the task directly (no Celery queue), or queue it for the
+    local worker pool when CRON_TASK_BACKEND is "worker".
     
     URL: /api/cron/trigger/<task_name>/
     """
@@ -132,21 +202,35 @@ def trigger_task(request, task_name):
     task_path = TASK_MAP[task_name]
     execution_id = str(uuid.uuid4())[:8]
     
+    if job_queue.worker_backend_enabled():
+        # Hand off to run_cron_worker; a trigger while the previous job is
+        # still queued or running reuses it
+        job = job_queue.enqueue(
+            task_path,
+            task_name=task_name,
+            concurrency_key="cron",
+            dedupe_key=f"cron:{task_name}",
+        )
+        logger.info(f"[{execution_id}] Queued task {task_name} as cron job {job.pk}")
+        return JsonResponse({
+            "status": "queued",
+            "task_name": task_name,
+            "task_path": task_path,
+            "execution_id": execution_id,
+            "job_id": job.pk,
+        }, status=202)
+    
     try:
         logger.info(f"[{execution_id}] QStash executing task {task_name} -> {task_path}")
         
-        # Execute the task synchronously
-        result = execute_task_sync(task_path)
+        # Execute one slice synchronously; resumable tasks checkpoint and yield
+        run = run_task(task_name, resolve_task(task_path), execution_id)
         
-        logger.info(f"[{execution_id}] Task {task_name} completed successfully")
+        if run is not None:
+            logger.info(f"[{execution_id}] Task {task_name} slice {run.slice_number} {run.status} "
+                        f"({run.items_processed} items in {run.duration_ms}ms)")
         
-        return JsonResponse({
-            "status": "completed",
-            "task_name": task_name,
-            "task_path": task_path,
-            "execution_id": execution_id,
-            "result": str(result) if result else None
-        })
+        return _run_response(task_name, task_path, execution_id, run, request)
         
     except Exception as e:
         logger.error(f"[{execution_id}] Task {task_name} failed: {e}")
@@ -182,18 +266,12 @@ def trigger_task_debug(request, task_name):
     try:
         logger.info(f"[{execution_id}] DEBUG executing task {task_name} -> {task_path}")
         
-        # Execute the task synchronously
-        result = execute_task_sync(task_path)
+        # Execute one slice synchronously; resumable tasks checkpoint and yield
+        run = run_task(task_name, resolve_task(task_path), execution_id)
         
-        logger.info(f"[{execution_id}] DEBUG task {task_name} completed")
+        logger.info(f"[{execution_id}] DEBUG task {task_name} {run.status if run else 'busy'}")
         
-        return JsonResponse({
-            "status": "completed",
-            "task_name": task_name,
-            "task_path": task_path,
-            "execution_id": execution_id,
-            "result": str(result) if result else None
-        })
+        return _run_response(task_name, task_path, execution_id, run, request)
         
     except Exception as e:
         logger.error(f"[{execution_id}] DEBUG task {task_name} failed: {e}")
@@ -208,17 +286,85 @@ def trigger_task_debug(request, task_name):
 
 def list_tasks(request):
     """
-    List all available tasks that can be triggered.
+    List the registered tasks with their run history and metrics.
     
-    Only available in DEBUG mode to prevent information disclosure.
+    Only available in DEBUG mode or to staff users to prevent information
+    disclosure. ``?history=N`` controls how many recent slices are listed
+    per task (default 10).
     
     URL: /api/cron/tasks/
     """
-    if not settings.DEBUG:
+    user = getattr(request, 'user', None)
+    if not (settings.DEBUG or (user is not None and user.is_staff)):
         return JsonResponse({"error": "Endpoint disabled"}, status=403)
     
+    try:
+        history = max(0, min(int(request.GET.get('history', 10)), 100))
+    except ValueError:
+        history = 10
+    
+    since = timezone.now() - timedelta(days=7)
+    metrics = {
+        row['task_name']: row
+        for row in CronTaskRun.objects.filter(started_at__gte=since)
+        .values('task_name')
+        .annotate(
+            slices=Count('id'),
+            errors=Count('id', filter=Q(status=CronTaskRun.STATUS_ERROR)),
+            completed_runs=Count('id', filter=Q(status=CronTaskRun.STATUS_COMPLETED)),
+            items_processed=Sum('items_processed'),
+            avg_duration_ms=Avg('duration_ms'),
+            max_duration_ms=Max('duration_ms'),
+        )
+    }
+    states = {state.task_name: state for state in CronTaskState.objects.filter(task_name__in=TASK_MAP)}
+    
+    tasks = []
+    for task_name, task_path in TASK_MAP.items():
+        state = states.get(task_name)
+        stats = metrics.get(task_name, {})
+        try:
+            resumable = is_resumable(resolve_task(task_path))
+        except Exception:
+            resumable = False
+        recent = CronTaskRun.objects.filter(task_name=task_name)[:history] if history else []
+        tasks.append({
+            "name": task_name,
+            "path": task_path,
+            "resumable": resumable,
+            "in_progress": bool(state and state.run_id),
+            "cursor": state.cursor if state else None,
+            "current_run": {
+                "run_id": str(state.run_id),
+                "started_at": state.run_started_at,
+                "slices": state.slices,
+                "items_processed": state.items_processed,
+            } if state and state.run_id else None,
+            "last_status": state.last_status if state else None,
+            "last_finished_at": state.last_finished_at if state else None,
+            "last_7_days": {
+                "slices": stats.get('slices', 0),
+                "completed_runs": stats.get('completed_runs', 0),
+                "errors": stats.get('errors', 0),
+                "items_processed": stats.get('items_processed') or 0,
+                "avg_duration_ms": round(stats['avg_duration_ms']) if stats.get('avg_duration_ms') else None,
+                "max_duration_ms": stats.get('max_duration_ms'),
+            },
+            "history": [
+                {
+                    "run_id": str(run.run_id),
+                    "slice": run.slice_number,
+                    "status": run.status,
+                    "started_at": run.started_at,
+                    "duration_ms": run.duration_ms,
+                    "items_processed": run.items_processed,
+                    "error": run.error.strip().splitlines()[-1] if run.error else None,
+                }
+                for run in recent
+            ],
+        })
+    
     return JsonResponse({
-        "tasks": list(TASK_MAP.keys()),
+        "tasks": tasks,
         "count": len(TASK_MAP)
     })
-
@@ -0,0 +1,275 @@
+"""
+Local job table drained by the run_cron_worker management command.
+
+With CRON_TASK_BACKEND = "worker", api.cron_triggers enqueues a CronJob and
+answers QStash immediately instead of running the task in the web worker.
+Fan-out work, such as per-user weekly meal plan fallbacks, is enqueued as one
+job per item so the worker pool spreads it across processes and threads.
+
+- enqueue(): add a job; an active job with the same dedupe_key is reused.
+- claim_job(): lease the next runnable job, honouring CRON_JOB_CONCURRENCY
+  caps per concurrency_key. Jobs whose lease lapsed (dead worker) are
+  claimed again.
+- complete_job() / fail_job(): failures are retried with exponential
+  backoff until max_attempts.
+- run_worker(): the thread pool one worker process runs.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import zlib
+from datetime import timedelta
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import CronJob, CronTaskRun
+from api.task_runner import resolve_task, run_task
+
+logger = logging.getLogger(__name__)
+
+BACKEND_INLINE = 'inline'
+BACKEND_WORKER = 'worker'
+
+DEFAULT_LEASE_SECONDS = getattr(settings, 'CRON_JOB_LEASE_SECONDS', 300)
+RETRY_BASE_SECONDS = 30
+# Runnable rows inspected per claim; rows held by other workers are skipped
+CLAIM_SCAN_SIZE = 20
+
+
+def worker_backend_enabled() -> bool:
+    return getattr(settings, 'CRON_TASK_BACKEND', BACKEND_INLINE) == BACKEND_WORKER
+
+
+def concurrency_limit(key: str) -> Optional[int]:
+    if not key:
+        return None
+    return getattr(settings, 'CRON_JOB_CONCURRENCY', {}).get(key)
+
+
+def enqueue(
+    task_path: str,
+    kwargs: Optional[Dict[str, Any]] = None,
+    *,
+    task_name: str = '',
+    concurrency_key: str = '',
+    dedupe_key: Optional[str] = None,
+    max_attempts: int = 3,
+    delay: float = 0,
+) -> CronJob:
+    """
+    Queue ``task_path(**kwargs)`` for the worker pool.
+
+    ``kwargs`` must be JSON-serializable. Jobs with a ``task_name`` are
+    TASK_MAP entries and run slice after slice through api.task_runner.
+    """
+    try:
+        with transaction.atomic():
+            return CronJob.objects.create(
+                task_path=task_path,
+                task_name=task_name,
+                kwargs=kwargs or {},
+                concurrency_key=concurrency_key,
+                dedupe_key=dedupe_key,
+                max_attempts=max_attempts,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+    except IntegrityError:
+        existing = CronJob.objects.filter(
+            dedupe_key=dedupe_key,
+            status__in=CronJob.ACTIVE_STATUSES,
+        ).first()
+        if existing is None:
+            raise
+        return existing
+
+
+def _serialize_claims(key: str) -> None:
+    # Count-then-claim under a transaction-scoped advisory lock so two
+    # workers can't both take the last slot under a concurrency cap.
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [zlib.crc32(f"cron_job:{key}".encode())])
+
+
+def claim_job(worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Optional[CronJob]:
+    """Lease the next runnable job to ``worker_id``, or return None."""
+    now = timezone.now()
+    with transaction.atomic():
+        candidates = list(
+            CronJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=CronJob.STATUS_QUEUED, run_after__lte=now)
+                | Q(status=CronJob.STATUS_RUNNING, lease_expires_at__lt=now)
+            )
+            .order_by('run_after', 'id')[:CLAIM_SCAN_SIZE]
+        )
+        for job in candidates:
+            if job.status == CronJob.STATUS_RUNNING:
+                logger.warning(f"Cron job {job.pk} lease held by {job.lease_owner} expired; reclaiming")
+                if job.attempts >= job.max_attempts:
+                    job.status = CronJob.STATUS_FAILED
+                    job.finished_at = now
+                    job.last_error = f"Lease expired on attempt {job.attempts} (worker {job.lease_owner})"
+                    job.save(update_fields=['status', 'finished_at', 'last_error'])
+                    continue
+
+            limit = concurrency_limit(job.concurrency_key)
+            if limit is not None:
+                _serialize_claims(job.concurrency_key)
+                running = CronJob.objects.filter(
+                    concurrency_key=job.concurrency_key,
+                    status=CronJob.STATUS_RUNNING,
+                    lease_expires_at__gte=now,
+                ).count()
+                if running >= limit:
+                    continue
+
+            job.status = CronJob.STATUS_RUNNING
+            job.attempts += 1
+            job.lease_owner = worker_id
+            job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+            job.started_at = now
+            job.save(update_fields=['status', 'attempts', 'lease_owner', 'lease_expires_at', 'started_at'])
+            return job
+    return None
+
+
+def renew_leases(worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> int:
+    """Extend the lease on every job ``worker_id`` is still running."""
+    return CronJob.objects.filter(status=CronJob.STATUS_RUNNING, lease_owner=worker_id).update(
+        lease_expires_at=timezone.now() + timedelta(seconds=lease_seconds)
+    )
+
+
+def complete_job(job: CronJob, result: Any = None) -> None:
+    CronJob.objects.filter(pk=job.pk, status=CronJob.STATUS_RUNNING, lease_owner=job.lease_owner).update(
+        status=CronJob.STATUS_SUCCEEDED,
+        finished_at=timezone.now(),
+        lease_expires_at=None,
+        result='' if result is None else str(result)[:2000],
+    )
+
+
+def fail_job(job: CronJob, error: str) -> None:
+    """Requeue with exponential backoff, or mark failed once attempts run out."""
+    now = timezone.now()
+    active = CronJob.objects.filter(pk=job.pk, status=CronJob.STATUS_RUNNING, lease_owner=job.lease_owner)
+    if job.attempts < job.max_attempts:
+        delay = RETRY_BASE_SECONDS * 2 ** (job.attempts - 1)
+        active.update(
+            status=CronJob.STATUS_QUEUED,
+            run_after=now + timedelta(seconds=delay),
+            lease_owner='',
+            lease_expires_at=None,
+            last_error=error[-4000:],
+        )
+        logger.warning(f"Cron job {job.pk} failed (attempt {job.attempts}/{job.max_attempts}); retrying in {delay}s")
+    else:
+        active.update(
+            status=CronJob.STATUS_FAILED,
+            finished_at=now,
+            lease_expires_at=None,
+            last_error=error[-4000:],
+        )
+        logger.error(f"Cron job {job.pk} failed permanently after {job.attempts} attempts")
+
+
+def execute_job(job: CronJob, on_slice: Optional[Callable[[], Any]] = None) -> Any:
+    """Run a claimed job; TASK_MAP jobs run their slices back to back."""
+    func = resolve_task(job.task_path)
+    if not job.task_name:
+        return func(**job.kwargs)
+
+    while True:
+        run = run_task(job.task_name, func, execution_id=f"job-{job.pk}")
+        if run is None:
+            return "skipped: task already running"
+        if run.status != CronTaskRun.STATUS_CONTINUE:
+            return run.result
+        if on_slice is not None:
+            on_slice()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _work_loop(worker_id: str, stop: threading.Event, poll_interval: float, lease_seconds: int, once: bool) -> None:
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            try:
+                job = claim_job(worker_id, lease_seconds)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} could not claim a job: {e}")
+                job = None
+            if job is None:
+                if once:
+                    return
+                stop.wait(poll_interval)
+                continue
+
+            logger.info(f"Worker {worker_id} running cron job {job.pk} ({job.task_name or job.task_path})")
+            try:
+                result = execute_job(job, on_slice=lambda: renew_leases(worker_id, lease_seconds))
+            except Exception:
+                fail_job(job, traceback.format_exc())
+            else:
+                complete_job(job, result)
+    finally:
+        connection.close()
+
+
+def run_worker(
+    threads: int = 4,
+    poll_interval: float = 2.0,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    once: bool = False,
+    stop: Optional[threading.Event] = None,
+    worker_id: Optional[str] = None,
+) -> None:
+    """
+    Drain the job table with ``threads`` threads until ``stop`` is set.
+
+    A heartbeat keeps the leases of running jobs alive; if this process dies
+    they lapse and another worker picks the jobs up. With ``once`` the
+    threads exit as soon as no job is runnable.
+    """
+    worker_id = worker_id or default_worker_id()
+    stop = stop or threading.Event()
+    pool = [
+        threading.Thread(
+            target=_work_loop,
+            args=(worker_id, stop, poll_interval, lease_seconds, once),
+            name=f"cron-worker-{i}",
+            daemon=True,
+        )
+        for i in range(max(1, threads))
+    ]
+    for thread in pool:
+        thread.start()
+
+    heartbeat = max(1.0, lease_seconds / 3)
+    last_renewal = time.monotonic()
+    while any(thread.is_alive() for thread in pool):
+        if stop.wait(1.0):
+            break
+        if time.monotonic() - last_renewal < heartbeat:
+            continue
+        try:
+            renew_leases(worker_id, lease_seconds)
+        except Exception as e:
+            logger.error(f"Worker {worker_id} could not renew leases: {e}")
+        finally:
+            connection.close()
+        last_renewal = time.monotonic()
+
+    for thread in pool:
+        thread.join()
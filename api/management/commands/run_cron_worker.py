@@ -0,0 +1,97 @@
+"""
+Management command that drains the local cron job table.
+
+Only needed when CRON_TASK_BACKEND = "worker"; the QStash trigger endpoint
+then enqueues jobs (see api.job_queue) and these processes run them.
+
+Usage:
+    python manage.py run_cron_worker
+    python manage.py run_cron_worker --processes=4 --threads=8
+    python manage.py run_cron_worker --once   # Drain runnable jobs and exit
+"""
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api.job_queue import DEFAULT_LEASE_SECONDS, run_worker
+
+
+def _worker_process(threads, poll_interval, lease_seconds, once):
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    run_worker(threads=threads, poll_interval=poll_interval, lease_seconds=lease_seconds, once=once, stop=stop)
+
+
+class Command(BaseCommand):
+    help = 'Run a pool of worker processes/threads that execute queued cron jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=getattr(settings, 'CRON_WORKER_PROCESSES', 1),
+            help='Worker processes to start (default: CRON_WORKER_PROCESSES or 1)'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=getattr(settings, 'CRON_WORKER_THREADS', 4),
+            help='Threads per process (default: CRON_WORKER_THREADS or 4)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds an idle thread waits before polling again (default: 2)'
+        )
+        parser.add_argument(
+            '--lease-seconds',
+            type=int,
+            default=DEFAULT_LEASE_SECONDS,
+            help='Lease length; jobs of a worker that stops renewing are retried after this'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no job is runnable instead of polling forever'
+        )
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        worker_args = (options['threads'], options['poll_interval'], options['lease_seconds'], options['once'])
+
+        self.stdout.write(
+            f"Starting {processes} cron worker process(es) x {options['threads']} thread(s)"
+        )
+
+        if processes == 1:
+            _worker_process(*worker_args)
+            self.stdout.write(self.style.SUCCESS('Cron worker stopped.'))
+            return
+
+        # Children must not share the parent's database connections
+        connections.close_all()
+        ctx = multiprocessing.get_context('fork')
+        children = [
+            ctx.Process(target=_worker_process, args=worker_args, name=f'cron-worker-{i}')
+            for i in range(processes)
+        ]
+        for child in children:
+            child.start()
+
+        def _shutdown(*_):
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+
+        signal.signal(signal.SIGTERM, _shutdown)
+        signal.signal(signal.SIGINT, _shutdown)
+
+        for child in children:
+            child.join()
+        self.stdout.write(self.style.SUCCESS('Cron worker pool stopped.'))
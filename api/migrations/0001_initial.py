@@ -0,0 +1,52 @@
+# Generated by Django 5.2.9 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CronTaskRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(max_length=100)),
+                ('run_id', models.UUIDField()),
+                ('execution_id', models.CharField(blank=True, default='', max_length=32)),
+                ('slice_number', models.PositiveIntegerField(default=1)),
+                ('status', models.CharField(choices=[('completed', 'Completed'), ('continue', 'Continue'), ('error', 'Error')], max_length=20)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField()),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('items_processed', models.PositiveIntegerField(default=0)),
+                ('cursor', models.JSONField(blank=True, null=True)),
+                ('result', models.TextField(blank=True, default='')),
+                ('error', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['task_name', '-started_at'], name='api_crontaskrun_task_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CronTaskState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_name', models.CharField(max_length=100, unique=True)),
+                ('run_id', models.UUIDField(blank=True, null=True)),
+                ('cursor', models.JSONField(blank=True, null=True)),
+                ('run_started_at', models.DateTimeField(blank=True, null=True)),
+                ('slices', models.PositiveIntegerField(default=0)),
+                ('items_processed', models.PositiveBigIntegerField(default=0)),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True)),
+                ('last_status', models.CharField(blank=True, default='', max_length=20)),
+                ('last_finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,126 @@
+"""
+Bookkeeping for QStash cron tasks.
+
+- CronTaskState: one row per task; holds the checkpoint cursor of the run in
+  progress and the lease that stops two invocations overlapping.
+- CronTaskRun: one row per invocation (slice), with duration and the number
+  of items it processed. A logical run that needed several slices shares a
+  run_id across its rows.
+- CronJob: work queued for the local worker pool when CRON_TASK_BACKEND is
+  "worker" (see api.job_queue and the run_cron_worker command).
+
+See api.task_runner for how tasks read and advance their cursor.
+"""
+
+from django.db import models
+
+
+class CronTaskState(models.Model):
+    """Checkpoint and lease for a single cron task."""
+    task_name = models.CharField(max_length=100, unique=True)
+
+    # Run in progress; both are cleared once the task reports it is done
+    run_id = models.UUIDField(null=True, blank=True)
+    cursor = models.JSONField(null=True, blank=True)
+    run_started_at = models.DateTimeField(null=True, blank=True)
+    slices = models.PositiveIntegerField(default=0)
+    items_processed = models.PositiveBigIntegerField(default=0)
+
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.CharField(max_length=20, blank=True, default='')
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.task_name} ({self.last_status or 'never run'})"
+
+
+class CronTaskRun(models.Model):
+    """History row for one invocation of a cron task."""
+    STATUS_COMPLETED = 'completed'
+    STATUS_CONTINUE = 'continue'
+    STATUS_ERROR = 'error'
+
+    STATUS_CHOICES = [
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_CONTINUE, 'Continue'),
+        (STATUS_ERROR, 'Error'),
+    ]
+
+    task_name = models.CharField(max_length=100)
+    run_id = models.UUIDField()
+    execution_id = models.CharField(max_length=32, blank=True, default='')
+    slice_number = models.PositiveIntegerField(default=1)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    duration_ms = models.PositiveIntegerField(default=0)
+    items_processed = models.PositiveIntegerField(default=0)
+    cursor = models.JSONField(null=True, blank=True)
+    result = models.TextField(blank=True, default='')
+    error = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['task_name', '-started_at'], name='api_crontaskrun_task_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name} slice {self.slice_number} ({self.status})"
+
+
+class CronJob(models.Model):
+    """A unit of work waiting for, or held by, a run_cron_worker process."""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = [STATUS_QUEUED, STATUS_RUNNING]
+
+    # Dotted path of the function to call with ``kwargs``; jobs with a
+    # task_name are TASK_MAP entries and run through api.task_runner
+    task_path = models.CharField(max_length=200)
+    task_name = models.CharField(max_length=100, blank=True, default='')
+    kwargs = models.JSONField(default=dict, blank=True)
+
+    # Jobs sharing a key are capped by CRON_JOB_CONCURRENCY[key]
+    concurrency_key = models.CharField(max_length=50, blank=True, default='')
+    # At most one queued/running job per dedupe key
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField()
+    lease_owner = models.CharField(max_length=100, blank=True, default='')
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    result = models.TextField(blank=True, default='')
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='api_cronjob_ready_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='api_cronjob_active_dedupe',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task_name or self.task_path} #{self.pk} ({self.status})"
@@ -0,0 +1,228 @@
+"""
+Time-sliced execution for QStash cron tasks.
+
+A cron task runs inside a single HTTP request, so anything that can outlive
+the web server timeout is written as a *resumable* task: it receives a
+TaskSlice, works from ``task_slice.cursor``, calls ``advance()`` as items are
+committed and stops once ``expired()``::
+
+    @resumable_task
+    def sync_all_chef_payments(task_slice):
+        for chef in Chef.objects.filter(pk__gt=task_slice.cursor or 0).order_by("pk"):
+            if task_slice.expired():
+                return task_slice.pause()
+            sync_recent_payments(chef)
+            task_slice.advance(chef.pk)
+        return task_slice.complete()
+
+run_task() persists the cursor on CronTaskState between invocations and
+records every slice in CronTaskRun. A slice that pauses reports "continue" so
+the trigger endpoint can schedule the next one; a slice that raises keeps the
+last checkpoint, so the retry resumes instead of starting over.
+
+Calling a resumable task directly (shell, management command) runs it to
+completion without touching the database bookkeeping.
+"""
+import functools
+import logging
+import time
+import traceback
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from importlib import import_module
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import CronTaskRun, CronTaskState
+
+logger = logging.getLogger(__name__)
+
+# Slices run for at most this long before checkpointing and yielding
+DEFAULT_SLICE_SECONDS = getattr(settings, 'CRON_TASK_SLICE_SECONDS', 240)
+# Extra time on the lease so a slice finishing its last item isn't raced
+LEASE_GRACE_SECONDS = 120
+# How often advance() writes the cursor back while a slice is running
+CHECKPOINT_INTERVAL_SECONDS = 10
+# Run history kept per task
+HISTORY_DAYS = getattr(settings, 'CRON_TASK_HISTORY_DAYS', 30)
+
+
+@dataclass
+class SliceResult:
+    """What a resumable task returns: whether it finished, and where it stopped."""
+    done: bool
+    cursor: Any = None
+    processed: int = 0
+    detail: Any = None
+
+
+class TaskSlice:
+    """Cursor, deadline and progress for one invocation of a resumable task."""
+
+    def __init__(self, cursor: Any = None, budget: Optional[float] = None, state: Optional[CronTaskState] = None):
+        self.cursor = cursor
+        self.processed = 0
+        self.deadline = None if budget is None else time.monotonic() + budget
+        self._state = state
+        self._base_processed = state.items_processed if state is not None else 0
+        self._last_checkpoint = time.monotonic()
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left in this slice, or None when unbounded."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def advance(self, cursor: Any, processed: int = 1) -> None:
+        """Record progress; ``cursor`` must point past work that is already committed."""
+        self.cursor = cursor
+        self.processed += processed
+        if self._state is not None and time.monotonic() - self._last_checkpoint >= CHECKPOINT_INTERVAL_SECONDS:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Persist the cursor now so a crash mid-slice resumes from here."""
+        if self._state is None:
+            return
+        CronTaskState.objects.filter(pk=self._state.pk).update(
+            cursor=self.cursor,
+            items_processed=self._base_processed + self.processed,
+        )
+        self._last_checkpoint = time.monotonic()
+
+    def pause(self, detail: Any = None) -> SliceResult:
+        return SliceResult(done=False, cursor=self.cursor, processed=self.processed, detail=detail)
+
+    def complete(self, detail: Any = None) -> SliceResult:
+        return SliceResult(done=True, cursor=None, processed=self.processed, detail=detail)
+
+
+def resumable_task(func: Callable) -> Callable:
+    """
+    Mark ``func(task_slice, **kwargs)`` as resumable.
+
+    The wrapper accepts being called without a slice, in which case the task
+    runs unbounded from the beginning. Apply it outermost so exceptions reach
+    run_task(), which records the error and keeps the cursor for the retry.
+    """
+    @functools.wraps(func)
+    def wrapper(task_slice: Optional[TaskSlice] = None, **kwargs):
+        if task_slice is None:
+            task_slice = TaskSlice()
+        return func(task_slice, **kwargs)
+
+    wrapper.resumable = True
+    return wrapper
+
+
+def is_resumable(func: Callable) -> bool:
+    return bool(getattr(func, 'resumable', False))
+
+
+def resolve_task(task_path: str) -> Callable:
+    """Import and return the task function at a dotted path."""
+    module_path, func_name = task_path.rsplit('.', 1)
+    module = import_module(module_path)
+    return getattr(module, func_name)
+
+
+def _claim(task_name: str, budget: float) -> Optional[CronTaskState]:
+    """Take the task's lease, starting a new logical run if none is in progress."""
+    now = timezone.now()
+    with transaction.atomic():
+        CronTaskState.objects.get_or_create(task_name=task_name)
+        state = CronTaskState.objects.select_for_update().get(task_name=task_name)
+        if state.lease_expires_at and state.lease_expires_at > now:
+            return None
+        if state.run_id is None:
+            state.run_id = uuid.uuid4()
+            state.run_started_at = now
+            state.cursor = None
+            state.slices = 0
+            state.items_processed = 0
+        state.slices += 1
+        state.lease_expires_at = now + timedelta(seconds=budget + LEASE_GRACE_SECONDS)
+        state.save()
+    return state
+
+
+def _record(state: CronTaskState, execution_id: str, status: str, started_at, elapsed: float,
+            task_slice: TaskSlice, result: Any = None, error: str = '') -> CronTaskRun:
+    finished_at = timezone.now()
+    run = CronTaskRun.objects.create(
+        task_name=state.task_name,
+        run_id=state.run_id,
+        execution_id=execution_id,
+        slice_number=state.slices,
+        status=status,
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_ms=int(elapsed * 1000),
+        items_processed=task_slice.processed,
+        cursor=task_slice.cursor if status != CronTaskRun.STATUS_COMPLETED else None,
+        result='' if result is None else str(result)[:2000],
+        error=error,
+    )
+
+    fields = {
+        'lease_expires_at': None,
+        'last_status': status,
+        'last_finished_at': finished_at,
+        'items_processed': state.items_processed + task_slice.processed,
+    }
+    if status == CronTaskRun.STATUS_COMPLETED:
+        fields.update(run_id=None, cursor=None)
+        CronTaskRun.objects.filter(
+            task_name=state.task_name,
+            started_at__lt=finished_at - timedelta(days=HISTORY_DAYS),
+        ).delete()
+    else:
+        fields['cursor'] = task_slice.cursor
+    CronTaskState.objects.filter(pk=state.pk).update(**fields)
+    return run
+
+
+def run_task(task_name: str, func: Callable, execution_id: str = '', budget: Optional[float] = None) -> Optional[CronTaskRun]:
+    """
+    Run one slice of ``func`` and record it.
+
+    Plain (non-resumable) tasks run to completion as a single slice. Returns
+    the CronTaskRun, or None when another invocation still holds the lease.
+    Exceptions from the task are recorded and re-raised.
+    """
+    budget = DEFAULT_SLICE_SECONDS if budget is None else budget
+    state = _claim(task_name, budget)
+    if state is None:
+        logger.info(f"[{execution_id}] Task {task_name} is already running; skipping")
+        return None
+
+    started_at = timezone.now()
+    start = time.monotonic()
+    task_slice = TaskSlice(cursor=state.cursor, budget=budget, state=state)
+    try:
+        if is_resumable(func):
+            result = func(task_slice)
+            if not isinstance(result, SliceResult):
+                raise TypeError(
+                    f"Resumable task {task_name} returned {type(result).__name__}; "
+                    f"expected pause() or complete()"
+                )
+        else:
+            result = SliceResult(done=True, cursor=None, detail=func())
+    except Exception as e:
+        _record(state, execution_id, CronTaskRun.STATUS_ERROR, started_at, time.monotonic() - start,
+                task_slice, error=traceback.format_exc()[-4000:] or str(e))
+        raise
+
+    task_slice.cursor = result.cursor
+    task_slice.processed = result.processed
+
+    status = CronTaskRun.STATUS_COMPLETED if result.done else CronTaskRun.STATUS_CONTINUE
+    return _record(state, execution_id, status, started_at, time.monotonic() - start, task_slice, result=result.detail)
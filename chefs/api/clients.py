@@ -17,7 +17,7 @@ from chefs.models import Chef
 from chef_services.models import ChefCustomerConnection
 from custom_auth.models import CustomUser
 from crm.models import Lead, LeadInteraction
-from chefs.services import get_client_stats, get_client_list_with_stats
+from chefs.services import get_client_stats, get_client_list_queryset
 from .serializers import (
     ClientListItemSerializer,
     ClientDetailSerializer,
@@ -96,20 +96,8 @@ def client_list(request):
         status = request.query_params.get('status', None)
         ordering = request.query_params.get('ordering', '-connected_since')
         
-        # Get client list with stats
-        clients = get_client_list_with_stats(chef, search=search, status=status)
-        
-        # Apply ordering
-        reverse = ordering.startswith('-')
-        sort_field = ordering.lstrip('-')
-        
-        valid_sort_fields = ['connected_since', 'total_spent', 'total_orders', 'username']
-        if sort_field in valid_sort_fields:
-            clients = sorted(
-                clients,
-                key=lambda x: x.get(sort_field) or ('' if sort_field == 'username' else 0),
-                reverse=reverse
-            )
+        # Sorting and pagination happen in SQL on the annotated queryset
+        clients = get_client_list_queryset(chef, search=search, status=status, ordering=ordering)
         
         # Paginate
         paginator = ClientPagination()
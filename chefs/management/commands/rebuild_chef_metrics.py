@@ -0,0 +1,26 @@
+# chefs/management/commands/rebuild_chef_metrics.py
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from chefs.services.dashboard_metrics import rebuild_metrics
+
+
+class Command(BaseCommand):
+    help = 'Rebuild materialized chef dashboard metrics for a range of days.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=365, help='Number of trailing days to rebuild (default 365).')
+        parser.add_argument('--start', type=date.fromisoformat, help='First day to rebuild (YYYY-MM-DD); overrides --days.')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to rebuild (YYYY-MM-DD); defaults to today.')
+        parser.add_argument('--chef', type=int, action='append', dest='chef_ids', help='Restrict to a chef id (repeatable).')
+
+    def handle(self, *args, **options):
+        end_day = options['end'] or timezone.localdate()
+        start_day = options['start'] or end_day - timedelta(days=options['days'] - 1)
+        if start_day > end_day:
+            raise CommandError('--start must not be after --end')
+
+        written = rebuild_metrics(start_day, end_day, chef_ids=options['chef_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {written} chef daily metric rows for {start_day}..{end_day}.'))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:00
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chefs', '0039_add_notify_cert_expiry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChefDailyMetrics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('meal_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('meal_orders', models.PositiveIntegerField(default=0)),
+                ('service_revenue_cents', models.BigIntegerField(default=0)),
+                ('service_orders', models.PositiveIntegerField(default=0)),
+                ('refunds', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('customer_savings', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('new_clients', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('chef', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_metrics', to='chefs.chef')),
+            ],
+            options={
+                'verbose_name': 'Chef Daily Metrics',
+                'verbose_name_plural': 'Chef Daily Metrics',
+                'ordering': ['chef', 'date'],
+                'constraints': [models.UniqueConstraint(fields=('chef', 'date'), name='chef_daily_metrics_unique_day')],
+            },
+        ),
+    ]
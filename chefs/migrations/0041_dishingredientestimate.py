@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chefs', '0040_chefdailymetrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DishIngredientEstimate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('generated', 'Generated ingredient list'), ('quantities', 'Estimated quantities')], max_length=20)),
+                ('dish_key', models.CharField(max_length=64)),
+                ('servings', models.PositiveIntegerField()),
+                ('dish_name', models.CharField(max_length=200)),
+                ('ingredients', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'dish_key', 'servings'), name='unique_dish_ingredient_estimate')],
+            },
+        ),
+    ]
@@ -46,6 +46,9 @@ from .telegram_integration import (
     ChefTelegramSettings,
 )
 
+# Dashboard metrics rollup
+from .metrics import ChefDailyMetrics
+
 __all__ = [
     # Base models
     'Chef',
@@ -76,4 +79,6 @@ __all__ = [
     'ChefTelegramLink',
     'TelegramLinkToken',
     'ChefTelegramSettings',
+    # Dashboard metrics
+    'ChefDailyMetrics',
 ]
@@ -0,0 +1,67 @@
+# chefs/models/metrics.py
+"""
+Chef Dashboard Metrics Rollup.
+
+This module provides:
+- ChefDailyMetrics: One row per chef per day with the totals the dashboard
+  and analytics charts display.
+
+Rows are refreshed for the affected day whenever an order, payment,
+review or client connection changes (see chefs.signals), and can be
+rebuilt for any range with chefs.services.dashboard_metrics.
+"""
+
+from decimal import Decimal
+
+from django.db import models
+
+
+class ChefDailyMetrics(models.Model):
+    """
+    Materialized per-day totals for a chef.
+
+    Days are bucketed in the server's current timezone, matching the
+    TruncDate grouping the analytics endpoints used before.
+    """
+    chef = models.ForeignKey(
+        'chefs.Chef',
+        on_delete=models.CASCADE,
+        related_name='daily_metrics'
+    )
+    date = models.DateField()
+
+    # Confirmed/completed orders, bucketed by order creation day
+    meal_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    meal_orders = models.PositiveIntegerField(default=0)
+    service_revenue_cents = models.BigIntegerField(default=0)
+    service_orders = models.PositiveIntegerField(default=0)
+
+    # Refund payment logs, bucketed by log creation day
+    refunds = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+
+    # Group pricing discounts, bucketed by event date
+    customer_savings = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+
+    # Reviews, bucketed by review creation day
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+
+    # Accepted client connections, bucketed by response day
+    new_clients = models.PositiveIntegerField(default=0)
+
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['chef', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['chef', 'date'], name='chef_daily_metrics_unique_day'),
+        ]
+        verbose_name = "Chef Daily Metrics"
+        verbose_name_plural = "Chef Daily Metrics"
+
+    def __str__(self):
+        return f"Metrics for chef {self.chef_id} on {self.date}"
+
+    @property
+    def total_revenue(self) -> Decimal:
+        return self.meal_revenue + Decimal(self.service_revenue_cents) / 100
@@ -18,7 +18,7 @@ import logging
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 
-from django.db import models
+from django.db import DatabaseError, connections, models, transaction
 from django.conf import settings
 from django.utils import timezone
 from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
@@ -27,6 +27,13 @@ from django.db.models import F, Q
 
 logger = logging.getLogger(__name__)
 
+# Hybrid search pulls this many candidates per ranked list (vector, text)
+# before merging: max(limit * multiplier, minimum).
+HYBRID_CANDIDATE_MULTIPLIER = 4
+HYBRID_MIN_CANDIDATES = 20
+# pgvector's default hnsw.ef_search; the vector scan never asks for fewer.
+HNSW_EF_SEARCH = 40
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CHEF WORKSPACE (Personality + Rules)
@@ -179,6 +186,38 @@ Guidelines:
 # HYBRID MEMORY SEARCH (Works with existing ChefMemory in customer_dashboard)
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _vector_candidates(qs, query_embedding, candidate_k: int) -> List[Dict[str, Any]]:
+    """
+    The candidate_k rows of qs nearest to query_embedding.
+
+    The HNSW index is global, so Postgres applies the chef (and client/lead)
+    filters to the rows the index scan returns. A plain scan stops after
+    hnsw.ef_search neighbours across all chefs, which can leave a chef whose
+    memories aren't among them with few or no hits. The scan runs in its own
+    transaction with ef_search raised to candidate_k and, on pgvector >= 0.8,
+    iterative scans enabled; if it still comes back short of the chef's
+    rows, they are scored exactly instead.
+    """
+    embedded = qs.filter(embedding__isnull=False)
+    ranked = embedded.annotate(
+        vector_distance=CosineDistance(F('embedding'), query_embedding)
+    ).order_by('vector_distance').values('id', 'vector_distance')[:candidate_k]
+
+    with transaction.atomic(using=qs.db), connections[qs.db].cursor() as cursor:
+        cursor.execute(f"SET LOCAL hnsw.ef_search = {max(int(candidate_k), HNSW_EF_SEARCH)}")
+        try:
+            with transaction.atomic(using=qs.db):
+                cursor.execute("SET LOCAL hnsw.iterative_scan = relaxed_order")
+        except DatabaseError:
+            # pgvector < 0.8 has no iterative scans
+            pass
+        rows = list(ranked)
+        if len(rows) < candidate_k and embedded.count() > len(rows):
+            cursor.execute("SET LOCAL enable_indexscan = off")
+            rows = list(ranked)
+    return rows
+
+
 def hybrid_memory_search(
     chef,
     query: str,
@@ -213,8 +252,6 @@ def hybrid_memory_search(
         List of (ChefMemory, score) tuples sorted by score descending
     """
     from customer_dashboard.models import ChefMemory
-    from django.contrib.postgres.search import SearchVector, SearchQuery, SearchRank
-    from pgvector.django import CosineDistance
     
     # Base queryset
     qs = ChefMemory.objects.filter(chef=chef, is_active=True)
@@ -227,33 +264,33 @@ def hybrid_memory_search(
         qs = qs.filter(lead=lead)
     
     results = []
+    # Each ranked list is bounded so both queries stay index-backed (HNSW for
+    # ORDER BY distance LIMIT k, GIN for the tsvector match) regardless of how
+    # many memories the chef has accumulated. See _vector_candidates for how
+    # the filtered HNSW scan is kept from coming up short.
+    candidate_k = max(limit * HYBRID_CANDIDATE_MULTIPLIER, HYBRID_MIN_CANDIDATES)
     
-    # Vector search (if embedding available and model has embedding field)
+    # Vector search (if embedding available)
     vector_scores = {}
     if query_embedding:
         try:
-            vector_qs = qs.filter(embedding__isnull=False).annotate(
-                vector_distance=CosineDistance(F('embedding'), query_embedding)
-            ).values('id', 'vector_distance')
+            vector_qs = _vector_candidates(qs, query_embedding, candidate_k)
             
             for row in vector_qs:
                 # Convert distance to similarity (1 - distance)
                 vector_scores[row['id']] = max(0, 1 - row['vector_distance'])
         except Exception as e:
-            # Embedding field might not exist yet - fall back to text-only
             logger.debug(f"Vector search not available: {e}")
     
-    # Full-text search (BM25-style via PostgreSQL)
+    # Full-text search against the stored, GIN-indexed tsvector
     text_scores = {}
     if query:
         try:
-            search_vector = SearchVector('content', weight='A')
-            search_query = SearchQuery(query, search_type='websearch')
+            search_query = SearchQuery(query, search_type='websearch', config='english')
             
-            text_qs = qs.annotate(
-                search=search_vector,
-                rank=SearchRank(search_vector, search_query)
-            ).filter(search=search_query).values('id', 'rank')
+            text_qs = qs.filter(search_vector=search_query).annotate(
+                rank=SearchRank(F('search_vector'), search_query)
+            ).order_by('-rank').values('id', 'rank')[:candidate_k]
             
             # Normalize ranks to 0-1 range
             ranks = list(text_qs)
@@ -263,7 +300,7 @@ def hybrid_memory_search(
         except Exception as e:
             # Fall back to simple icontains search
             logger.debug(f"Full-text search not available, using fallback: {e}")
-            fallback_qs = qs.filter(content__icontains=query).values('id')
+            fallback_qs = qs.filter(content__icontains=query).values('id')[:candidate_k]
             for row in fallback_qs:
                 text_scores[row['id']] = 0.5  # Default score for fallback matches
     
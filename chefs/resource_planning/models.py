@@ -71,6 +71,45 @@ class RecipeIngredient(models.Model):
         return age.days > max_age_days
 
 
+class DishIngredientEstimate(models.Model):
+    """
+    Cached AI ingredient estimate for a dish at a given serving count.
+
+    Prep plans estimate the same dishes week after week; caching the Groq
+    result per dish avoids paying for the same request on every plan.
+    Keyed by a hash of the dish name, description and the ingredients that
+    needed quantities, so a changed recipe misses the cache.
+    """
+    KIND_CHOICES = [
+        ('generated', 'Generated ingredient list'),
+        ('quantities', 'Estimated quantities'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    dish_key = models.CharField(max_length=64)
+    servings = models.PositiveIntegerField()
+    dish_name = models.CharField(max_length=200)
+    # [{name, quantity, unit}], already scaled for servings
+    ingredients = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'chefs'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'dish_key', 'servings'],
+                name='unique_dish_ingredient_estimate'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.dish_name} x{self.servings}"
+
+    def is_stale(self, max_age_days: int = 30) -> bool:
+        """Check if the estimate should be requested again."""
+        return (timezone.now() - self.updated_at).days > max_age_days
+
+
 class ChefPrepPlan(models.Model):
     """
     Aggregated planning view for a chef's upcoming service window.
@@ -6,10 +6,12 @@ Provides comprehensive meal planning and resource optimization for chefs:
 - Generates consolidated shopping lists with timing suggestions
 - Provides batch cooking recommendations to reduce waste
 """
+import hashlib
 import json
 import logging
 import os
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
@@ -25,6 +27,7 @@ from chefs.resource_planning.models import (
     ChefPrepPlan,
     ChefPrepPlanCommitment,
     ChefPrepPlanItem,
+    DishIngredientEstimate,
     RecipeIngredient,
 )
 from chefs.resource_planning.shelf_life import (
@@ -34,6 +37,9 @@ from chefs.resource_planning.shelf_life import (
 
 logger = logging.getLogger(__name__)
 
+PREP_PLAN_ESTIMATE_CONCURRENCY = getattr(settings, 'PREP_PLAN_ESTIMATE_CONCURRENCY', 2)
+ESTIMATE_MAX_AGE_DAYS = 30
+
 
 # Pydantic schemas for AI responses
 class EstimatedIngredient(BaseModel):
@@ -449,6 +455,22 @@ def generate_ingredients_for_meal(
         logger.warning(f"No Groq client - returning default ingredients for {meal_name}")
         return _get_default_ingredients_for_meal(meal_name)
     
+    try:
+        return _request_generated_ingredients(groq_client, meal_name, description, servings)
+    except Exception as e:
+        logger.warning(f"Failed to generate ingredients for {meal_name}: {e}")
+        return _get_default_ingredients_for_meal(meal_name)
+
+
+def _request_generated_ingredients(
+    groq_client,
+    meal_name: str,
+    description: str,
+    servings: int
+) -> List[Dict]:
+    """Ask Groq for a meal's ingredient list. Raises on failure."""
+    from utils.groq_rate_limit import groq_call_with_retry
+
     system_prompt = """You are a professional chef. Generate a realistic shopping list of ingredients for a meal.
 
 For each ingredient, provide:
@@ -471,36 +493,34 @@ Return ONLY valid JSON matching the schema."""
 
 Return JSON with an "ingredients" array containing name, quantity, and unit for each ingredient needed to prepare this meal."""
 
-    try:
-        response = groq_client.chat.completions.create(
-            model=getattr(settings, 'GROQ_MODEL', 'llama-3.3-70b-versatile'),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "generated_ingredients",
-                    "schema": GeneratedIngredientsResponse.model_json_schema(),
-                },
+    response = groq_call_with_retry(
+        raw_create_fn=groq_client.chat.completions.with_raw_response.create,
+        create_fn=groq_client.chat.completions.create,
+        desc='prep_plan.generate_ingredients',
+        model=getattr(settings, 'GROQ_MODEL', 'llama-3.3-70b-versatile'),
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.3,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "generated_ingredients",
+                "schema": GeneratedIngredientsResponse.model_json_schema(),
             },
-        )
-        
-        raw_json = response.choices[0].message.content or "{}"
-        result = GeneratedIngredientsResponse.model_validate_json(raw_json)
-        
-        logger.info(f"Generated {len(result.ingredients)} ingredients for {meal_name}")
-        
-        return [
-            {'name': ing.name, 'quantity': ing.quantity, 'unit': ing.unit}
-            for ing in result.ingredients
-        ]
-        
-    except Exception as e:
-        logger.warning(f"Failed to generate ingredients for {meal_name}: {e}")
-        return _get_default_ingredients_for_meal(meal_name)
+        },
+    )
+    
+    raw_json = response.choices[0].message.content or "{}"
+    result = GeneratedIngredientsResponse.model_validate_json(raw_json)
+    
+    logger.info(f"Generated {len(result.ingredients)} ingredients for {meal_name}")
+    
+    return [
+        {'name': ing.name, 'quantity': ing.quantity, 'unit': ing.unit}
+        for ing in result.ingredients
+    ]
 
 
 def _get_default_ingredients_for_meal(meal_name: str) -> List[Dict]:
@@ -580,13 +600,35 @@ def estimate_ingredient_quantities(
         return {}
     
     groq_client = _get_groq_client()
-    if not groq_client:
-        # Return default estimates
-        return {
-            name: {'quantity': servings * 0.25, 'unit': 'cups'}
-            for name in ingredient_names
-        }
+    estimated = _default_quantity_estimates(ingredient_names, servings)
+    if groq_client:
+        try:
+            estimated = _request_quantity_estimates(groq_client, dish_name, ingredient_names, servings)
+        except Exception as e:
+            logger.warning(f"Failed to estimate quantities: {e}")
     
+    return {
+        ing['name'].lower(): {'quantity': ing['quantity'], 'unit': ing['unit']}
+        for ing in estimated
+    }
+
+
+def _default_quantity_estimates(ingredient_names: List[str], servings: int) -> List[Dict]:
+    return [
+        {'name': name, 'quantity': servings * 0.25, 'unit': 'cups'}
+        for name in ingredient_names
+    ]
+
+
+def _request_quantity_estimates(
+    groq_client,
+    dish_name: str,
+    ingredient_names: List[str],
+    servings: int
+) -> List[Dict]:
+    """Ask Groq for quantities of a dish's ingredients. Raises on failure."""
+    from utils.groq_rate_limit import groq_call_with_retry
+
     ingredients_list = ", ".join(ingredient_names)
     
     system_prompt = """You are a professional chef. Estimate realistic ingredient quantities.
@@ -610,37 +652,199 @@ Ingredients to estimate:
 
 Return JSON with an "ingredients" array containing name, quantity, and unit for each."""
 
-    try:
-        response = groq_client.chat.completions.create(
-            model=getattr(settings, 'GROQ_MODEL', 'llama-3.3-70b-versatile'),
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            response_format={
-                "type": "json_schema",
-                "json_schema": {
-                    "name": "estimated_ingredients",
-                    "schema": EstimatedIngredientsResponse.model_json_schema(),
-                },
+    response = groq_call_with_retry(
+        raw_create_fn=groq_client.chat.completions.with_raw_response.create,
+        create_fn=groq_client.chat.completions.create,
+        desc='prep_plan.estimate_quantities',
+        model=getattr(settings, 'GROQ_MODEL', 'llama-3.3-70b-versatile'),
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.3,
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": "estimated_ingredients",
+                "schema": EstimatedIngredientsResponse.model_json_schema(),
             },
+        },
+    )
+    
+    raw_json = response.choices[0].message.content or "{}"
+    result = EstimatedIngredientsResponse.model_validate_json(raw_json)
+    
+    return [
+        {'name': ing.name, 'quantity': ing.quantity, 'unit': ing.unit}
+        for ing in result.ingredients
+    ]
+
+
+@dataclass(frozen=True)
+class EstimateRequest:
+    """One AI ingredient estimate a prep plan needs, shared by every commitment serving the dish."""
+    kind: str  # 'generated' (full ingredient list) or 'quantities'
+    dish_name: str
+    servings: int
+    description: str = ""
+    ingredient_names: Tuple[str, ...] = ()
+
+    @property
+    def dish_key(self) -> str:
+        payload = json.dumps([
+            self.dish_name.lower().strip(),
+            self.description.strip(),
+            sorted(name.lower().strip() for name in self.ingredient_names),
+        ])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return (self.kind, self.dish_key, self.servings)
+
+
+def _estimate_request_for(dish: Dict, servings: int) -> Optional[EstimateRequest]:
+    """The estimate a dish needs at this serving count, if any."""
+    ingredients = dish.get('ingredients', [])
+    if dish.get('needs_ingredient_generation') and not ingredients:
+        return EstimateRequest(
+            kind='generated',
+            dish_name=dish['name'],
+            servings=servings,
+            description=dish.get('description') or '',
         )
-        
-        raw_json = response.choices[0].message.content or "{}"
-        result = EstimatedIngredientsResponse.model_validate_json(raw_json)
-        
-        return {
-            ing.name.lower(): {'quantity': ing.quantity, 'unit': ing.unit}
-            for ing in result.ingredients
-        }
-        
-    except Exception as e:
-        logger.warning(f"Failed to estimate quantities: {e}")
-        return {
-            name: {'quantity': servings * 0.25, 'unit': 'cups'}
-            for name in ingredient_names
-        }
+    missing = tuple(ing['name'] for ing in ingredients if ing.get('quantity') is None)
+    if missing:
+        return EstimateRequest(
+            kind='quantities',
+            dish_name=dish['name'],
+            servings=servings,
+            ingredient_names=missing,
+        )
+    return None
+
+
+def plan_ingredient_estimates(
+    commitments: List[Commitment]
+) -> Dict[Tuple[str, str, int], EstimateRequest]:
+    """
+    Collect the AI estimates needed across all commitments.
+    
+    The same dish at the same serving count is requested once, however
+    many days it is served.
+    """
+    requests = {}
+    for commitment in commitments:
+        for dish in commitment.dishes:
+            request = _estimate_request_for(dish, commitment.servings)
+            if request is not None:
+                requests.setdefault(request.key, request)
+    return requests
+
+
+def _run_estimate_request(groq_client, request: EstimateRequest) -> List[Dict]:
+    if request.kind == 'generated':
+        return _request_generated_ingredients(
+            groq_client, request.dish_name, request.description, request.servings
+        )
+    return _request_quantity_estimates(
+        groq_client, request.dish_name, list(request.ingredient_names), request.servings
+    )
+
+
+def _default_estimate(request: EstimateRequest) -> List[Dict]:
+    if request.kind == 'generated':
+        return _get_default_ingredients_for_meal(request.dish_name)
+    return _default_quantity_estimates(list(request.ingredient_names), request.servings)
+
+
+def resolve_ingredient_estimates(
+    requests: Dict[Tuple[str, str, int], EstimateRequest]
+) -> Dict[Tuple[str, str, int], List[Dict]]:
+    """
+    Resolve estimates from DishIngredientEstimate, asking Groq for the rest.
+    
+    Cache misses are requested concurrently (PREP_PLAN_ESTIMATE_CONCURRENCY
+    at a time). Successful answers are cached; failures fall back to
+    defaults for this plan only.
+    
+    Returns:
+        Dict mapping request key to a list of {name, quantity, unit},
+        already scaled for servings
+    """
+    if not requests:
+        return {}
+
+    resolved = {}
+    cached = DishIngredientEstimate.objects.filter(
+        dish_key__in={request.dish_key for request in requests.values()}
+    )
+    for estimate in cached:
+        key = (estimate.kind, estimate.dish_key, estimate.servings)
+        if key in requests and not estimate.is_stale(ESTIMATE_MAX_AGE_DAYS):
+            resolved[key] = estimate.ingredients
+
+    pending = [request for key, request in requests.items() if key not in resolved]
+    logger.info(
+        f"Prep plan needs {len(requests)} ingredient estimates: "
+        f"{len(resolved)} cached, {len(pending)} to request"
+    )
+    if not pending:
+        return resolved
+
+    groq_client = _get_groq_client()
+    if not groq_client:
+        logger.warning("No Groq client - using default ingredient estimates")
+        for request in pending:
+            resolved[request.key] = _default_estimate(request)
+        return resolved
+
+    def estimate(request: EstimateRequest) -> Optional[List[Dict]]:
+        try:
+            return _run_estimate_request(groq_client, request)
+        except Exception as e:
+            logger.warning(f"Failed to estimate ingredients for {request.dish_name}: {e}")
+            return None
+
+    workers = max(1, min(PREP_PLAN_ESTIMATE_CONCURRENCY, len(pending)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prep-plan-estimate") as pool:
+        answers = list(pool.map(estimate, pending))
+
+    to_cache = []
+    for request, ingredients in zip(pending, answers):
+        if ingredients is None:
+            resolved[request.key] = _default_estimate(request)
+            continue
+        resolved[request.key] = ingredients
+        to_cache.append(DishIngredientEstimate(
+            kind=request.kind,
+            dish_key=request.dish_key,
+            servings=request.servings,
+            dish_name=request.dish_name[:200],
+            ingredients=ingredients,
+        ))
+
+    if to_cache:
+        DishIngredientEstimate.objects.bulk_create(
+            to_cache,
+            update_conflicts=True,
+            unique_fields=['kind', 'dish_key', 'servings'],
+            update_fields=['dish_name', 'ingredients', 'updated_at'],
+        )
+    return resolved
+
+
+def purge_stale_estimates(max_age_days: int = ESTIMATE_MAX_AGE_DAYS) -> dict:
+    """
+    Cron task: delete cached ingredient estimates older than max_age_days.
+
+    Stale rows are never served by resolve_ingredient_estimates, so this
+    only reclaims space.
+    """
+    cutoff = timezone.now() - timedelta(days=max_age_days)
+    deleted, _ = DishIngredientEstimate.objects.filter(updated_at__lt=cutoff).delete()
+    logger.info(f"Purged {deleted} ingredient estimates older than {max_age_days} days")
+    return {'deleted': deleted}
 
 
 def aggregate_ingredients(
@@ -652,6 +856,8 @@ def aggregate_ingredients(
     Groups by ingredient name (case-insensitive) and sums quantities.
     Estimates quantities where not provided.
     Generates ingredients for dishes without any structured data.
+    All estimates are planned and resolved up front, so a dish served on
+    several days costs one request at most.
     
     Args:
         commitments: List of Commitment objects
@@ -666,37 +872,26 @@ def aggregate_ingredients(
         'dates': []
     })
     
+    # Every AI estimate the plan needs, deduplicated and resolved up front
+    estimates = resolve_ingredient_estimates(plan_ingredient_estimates(commitments))
+    
     for commitment in commitments:
         for dish in commitment.dishes:
             current_ingredients = dish.get('ingredients', [])
             already_scaled_for_servings = False
+            quantity_estimates = {}
             
-            # If dish needs full ingredient generation (no structured data)
-            if dish.get('needs_ingredient_generation') and not current_ingredients:
-                logger.info(f"Generating ingredients for: {dish['name']}")
-                generated = generate_ingredients_for_meal(
-                    meal_name=dish['name'],
-                    description=dish.get('description', ''),
-                    servings=commitment.servings
-                )
-                current_ingredients = generated
-                already_scaled_for_servings = True  # AI generation already factors in servings
-            
-            # Get or estimate ingredient quantities for existing ingredients without quantities
-            ingredients_to_estimate = []
-            
-            for ing in current_ingredients:
-                if ing.get('quantity') is None:
-                    ingredients_to_estimate.append(ing['name'])
-            
-            # Estimate missing quantities (already includes serving scaling)
-            estimates = {}
-            if ingredients_to_estimate:
-                estimates = estimate_ingredient_quantities(
-                    dish['name'],
-                    ingredients_to_estimate,
-                    commitment.servings
-                )
+            request = _estimate_request_for(dish, commitment.servings)
+            if request is not None and request.kind == 'generated':
+                # Dish had no structured data; AI generation already factors in servings
+                current_ingredients = estimates.get(request.key, [])
+                already_scaled_for_servings = True
+            elif request is not None:
+                # Estimated quantities are already scaled for servings
+                quantity_estimates = {
+                    est['name'].lower().strip(): est
+                    for est in estimates.get(request.key, [])
+                }
             
             # Aggregate each ingredient
             for ing in current_ingredients:
@@ -713,7 +908,7 @@ def aggregate_ingredients(
                     unit = ing.get('unit', 'units')
                 else:
                     # Estimated quantities are already scaled for servings
-                    est = estimates.get(name_key, {'quantity': 0.25, 'unit': 'cups'})
+                    est = quantity_estimates.get(name_key, {'quantity': 0.25, 'unit': 'cups'})
                     quantity = Decimal(str(est['quantity']))
                     unit = est['unit']
                 
@@ -3,9 +3,16 @@ from .client_insights import (
     get_dashboard_summary,
     get_client_stats,
     get_client_list_with_stats,
+    get_client_list_queryset,
     get_revenue_breakdown,
     get_upcoming_orders,
 )
+from .dashboard_metrics import (
+    get_daily_metrics,
+    summarize_metrics,
+    rebuild_metrics,
+    reconcile_chef_daily_metrics,
+)
 from .proactive_insights import (
     generate_chef_insights,
     save_insights,
@@ -26,8 +33,14 @@ __all__ = [
     'get_dashboard_summary',
     'get_client_stats',
     'get_client_list_with_stats',
+    'get_client_list_queryset',
     'get_revenue_breakdown',
     'get_upcoming_orders',
+    # Dashboard metrics rollup
+    'get_daily_metrics',
+    'summarize_metrics',
+    'rebuild_metrics',
+    'reconcile_chef_daily_metrics',
     # Proactive insights
     'generate_chef_insights',
     'save_insights',
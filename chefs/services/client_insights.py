@@ -13,8 +13,10 @@ from datetime import timedelta
 from decimal import Decimal
 from typing import Any, Optional
 
-from django.db.models import Sum, Count, Q, F, Avg
-from django.db.models.functions import Coalesce
+from django.db.models import (
+    Avg, Count, DecimalField, ExpressionWrapper, F, IntegerField, OuterRef, Q, Subquery, Sum, Value,
+)
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 
 from chef_services.models import (
@@ -24,6 +26,8 @@ from chef_services.models import (
 )
 from meals.models import ChefMealEvent, ChefMealOrder
 
+from .dashboard_metrics import get_daily_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,7 +43,7 @@ def get_dashboard_summary(chef) -> dict[str, Any]:
             "top_services": [{"id": int, "name": str, "order_count": int}]
         }
     """
-    now = timezone.now()
+    now = timezone.localtime()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=today_start.weekday())
     month_start = today_start.replace(day=1)
@@ -65,34 +69,21 @@ def get_dashboard_summary(chef) -> dict[str, Any]:
 
 
 def _calculate_revenue(chef, today_start, week_start, month_start) -> dict[str, Decimal]:
-    """Calculate revenue from both ChefMealOrders and ChefServiceOrders."""
-    
-    def sum_meal_revenue(date_filter):
-        result = ChefMealOrder.objects.filter(
-            meal_event__chef=chef,
-            status='confirmed',
-            **date_filter
-        ).aggregate(
-            total=Coalesce(Sum(F('price_paid') * F('quantity')), Decimal('0'))
+    """Calculate meal and service revenue from the daily metrics rollup."""
+    today = today_start.date()
+    first_day = min(week_start, month_start).date()
+    rows = get_daily_metrics(chef, first_day, today)
+
+    def total_since(start):
+        return sum(
+            (row.total_revenue for day, row in rows.items() if day >= start.date()),
+            Decimal('0'),
         )
-        return result['total'] or Decimal('0')
-    
-    def sum_service_revenue(date_filter):
-        result = ChefServiceOrder.objects.filter(
-            chef=chef,
-            status='confirmed',
-            **date_filter
-        ).aggregate(
-            total=Coalesce(Sum('tier__desired_unit_amount_cents'), 0)
-        )
-        # Convert cents to dollars
-        cents = result['total'] or 0
-        return Decimal(cents) / 100
-    
+
     return {
-        "today": sum_meal_revenue({'created_at__gte': today_start}) + sum_service_revenue({'created_at__gte': today_start}),
-        "this_week": sum_meal_revenue({'created_at__gte': week_start}) + sum_service_revenue({'created_at__gte': week_start}),
-        "this_month": sum_meal_revenue({'created_at__gte': month_start}) + sum_service_revenue({'created_at__gte': month_start}),
+        "today": total_since(today_start),
+        "this_week": total_since(week_start),
+        "this_month": total_since(month_start),
     }
 
 
@@ -263,19 +254,44 @@ def get_client_stats(chef, customer) -> dict[str, Any]:
     }
 
 
-def get_client_list_with_stats(chef, search: Optional[str] = None, status: Optional[str] = None) -> list[dict[str, Any]]:
+# Orders that count toward client totals
+ACTIVE_ORDER_STATUSES = ['confirmed', 'completed']
+
+# Sortable client list fields -> annotated column
+CLIENT_LIST_ORDERING = {
+    'connected_since': 'connected_since',
+    'total_spent': 'total_spent',
+    'total_orders': 'total_orders',
+    'username': 'username',
+}
+
+
+def _grouped_subquery(queryset, aggregate, output_field):
+    """Correlated per-customer aggregate, coalesced to zero."""
+    value = queryset.values('customer').annotate(value=aggregate).values('value')[:1]
+    return Coalesce(Subquery(value, output_field=output_field), Value(0), output_field=output_field)
+
+
+def get_client_list_queryset(
+    chef,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    ordering: Optional[str] = None,
+):
     """
-    Get list of clients with aggregated stats for list view.
+    Client list for the CRM as a single annotated values() queryset.
+    
+    Order counts and spend are computed with correlated subqueries, so the
+    query count does not grow with the number of clients. The result can be
+    sliced by a paginator to push LIMIT/OFFSET into SQL.
     
     Args:
         chef: Chef instance
-        search: Optional search term for customer username/email
+        search: Optional search term for customer username/email/name
         status: Optional status filter ('accepted', 'pending', 'ended')
-    
-    Returns:
-        List of client dicts with basic stats
+        ordering: Optional sort key, e.g. '-total_spent' (see CLIENT_LIST_ORDERING)
     """
-    connections = ChefCustomerConnection.objects.filter(chef=chef).select_related('customer')
+    connections = ChefCustomerConnection.objects.filter(chef=chef)
     
     if status:
         connections = connections.filter(status=status)
@@ -291,55 +307,74 @@ def get_client_list_with_stats(chef, search: Optional[str] = None, status: Optio
             Q(customer__last_name__icontains=search)
         )
     
-    results = []
-    for conn in connections:
-        customer = conn.customer
-        
-        # Quick stats (optimized - could be further optimized with annotate if needed)
-        meal_count = ChefMealOrder.objects.filter(
-            meal_event__chef=chef,
-            customer=customer,
-            status__in=['confirmed', 'completed']
-        ).count()
-        
-        service_count = ChefServiceOrder.objects.filter(
-            chef=chef,
-            customer=customer,
-            status__in=['confirmed', 'completed']
-        ).count()
-        
-        # Total spent
-        meal_spent = ChefMealOrder.objects.filter(
-            meal_event__chef=chef,
-            customer=customer,
-            status__in=['confirmed', 'completed']
-        ).aggregate(
-            total=Coalesce(Sum(F('price_paid') * F('quantity')), Decimal('0'))
-        )['total'] or Decimal('0')
-        
-        service_spent_cents = ChefServiceOrder.objects.filter(
-            chef=chef,
-            customer=customer,
-            status__in=['confirmed', 'completed']
-        ).aggregate(
-            total=Coalesce(Sum('tier__desired_unit_amount_cents'), 0)
-        )['total'] or 0
-        
-        total_spent = meal_spent + Decimal(service_spent_cents) / 100
-        
-        results.append({
-            "customer_id": customer.id,
-            "username": customer.username,
-            "email": customer.email,
-            "first_name": customer.first_name,
-            "last_name": customer.last_name,
-            "connection_status": conn.status,
-            "connected_since": conn.responded_at or conn.requested_at,
-            "total_orders": meal_count + service_count,
-            "total_spent": total_spent,
-        })
+    money = DecimalField(max_digits=14, decimal_places=2)
+    meal_orders = ChefMealOrder.objects.filter(
+        meal_event__chef=chef,
+        customer=OuterRef('customer'),
+        status__in=ACTIVE_ORDER_STATUSES,
+    )
+    service_orders = ChefServiceOrder.objects.filter(
+        chef=chef,
+        customer=OuterRef('customer'),
+        status__in=ACTIVE_ORDER_STATUSES,
+    )
+    
+    connections = connections.annotate(
+        meal_count=_grouped_subquery(meal_orders, Count('id'), IntegerField()),
+        service_count=_grouped_subquery(service_orders, Count('id'), IntegerField()),
+        meal_spent=_grouped_subquery(meal_orders, Sum(F('price_paid') * F('quantity')), money),
+        service_spent_cents=_grouped_subquery(
+            service_orders, Sum('tier__desired_unit_amount_cents'), IntegerField()
+        ),
+    ).annotate(
+        total_orders=F('meal_count') + F('service_count'),
+        total_spent=ExpressionWrapper(
+            F('meal_spent') + Cast(F('service_spent_cents'), money) / Value(Decimal('100')),
+            output_field=money,
+        ),
+        connected_since=Coalesce('responded_at', 'requested_at'),
+    ).values(
+        'customer_id',
+        'total_orders',
+        'total_spent',
+        'connected_since',
+        username=F('customer__username'),
+        email=F('customer__email'),
+        first_name=F('customer__first_name'),
+        last_name=F('customer__last_name'),
+        connection_status=F('status'),
+    )
+    
+    sort_field = (ordering or '').lstrip('-')
+    if sort_field in CLIENT_LIST_ORDERING:
+        column = F(CLIENT_LIST_ORDERING[sort_field])
+        column = column.desc(nulls_last=True) if ordering.startswith('-') else column.asc(nulls_last=True)
+        connections = connections.order_by(column, 'id')
+    else:
+        connections = connections.order_by('id')
+    
+    return connections
+
+
+def get_client_list_with_stats(
+    chef,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    ordering: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """
+    Get list of clients with aggregated stats for list view.
+    
+    Args:
+        chef: Chef instance
+        search: Optional search term for customer username/email
+        status: Optional status filter ('accepted', 'pending', 'ended')
+        ordering: Optional sort key, e.g. '-total_spent'
     
-    return results
+    Returns:
+        List of client dicts with basic stats
+    """
+    return list(get_client_list_queryset(chef, search=search, status=status, ordering=ordering))
 
 
 def get_revenue_breakdown(
@@ -511,7 +546,7 @@ def get_analytics_time_series(chef, metric: str, days: int = 30) -> list[dict[st
         List of daily data points:
         [{"date": "2025-12-01", "value": 150.00, "label": "Dec 1"}, ...]
     """
-    now = timezone.now()
+    now = timezone.localtime()
     end_date = now.replace(hour=23, minute=59, second=59, microsecond=999999)
     start_date = (now - timedelta(days=days - 1)).replace(hour=0, minute=0, second=0, microsecond=0)
     
@@ -526,132 +561,26 @@ def get_analytics_time_series(chef, metric: str, days: int = 30) -> list[dict[st
         return []
 
 
+def _rollup_series(chef, start_date, days: int, value) -> list[dict]:
+    """Build a daily series from rollup rows, one value per day."""
+    rows = get_daily_metrics(chef, start_date.date(), (start_date + timedelta(days=days - 1)).date())
+    data_by_date = {day.strftime('%Y-%m-%d'): value(row) for day, row in rows.items()}
+    return _fill_date_range(start_date, days, data_by_date)
+
+
 def _get_revenue_time_series(chef, start_date, end_date, days: int) -> list[dict]:
     """Generate daily revenue data points."""
-    from django.db.models.functions import TruncDate
-    
-    # Get meal order revenue by day
-    meal_by_day = (
-        ChefMealOrder.objects
-        .filter(
-            meal_event__chef=chef,
-            status__in=['confirmed', 'completed'],
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        )
-        .annotate(day=TruncDate('created_at'))
-        .values('day')
-        .annotate(total=Sum(F('price_paid') * F('quantity')))
-        .order_by('day')
-    )
-    
-    # Get service order revenue by day
-    service_by_day = (
-        ChefServiceOrder.objects
-        .filter(
-            chef=chef,
-            status__in=['confirmed', 'completed'],
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        )
-        .annotate(day=TruncDate('created_at'))
-        .values('day')
-        .annotate(total=Sum('tier__desired_unit_amount_cents'))
-        .order_by('day')
-    )
-    
-    # Combine into a dict by date
-    revenue_by_date = {}
-    for item in meal_by_day:
-        if item['day']:
-            date_str = item['day'].strftime('%Y-%m-%d')
-            revenue_by_date[date_str] = float(item['total'] or 0)
-    
-    for item in service_by_day:
-        if item['day']:
-            date_str = item['day'].strftime('%Y-%m-%d')
-            cents = item['total'] or 0
-            revenue_by_date[date_str] = revenue_by_date.get(date_str, 0) + (cents / 100)
-    
-    # Generate all days in range
-    return _fill_date_range(start_date, days, revenue_by_date)
+    return _rollup_series(chef, start_date, days, lambda row: float(row.total_revenue))
 
 
 def _get_orders_time_series(chef, start_date, end_date, days: int) -> list[dict]:
     """Generate daily order count data points."""
-    from django.db.models.functions import TruncDate
-    
-    # Get meal order count by day
-    meal_by_day = (
-        ChefMealOrder.objects
-        .filter(
-            meal_event__chef=chef,
-            status__in=['confirmed', 'completed'],
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        )
-        .annotate(day=TruncDate('created_at'))
-        .values('day')
-        .annotate(count=Count('id'))
-        .order_by('day')
-    )
-    
-    # Get service order count by day
-    service_by_day = (
-        ChefServiceOrder.objects
-        .filter(
-            chef=chef,
-            status__in=['confirmed', 'completed'],
-            created_at__gte=start_date,
-            created_at__lte=end_date
-        )
-        .annotate(day=TruncDate('created_at'))
-        .values('day')
-        .annotate(count=Count('id'))
-        .order_by('day')
-    )
-    
-    # Combine into a dict by date
-    orders_by_date = {}
-    for item in meal_by_day:
-        if item['day']:
-            date_str = item['day'].strftime('%Y-%m-%d')
-            orders_by_date[date_str] = item['count'] or 0
-    
-    for item in service_by_day:
-        if item['day']:
-            date_str = item['day'].strftime('%Y-%m-%d')
-            orders_by_date[date_str] = orders_by_date.get(date_str, 0) + (item['count'] or 0)
-    
-    return _fill_date_range(start_date, days, orders_by_date)
+    return _rollup_series(chef, start_date, days, lambda row: row.meal_orders + row.service_orders)
 
 
 def _get_clients_time_series(chef, start_date, end_date, days: int) -> list[dict]:
     """Generate daily new client count data points."""
-    from django.db.models.functions import TruncDate
-    
-    # Get new accepted connections by day
-    connections_by_day = (
-        ChefCustomerConnection.objects
-        .filter(
-            chef=chef,
-            status=ChefCustomerConnection.STATUS_ACCEPTED,
-            responded_at__gte=start_date,
-            responded_at__lte=end_date
-        )
-        .annotate(day=TruncDate('responded_at'))
-        .values('day')
-        .annotate(count=Count('id'))
-        .order_by('day')
-    )
-    
-    clients_by_date = {}
-    for item in connections_by_day:
-        if item['day']:
-            date_str = item['day'].strftime('%Y-%m-%d')
-            clients_by_date[date_str] = item['count'] or 0
-    
-    return _fill_date_range(start_date, days, clients_by_date)
+    return _rollup_series(chef, start_date, days, lambda row: row.new_clients)
 
 
 def _fill_date_range(start_date, days: int, data_by_date: dict) -> list[dict]:
@@ -0,0 +1,287 @@
+"""
+Materialized dashboard metrics for the Chef CRM.
+
+ChefDailyMetrics holds one row per chef per day. Writes to orders,
+payment logs, reviews and client connections refresh just the affected
+day (see chefs.signals); readers then scan O(days) rollup rows instead of
+re-aggregating every order on each dashboard load.
+
+Any day range can be rebuilt from source with rebuild_metrics(), which
+the reconcile_chef_daily_metrics cron task and the rebuild_chef_metrics
+management command use to repair drift from bulk updates that bypass
+signals.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import BigIntegerField, Count, DecimalField, ExpressionWrapper, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from chef_services.models import ChefCustomerConnection, ChefServiceOrder
+from chefs.models import Chef, ChefDailyMetrics
+from meals.models import ChefMealEvent, ChefMealOrder, ChefMealReview, PaymentLog
+
+logger = logging.getLogger(__name__)
+
+REVENUE_STATUSES = ('confirmed', 'completed')
+SAVINGS_EVENT_STATUSES = ('completed', 'closed', 'in_progress')
+
+METRIC_FIELDS = (
+    'meal_revenue',
+    'meal_orders',
+    'service_revenue_cents',
+    'service_orders',
+    'refunds',
+    'customer_savings',
+    'review_count',
+    'rating_sum',
+    'new_clients',
+)
+
+DECIMAL_FIELDS = ('meal_revenue', 'refunds', 'customer_savings')
+
+_MONEY = DecimalField(max_digits=12, decimal_places=2)
+
+
+def local_day(value) -> date:
+    """Return the dashboard day a date or datetime falls on."""
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            return timezone.localtime(value).date()
+        return value.date()
+    return value
+
+
+def _day_bounds(start_day: date, end_day: date) -> tuple[datetime, datetime]:
+    """Aware [start, end) datetimes covering start_day..end_day inclusive."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(start_day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(end_day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def _grouped(queryset, chef_field: str, day_expr, **aggregates) -> dict:
+    """Aggregate a queryset per (chef_id, day)."""
+    rows = (
+        queryset
+        .annotate(metric_chef=F(chef_field), metric_day=day_expr)
+        .values('metric_chef', 'metric_day')
+        .annotate(**aggregates)
+        .order_by()
+    )
+    return {(row['metric_chef'], row['metric_day']): row for row in rows}
+
+
+def rebuild_metrics(start_day: date, end_day: date, chef_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute rollup rows for every day in start_day..end_day.
+
+    Runs one grouped query per source table regardless of how many chefs
+    or days are covered, then upserts a row for every (chef, day) pair -
+    including empty days, so readers can tell a quiet day from one that
+    has never been computed.
+
+    Returns the number of rows written.
+    """
+    if chef_ids is None:
+        chef_ids = list(Chef.objects.values_list('id', flat=True))
+    else:
+        chef_ids = list(chef_ids)
+    if not chef_ids or end_day < start_day:
+        return 0
+
+    start, end = _day_bounds(start_day, end_day)
+
+    meal_orders = _grouped(
+        ChefMealOrder.objects.filter(
+            meal_event__chef_id__in=chef_ids,
+            status__in=REVENUE_STATUSES,
+            created_at__gte=start,
+            created_at__lt=end,
+        ),
+        'meal_event__chef_id',
+        TruncDate('created_at'),
+        revenue=Sum(ExpressionWrapper(F('price_paid') * F('quantity'), output_field=_MONEY)),
+        orders=Count('id'),
+    )
+    service_orders = _grouped(
+        ChefServiceOrder.objects.filter(
+            chef_id__in=chef_ids,
+            status__in=REVENUE_STATUSES,
+            created_at__gte=start,
+            created_at__lt=end,
+        ),
+        'chef_id',
+        TruncDate('created_at'),
+        cents=Sum('tier__desired_unit_amount_cents'),
+        orders=Count('id'),
+    )
+    refunds = _grouped(
+        PaymentLog.objects.filter(
+            chef_id__in=chef_ids,
+            action='refund',
+            created_at__gte=start,
+            created_at__lt=end,
+        ),
+        'chef_id',
+        TruncDate('created_at'),
+        total=Sum('amount'),
+    )
+    savings = _grouped(
+        ChefMealEvent.objects.filter(
+            chef_id__in=chef_ids,
+            status__in=SAVINGS_EVENT_STATUSES,
+            current_price__lt=F('base_price'),
+            event_date__gte=start_day,
+            event_date__lte=end_day,
+        ),
+        'chef_id',
+        F('event_date'),
+        total=Sum(ExpressionWrapper(
+            (F('base_price') - F('current_price')) * F('orders_count'),
+            output_field=_MONEY,
+        )),
+    )
+    reviews = _grouped(
+        ChefMealReview.objects.filter(
+            chef_id__in=chef_ids,
+            created_at__gte=start,
+            created_at__lt=end,
+        ),
+        'chef_id',
+        TruncDate('created_at'),
+        count=Count('id'),
+        rating_sum=Sum('rating'),
+    )
+    clients = _grouped(
+        ChefCustomerConnection.objects.filter(
+            chef_id__in=chef_ids,
+            status=ChefCustomerConnection.STATUS_ACCEPTED,
+            responded_at__gte=start,
+            responded_at__lt=end,
+        ),
+        'chef_id',
+        TruncDate('responded_at'),
+        count=Count('id'),
+    )
+
+    empty = {}
+    rows = []
+    days = (end_day - start_day).days + 1
+    for chef_id in chef_ids:
+        for offset in range(days):
+            day = start_day + timedelta(days=offset)
+            key = (chef_id, day)
+            meal = meal_orders.get(key, empty)
+            service = service_orders.get(key, empty)
+            review = reviews.get(key, empty)
+            rows.append(ChefDailyMetrics(
+                chef_id=chef_id,
+                date=day,
+                meal_revenue=meal.get('revenue') or Decimal('0.00'),
+                meal_orders=meal.get('orders') or 0,
+                service_revenue_cents=service.get('cents') or 0,
+                service_orders=service.get('orders') or 0,
+                refunds=refunds.get(key, empty).get('total') or Decimal('0.00'),
+                customer_savings=savings.get(key, empty).get('total') or Decimal('0.00'),
+                review_count=review.get('count') or 0,
+                rating_sum=review.get('rating_sum') or 0,
+                new_clients=clients.get(key, empty).get('count') or 0,
+            ))
+
+    ChefDailyMetrics.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['chef', 'date'],
+        update_fields=[*METRIC_FIELDS, 'refreshed_at'],
+    )
+    return len(rows)
+
+
+def refresh_chef_day(chef_id: int, when) -> None:
+    """
+    Recompute a single chef-day after one of its source rows changed.
+
+    Signal handlers queue this with transaction.on_commit, so it runs
+    inside its own savepoint and never raises: a failed refresh leaves the
+    row for the reconcile job instead of surfacing after the write that
+    triggered it.
+    """
+    if not chef_id or when is None:
+        return
+    day = local_day(when)
+    try:
+        with transaction.atomic():
+            rebuild_metrics(day, day, chef_ids=[chef_id])
+    except Exception as e:
+        logger.warning(f"Failed to refresh dashboard metrics for chef {chef_id} on {day}: {e}")
+
+
+def get_daily_metrics(chef, start_day: date, end_day: date) -> dict[date, ChefDailyMetrics]:
+    """
+    Rollup rows for a chef keyed by day, computing any missing days first.
+
+    Days that have never been materialized (new chefs, or history from
+    before the rollup existed) are rebuilt in a single pass so the first
+    read is correct; later reads are a single indexed range scan.
+    """
+    def fetch():
+        return {
+            row.date: row
+            for row in ChefDailyMetrics.objects.filter(
+                chef=chef, date__gte=start_day, date__lte=end_day
+            )
+        }
+
+    rows = fetch()
+    expected = (end_day - start_day).days + 1
+    if len(rows) < expected:
+        missing = [
+            start_day + timedelta(days=offset)
+            for offset in range(expected)
+            if start_day + timedelta(days=offset) not in rows
+        ]
+        rebuild_metrics(missing[0], missing[-1], chef_ids=[chef.id])
+        rows = fetch()
+    return rows
+
+
+def _total(name: str):
+    if name in DECIMAL_FIELDS:
+        return Coalesce(Sum(name), Value(Decimal('0.00')), output_field=_MONEY)
+    return Coalesce(Sum(name), Value(0), output_field=BigIntegerField())
+
+
+def summarize_metrics(chef, start_day: Optional[date] = None, end_day: Optional[date] = None) -> dict:
+    """Sum rollup rows for a chef over an optional day range."""
+    rows = ChefDailyMetrics.objects.filter(chef=chef)
+    if start_day is not None:
+        rows = rows.filter(date__gte=start_day)
+    if end_day is not None:
+        rows = rows.filter(date__lte=end_day)
+    totals = rows.aggregate(**{name: _total(name) for name in METRIC_FIELDS})
+    totals['total_revenue'] = totals['meal_revenue'] + Decimal(totals['service_revenue_cents']) / 100
+    return totals
+
+
+def reconcile_chef_daily_metrics(days: Optional[int] = None) -> dict:
+    """
+    Cron task: rebuild the trailing window of rollup rows for every chef.
+
+    Signals cover normal writes; this repairs days touched by queryset
+    updates or deletes that bypass them.
+    """
+    if days is None:
+        days = getattr(settings, 'CHEF_METRICS_RECONCILE_DAYS', 7)
+    end_day = timezone.localdate()
+    start_day = end_day - timedelta(days=days - 1)
+    written = rebuild_metrics(start_day, end_day)
+    logger.info(f"Reconciled {written} chef daily metric rows for {start_day}..{end_day}")
+    return {'start': start_day.isoformat(), 'end': end_day.isoformat(), 'rows': written}
@@ -20,6 +20,8 @@ from django.db.models import Q
 
 from openai import OpenAI
 
+from shared.services.embedding_gateway import embedding_gateway
+
 logger = logging.getLogger(__name__)
 
 # Initialize OpenAI client
@@ -48,53 +50,36 @@ class EmbeddingService:
         """
         Generate embedding for text.
         
+        Served from the shared embedding cache when the text was seen before.
         Returns None if embedding fails.
         """
         if not text or not text.strip():
             return None
         
-        try:
-            client = get_openai_client()
-            response = client.embeddings.create(
-                model=cls.MODEL,
-                input=text[:8000],  # Truncate to model limit
-                dimensions=cls.DIMENSIONS
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            logger.error(f"Embedding generation failed: {e}")
-            return None
+        return embedding_gateway.embed(
+            text,
+            model=cls.MODEL,
+            dimensions=cls.DIMENSIONS,
+            client_factory=get_openai_client,
+        )
     
     @classmethod
     def get_embeddings_batch(cls, texts: List[str]) -> List[Optional[List[float]]]:
         """
-        Generate embeddings for multiple texts in one API call.
+        Generate embeddings for multiple texts.
         
-        More efficient for bulk operations.
+        Cached texts are reused; the rest go out in as few API calls as
+        the per-request input limit allows.
         """
         if not texts:
             return []
         
-        try:
-            client = get_openai_client()
-            # Truncate each text
-            truncated = [t[:8000] if t else "" for t in texts]
-            
-            response = client.embeddings.create(
-                model=cls.MODEL,
-                input=truncated,
-                dimensions=cls.DIMENSIONS
-            )
-            
-            # Map back by index
-            embeddings = [None] * len(texts)
-            for item in response.data:
-                embeddings[item.index] = item.embedding
-            
-            return embeddings
-        except Exception as e:
-            logger.error(f"Batch embedding generation failed: {e}")
-            return [None] * len(texts)
+        return embedding_gateway.embed_many(
+            texts,
+            model=cls.MODEL,
+            dimensions=cls.DIMENSIONS,
+            client_factory=get_openai_client,
+        )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -219,9 +204,10 @@ class MemoryService:
             limit=limit,
         )
         
-        # Record access for returned memories
-        for memory, _ in results:
-            memory.mark_accessed()
+        # Record access for returned memories in one UPDATE
+        if results:
+            from customer_dashboard.models import ChefMemory
+            ChefMemory.mark_accessed_bulk([memory for memory, _ in results])
         
         return results
     
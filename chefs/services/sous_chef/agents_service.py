@@ -6,12 +6,15 @@ Drop-in replacement for SousChefService that uses the Agents SDK
 with Groq via LiteLLM as the backend.
 """
 
+import asyncio
 import logging
 import re
-from typing import Dict, Any, Optional, Generator
+import time
+from typing import Dict, Any, List, Optional, Generator
 
 from .agents_factory import AgentsSousChefFactory
-from .html_converter import markdown_to_html
+from .html_converter import BLOCK_SEPARATOR_HTML, MarkdownBlockBuffer, markdown_to_html
+from .session_cache import SousChefSession, get_session, session_key
 from .thread_manager import ThreadManager
 from .tools.agents_tools import ToolContext
 
@@ -34,15 +37,35 @@ class ActionCaptureHooks(RunHooksBase if RunHooksBase else object):
 
     When tools return results with `render_as_action: True`, this hook
     captures them so they can be merged into the response as action blocks.
+    Tool starts and ends are also queued as stream events; stream_message
+    drains them with drain_events().
     """
 
     def __init__(self):
         self.captured_actions = []
+        self.tool_calls = 0
+        self._events = []
+
+    def drain_events(self) -> List[Dict[str, Any]]:
+        """Return and clear the tool events queued since the last call."""
+        events, self._events = self._events, []
+        return events
+
+    async def on_tool_start(self, context, agent, tool) -> None:
+        self.tool_calls += 1
+        self._events.append({"type": "tool_start", "name": getattr(tool, 'name', 'unknown')})
 
     async def on_tool_end(self, context, agent, tool, result) -> None:
         """Capture tool results that should render as actions."""
-        import json
         tool_name = getattr(tool, 'name', 'unknown')
+        action = self._parse_action(tool_name, result)
+        event = {"type": "tool_end", "name": tool_name}
+        if action is not None:
+            event["action"] = action
+        self._events.append(event)
+
+    def _parse_action(self, tool_name: str, result) -> Optional[Dict[str, Any]]:
+        import json
         logger.info(f"[ActionCaptureHooks] on_tool_end called for tool: {tool_name}")
         logger.info(f"[ActionCaptureHooks] Tool result type: {type(result).__name__}")
 
@@ -55,17 +78,60 @@ class ActionCaptureHooks(RunHooksBase if RunHooksBase else object):
                 data = json.loads(result)
             except (json.JSONDecodeError, TypeError) as e:
                 logger.info(f"[ActionCaptureHooks] Failed to parse result as JSON: {e}")
-                return
+                return None
         else:
             logger.info(f"[ActionCaptureHooks] Unexpected result type: {type(result)}")
-            return
+            return None
 
         logger.info(f"[ActionCaptureHooks] Parsed data: {data}")
         if isinstance(data, dict) and data.get("render_as_action"):
             logger.info(f"[ActionCaptureHooks] CAPTURED action: {data}")
             self.captured_actions.append(data)
-        else:
-            logger.info(f"[ActionCaptureHooks] Not an action (render_as_action={data.get('render_as_action') if isinstance(data, dict) else 'N/A'})")
+            return data
+        logger.info(f"[ActionCaptureHooks] Not an action (render_as_action={data.get('render_as_action') if isinstance(data, dict) else 'N/A'})")
+        return None
+
+
+class StreamMetrics:
+    """Latency of one streamed response, reported with the final "done" event."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.first_block_at: Optional[float] = None
+        self.blocks = 0
+        self.tool_calls = 0
+
+    def _ms(self, at: Optional[float]) -> Optional[int]:
+        return None if at is None else int((at - self.started) * 1000)
+
+    def token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+    def block(self) -> None:
+        self.blocks += 1
+        if self.first_block_at is None:
+            self.first_block_at = time.monotonic()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "time_to_first_token_ms": self._ms(self.first_token_at),
+            "time_to_first_block_ms": self._ms(self.first_block_at),
+            "total_ms": self._ms(time.monotonic()),
+            "blocks": self.blocks,
+            "tool_calls": self.tool_calls,
+        }
+
+
+def _text_delta(event) -> Optional[str]:
+    """Text from a raw model stream event, if it carries any."""
+    if getattr(event, 'type', None) != 'raw_response_event':
+        return None
+    data = getattr(event, 'data', None)
+    if getattr(data, 'type', None) != 'response.output_text.delta':
+        return None
+    return getattr(data, 'delta', None) or None
 
 
 class AgentsSousChefService:
@@ -110,25 +176,16 @@ class AgentsSousChefService:
         self.family_id = family_id
         self.family_type = family_type
         self.client_type = client_type
+        self.last_stream_metrics: Optional[Dict[str, Any]] = None
         
-        # Initialize factory
-        self.factory = AgentsSousChefFactory(
-            chef_id=chef_id,
-            channel=channel,
-            family_id=family_id,
-            family_type=family_type,
-        )
-        
-        # Initialize thread manager
-        self.thread_manager = ThreadManager(
-            chef_id=chef_id,
-            family_id=family_id,
-            family_type=family_type,
-            channel=channel,
+        # Reuse the warm session (agent, prompt, history window) if any
+        self.session = get_session(
+            session_key(chef_id, channel, family_id, family_type),
+            self._build_session,
         )
-        
-        # Create agent
-        self.agent = self.factory.create_agent()
+        self.factory = self.session.factory
+        self.thread_manager = self.session.thread_manager
+        self.agent = self.session.agent
         
         # Set tool context
         ToolContext.set(
@@ -138,6 +195,21 @@ class AgentsSousChefService:
             channel=channel,
         )
     
+    def _build_session(self, key, versions) -> SousChefSession:
+        factory = AgentsSousChefFactory(
+            chef_id=self.chef_id,
+            channel=self.channel,
+            family_id=self.family_id,
+            family_type=self.family_type,
+        )
+        thread_manager = ThreadManager(
+            chef_id=self.chef_id,
+            family_id=self.family_id,
+            family_type=self.family_type,
+            channel=self.channel,
+        )
+        return SousChefSession(key, factory, thread_manager, factory.create_agent(), versions)
+    
     def send_message(self, message: str) -> Dict[str, Any]:
         """
         Send a message and get a response (synchronous).
@@ -167,7 +239,7 @@ class AgentsSousChefService:
             response = result.final_output or "I processed your request."
 
             # Save turn to thread
-            self.thread_manager.save_turn(message, response)
+            self.session.save_turn(message, response)
 
             return {
                 "status": "success",
@@ -239,7 +311,7 @@ class AgentsSousChefService:
             logger.info(f"[_send_structured_web] Structured HTML content: {structured_content}")
 
             # Save to thread
-            self.thread_manager.save_turn(message, agent_response)
+            self.session.save_turn(message, agent_response)
 
             return {
                 "status": "success",
@@ -445,7 +517,7 @@ class AgentsSousChefService:
             result = await Runner.run(self.agent, full_message)
             response = result.final_output or "I processed your request."
             
-            self.thread_manager.save_turn(message, response)
+            self.session.save_turn(message, response)
             
             return {
                 "status": "success",
@@ -465,8 +537,21 @@ class AgentsSousChefService:
         """
         Stream a response (for web UI).
 
-        Note: Agents SDK streaming support may be limited.
-        Falls back to non-streaming if not available.
+        Uses Runner.run_streamed and yields events as the run progresses:
+
+        - {"type": "text_delta", "delta"}: raw markdown as the model writes it
+        - {"type": "tool_start", "name"} / {"type": "tool_end", "name", "action"?}
+        - {"type": "html_block", "index", "content"}: HTML for each markdown
+          block (paragraph, list, table, code block) once it is complete.
+          Every client appends these as they arrive.
+        - web clients additionally get the structured blocks as a final
+          {"type": "text", "content": "<json>"} event, which replaces the
+          streamed blocks (it adds action buttons)
+        - {"type": "done", "thread_id", "metrics"}: metrics include
+          time_to_first_token_ms, also kept on self.last_stream_metrics
+
+        Falls back to a single non-streamed response if the SDK has no
+        run_streamed.
 
         Args:
             message: The user's message
@@ -479,39 +564,14 @@ class AgentsSousChefService:
 
             # Check if streaming is supported
             if hasattr(Runner, 'run_streamed'):
-                # Use streaming if available
                 history_context = self._get_history_context()
                 if history_context:
                     full_message = f"{history_context}\n\nUser: {message}"
                 else:
                     full_message = message
 
-                # TODO: Implement proper streaming when SDK supports it
-                # For now, fall back to sync with hooks to capture actions
-                import json as json_module
-                hooks = ActionCaptureHooks()
                 logger.info(f"[stream_message] Running agent with message: {message[:100]}...")
-                result = Runner.run_sync(self.agent, full_message, hooks=hooks)
-                response = result.final_output or ""
-                logger.info(f"[stream_message] Agent response: {response[:500]}...")
-                logger.info(f"[stream_message] Captured actions: {hooks.captured_actions}")
-
-                # Convert markdown to HTML for all clients
-                normalized = self._normalize_markdown(response)
-                html_content = markdown_to_html(normalized)
-
-                # For iOS/Android clients, return HTML directly (no JSON wrapper)
-                if self.client_type in ("ios", "android"):
-                    logger.info(f"[stream_message] Sending HTML for {self.client_type} client")
-                    yield {"type": "text", "content": html_content}
-                else:
-                    # For web, convert response to structured blocks with HTML content
-                    structured = self._convert_to_blocks_html(response, actions=hooks.captured_actions)
-                    logger.info(f"[stream_message] Structured HTML content: {structured}")
-                    yield {"type": "text", "content": json_module.dumps(structured)}
-
-                self.thread_manager.save_turn(message, response)
-                yield {"type": "done", "thread_id": thread.id}
+                yield from self._stream_agent_run(message, full_message, thread)
             else:
                 # Fallback to send_message and convert to HTML
                 import json as json_module
@@ -535,31 +595,96 @@ class AgentsSousChefService:
             logger.error(f"AgentsSousChefService stream error: {e}", exc_info=True)
             yield {"type": "error", "message": str(e)}
     
-    def _get_history_context(self, max_turns: int = 5) -> str:
+    def _html_block_event(self, block: str, metrics: StreamMetrics) -> Dict[str, Any]:
+        html_content = markdown_to_html(self._normalize_markdown(block))
+        if metrics.blocks:
+            html_content = BLOCK_SEPARATOR_HTML + html_content
+        event = {"type": "html_block", "index": metrics.blocks, "content": html_content}
+        metrics.block()
+        return event
+
+    def _stream_agent_run(self, message: str, full_message: str, thread) -> Generator[Dict[str, Any], None, None]:
         """
-        Get recent conversation history as context string.
-        
-        Args:
-            max_turns: Maximum conversation turns to include
+        Drive Runner.run_streamed from this synchronous generator.
+
+        The run gets a private event loop that only runs while we wait for
+        the next event, so the caller (a WSGI streaming response) can keep
+        using the ORM between events, e.g. to save the turn.
+        """
+        import json as json_module
+
+        hooks = ActionCaptureHooks()
+        metrics = StreamMetrics()
+        blocks = MarkdownBlockBuffer()
+        streamed_text = []
+
+        async def start():
+            return Runner.run_streamed(self.agent, full_message, hooks=hooks)
+
+        loop = asyncio.new_event_loop()
+        result = None
+        finished = False
+        try:
+            result = loop.run_until_complete(start())
+            events = result.stream_events()
+            while True:
+                try:
+                    event = loop.run_until_complete(events.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield from hooks.drain_events()
+
+                delta = _text_delta(event)
+                if not delta:
+                    continue
+                metrics.token()
+                streamed_text.append(delta)
+                yield {"type": "text_delta", "delta": delta}
+                for block in blocks.feed(delta):
+                    yield self._html_block_event(block, metrics)
+            finished = True
+        finally:
+            if not finished and result is not None:
+                # Client went away or the run failed: stop the model and tools
+                result.cancel()
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+        yield from hooks.drain_events()
+        tail = blocks.flush()
+        if tail:
+            yield self._html_block_event(tail, metrics)
+
+        response = result.final_output or "".join(streamed_text)
+        logger.info(f"[stream_message] Agent response: {response[:500]}...")
+        logger.info(f"[stream_message] Captured actions: {hooks.captured_actions}")
+
+        if self.client_type not in ("ios", "android"):
+            # Web renders the final structured blocks (text + actions)
+            structured = self._convert_to_blocks_html(response, actions=hooks.captured_actions)
+            yield {"type": "text", "content": json_module.dumps(structured)}
+
+        self.session.save_turn(message, response)
+
+        metrics.tool_calls = hooks.tool_calls
+        self.last_stream_metrics = metrics.as_dict()
+        logger.info(f"[stream_message] chef={self.chef_id} metrics={self.last_stream_metrics}")
+        yield {"type": "done", "thread_id": thread.id, "metrics": self.last_stream_metrics}
+
+    def _get_history_context(self) -> str:
+        """
+        Get the conversation summary and recent messages as context string.
         
         Returns:
             Formatted history string or empty string
         """
         try:
-            history = self.thread_manager.get_history(limit=max_turns * 2)
-            
-            if not history:
-                return ""
-            
-            # Format as conversation
-            lines = ["Recent conversation:"]
-            for msg in history[-max_turns * 2:]:
-                role = "User" if msg.get("role") == "chef" else "Assistant"
-                content = msg.get("content", "")[:500]  # Truncate long messages
-                lines.append(f"{role}: {content}")
-            
-            return "\n".join(lines)
-            
+            return self.session.history_window().as_context()
         except Exception as e:
             logger.warning(f"Failed to get history context: {e}")
             return ""
@@ -571,7 +696,7 @@ class AgentsSousChefService:
         Returns:
             Dict with status and new thread_id
         """
-        thread = self.thread_manager.new_conversation()
+        thread = self.session.new_conversation()
         return {
             "status": "success",
             "thread_id": thread.id,
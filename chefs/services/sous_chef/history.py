@@ -0,0 +1,339 @@
+# chefs/services/sous_chef/history.py
+"""
+Token-budgeted conversation history for Sous Chef threads.
+
+The model sees a thread as a rolling summary of older messages
+(SousChefThread.conversation_summary) plus the exact newest messages that
+fit in HISTORY_TOKEN_BUDGET tokens. Messages that drop out of that tail are
+"overflow": not summarized yet. Once the overflow reaches
+SUMMARY_TRIGGER_TOKENS, compaction is scheduled off the request path. It
+folds the overflow into the summary and advances
+messages_summarized_count, the number of oldest messages the summary
+covers. That keeps the prompt roughly constant however long a thread gets.
+
+Tokens are counted with tiktoken (cl100k_base).
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+HISTORY_TOKEN_BUDGET = getattr(settings, "SOUS_CHEF_HISTORY_TOKEN_BUDGET", 2000)
+SUMMARY_TRIGGER_TOKENS = getattr(settings, "SOUS_CHEF_SUMMARY_TRIGGER_TOKENS", 1500)
+SUMMARY_MAX_TOKENS = 400
+# One very long message (a pasted menu, a full prep plan) is clipped to this
+MESSAGE_MAX_TOKENS = 800
+# Role label and separators per message
+MESSAGE_OVERHEAD_TOKENS = 4
+# Newest unsummarized messages read when building a window
+TAIL_SCAN_LIMIT = 60
+# Overflow folded into the summary per compaction run
+COMPACTION_INPUT_TOKENS = 6000
+TOKEN_ENCODING = "cl100k_base"
+
+SUMMARY_PREFIX = "[Previous conversation summary - use this context to maintain continuity]:"
+
+Row = Dict[str, Any]
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        # The BPE file is downloaded on first use; without it we fall back
+        # to ~4 characters per token rather than failing the conversation
+        logger.warning(f"tiktoken encoding {TOKEN_ENCODING} unavailable, estimating tokens: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _encoding()
+    if encoding is None:
+        return text[:max_tokens * 4].rstrip() + "…"
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens]).rstrip() + "…"
+
+
+def _message_tokens(content: str) -> int:
+    return min(count_tokens(content), MESSAGE_MAX_TOKENS) + MESSAGE_OVERHEAD_TOKENS
+
+
+def _as_message(row: Row) -> Dict[str, str]:
+    # Map 'chef' role to 'user' for LLM format
+    role = "user" if row["role"] == "chef" else "assistant"
+    return {"role": role, "content": clip_to_tokens(row["content"], MESSAGE_MAX_TOKENS)}
+
+
+def split_tail(rows: List[Row], budget: int) -> Tuple[List[Row], List[Row], int]:
+    """
+    Split oldest-first rows into (overflow, tail, tail_tokens).
+
+    The tail is the newest rows that fit the budget; the newest message is
+    always kept.
+    """
+    tail_tokens = 0
+    start = len(rows)
+    while start > 0:
+        tokens = _message_tokens(rows[start - 1]["content"])
+        if start < len(rows) and tail_tokens + tokens > budget:
+            break
+        tail_tokens += tokens
+        start -= 1
+    return rows[:start], rows[start:], tail_tokens
+
+
+@dataclass
+class HistoryWindow:
+    """Summary plus exact tail of one thread, as sent to the model."""
+
+    summary: str = ""
+    tail: List[Dict[str, str]] = field(default_factory=list)
+    tail_tokens: int = 0
+    overflow_tokens: int = 0
+    budget: int = HISTORY_TOKEN_BUDGET
+
+    @property
+    def summary_tokens(self) -> int:
+        return count_tokens(self.summary)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.summary_tokens + self.tail_tokens
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.overflow_tokens >= SUMMARY_TRIGGER_TOKENS
+
+    def append(self, role: str, content: str) -> None:
+        """Add a new message (role 'user' or 'assistant'), pushing old ones out of the tail."""
+        self.tail.append({"role": role, "content": clip_to_tokens(content, MESSAGE_MAX_TOKENS)})
+        self.tail_tokens += _message_tokens(content)
+        while len(self.tail) > 1 and self.tail_tokens > self.budget:
+            dropped = self.tail.pop(0)
+            tokens = _message_tokens(dropped["content"])
+            self.tail_tokens -= tokens
+            self.overflow_tokens += tokens
+
+    def as_messages(self) -> List[Dict[str, str]]:
+        """Chat-completions messages: the summary as a system message, then the tail."""
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"{SUMMARY_PREFIX}\n{self.summary}"})
+        messages.extend(self.tail)
+        return messages
+
+    def as_context(self) -> str:
+        """The window as text, for prepending to a single user message."""
+        parts = []
+        if self.summary:
+            parts.append(f"Summary of earlier conversation:\n{self.summary}")
+        if self.tail:
+            lines = ["Recent conversation:"]
+            for msg in self.tail:
+                role = "User" if msg["role"] == "user" else "Assistant"
+                lines.append(f"{role}: {msg['content']}")
+            parts.append("\n".join(lines))
+        return "\n\n".join(parts)
+
+
+def _unsummarized_rows(thread, limit: Optional[int] = None) -> Tuple[List[Row], int]:
+    """
+    Messages the summary doesn't cover yet, oldest first (only the newest
+    ``limit`` if given), and how many there are in total.
+    """
+    pending = thread.messages.count() - thread.messages_summarized_count
+    if pending <= 0:
+        return [], 0
+    rows = thread.messages.order_by("-created_at", "-id").values("id", "role", "content")
+    rows = rows[:pending if limit is None else min(pending, limit)]
+    return list(reversed(rows)), pending
+
+
+def build_window(thread, budget: int = HISTORY_TOKEN_BUDGET) -> HistoryWindow:
+    """Load the summary and token-budgeted tail of a thread."""
+    rows, pending = _unsummarized_rows(thread, limit=TAIL_SCAN_LIMIT)
+    overflow, tail, tail_tokens = split_tail(rows, budget)
+    overflow_tokens = sum(_message_tokens(row["content"]) for row in overflow)
+    if pending > len(rows):
+        # More unsummarized messages than we scanned: certainly over the trigger
+        overflow_tokens = max(overflow_tokens, SUMMARY_TRIGGER_TOKENS)
+    return HistoryWindow(
+        summary=thread.conversation_summary or "",
+        tail=[_as_message(row) for row in tail],
+        tail_tokens=tail_tokens,
+        overflow_tokens=overflow_tokens,
+        budget=budget,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+def _get_groq_client():
+    """Lazy Groq client factory."""
+    try:
+        from groq import Groq
+        api_key = getattr(settings, 'GROQ_API_KEY', None) or os.getenv('GROQ_API_KEY')
+        if api_key:
+            return Groq(api_key=api_key)
+    except Exception as e:
+        logger.warning(f"Failed to create Groq client: {e}")
+    return None
+
+
+def summarize(previous_summary: str, messages: List[Dict[str, str]]) -> str:
+    """Fold messages into the running summary with Groq; returns '' on failure."""
+    from utils.groq_rate_limit import groq_call_with_retry
+
+    client = _get_groq_client()
+    if client is None:
+        return ""
+
+    conversation = "\n".join(
+        f"{'Chef' if msg['role'] == 'user' else 'Sous Chef'}: {msg['content']}" for msg in messages
+    )
+    user_prompt = f"""Update the running summary of this chef/Sous Chef conversation with the new messages.
+Keep: decisions, client and dietary details, menu preferences, open tasks, numbers the chef gave.
+Drop: greetings, pleasantries and anything superseded. Max 250 words.
+
+Current summary:
+{previous_summary or '(none)'}
+
+New messages:
+{conversation}"""
+
+    try:
+        response = groq_call_with_retry(
+            raw_create_fn=client.chat.completions.with_raw_response.create,
+            create_fn=client.chat.completions.create,
+            desc='sous_chef.history_summary',
+            model=getattr(settings, 'GROQ_MODEL', 'openai/gpt-oss-120b'),
+            messages=[
+                {"role": "system", "content": "You are a concise summarizer. Create brief summaries focusing on key decisions and preferences."},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=0.3,
+        )
+        return (response.choices[0].message.content or "").strip()
+    except Exception as e:
+        logger.warning(f"Sous Chef history summary failed: {e}")
+        return ""
+
+
+def compact_thread(
+    thread_id: int,
+    budget: int = HISTORY_TOKEN_BUDGET,
+    summarizer: Optional[Callable[[str, List[Dict[str, str]]], str]] = None,
+) -> int:
+    """
+    Fold the thread's overflow into its summary.
+
+    The LLM call happens outside any transaction; the result is only saved
+    if no other run moved messages_summarized_count meanwhile. Returns the
+    number of messages summarized.
+    """
+    from customer_dashboard.models import SousChefThread
+
+    summarizer = summarizer or summarize
+    thread = SousChefThread.objects.filter(pk=thread_id).first()
+    if thread is None:
+        return 0
+
+    rows, _ = _unsummarized_rows(thread)
+    overflow, _, _ = split_tail(rows, budget)
+    batch, batch_tokens = [], 0
+    for row in overflow:
+        batch_tokens += _message_tokens(row["content"])
+        batch.append(row)
+        if batch_tokens >= COMPACTION_INPUT_TOKENS:
+            break
+    if not batch or batch_tokens < SUMMARY_TRIGGER_TOKENS:
+        return 0
+
+    summary = summarizer(thread.conversation_summary, [_as_message(row) for row in batch])
+    if not summary:
+        return 0
+    summary = clip_to_tokens(summary, SUMMARY_MAX_TOKENS)
+
+    with transaction.atomic():
+        updated = SousChefThread.objects.filter(
+            pk=thread_id,
+            messages_summarized_count=thread.messages_summarized_count,
+        ).update(
+            conversation_summary=summary,
+            summary_generated_at=timezone.now(),
+            messages_summarized_count=thread.messages_summarized_count + len(batch),
+        )
+    if not updated:
+        logger.info(f"Sous Chef thread {thread_id} was compacted concurrently, dropping this summary")
+        return 0
+
+    logger.info(f"Summarized {len(batch)} messages ({batch_tokens} tokens) of Sous Chef thread {thread_id}")
+    from .session_cache import bump_thread_version
+    bump_thread_version(thread_id)
+    return len(batch)
+
+
+def compact_thread_job(thread_id: int) -> None:
+    """Worker-pool entry point."""
+    compact_thread(thread_id)
+
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sous-chef-summary")
+_scheduled = set()
+_scheduled_lock = threading.Lock()
+
+
+def _compact_in_background(thread_id: int) -> None:
+    try:
+        compact_thread(thread_id)
+    except Exception as e:
+        logger.error(f"Sous Chef history compaction failed for thread {thread_id}: {e}", exc_info=True)
+    finally:
+        with _scheduled_lock:
+            _scheduled.discard(thread_id)
+        connection.close()
+
+
+def schedule_compaction(thread_id: int) -> None:
+    """Compact the thread after the current transaction commits, never on the request path."""
+    from api import job_queue
+
+    if job_queue.worker_backend_enabled():
+        job_queue.enqueue(
+            "chefs.services.sous_chef.history.compact_thread_job",
+            {"thread_id": thread_id},
+            concurrency_key="sous_chef_summary",
+            dedupe_key=f"sous_chef_summary:{thread_id}",
+        )
+        return
+
+    with _scheduled_lock:
+        if thread_id in _scheduled:
+            return
+        _scheduled.add(thread_id)
+    transaction.on_commit(lambda: _executor.submit(_compact_in_background, thread_id))
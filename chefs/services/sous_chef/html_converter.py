@@ -9,7 +9,7 @@ Based on patterns from telegram_tasks.py but outputs full HTML tags instead
 of Telegram-specific subset.
 """
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 
 def markdown_to_html(text: str) -> str:
@@ -303,3 +303,46 @@ def _wrap_paragraphs(text: str) -> str:
 
 # Alias for backwards compatibility if needed
 convert_markdown_to_html = markdown_to_html
+
+
+# Paragraph break markdown_to_html emits for a blank line; put between blocks
+# that were converted one at a time
+BLOCK_SEPARATOR_HTML = '<br><br>'
+
+
+class MarkdownBlockBuffer:
+    """
+    Split streamed markdown into completed blocks.
+
+    A block ends at a blank line outside a ``` code fence, which is the point
+    where markdown_to_html would close a paragraph, list or table anyway, so
+    each block can be converted on its own as soon as it is complete.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+
+    def feed(self, delta: str) -> List[str]:
+        """Add streamed text; returns the blocks it completed."""
+        self._buffer += delta
+        blocks = []
+        search_from = 0
+        while True:
+            boundary = self._buffer.find('\n\n', search_from)
+            if boundary == -1:
+                break
+            if self._buffer.count('```', 0, boundary) % 2:
+                # Blank line inside a code block
+                search_from = boundary + 2
+                continue
+            block = self._buffer[:boundary].strip('\n')
+            self._buffer = self._buffer[boundary:].lstrip('\n')
+            search_from = 0
+            if block.strip():
+                blocks.append(block)
+        return blocks
+
+    def flush(self) -> Optional[str]:
+        """Return whatever is left once the stream has ended."""
+        block, self._buffer = self._buffer.strip('\n'), ''
+        return block if block.strip() else None
@@ -20,6 +20,7 @@ from django.conf import settings
 from .agent_factory import SousChefAgentFactory
 from .thread_manager import ThreadManager
 from .tools import get_tool_schemas_for_channel
+from .tools.executor import ToolCall, ToolExecutor, plan_batches
 
 logger = logging.getLogger(__name__)
 
@@ -167,9 +168,7 @@ class SousChefService:
         Returns:
             Final response text
         """
-        from .tools.loader import execute_tool
-        
-        context = self.factory.get_context()
+        executor = self._tool_executor()
         
         for iteration in range(max_iterations):
             # Call Groq
@@ -209,34 +208,27 @@ class SousChefService:
             })
             
             # Execute tool calls with channel-aware sensitive data handling
-            for tool_call in tool_calls:
-                try:
-                    # Parse arguments
-                    args = json.loads(tool_call.function.arguments) if tool_call.function.arguments else {}
-                    
-                    # Execute with channel awareness (sensitive tools blocked on restricted channels)
-                    result = execute_tool(
-                        tool_name=tool_call.function.name,
-                        args=args,
-                        chef=context.get("chef"),
-                        customer=context.get("customer"),
-                        lead=context.get("lead"),
-                        channel=self.channel,  # Key: pass channel for sensitive data handling
-                    )
-                except Exception as e:
-                    logger.error(f"Tool call error ({tool_call.function.name}): {e}")
-                    result = {"status": "error", "message": str(e)}
-                
+            calls = [ToolCall(tc.id, tc.function.name, tc.function.arguments) for tc in tool_calls]
+            for call, result in zip(calls, executor.run(calls)):
                 # Add tool result
                 messages.append({
                     "role": "tool",
                     "content": json.dumps(result) if isinstance(result, dict) else str(result),
-                    "tool_call_id": tool_call.id,
+                    "tool_call_id": call.id,
                 })
         
         # Max iterations reached
         return response_text or "I completed the requested actions."
     
+    def _tool_executor(self) -> ToolExecutor:
+        context = self.factory.get_context()
+        return ToolExecutor(
+            chef=context.get("chef"),
+            customer=context.get("customer"),
+            lead=context.get("lead"),
+            channel=self.channel,
+        )
+    
     def stream_message(self, message: str) -> Generator[Dict[str, Any], None, None]:
         """
         Stream a response (for web UI).
@@ -291,9 +283,7 @@ class SousChefService:
         
         Yields text chunks and tool events.
         """
-        from .tools.loader import execute_tool
-        
-        context = self.factory.get_context()
+        executor = self._tool_executor()
         
         for iteration in range(max_iterations):
             # Stream from Groq
@@ -359,34 +349,21 @@ class SousChefService:
                 ]
             })
             
-            # Execute tool calls with channel-aware sensitive data handling
-            for tc in tool_calls_data.values():
-                try:
-                    yield {"type": "tool_call", "name": tc["name"]}
-                    
-                    # Parse arguments
-                    args = json.loads(tc["arguments"]) if tc["arguments"] else {}
-                    
-                    # Execute with channel awareness
-                    result = execute_tool(
-                        tool_name=tc["name"],
-                        args=args,
-                        chef=context.get("chef"),
-                        customer=context.get("customer"),
-                        lead=context.get("lead"),
-                        channel=self.channel,  # Key: pass channel for sensitive data handling
-                    )
-                except Exception as e:
-                    logger.error(f"Tool error ({tc['name']}): {e}")
-                    result = {"status": "error", "message": str(e)}
+            # Execute tool calls with channel-aware sensitive data handling;
+            # read-only calls in a batch run concurrently
+            calls = [ToolCall(tc["id"], tc["name"], tc["arguments"]) for tc in tool_calls_data.values()]
+            for batch in plan_batches(calls):
+                for call in batch:
+                    yield {"type": "tool_call", "name": call.name}
                 
-                messages.append({
-                    "role": "tool",
-                    "content": json.dumps(result) if isinstance(result, dict) else str(result),
-                    "tool_call_id": tc["id"],
-                })
-                
-                yield {"type": "tool_result", "name": tc["name"]}
+                for call, result in zip(batch, executor.run_batch(batch)):
+                    messages.append({
+                        "role": "tool",
+                        "content": json.dumps(result) if isinstance(result, dict) else str(result),
+                        "tool_call_id": call.id,
+                    })
+                    
+                    yield {"type": "tool_result", "name": call.name}
         
         # Max iterations
         yield {"type": "max_iterations"}
@@ -0,0 +1,243 @@
+# chefs/services/sous_chef/session_cache.py
+"""
+Warm Sous Chef sessions, reused across requests.
+
+Building an AgentsSousChefService means loading the chef, customer and lead,
+rendering the system prompt, wrapping every tool and reading the recent
+conversation back from the DB. A session keeps all of that per
+(chef, family, channel) in this process, together with the thread's
+token-budgeted history window (see history.py), so a follow-up turn only
+has to run the agent.
+
+Sessions are bounded by LRU size and a TTL. Edits to the chef, their
+workspace or the family bump a version number in the shared Django cache
+(see chefs/signals.py), so every worker rebuilds on its next request.
+Saved turns and summaries bump the thread's version the same way, which
+tells other workers to re-read the history window instead of the whole
+session.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .history import HistoryWindow, schedule_compaction
+
+logger = logging.getLogger(__name__)
+
+SESSION_CACHE_SIZE = getattr(settings, "SOUS_CHEF_SESSION_CACHE_SIZE", 256)
+SESSION_TTL = getattr(settings, "SOUS_CHEF_SESSION_TTL", 900)
+VERSION_TIMEOUT = 24 * 60 * 60
+
+SessionKey = Tuple[int, Optional[str], Optional[int], str]
+
+
+def session_key(chef_id: int, channel: str, family_id: Optional[int] = None, family_type: Optional[str] = None) -> SessionKey:
+    if not (family_id and family_type):
+        family_id = family_type = None
+    return (chef_id, family_type, family_id, channel)
+
+
+def _chef_version_key(chef_id: int) -> str:
+    return f"sous_chef_session:chef:{chef_id}"
+
+
+def _family_version_key(family_type: str, family_id: int) -> str:
+    return f"sous_chef_session:{family_type}:{family_id}"
+
+
+def _thread_version_key(thread_id: int) -> str:
+    return f"sous_chef_session:thread:{thread_id}"
+
+
+def _bump(key: str) -> Optional[int]:
+    try:
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Missing key; a concurrent add() wins and we bump its value
+            if cache.add(key, 1, timeout=VERSION_TIMEOUT):
+                return 1
+            return cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Failed to bump Sous Chef session version {key}: {e}")
+        return None
+
+
+def bump_thread_version(thread_id: int) -> None:
+    """The thread changed outside a session (e.g. it was summarized): re-read it."""
+    _bump(_thread_version_key(thread_id))
+
+
+def invalidate_chef(chef_id: int) -> None:
+    """Drop every session of a chef (profile or workspace changed)."""
+    _bump(_chef_version_key(chef_id))
+    sessions.discard(lambda key: key[0] == chef_id)
+
+
+def invalidate_family(family_type: str, family_id: int) -> None:
+    """Drop every session about a customer or lead (profile or household changed)."""
+    _bump(_family_version_key(family_type, family_id))
+    sessions.discard(lambda key: key[1] == family_type and key[2] == family_id)
+
+
+class SousChefSession:
+    """A built agent plus the conversation window for one session key."""
+
+    def __init__(self, key: SessionKey, factory, thread_manager, agent, versions: Tuple):
+        self.key = key
+        self.factory = factory
+        self.thread_manager = thread_manager
+        self.agent = agent
+        self.versions = versions
+        self.thread_version: Optional[int] = None
+        self.created_at = time.monotonic()
+        self._window: Optional[HistoryWindow] = None
+        self._lock = threading.Lock()
+
+    @property
+    def instructions(self) -> str:
+        return self.agent.instructions
+
+    def history_window(self) -> HistoryWindow:
+        """Summary and recent messages, read from the thread only when the window is cold."""
+        with self._lock:
+            if self._window is None:
+                self._window = self.thread_manager.get_history_window()
+            return self._window
+
+    def save_turn(self, user_message: str, assistant_message: str) -> None:
+        """Persist a turn and add it to the window."""
+        self.thread_manager.save_turn(user_message, assistant_message)
+        with self._lock:
+            window = self._window
+            if window is not None:
+                window.append("user", user_message)
+                window.append("assistant", assistant_message)
+        self._bump_thread()
+        if window is not None and window.needs_compaction:
+            schedule_compaction(self.thread_manager.thread_id)
+
+    def new_conversation(self):
+        """Start a new thread with an empty window."""
+        old_thread_id = self.thread_manager.thread_id
+        thread = self.thread_manager.new_conversation()
+        if old_thread_id:
+            _bump(_thread_version_key(old_thread_id))
+        with self._lock:
+            self._window = HistoryWindow()
+        self._bump_thread()
+        return thread
+
+    def sync_thread(self, version: Optional[int]) -> None:
+        """Another worker wrote to the thread: re-read it on next use."""
+        if version == self.thread_version:
+            return
+        self.thread_manager.refresh()
+        with self._lock:
+            self._window = None
+        self.thread_version = version
+
+    def _bump_thread(self) -> None:
+        thread_id = self.thread_manager.thread_id
+        if thread_id:
+            self.thread_version = _bump(_thread_version_key(thread_id))
+
+
+class SessionCache:
+    """Process-local LRU of SousChefSessions with a TTL."""
+
+    def __init__(self, max_size: int = SESSION_CACHE_SIZE, ttl: float = SESSION_TTL, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._sessions: "OrderedDict[SessionKey, SousChefSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key: SessionKey, versions: Tuple) -> Optional[SousChefSession]:
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                self._stats["misses"] += 1
+                return None
+            if session.versions != versions or self._clock() - session.created_at > self.ttl:
+                del self._sessions[key]
+                self._stats["misses"] += 1
+                self._stats["invalidations"] += 1
+                return None
+            self._sessions.move_to_end(key)
+            self._stats["hits"] += 1
+            return session
+
+    def put(self, session: SousChefSession) -> None:
+        if self.max_size <= 0:
+            return
+        session.created_at = self._clock()
+        with self._lock:
+            self._sessions[session.key] = session
+            self._sessions.move_to_end(session.key)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def discard(self, predicate: Callable[[SessionKey], bool]) -> None:
+        with self._lock:
+            for key in [key for key in self._sessions if predicate(key)]:
+                del self._sessions[key]
+                self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "size": len(self._sessions)}
+
+
+sessions = SessionCache()
+
+
+def _versions(key: SessionKey) -> Optional[Tuple]:
+    chef_id, family_type, family_id, _ = key
+    keys = [_chef_version_key(chef_id)]
+    if family_type:
+        keys.append(_family_version_key(family_type, family_id))
+    try:
+        found = cache.get_many(keys)
+    except Exception as e:
+        logger.warning(f"Sous Chef session versions unavailable: {e}")
+        return None
+    return tuple(found.get(k, 0) for k in keys)
+
+
+def get_session(key: SessionKey, build: Callable[[SessionKey, Tuple], SousChefSession]) -> SousChefSession:
+    """
+    Return the warm session for key, building it with build(key, versions)
+    on a miss. Without the shared cache there is no way to hear about
+    edits, so sessions are built fresh and not kept.
+    """
+    versions = _versions(key)
+    if versions is None:
+        return build(key, ())
+
+    session = sessions.get(key, versions)
+    if session is not None:
+        thread_id = session.thread_manager.thread_id
+        if thread_id:
+            try:
+                session.sync_thread(cache.get(_thread_version_key(thread_id)))
+            except Exception as e:
+                logger.warning(f"Sous Chef thread version unavailable: {e}")
+                session.sync_thread(None)
+        return session
+
+    session = build(key, versions)
+    sessions.put(session)
+    return session
@@ -4,6 +4,15 @@ import pytest
 from unittest.mock import MagicMock, patch
 
 
+@pytest.fixture(autouse=True)
+def clear_sous_chef_sessions():
+    """Warm sessions would otherwise outlive the rows a test rolled back."""
+    from chefs.services.sous_chef.session_cache import sessions
+    sessions.clear()
+    yield
+    sessions.clear()
+
+
 @pytest.fixture
 def test_user(db):
     """Create a test user."""
@@ -538,6 +538,83 @@ class TestActionCaptureHooks:
         assert len(hooks.captured_actions) == 0
 
 
+class _FakeStreamedRun:
+    """Stands in for RunResultStreaming: replays text deltas and a tool call."""
+
+    def __init__(self, deltas, hooks):
+        self.deltas = deltas
+        self.hooks = hooks
+        self.final_output = "".join(deltas)
+        self.cancelled = False
+
+    async def stream_events(self):
+        from types import SimpleNamespace
+
+        tool = SimpleNamespace(name="get_upcoming_orders")
+        await self.hooks.on_tool_start(None, None, tool)
+        await self.hooks.on_tool_end(None, None, tool, '{"status": "success"}')
+        yield SimpleNamespace(type="run_item_stream_event", data=None)
+        for delta in self.deltas:
+            yield SimpleNamespace(
+                type="raw_response_event",
+                data=SimpleNamespace(type="response.output_text.delta", delta=delta),
+            )
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestStreamMessage:
+    """Test stream_message emits tokens, tool events and blocks as they happen."""
+
+    DELTAS = ["You have ", "two orders.\n", "\n- Pasta\n", "- Soup"]
+
+    def _run(self, test_chef, client_type):
+        pytest.importorskip("agents", reason="openai-agents not installed")
+
+        from chefs.services.sous_chef.agents_service import AgentsSousChefService
+
+        service = AgentsSousChefService(chef_id=test_chef.id, channel="web", client_type=client_type)
+
+        def run_streamed(agent, message, hooks=None):
+            return _FakeStreamedRun(self.DELTAS, hooks)
+
+        with patch('chefs.services.sous_chef.agents_service.Runner.run_streamed', side_effect=run_streamed):
+            return service, list(service.stream_message("What's on today?"))
+
+    @pytest.mark.django_db
+    def test_events_arrive_in_order(self, test_chef):
+        service, events = self._run(test_chef, "ios")
+        types = [e["type"] for e in events]
+
+        assert types[:2] == ["tool_start", "tool_end"]
+        assert "".join(e["delta"] for e in events if e["type"] == "text_delta") == "".join(self.DELTAS)
+        html_blocks = [e for e in events if e["type"] == "html_block"]
+        assert [b["index"] for b in html_blocks] == [0, 1]
+        assert "two orders." in html_blocks[0]["content"]
+        assert html_blocks[1]["content"].startswith("<br><br>") and "<ul>" in html_blocks[1]["content"]
+        # First block is sent before the rest of the text has arrived
+        assert types.index("html_block") < len(types) - 3
+        assert "text" not in types
+        assert types[-1] == "done"
+        assert events[-1]["metrics"]["tool_calls"] == 1
+        assert events[-1]["metrics"]["time_to_first_token_ms"] is not None
+        assert service.last_stream_metrics == events[-1]["metrics"]
+
+    @pytest.mark.django_db
+    def test_web_gets_structured_blocks_and_turn_is_saved(self, test_chef):
+        import json
+        from customer_dashboard.models import SousChefThread
+
+        _, events = self._run(test_chef, "web")
+
+        final = [e for e in events if e["type"] == "text"]
+        assert len(final) == 1
+        assert "blocks" in json.loads(final[0]["content"])
+        thread = SousChefThread.objects.filter(chef=test_chef).first()
+        assert thread is not None
+
+
 class TestConvertToBlocksWithActions:
     """Test _convert_to_blocks merges captured actions."""
 
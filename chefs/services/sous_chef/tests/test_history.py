@@ -0,0 +1,174 @@
+# chefs/services/sous_chef/tests/test_history.py
+"""Tests for token-budgeted history and rolling summaries."""
+import pytest
+
+from chefs.services.sous_chef import history
+from chefs.services.sous_chef.history import (
+    HistoryWindow,
+    build_window,
+    compact_thread,
+    count_tokens,
+    split_tail,
+)
+
+WORDS = "menu prep notes for the family " * 10
+
+
+def _rows(n):
+    return [{"id": i, "role": "chef" if i % 2 == 0 else "assistant", "content": f"{i}: {WORDS}"} for i in range(n)]
+
+
+def _tokens(row):
+    return count_tokens(row["content"]) + history.MESSAGE_OVERHEAD_TOKENS
+
+
+@pytest.fixture
+def small_budget(monkeypatch):
+    """Trigger compaction after about two messages of overflow."""
+    per_message = _tokens(_rows(1)[0])
+    monkeypatch.setattr(history, "SUMMARY_TRIGGER_TOKENS", per_message * 2)
+    return per_message * 3
+
+
+class TestTokenBudget:
+    """Test the exact tail stays within its token budget."""
+
+    def test_tail_is_newest_messages_within_budget(self):
+        rows = _rows(10)
+        budget = _tokens(rows[0]) * 3
+
+        overflow, tail, tail_tokens = split_tail(rows, budget)
+
+        assert [r["id"] for r in tail] == [7, 8, 9]
+        assert [r["id"] for r in overflow] == list(range(7))
+        assert tail_tokens <= budget
+
+    def test_newest_message_is_kept_even_if_too_long(self):
+        overflow, tail, _ = split_tail(_rows(3), budget=1)
+        assert [r["id"] for r in tail] == [2]
+
+    def test_long_messages_are_clipped(self):
+        window = HistoryWindow(budget=10_000)
+        window.append("user", "word " * 5000)
+
+        assert count_tokens(window.tail[0]["content"]) <= history.MESSAGE_MAX_TOKENS + 2
+
+    def test_appending_moves_old_messages_to_overflow(self, small_budget):
+        window = HistoryWindow(budget=small_budget)
+        for row in _rows(4):
+            window.append("user", row["content"])
+
+        assert len(window.tail) == 3
+        assert not window.needs_compaction
+        window.append("assistant", _rows(5)[4]["content"])
+        assert window.needs_compaction
+        assert window.tail_tokens <= small_budget
+
+    def test_context_has_summary_then_tail(self):
+        window = HistoryWindow(summary="Prefers vegetarian menus.")
+        window.append("user", "Plan Friday")
+        window.append("assistant", "Sure")
+
+        assert window.as_context() == (
+            "Summary of earlier conversation:\nPrefers vegetarian menus.\n\n"
+            "Recent conversation:\nUser: Plan Friday\nAssistant: Sure"
+        )
+        assert window.as_messages()[0]["role"] == "system"
+
+
+@pytest.mark.django_db
+class TestThreadSummaries:
+    """Test rolling summaries stored on SousChefThread."""
+
+    def _thread(self, test_chef, n):
+        from customer_dashboard.models import SousChefMessage, SousChefThread
+
+        thread = SousChefThread.objects.create(chef=test_chef)
+        for row in _rows(n):
+            SousChefMessage.objects.create(thread=thread, role=row["role"], content=row["content"])
+        return thread
+
+    def test_window_skips_summarized_messages(self, test_chef, small_budget):
+        thread = self._thread(test_chef, 6)
+        thread.conversation_summary = "Earlier: agreed on a nut-free menu."
+        thread.messages_summarized_count = 4
+        thread.save()
+
+        window = build_window(thread, budget=small_budget)
+
+        assert window.summary == "Earlier: agreed on a nut-free menu."
+        assert [m["content"][:2] for m in window.tail] == ["4:", "5:"]
+        assert window.overflow_tokens == 0
+
+    def test_compaction_folds_overflow_into_summary(self, test_chef, small_budget):
+        from customer_dashboard.models import SousChefThread
+
+        thread = self._thread(test_chef, 8)
+        seen = {}
+
+        def summarizer(previous, messages):
+            seen["previous"] = previous
+            seen["messages"] = [m["content"][:2] for m in messages]
+            return "Chef plans weekly menus."
+
+        assert compact_thread(thread.id, budget=small_budget, summarizer=summarizer) == 5
+
+        thread = SousChefThread.objects.get(pk=thread.id)
+        assert seen == {"previous": "", "messages": ["0:", "1:", "2:", "3:", "4:"]}
+        assert thread.conversation_summary == "Chef plans weekly menus."
+        assert thread.messages_summarized_count == 5
+        assert not build_window(thread, budget=small_budget).needs_compaction
+
+    def test_concurrent_compaction_is_not_overwritten(self, test_chef, small_budget):
+        from customer_dashboard.models import SousChefThread
+
+        thread = self._thread(test_chef, 8)
+
+        def summarizer(previous, messages):
+            # Another run finishes while this one waits on the LLM
+            SousChefThread.objects.filter(pk=thread.id).update(messages_summarized_count=2)
+            return "stale"
+
+        assert compact_thread(thread.id, budget=small_budget, summarizer=summarizer) == 0
+        assert SousChefThread.objects.get(pk=thread.id).conversation_summary == ""
+
+    def test_reading_history_schedules_compaction(self, test_chef, small_budget, monkeypatch):
+        from chefs.services.sous_chef import thread_manager as thread_manager_module
+        from chefs.services.sous_chef.thread_manager import ThreadManager
+
+        scheduled = []
+        monkeypatch.setattr(thread_manager_module, "schedule_compaction", scheduled.append)
+        monkeypatch.setattr(thread_manager_module, "build_window", lambda thread: build_window(thread, small_budget))
+
+        manager = ThreadManager(chef_id=test_chef.id)
+        manager.save_turn("hi", "hello")
+        manager.get_history_window()
+        assert scheduled == []
+
+        for row in _rows(6):
+            manager.save_message(row["role"], row["content"])
+        manager.get_history_window()
+        assert scheduled == [manager.thread_id]
+
+    def test_legacy_assistant_leaves_summary_to_compaction(self, test_chef, small_budget, monkeypatch):
+        from customer_dashboard.models import SousChefThread
+        from meals.sous_chef_assistant import SousChefAssistant
+
+        thread = self._thread(test_chef, 8)
+        thread.conversation_summary = "Chef plans weekly menus."
+        thread.save()
+        scheduled = []
+        monkeypatch.setattr(history, "schedule_compaction", scheduled.append)
+        monkeypatch.setattr(history, "build_window", lambda thread: build_window(thread, small_budget))
+        assistant = SousChefAssistant.__new__(SousChefAssistant)
+        legacy = [{"role": "system", "content": "instructions"}] + [
+            {"role": "user", "content": row["content"]} for row in _rows(20)
+        ]
+
+        truncated = assistant._truncate_with_summarization(legacy, thread, max_messages=10)
+
+        thread = SousChefThread.objects.get(pk=thread.id)
+        assert thread.conversation_summary == "Chef plans weekly menus."
+        assert thread.messages_summarized_count == 0
+        assert scheduled == [thread.id]
+        assert "Chef plans weekly menus." in truncated[1]["content"]
@@ -1,6 +1,6 @@
 """Tests for HTML converter module."""
 import pytest
-from chefs.services.sous_chef.html_converter import markdown_to_html
+from chefs.services.sous_chef.html_converter import MarkdownBlockBuffer, markdown_to_html
 
 
 class TestBasicConversions:
@@ -308,3 +308,23 @@ class TestEdgeCases:
         result = markdown_to_html("Line 1\n\n\n\nLine 2")
         # Excessive newlines should be cleaned up
         assert result.count('<br>') < 5 or '\n\n\n' not in result
+
+
+class TestMarkdownBlockBuffer:
+    """Test splitting streamed markdown into complete blocks."""
+
+    def test_emits_block_at_blank_line(self):
+        """A block is complete once the blank line after it arrives."""
+        buffer = MarkdownBlockBuffer()
+        assert buffer.feed("First para") == []
+        assert buffer.feed("graph.\n") == []
+        assert buffer.feed("\nSecond") == ["First paragraph."]
+        assert buffer.flush() == "Second"
+        assert buffer.flush() is None
+
+    def test_does_not_split_code_fences(self):
+        """Blank lines inside a fenced code block don't end the block."""
+        buffer = MarkdownBlockBuffer()
+        blocks = buffer.feed("```\nline 1\n\nline 2\n```\n\nAfter")
+        assert blocks == ["```\nline 1\n\nline 2\n```"]
+        assert buffer.flush() == "After"
@@ -0,0 +1,121 @@
+# chefs/services/sous_chef/tests/test_session_cache.py
+"""Tests for warm Sous Chef sessions."""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from chefs.services.sous_chef.session_cache import SessionCache, session_key
+
+
+def _agents_service():
+    try:
+        from chefs.services.sous_chef.agents_service import AgentsSousChefService
+    except ImportError:
+        pytest.skip("openai-agents not installed")
+    return AgentsSousChefService
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _session(key):
+    return SimpleNamespace(key=key, versions=(0,), created_at=0.0)
+
+
+class TestSessionCache:
+    """Test LRU and TTL bounds."""
+
+    def test_least_recently_used_is_evicted(self):
+        cache = SessionCache(max_size=2, ttl=60)
+        a, b, c = (session_key(i, "web") for i in (1, 2, 3))
+        cache.put(_session(a))
+        cache.put(_session(b))
+        assert cache.get(a, (0,)) is not None
+        cache.put(_session(c))
+
+        assert cache.get(b, (0,)) is None
+        assert cache.get(a, (0,)) is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_expired_and_outdated_sessions_are_dropped(self):
+        clock = _Clock()
+        cache = SessionCache(max_size=4, ttl=60, clock=clock)
+        key = session_key(1, "web")
+        cache.put(_session(key))
+
+        assert cache.get(key, (1,)) is None  # chef edited since
+        cache.put(_session(key))
+        clock.now = 61
+        assert cache.get(key, (0,)) is None
+
+    def test_family_is_ignored_without_type(self):
+        assert session_key(1, "web", 5, None) == session_key(1, "web")
+
+
+@pytest.mark.django_db
+class TestWarmSessions:
+    """Test AgentsSousChefService reuses sessions across requests."""
+
+    def test_follow_up_reuses_agent_and_history(self, test_chef, django_assert_num_queries):
+        AgentsSousChefService = _agents_service()
+        first = AgentsSousChefService(chef_id=test_chef.id, channel="web")
+
+        with patch('agents.Runner.run_sync', return_value=MagicMock(final_output="Two orders today.")):
+            first.send_message("What's on today?")
+
+        with patch.object(first.factory, 'create_agent') as create_agent:
+            second = AgentsSousChefService(chef_id=test_chef.id, channel="web")
+            create_agent.assert_not_called()
+        assert second.agent is first.agent
+
+        with django_assert_num_queries(0):
+            context = second._get_history_context()
+        assert "User: What's on today?" in context
+        assert "Assistant: Two orders today." in context
+
+    def test_chef_edit_rebuilds_session(self, test_chef):
+        AgentsSousChefService = _agents_service()
+        first = AgentsSousChefService(chef_id=test_chef.id, channel="web")
+
+        test_chef.save()
+
+        assert AgentsSousChefService(chef_id=test_chef.id, channel="web").agent is not first.agent
+
+    def test_household_edit_rebuilds_family_session_only(self, test_chef, test_customer):
+        from custom_auth.models import HouseholdMember
+
+        AgentsSousChefService = _agents_service()
+        family = AgentsSousChefService(
+            chef_id=test_chef.id, channel="web", family_id=test_customer.id, family_type="customer"
+        )
+        general = AgentsSousChefService(chef_id=test_chef.id, channel="web")
+
+        HouseholdMember.objects.create(user=test_customer, name="Sam")
+
+        assert AgentsSousChefService(
+            chef_id=test_chef.id, channel="web", family_id=test_customer.id, family_type="customer"
+        ).agent is not family.agent
+        assert AgentsSousChefService(chef_id=test_chef.id, channel="web").agent is general.agent
+
+    def test_turn_saved_by_another_worker_is_read_back(self, test_chef):
+        from chefs.services.sous_chef import session_cache
+        from customer_dashboard.models import SousChefMessage
+
+        AgentsSousChefService = _agents_service()
+        first = AgentsSousChefService(chef_id=test_chef.id, channel="web")
+        first.session.save_turn("Hi", "Hello chef")
+
+        # Another process writes to the same thread
+        thread = first.thread_manager.get_or_create_thread()
+        SousChefMessage.objects.create(thread=thread, role="chef", content="Any new orders?")
+        session_cache._bump(session_cache._thread_version_key(thread.id))
+
+        second = AgentsSousChefService(chef_id=test_chef.id, channel="web")
+        assert second.agent is first.agent
+        assert "User: Any new orders?" in second._get_history_context()
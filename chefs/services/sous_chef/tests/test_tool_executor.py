@@ -0,0 +1,124 @@
+# chefs/services/sous_chef/tests/test_tool_executor.py
+"""Tests for concurrent tool execution."""
+import threading
+import time
+
+from chefs.services.sous_chef.tools.categories import READ_ONLY_TOOLS, TOOL_REGISTRY
+from chefs.services.sous_chef.tools.executor import (
+    LatencyHistogram,
+    ToolCall,
+    ToolExecutor,
+    plan_batches,
+    tool_latency,
+)
+
+
+class RecordingTools:
+    """Stand-in for execute_tool that records overlap between calls."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.order = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, tool_name, args, chef, customer, lead, channel):
+        with self._lock:
+            self.order.append(tool_name)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        if tool_name == "broken_tool":
+            raise RuntimeError("boom")
+        return {"status": "success", "tool": tool_name, "args": args}
+
+
+def _calls(*names):
+    return [ToolCall(f"call_{i}", name, '{"n": %d}' % i) for i, name in enumerate(names)]
+
+
+class TestPlanBatches:
+    """Test grouping of read-only and mutating calls."""
+
+    def test_read_only_tools_are_registered(self):
+        """Every read-only tool is a known tool."""
+        assert READ_ONLY_TOOLS <= set(TOOL_REGISTRY)
+
+    def test_mutating_calls_split_batches(self):
+        """Consecutive reads share a batch; each write runs alone."""
+        calls = _calls(
+            "get_family_order_history",
+            "get_chef_analytics",
+            "save_chef_memory",
+            "update_chef_memory",
+            "recall_chef_memories",
+        )
+        batches = plan_batches(calls)
+        assert [[c.name for c in batch] for batch in batches] == [
+            ["get_family_order_history", "get_chef_analytics"],
+            ["save_chef_memory"],
+            ["update_chef_memory"],
+            ["recall_chef_memories"],
+        ]
+
+    def test_unknown_tools_are_treated_as_mutating(self):
+        batches = plan_batches(_calls("get_chef_analytics", "mystery_tool", "get_chef_analytics"))
+        assert len(batches) == 3
+
+
+class TestToolExecutor:
+    """Test ToolExecutor runs calls concurrently but returns them in order."""
+
+    def test_read_only_calls_overlap(self):
+        tools = RecordingTools()
+        executor = ToolExecutor(chef=None, execute=tools, max_workers=4)
+        names = ["get_family_order_history", "get_upcoming_family_orders", "get_chef_analytics", "recall_chef_memories"]
+
+        results = executor.run(_calls(*names))
+
+        assert tools.max_running > 1
+        assert [r["tool"] for r in results] == names
+        assert [r["args"]["n"] for r in results] == [0, 1, 2, 3]
+
+    def test_mutating_calls_run_alone_and_in_order(self):
+        tools = RecordingTools(delay=0.01)
+        executor = ToolExecutor(chef=None, execute=tools, max_workers=4)
+
+        executor.run(_calls("save_chef_memory", "add_family_note", "update_chef_memory"))
+
+        assert tools.max_running == 1
+        assert tools.order == ["save_chef_memory", "add_family_note", "update_chef_memory"]
+
+    def test_errors_become_results(self):
+        tools = RecordingTools(delay=0)
+        executor = ToolExecutor(chef=None, execute=tools)
+
+        results = executor.run([ToolCall("a", "broken_tool"), ToolCall("b", "get_chef_analytics", "not json")])
+
+        assert results[0] == {"status": "error", "message": "boom"}
+        assert results[1]["status"] == "error"
+
+    def test_latency_is_recorded_per_tool(self):
+        tool_latency.reset()
+        executor = ToolExecutor(chef=None, execute=RecordingTools(delay=0))
+
+        executor.run(_calls("get_chef_analytics", "get_chef_analytics"))
+
+        stats = tool_latency.snapshot()["get_chef_analytics"]
+        assert stats["count"] == 2
+        assert sum(stats["buckets"].values()) == 2
+
+
+class TestLatencyHistogram:
+    def test_buckets(self):
+        histogram = LatencyHistogram(buckets_ms=(10, 100))
+        histogram.observe("t", 0.005)
+        histogram.observe("t", 0.05)
+        histogram.observe("t", 2)
+
+        stats = histogram.snapshot()["t"]
+        assert stats["buckets"] == {"le_10ms": 1, "le_100ms": 1, "inf": 1}
+        assert stats["max_ms"] == 2000
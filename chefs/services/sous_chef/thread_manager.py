@@ -10,6 +10,8 @@ from typing import List, Dict, Any, Optional
 
 from django.db import transaction
 
+from .history import HistoryWindow, build_window, schedule_compaction
+
 logger = logging.getLogger(__name__)
 
 
@@ -175,22 +177,45 @@ class ThreadManager:
         
         return history
     
+    def get_history_window(self) -> HistoryWindow:
+        """
+        Get the token-budgeted history: rolling summary plus exact tail.
+        
+        Schedules summarization in the background once enough messages have
+        fallen out of the tail.
+        """
+        thread = self.get_or_create_thread()
+        window = build_window(thread)
+        if window.needs_compaction:
+            schedule_compaction(thread.id)
+        return window
+    
     def get_history_for_groq(self, limit: Optional[int] = 20) -> List[Dict[str, str]]:
         """
         Get history formatted for Groq chat completions.
         
+        The conversation summary (if any) comes first as a system message,
+        followed by the newest messages that fit the token budget.
+        
         Args:
-            limit: Max messages to include (default 20)
+            limit: Max tail messages to include (default 20)
         
         Returns:
             List ready for Groq messages parameter
         """
-        return self.get_history(limit=limit)
+        messages = self.get_history_window().as_messages()
+        if limit and messages and messages[0]["role"] == "system":
+            return messages[:1] + messages[1:][-limit:]
+        return messages[-limit:] if limit else messages
     
     def clear_history(self) -> None:
         """Clear the current thread's history (start fresh)."""
         thread = self.get_or_create_thread()
-        thread.messages.all().delete()
+        with transaction.atomic():
+            thread.messages.all().delete()
+            thread.conversation_summary = ''
+            thread.messages_summarized_count = 0
+            thread.save(update_fields=['conversation_summary', 'messages_summarized_count'])
         logger.info(f"Cleared history for thread {thread.id}")
     
     def new_conversation(self) -> "SousChefThread":
@@ -225,6 +250,10 @@ class ThreadManager:
         # Create new thread
         return self.get_or_create_thread()
     
+    def refresh(self) -> None:
+        """Forget the cached thread so the next call looks it up again."""
+        self._thread = None
+    
     @property
     def thread_id(self) -> Optional[int]:
         """Get current thread ID if exists."""
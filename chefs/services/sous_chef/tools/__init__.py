@@ -8,6 +8,8 @@ Tools are categorized by where they can be used:
 - NAVIGATION: Web dashboard only (UI navigation, form prefills)
 - MESSAGING: Messaging channels (draft messages for customers)
 
+Read-only tools from one model turn run concurrently (see executor.py).
+
 Security:
 - SENSITIVE tools return redirect messages on Telegram/LINE
 - This is a defense-in-depth measure (not relying on LLM compliance)
@@ -18,12 +20,19 @@ from .categories import (
     TOOL_REGISTRY, 
     CHANNEL_TOOLS,
     SENSITIVE_RESTRICTED_CHANNELS,
+    READ_ONLY_TOOLS,
+    is_read_only_tool,
 )
 from .loader import (
     get_tools_for_channel, 
     get_tool_schemas_for_channel,
     execute_tool,
 )
+from .executor import (
+    ToolCall,
+    ToolExecutor,
+    tool_latency_stats,
+)
 from .sensitive_wrapper import (
     is_sensitive_tool,
     is_restricted_channel,
@@ -36,10 +45,16 @@ __all__ = [
     "TOOL_REGISTRY", 
     "CHANNEL_TOOLS",
     "SENSITIVE_RESTRICTED_CHANNELS",
+    "READ_ONLY_TOOLS",
+    "is_read_only_tool",
     # Loader
     "get_tools_for_channel",
     "get_tool_schemas_for_channel",
     "execute_tool",
+    # Executor
+    "ToolCall",
+    "ToolExecutor",
+    "tool_latency_stats",
     # Sensitive wrapper
     "is_sensitive_tool",
     "is_restricted_channel",
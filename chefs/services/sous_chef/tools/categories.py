@@ -105,6 +105,37 @@ TOOL_REGISTRY: Dict[str, ToolCategory] = {
 }
 
 
+# Tools that don't change anything the conversation can observe, so several
+# of them from one model turn can run at the same time. Anything not listed
+# is treated as mutating and runs on its own, in the order the model asked.
+# recall_chef_memories only bumps access counters, which commute.
+READ_ONLY_TOOLS: Set[str] = {
+    "get_family_dietary_summary",
+    "get_household_members",
+    "check_recipe_compliance",
+    "suggest_ingredient_substitution",
+    "get_family_order_history",
+    "get_upcoming_family_orders",
+    "get_family_insights",
+    "suggest_family_menu",
+    "scale_recipe_for_household",
+    "get_seasonal_ingredients",
+    "estimate_prep_time",
+    "get_prep_plan_summary",
+    "get_shopping_list",
+    "get_batch_cooking_suggestions",
+    "check_ingredient_shelf_life",
+    "search_chef_dishes",
+    "get_chef_analytics",
+    "get_upcoming_commitments",
+    "recall_chef_memories",
+    "lookup_chef_hub_help",
+    "navigate_to_dashboard_tab",
+    "prefill_form",
+    "draft_client_message",
+}
+
+
 # Which categories are allowed per channel
 # Note: SENSITIVE is included but tools are WRAPPED on restricted channels
 CHANNEL_TOOLS: Dict[str, Set[ToolCategory]] = {
@@ -150,3 +181,8 @@ def is_tool_allowed(tool_name: str, channel: str) -> bool:
     
     allowed = get_categories_for_channel(channel)
     return category in allowed
+
+
+def is_read_only_tool(tool_name: str) -> bool:
+    """Check if a tool can run concurrently with other read-only tools."""
+    return tool_name in READ_ONLY_TOOLS
@@ -0,0 +1,182 @@
+# chefs/services/sous_chef/tools/executor.py
+"""
+Batch execution of the tool calls from one model turn.
+
+The model often asks for several lookups at once (order history, upcoming
+orders, analytics, memories), each doing its own DB work. Consecutive
+read-only calls run together on a bounded thread pool; a mutating call is a
+barrier that runs on its own, so writes keep the order the model asked for
+and reads after a write see it. Results always come back in call order.
+
+Every call's latency is recorded in a per-tool histogram
+(see tool_latency_stats()).
+"""
+
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connection
+
+from .categories import is_read_only_tool
+
+logger = logging.getLogger(__name__)
+
+TOOL_CONCURRENCY = getattr(settings, "SOUS_CHEF_TOOL_CONCURRENCY", 4)
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+@dataclass
+class ToolCall:
+    id: str
+    name: str
+    arguments: str = ""  # JSON, as sent by the model
+
+
+class LatencyHistogram:
+    """Thread-safe per-tool latency histogram."""
+
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._tools: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, tool_name: str, seconds: float) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            tool = self._tools.setdefault(tool_name, {
+                "count": 0,
+                "sum_ms": 0.0,
+                "max_ms": 0.0,
+                "buckets": [0] * (len(self.buckets_ms) + 1),
+            })
+            tool["count"] += 1
+            tool["sum_ms"] += ms
+            tool["max_ms"] = max(tool["max_ms"], ms)
+            index = next((i for i, bound in enumerate(self.buckets_ms) if ms <= bound), len(self.buckets_ms))
+            tool["buckets"][index] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        labels = [f"le_{bound}ms" for bound in self.buckets_ms] + ["inf"]
+        with self._lock:
+            return {
+                name: {
+                    "count": tool["count"],
+                    "avg_ms": round(tool["sum_ms"] / tool["count"], 2),
+                    "max_ms": round(tool["max_ms"], 2),
+                    "buckets": dict(zip(labels, tool["buckets"])),
+                }
+                for name, tool in self._tools.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tools.clear()
+
+
+tool_latency = LatencyHistogram()
+
+
+def tool_latency_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-tool call counts and latency histograms for this process."""
+    return tool_latency.snapshot()
+
+
+def plan_batches(calls: List[ToolCall]) -> List[List[ToolCall]]:
+    """
+    Group calls into batches that run one after another.
+
+    Consecutive read-only calls share a batch; each mutating call gets a
+    batch of its own.
+    """
+    batches: List[List[ToolCall]] = []
+    for call in calls:
+        if is_read_only_tool(call.name) and batches and is_read_only_tool(batches[-1][0].name):
+            batches[-1].append(call)
+        else:
+            batches.append([call])
+    return batches
+
+
+class ToolExecutor:
+    """
+    Runs a turn's tool calls for one chef/channel.
+
+    Args:
+        chef, customer, lead, channel: Passed through to execute_tool
+        max_workers: Read-only calls run at once (default TOOL_CONCURRENCY)
+        execute: Tool entry point, defaults to loader.execute_tool
+    """
+
+    def __init__(
+        self,
+        chef: Any,
+        customer: Optional[Any] = None,
+        lead: Optional[Any] = None,
+        channel: str = "web",
+        max_workers: Optional[int] = None,
+        execute: Optional[Callable[..., Dict[str, Any]]] = None,
+    ):
+        if execute is None:
+            from .loader import execute_tool as execute
+        self.chef = chef
+        self.customer = customer
+        self.lead = lead
+        self.channel = channel
+        self.max_workers = max_workers or TOOL_CONCURRENCY
+        self._execute = execute
+
+    def run(self, calls: List[ToolCall]) -> List[Dict[str, Any]]:
+        """Execute all calls; results are in call order."""
+        results: List[Dict[str, Any]] = []
+        for batch in plan_batches(calls):
+            results.extend(self.run_batch(batch))
+        return results
+
+    def run_batch(self, batch: List[ToolCall]) -> List[Dict[str, Any]]:
+        """Execute one batch from plan_batches; results are in call order."""
+        if len(batch) == 1 or self.max_workers <= 1:
+            return [self._call(call) for call in batch]
+
+        workers = min(self.max_workers, len(batch))
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sous-chef-tool") as pool:
+            results = list(pool.map(self._call_in_worker, batch))
+        logger.info(
+            f"Ran {len(batch)} read-only tools concurrently in {(time.monotonic() - started) * 1000:.0f}ms: "
+            f"{', '.join(call.name for call in batch)}"
+        )
+        return results
+
+    def _call_in_worker(self, call: ToolCall) -> Dict[str, Any]:
+        try:
+            return self._call(call)
+        finally:
+            # Worker threads each open their own database connection
+            connection.close()
+
+    def _call(self, call: ToolCall) -> Dict[str, Any]:
+        started = time.monotonic()
+        try:
+            args = json.loads(call.arguments) if call.arguments else {}
+            result = self._execute(
+                tool_name=call.name,
+                args=args,
+                chef=self.chef,
+                customer=self.customer,
+                lead=self.lead,
+                channel=self.channel,  # Key: pass channel for sensitive data handling
+            )
+        except Exception as e:
+            logger.error(f"Tool call error ({call.name}): {e}")
+            result = {"status": "error", "message": str(e)}
+        finally:
+            tool_latency.observe(call.name, time.monotonic() - started)
+        return result
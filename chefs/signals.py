@@ -1,10 +1,17 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.conf import settings
-from .models import Chef
+from .models import Chef, ChefWorkspace
 from django.utils import timezone
-from meals.models import ChefMealEvent, STATUS_SCHEDULED, STATUS_OPEN
+from meals.models import (
+    ChefMealEvent, ChefMealOrder, ChefMealReview, PaymentLog, STATUS_SCHEDULED, STATUS_OPEN,
+)
+from chef_services.models import ChefCustomerConnection, ChefServiceOrder
+from crm.models import Lead, LeadHouseholdMember
+from custom_auth.models import CustomUser, HouseholdMember
 from local_chefs.models import ChefPostalCode
+from .services.dashboard_metrics import local_day, refresh_chef_day
 
 from .tasks import notify_waitlist_subscribers_for_chef, notify_area_waitlist_users
 
@@ -63,3 +70,119 @@ def on_chef_postal_code_added(sender, instance: ChefPostalCode, created, **kwarg
     except Exception:
         # Never raise in signal handler
         return
+
+
+# Dashboard metrics rollup: recompute only the chef-day a write touched.
+
+def _refresh_metrics(sender, chef_id, when, **kwargs):
+    # Deletes cascading from another model (e.g. a chef or user being removed)
+    # are left to the reconcile job - the rollup row may be going away too.
+    origin = kwargs.get('origin')
+    if origin is not None and getattr(origin, 'model', type(origin)) is not sender:
+        return
+    if not chef_id or when is None:
+        return
+    # Rebuild after commit so the write path doesn't pay for the recompute
+    # and the rebuild sees the committed rows
+    day = local_day(when)
+    transaction.on_commit(lambda: refresh_chef_day(chef_id, day))
+
+
+@receiver(post_save, sender=ChefMealOrder)
+@receiver(post_delete, sender=ChefMealOrder)
+def refresh_metrics_for_meal_order(sender, instance: ChefMealOrder, **kwargs):
+    chef_id = ChefMealEvent.objects.filter(pk=instance.meal_event_id).values_list('chef_id', flat=True).first()
+    _refresh_metrics(sender, chef_id, instance.created_at, **kwargs)
+
+
+@receiver(post_save, sender=ChefServiceOrder)
+@receiver(post_delete, sender=ChefServiceOrder)
+def refresh_metrics_for_service_order(sender, instance: ChefServiceOrder, **kwargs):
+    _refresh_metrics(sender, instance.chef_id, instance.created_at, **kwargs)
+
+
+@receiver(post_save, sender=PaymentLog)
+@receiver(post_delete, sender=PaymentLog)
+def refresh_metrics_for_payment_log(sender, instance: PaymentLog, **kwargs):
+    if instance.action == 'refund':
+        _refresh_metrics(sender, instance.chef_id, instance.created_at, **kwargs)
+
+
+@receiver(post_save, sender=ChefMealReview)
+@receiver(post_delete, sender=ChefMealReview)
+def refresh_metrics_for_review(sender, instance: ChefMealReview, **kwargs):
+    _refresh_metrics(sender, instance.chef_id, instance.created_at, **kwargs)
+
+
+@receiver(post_save, sender=ChefCustomerConnection)
+@receiver(post_delete, sender=ChefCustomerConnection)
+def refresh_metrics_for_connection(sender, instance: ChefCustomerConnection, **kwargs):
+    _refresh_metrics(sender, instance.chef_id, instance.responded_at, **kwargs)
+
+
+@receiver(post_save, sender=ChefMealEvent)
+@receiver(post_delete, sender=ChefMealEvent)
+def refresh_metrics_for_event_savings(sender, instance: ChefMealEvent, **kwargs):
+    _refresh_metrics(sender, instance.chef_id, instance.event_date, **kwargs)
+
+
+# Sous Chef sessions: drop warm agents whose prompt or context an edit changed.
+# The session cache is imported lazily so app startup doesn't load the Agents SDK.
+
+def _invalidate_sous_chef_chef(chef_id):
+    if chef_id is None:
+        return
+    from .services.sous_chef.session_cache import invalidate_chef
+    invalidate_chef(chef_id)
+
+
+def _invalidate_sous_chef_family(family_type, family_id):
+    if family_id is None:
+        return
+    from .services.sous_chef.session_cache import invalidate_family
+    invalidate_family(family_type, family_id)
+
+
+@receiver(post_save, sender=Chef)
+def invalidate_sous_chef_for_chef(sender, instance: Chef, **kwargs):
+    _invalidate_sous_chef_chef(instance.pk)
+
+
+@receiver(post_save, sender=ChefWorkspace)
+@receiver(post_delete, sender=ChefWorkspace)
+def invalidate_sous_chef_for_workspace(sender, instance: ChefWorkspace, **kwargs):
+    _invalidate_sous_chef_chef(instance.chef_id)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_sous_chef_for_user(sender, instance: CustomUser, update_fields=None, **kwargs):
+    # Logins only touch last_login
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    _invalidate_sous_chef_family('customer', instance.pk)
+    # The chef's name in the prompt comes from their user
+    _invalidate_sous_chef_chef(Chef.objects.filter(user_id=instance.pk).values_list('id', flat=True).first())
+
+
+@receiver(post_save, sender=HouseholdMember)
+@receiver(post_delete, sender=HouseholdMember)
+def invalidate_sous_chef_for_household_member(sender, instance: HouseholdMember, **kwargs):
+    _invalidate_sous_chef_family('customer', instance.user_id)
+
+
+@receiver(m2m_changed, sender=HouseholdMember.dietary_preferences.through)
+def invalidate_sous_chef_for_household_diet(sender, instance, **kwargs):
+    if isinstance(instance, HouseholdMember) and kwargs.get('action', '').startswith('post_'):
+        _invalidate_sous_chef_family('customer', instance.user_id)
+
+
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+def invalidate_sous_chef_for_lead(sender, instance: Lead, **kwargs):
+    _invalidate_sous_chef_family('lead', instance.pk)
+
+
+@receiver(post_save, sender=LeadHouseholdMember)
+@receiver(post_delete, sender=LeadHouseholdMember)
+def invalidate_sous_chef_for_lead_household_member(sender, instance: LeadHouseholdMember, **kwargs):
+    _invalidate_sous_chef_family('lead', instance.lead_id)
@@ -468,3 +468,28 @@ class ServicePerformanceTests(TestCase):
         # Log query count for monitoring
         # print(f"Client list queries: {len(context.captured_queries)}")
 
+
+    def test_client_list_query_count_independent_of_client_count(self):
+        """Client list query count must not grow with the number of clients."""
+        with CaptureQueriesContext(connection) as small:
+            get_client_list_with_stats(self.chef)
+
+        for i in range(20, 60):
+            customer = CustomUser.objects.create_user(
+                username=f"customer{i}",
+                email=f"customer{i}@example.com",
+                password="testpass123",
+            )
+            ChefCustomerConnection.objects.create(
+                chef=self.chef,
+                customer=customer,
+                status=ChefCustomerConnection.STATUS_ACCEPTED,
+                initiated_by=ChefCustomerConnection.INITIATED_BY_CUSTOMER,
+            )
+
+        with CaptureQueriesContext(connection) as large:
+            clients = get_client_list_with_stats(self.chef, ordering='-total_spent')
+
+        self.assertEqual(len(clients), 60)
+        self.assertEqual(len(large.captured_queries), len(small.captured_queries))
+        self.assertLessEqual(len(large.captured_queries), 2)
@@ -0,0 +1,148 @@
+"""
+Tests for the materialized chef dashboard metrics rollup.
+
+Run with: pytest chefs/tests/test_dashboard_metrics.py -v
+"""
+
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from custom_auth.models import CustomUser
+from chefs.models import Chef, ChefDailyMetrics
+from chef_services.models import (
+    ChefCustomerConnection,
+    ChefServiceOffering,
+    ChefServiceOrder,
+    ChefServicePriceTier,
+)
+from chefs.services.client_insights import get_analytics_time_series, get_dashboard_summary
+from chefs.services.dashboard_metrics import get_daily_metrics, rebuild_metrics
+from meals.models import ChefMealEvent, ChefMealOrder, ChefMealReview, Meal, Order
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+)
+class DashboardMetricsTests(TestCase):
+
+    def setUp(self):
+        chef_user = CustomUser.objects.create_user(
+            username="chefrollup", email="rollup@example.com", password="testpass123",
+        )
+        self.chef = Chef.objects.create(user=chef_user, bio="Test chef")
+        self.customer = CustomUser.objects.create_user(
+            username="rollupcustomer", email="rollupcustomer@example.com", password="testpass123",
+        )
+        offering = ChefServiceOffering.objects.create(
+            chef=self.chef, service_type='home_chef', title='Weekly prep', active=True,
+        )
+        self.tier = ChefServicePriceTier.objects.create(
+            offering=offering, household_min=1, household_max=4,
+            desired_unit_amount_cents=12500, active=True,
+        )
+        self.offering = offering
+
+    def _order(self, status='confirmed'):
+        return ChefServiceOrder.objects.create(
+            chef=self.chef, customer=self.customer, offering=self.offering, tier=self.tier,
+            household_size=2, service_date=timezone.localdate() + timedelta(days=3), status=status,
+        )
+
+    def test_order_save_refreshes_todays_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._order()
+
+        row = ChefDailyMetrics.objects.get(chef=self.chef, date=timezone.localdate())
+        self.assertEqual(row.service_orders, 1)
+        self.assertEqual(row.service_revenue_cents, 12500)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self._order(status='draft')
+            order.status = 'confirmed'
+            order.save()
+
+        row.refresh_from_db()
+        self.assertEqual(row.service_orders, 2)
+        self.assertEqual(get_dashboard_summary(self.chef)['revenue']['today'], Decimal('250'))
+
+    def test_refresh_waits_for_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self._order()
+
+        self.assertFalse(ChefDailyMetrics.objects.filter(chef=self.chef).exists())
+        self.assertEqual(len(callbacks), 1)
+
+    def test_dashboard_review_stats_cover_days_without_rollup_rows(self):
+        meal = Meal.objects.create(name="Lasagna", creator=self.chef.user)
+        event = ChefMealEvent.objects.create(
+            chef=self.chef,
+            meal=meal,
+            event_date=timezone.localdate() - timedelta(days=90),
+            event_time=time(18, 0),
+            order_cutoff_time=timezone.now() - timedelta(days=91),
+            max_orders=10,
+            base_price=Decimal("20.00"),
+            current_price=Decimal("20.00"),
+            min_price=Decimal("15.00"),
+        )
+        order = ChefMealOrder.objects.create(
+            order=Order.objects.create(customer=self.customer),
+            meal_event=event,
+            customer=self.customer,
+            status="completed",
+            price_paid=Decimal("20.00"),
+        )
+        ChefMealReview.objects.create(
+            chef_meal_order=order, customer=self.customer, chef=self.chef, meal_event=event, rating=4,
+        )
+        ChefDailyMetrics.objects.all().delete()
+
+        client = APIClient()
+        client.force_authenticate(user=self.chef.user)
+        response = client.get(reverse('meals:api_chef_dashboard_stats'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['review_count'], 1)
+        self.assertEqual(response.data['avg_rating'], 4)
+
+    def test_connection_acceptance_counts_as_new_client(self):
+        ChefCustomerConnection.objects.create(
+            chef=self.chef,
+            customer=self.customer,
+            status=ChefCustomerConnection.STATUS_ACCEPTED,
+            initiated_by=ChefCustomerConnection.INITIATED_BY_CUSTOMER,
+            responded_at=timezone.now(),
+        )
+
+        series = get_analytics_time_series(self.chef, 'clients', days=7)
+
+        self.assertEqual(series[-1]['value'], 1)
+        self.assertEqual(sum(point['value'] for point in series), 1)
+
+    def test_missing_days_are_built_once_then_read_from_rollup(self):
+        self._order()
+        ChefDailyMetrics.objects.all().delete()
+
+        series = get_analytics_time_series(self.chef, 'revenue', days=30)
+        self.assertEqual(series[-1]['value'], 125.0)
+        self.assertEqual(ChefDailyMetrics.objects.filter(chef=self.chef).count(), 30)
+
+        with CaptureQueriesContext(connection) as ctx:
+            get_analytics_time_series(self.chef, 'orders', days=30)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_rebuild_repairs_rows_changed_behind_signals(self):
+        self._order()
+        ChefServiceOrder.objects.filter(chef=self.chef).update(status='cancelled')
+
+        today = timezone.localdate()
+        rebuild_metrics(today, today)
+
+        self.assertEqual(get_daily_metrics(self.chef, today, today)[today].service_orders, 0)
@@ -361,6 +361,43 @@ class HybridMemorySearchTests(TestCase):
         memory, _ = results[0]
         self.assertEqual(memory.memory_type, 'lesson')
 
+    def test_vector_search_finds_chef_outside_global_neighbours(self):
+        """A chef whose memories are far from everyone else's still gets limit hits."""
+        from django.db import connection
+        from customer_dashboard.models import ChefMemory
+        from chefs.models import Chef, hybrid_memory_search
+
+        def vector(*weights):
+            return list(weights) + [0.0] * (1536 - len(weights))
+
+        query = vector(1.0)
+        # Other chefs fill the index with rows nearer the query than any of ours
+        for n in range(3):
+            user = User.objects.create_user(
+                username=f'nearchef{n}', email=f'near{n}@test.com', password='testpass123'
+            )
+            other, _ = Chef.objects.get_or_create(user=user)
+            for i in range(20):
+                ChefMemory.objects.create(
+                    chef=other, memory_type='lesson', content=f'Near memory {i}',
+                    importance=3, embedding=vector(1.0, 0.01 * (i + 1)),
+                )
+        for i in range(8):
+            ChefMemory.objects.create(
+                chef=self.chef, memory_type='lesson', content=f'Far memory {i}',
+                importance=3, embedding=vector(0.6, 0.8, 0.01 * (i + 1)),
+            )
+        with connection.cursor() as cursor:
+            # Make the planner use the HNSW index even on this tiny table
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        results = hybrid_memory_search(
+            chef=self.chef, query='', query_embedding=query, limit=5
+        )
+
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(memory.chef_id == self.chef.id for memory, _ in results))
+
 
 class MemoryServiceTests(TestCase):
     """Tests for MemoryService operations."""
@@ -472,6 +509,25 @@ class MemoryServiceTests(TestCase):
         self.assertEqual(len(memories), 1)
         self.assertEqual(memories[0].content, 'Client likes spicy food')
 
+    def test_mark_accessed_bulk_single_update(self):
+        """Test access tracking for many memories uses one atomic UPDATE."""
+        from customer_dashboard.models import ChefMemory
+
+        memories = [
+            ChefMemory.objects.create(chef=self.chef, memory_type='lesson', content=f'Tip {i}')
+            for i in range(3)
+        ]
+        # A concurrent chat already bumped one of them
+        ChefMemory.objects.filter(pk=memories[0].pk).update(access_count=5)
+
+        with self.assertNumQueries(1):
+            ChefMemory.mark_accessed_bulk(memories)
+
+        counts = dict(ChefMemory.objects.filter(chef=self.chef).values_list('pk', 'access_count'))
+        self.assertEqual(counts[memories[0].pk], 6)
+        self.assertEqual(counts[memories[1].pk], 1)
+        self.assertIsNotNone(memories[2].last_accessed_at)
+
 
 class ContextAssemblyTests(TestCase):
     """Tests for ContextAssemblyService."""
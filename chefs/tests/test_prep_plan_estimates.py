@@ -0,0 +1,178 @@
+# chefs/tests/test_prep_plan_estimates.py
+"""Tests for deduplicated, cached and concurrent prep-plan ingredient estimates."""
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from chefs.resource_planning import services
+from chefs.resource_planning.models import DishIngredientEstimate
+from chefs.resource_planning.services import (
+    Commitment,
+    aggregate_ingredients,
+    plan_ingredient_estimates,
+    purge_stale_estimates,
+)
+
+
+class FakeEstimator:
+    """Stand-in for the Groq request that records calls and overlap."""
+
+    def __init__(self, delay=0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, groq_client, request):
+        with self._lock:
+            self.calls.append((request.kind, request.dish_name, request.servings))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        if request.dish_name in self.fail:
+            raise RuntimeError("rate limited")
+        if request.kind == 'generated':
+            return [{'name': 'Rice', 'quantity': request.servings * 0.5, 'unit': 'cups'}]
+        return [
+            {'name': name, 'quantity': request.servings, 'unit': 'oz'}
+            for name in request.ingredient_names
+        ]
+
+
+@pytest.fixture
+def estimator(monkeypatch):
+    fake = FakeEstimator()
+    monkeypatch.setattr(services, '_get_groq_client', lambda: object())
+    monkeypatch.setattr(services, '_run_estimate_request', fake)
+    return fake
+
+
+def _generated(name, servings, day):
+    return Commitment(
+        commitment_type='client_meal_plan',
+        service_date=date(2026, 10, 19) + timedelta(days=day),
+        servings=servings,
+        meal_name=name,
+        dishes=[{'name': name, 'needs_ingredient_generation': True, 'ingredients': []}],
+    )
+
+
+def _partial(name, servings, day):
+    return Commitment(
+        commitment_type='meal_event',
+        service_date=date(2026, 10, 19) + timedelta(days=day),
+        servings=servings,
+        meal_name=name,
+        dishes=[{
+            'name': name,
+            'ingredients': [
+                {'name': 'Salmon', 'quantity': None},
+                {'name': 'Lemon', 'quantity': 1, 'unit': 'pieces'},
+            ],
+        }],
+    )
+
+
+def _week():
+    return (
+        [_generated('Rice Bowl', 4, day) for day in range(5)]
+        + [_partial('Grilled Salmon', 2, day) for day in range(3)]
+        + [_generated('Rice Bowl', 6, 5)]
+    )
+
+
+class TestPlanEstimates:
+    """Test the planning stage dedupes dishes across commitments."""
+
+    def test_same_dish_and_servings_is_planned_once(self):
+        requests = plan_ingredient_estimates(_week())
+
+        assert sorted((r.kind, r.dish_name, r.servings) for r in requests.values()) == [
+            ('generated', 'Rice Bowl', 4),
+            ('generated', 'Rice Bowl', 6),
+            ('quantities', 'Grilled Salmon', 2),
+        ]
+
+    def test_dishes_with_full_quantities_need_nothing(self):
+        commitment = _partial('Grilled Salmon', 2, 0)
+        commitment.dishes[0]['ingredients'][0]['quantity'] = 6
+
+        assert plan_ingredient_estimates([commitment]) == {}
+
+
+@pytest.mark.django_db
+class TestResolveEstimates:
+    """Test estimates come from the cache or concurrent Groq requests."""
+
+    def test_week_makes_one_request_per_unique_dish(self, estimator):
+        aggregated = aggregate_ingredients(_week())
+
+        assert len(estimator.calls) == 3
+        # 5 x 2 cups at 4 servings + 3 cups at 6 servings
+        assert aggregated['rice'].total_quantity == Decimal('13')
+        assert aggregated['salmon'].total_quantity == Decimal('6')
+        assert aggregated['salmon'].unit == 'oz'
+        assert len(aggregated['rice'].meals_using) == 6
+
+    def test_second_plan_is_served_from_cache(self, estimator):
+        first = aggregate_ingredients(_week())
+        estimator.calls.clear()
+
+        second = aggregate_ingredients(_week())
+
+        assert estimator.calls == []
+        assert DishIngredientEstimate.objects.count() == 3
+        assert second['rice'].total_quantity == first['rice'].total_quantity
+
+    def test_changed_recipe_misses_cache(self, estimator):
+        aggregate_ingredients([_partial('Grilled Salmon', 2, 0)])
+        commitment = _partial('Grilled Salmon', 2, 0)
+        commitment.dishes[0]['ingredients'].append({'name': 'Dill', 'quantity': None})
+
+        aggregate_ingredients([commitment])
+
+        assert len(estimator.calls) == 2
+
+    def test_failed_requests_use_defaults_and_are_not_cached(self, estimator):
+        estimator.fail = {'Grilled Salmon'}
+
+        aggregated = aggregate_ingredients(_week())
+
+        assert aggregated['salmon'].unit == 'cups'
+        assert not DishIngredientEstimate.objects.filter(dish_name='Grilled Salmon').exists()
+        assert DishIngredientEstimate.objects.filter(dish_name='Rice Bowl').count() == 2
+
+    def test_cache_misses_are_requested_concurrently(self, estimator):
+        estimator.delay = 0.05
+        commitments = [_generated(f'Dish {i}', 4, i % 7) for i in range(4)]
+
+        aggregate_ingredients(commitments)
+
+        assert len(estimator.calls) == 4
+        assert estimator.max_running > 1
+
+
+@pytest.mark.django_db
+class TestPurgeStaleEstimates:
+    """Test the purge cron task drops estimates the cache no longer serves."""
+
+    def test_only_stale_rows_are_deleted(self, estimator):
+        aggregate_ingredients(_week())
+        old = timezone.now() - timedelta(days=services.ESTIMATE_MAX_AGE_DAYS + 1)
+        DishIngredientEstimate.objects.filter(dish_name='Grilled Salmon').update(updated_at=old)
+
+        assert purge_stale_estimates() == {'deleted': 1}
+        assert set(DishIngredientEstimate.objects.values_list('dish_name', flat=True)) == {'Rice Bowl'}
+
+    def test_registered_as_cron_task(self):
+        from api.cron_triggers import TASK_MAP
+
+        assert TASK_MAP['purge_stale_estimates'] == 'chefs.resource_planning.services.purge_stale_estimates'
@@ -29,12 +29,11 @@ from meals.models import (
 from custom_auth.models import Address
 from django_countries import countries
 import os
-import requests
-import traceback
 import logging
 from local_chefs.models import PostalCode, ChefPostalCode
 from django.db import transaction
 import stripe
+from utils.error_reporting import report_error
 
 logger = logging.getLogger(__name__)
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -275,8 +274,7 @@ def submit_chef_request(request):
             address.country = country_code
             address.save(update_fields=['city', 'country'])
         except Exception as e:
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": f"Failed to save address info for chef request: {str(e)}", "source":"submit_chef_request", "traceback": traceback.format_exc()})
+            report_error(f"Failed to save address info for chef request: {str(e)}", "submit_chef_request")
             return JsonResponse({
                 'error': 'Failed to save address info for chef request',
                 'details': str(e)
@@ -318,8 +316,7 @@ def submit_chef_request(request):
                     chef_request.profile_pic = profile_pic
                 except Exception as e:
                     # n8n traceback
-                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                    requests.post(n8n_traceback_url, json={"error": f"Failed to process profile picture", "source":"submit_chef_request", "traceback": traceback.format_exc()})
+                    report_error(f"Failed to process profile picture", "submit_chef_request")
                     return JsonResponse({
                         'error': 'Failed to process profile picture',
                         'details': str(e)
@@ -329,8 +326,7 @@ def submit_chef_request(request):
             
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": f"Failed to save chef request", "source":"submit_chef_request", "traceback": traceback.format_exc()})
+            report_error(f"Failed to save chef request", "submit_chef_request")
             return JsonResponse({
                 'error': 'Failed to save chef request',
                 'details': str(e)
@@ -388,8 +384,7 @@ def submit_chef_request(request):
                         processed_codes.append(code)
                     except Exception as e:
                         # n8n traceback
-                        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                        requests.post(n8n_traceback_url, json={"error": f"Error processing postal code {code}: {str(e)}", "source":"submit_chef_request", "traceback": traceback.format_exc()})
+                        report_error(f"Error processing postal code {code}: {str(e)}", "submit_chef_request")
                         failed_codes.append({'code': code, 'error': str(e)})
             
             if failed_codes:
@@ -397,8 +392,7 @@ def submit_chef_request(request):
             
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": f"Failed to process postal codes", "source":"submit_chef_request", "traceback": traceback.format_exc()})
+            report_error(f"Failed to process postal codes", "submit_chef_request")
             return JsonResponse({
                 'error': 'Failed to process postal codes',
                 'details': str(e),
@@ -419,8 +413,7 @@ def submit_chef_request(request):
         
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Unexpected error in submit_chef_request: {str(e)}", "source":"submit_chef_request", "traceback": traceback.format_exc()})
+        report_error(f"Unexpected error in submit_chef_request: {str(e)}", "submit_chef_request")
         return JsonResponse({
             'error': 'An unexpected error occurred',
             'details': str(e),
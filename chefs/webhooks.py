@@ -5,9 +5,6 @@ Handles payment link completion and other chef-specific payment events.
 """
 
 import logging
-import os
-import requests
-import traceback
 
 import stripe
 from django.conf import settings
@@ -15,6 +12,7 @@ from django.db import transaction
 from django.utils import timezone
 
 from .models import ChefPaymentLink
+from utils.error_reporting import report_error
 
 logger = logging.getLogger(__name__)
 
@@ -140,22 +138,7 @@ def _send_payment_confirmation(payment_link):
 
 def _send_traceback(error, source):
     """Send error traceback to N8N for monitoring."""
-    n8n_url = os.getenv('N8N_TRACEBACK_URL')
-    if not n8n_url:
-        return
-    
-    try:
-        requests.post(
-            n8n_url,
-            json={
-                'error': str(error),
-                'source': source,
-                'traceback': traceback.format_exc()
-            },
-            timeout=5
-        )
-    except requests.exceptions.RequestException:
-        pass  # Don't fail silently but don't raise either
+    report_error(error, source)
 
 
 
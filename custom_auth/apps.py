@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'custom_auth'
+
+    def ready(self):
+        # Import signals to register them
+        from custom_auth import signals  # noqa: F401
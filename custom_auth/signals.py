@@ -0,0 +1,19 @@
+"""
+Signals for custom_auth app.
+
+Keeps per-process caches derived from the user profile in step with edits.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from custom_auth.models import CustomUser
+from utils.quotas import invalidate_user_timezone
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_quota_timezone(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached quota timezone so the next window uses the new zone."""
+    if update_fields and 'timezone' not in update_fields:
+        return
+    invalidate_user_timezone(instance.pk)
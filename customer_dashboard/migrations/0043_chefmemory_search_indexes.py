@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-16 09:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import pgvector.django
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer_dashboard', '0042_add_embedding_to_chefmemory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chefmemory',
+            name='search_vector',
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector('content', config='english', weight='A'),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='chefmemory',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='chefmemory_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='chefmemory',
+            index=pgvector.django.HnswIndex(
+                ef_construction=64,
+                fields=['embedding'],
+                m=16,
+                name='chefmemory_embedding_hnsw',
+                opclasses=['vector_cosine_ops'],
+            ),
+        ),
+    ]
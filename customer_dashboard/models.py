@@ -12,7 +12,9 @@ from django_countries.fields import CountryField
 from django.contrib.auth import get_user_model
 from datetime import date
 from django.conf import settings
-from pgvector.django import VectorField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from pgvector.django import HnswIndex, VectorField
 
 User = get_user_model()
 
@@ -644,6 +646,13 @@ class ChefMemory(models.Model):
         help_text="Embedding vector for semantic/hybrid search"
     )
 
+    # Stored full-text vector for keyword search (maintained by Postgres)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('content', weight='A', config='english'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
     class Meta:
         ordering = ['-importance', '-updated_at']
         indexes = [
@@ -651,6 +660,14 @@ class ChefMemory(models.Model):
             models.Index(fields=['chef', 'importance', 'is_active']),
             models.Index(fields=['chef', 'customer']),
             models.Index(fields=['chef', 'lead']),
+            GinIndex(fields=['search_vector'], name='chefmemory_search_gin'),
+            HnswIndex(
+                name='chefmemory_embedding_hnsw',
+                fields=['embedding'],
+                m=16,
+                ef_construction=64,
+                opclasses=['vector_cosine_ops'],
+            ),
         ]
         verbose_name = 'Chef Memory'
         verbose_name_plural = 'Chef Memories'
@@ -662,9 +679,29 @@ class ChefMemory(models.Model):
     
     def mark_accessed(self):
         """Update access tracking when memory is used."""
-        self.last_accessed_at = timezone.now()
-        self.access_count += 1
-        self.save(update_fields=['last_accessed_at', 'access_count'])
+        type(self).mark_accessed_bulk([self])
+    
+    @classmethod
+    def mark_accessed_bulk(cls, memories):
+        """
+        Record one access for each memory in a single UPDATE.
+        
+        The increment happens in SQL (access_count = access_count + 1), so
+        concurrent conversations never overwrite each other's counts.
+        In-memory instances are updated to match.
+        """
+        memories = [m for m in memories if m.pk is not None]
+        if not memories:
+            return 0
+        now = timezone.now()
+        updated = cls.objects.filter(pk__in={m.pk for m in memories}).update(
+            access_count=models.F('access_count') + 1,
+            last_accessed_at=now,
+        )
+        for memory in memories:
+            memory.access_count += 1
+            memory.last_accessed_at = now
+        return updated
     
     @property
     def family_context(self):
@@ -23,6 +23,7 @@ from .tasks import process_aggregated_emails
 from requests.compat import urlencode 
 from utils.translate_html import translate_paragraphs, _get_language_name # Import the translation utility
 from bs4 import BeautifulSoup
+from utils.error_reporting import report_payload
 
 logger = logging.getLogger(__name__)
 
@@ -227,7 +228,7 @@ def process_email(request):
                         'source': 'process_email',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                     # Continue with partially translated content
                 
                 # Check if user has unsubscribed from emails
@@ -392,7 +393,7 @@ def process_email(request):
                     'source': 'process_email',
                     'traceback': traceback.format_exc()
                 }
-                requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                report_payload(n8n_traceback)
                 auth_email_body_translated = auth_email_body_raw  # Fallback to original
 
             auth_email_html_content = render_to_string(
@@ -419,7 +420,7 @@ def process_email(request):
                     'source': 'process_email',
                     'traceback': traceback.format_exc()
                 }
-                requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                report_payload(n8n_traceback)
                 # Continue with partially translated content
 
             auth_subject = "Activate Your sautai Email Assistant Session"
@@ -593,7 +594,7 @@ def enhanced_process_aggregated_emails_task(session_identifier_str, use_enhanced
                         'session_id': session_identifier_str,
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
             else:
                 logger.error("N8N_EMAIL_REPLY_WEBHOOK_URL not configured")
         else:
@@ -608,4 +609,4 @@ def enhanced_process_aggregated_emails_task(session_identifier_str, use_enhanced
             'session_id': session_identifier_str,
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
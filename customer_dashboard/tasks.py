@@ -23,6 +23,7 @@ from utils.translate_html import translate_paragraphs, _get_language_name
 from shared.utils import get_groq_client
 from django.template.loader import render_to_string
 import re
+from utils.error_reporting import report_payload
 
 # Define constants for cache keys. These should ideally match those in secure_email_integration.py
 EMAIL_AGGREGATION_MESSAGES_KEY_PREFIX = "email_aggregation_messages_user_"
@@ -205,7 +206,7 @@ def summarize_user_chat_sessions():
                     'source': 'summarize_user_chat_sessions',
                     'traceback': traceback.format_exc()
                 }
-                requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                report_payload(n8n_traceback)
     
     # If any summaries were created/updated, run the consolidated summary
     if count > 0:
@@ -346,7 +347,7 @@ def generate_chat_session_summary(summary_id):
                 'source': 'generate_chat_session_summary',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return f"API error for summary {summary_id}: {str(api_error)}"
     
     except ChatSessionSummary.DoesNotExist:
@@ -360,7 +361,7 @@ def generate_chat_session_summary(summary_id):
             'source': 'generate_chat_session_summary',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         return f"Error for summary {summary_id}: {str(e)}"
 
 def consolidate_user_chat_summaries():
@@ -412,7 +413,7 @@ def consolidate_user_chat_summaries():
                 'source': 'consolidate_user_chat_summaries',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
     return count
 
 def generate_consolidated_user_summary(user_id):
@@ -528,7 +529,7 @@ def generate_consolidated_user_summary(user_id):
                 'source': 'generate_consolidated_user_summary',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return f"API error for user summary {user_id}: {str(api_error)}"
     
     except CustomUser.DoesNotExist:
@@ -542,7 +543,7 @@ def generate_consolidated_user_summary(user_id):
             'source': 'generate_consolidated_user_summary',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         return f"Error for user summary {user_id}: {str(e)}"
 
 def process_aggregated_emails(session_identifier_str, use_enhanced_formatting=False):
@@ -779,7 +780,7 @@ def process_aggregated_emails(session_identifier_str, use_enhanced_formatting=Fa
                         'user_id': str(session.user.id),
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback, timeout=5)
+                    report_payload(n8n_traceback)
                 except:
                     pass  # Don't let traceback reporting break the main flow
                 
@@ -937,7 +938,7 @@ def process_aggregated_emails(session_identifier_str, use_enhanced_formatting=Fa
                             'user_id': str(session.user.id),
                             'traceback': traceback.format_exc()
                         }
-                        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback, timeout=5)
+                        report_payload(n8n_traceback)
                     except:
                         pass
                     
@@ -972,7 +973,7 @@ def process_aggregated_emails(session_identifier_str, use_enhanced_formatting=Fa
                 'session_id': session_identifier_str,
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback, timeout=5)
+            report_payload(n8n_traceback)
         except:
             pass
         
@@ -15,10 +15,8 @@ from .models import (ChatThread, UserMessage, UserSummary, ToolCall, AssistantEm
 import pytz
 from zoneinfo import ZoneInfo
 import json
-import os
 import re
 import time
-import requests
 import traceback
 from shared.utils import (get_user_info, post_review, update_review, delete_review, replace_meal_in_plan, 
                           remove_meal_from_plan, list_upcoming_meals, get_date, create_meal_plan, 
@@ -75,6 +73,7 @@ from meals.tool_registration import get_all_tools, handle_tool_call
 # Enhanced email processor removed - customer standalone meal planning deprecated
 from customer_dashboard.template_router import render_email_sections
 from meals.feature_flags import legacy_meal_plan_enabled
+from utils.error_reporting import report_error, report_payload
 
 class GuestChatThrottle(UserRateThrottle):
     rate = '100/day'  
@@ -538,8 +537,7 @@ def api_thread_detail_view(request, openai_thread_id):
     except Exception as e:
         logger.error(f"Error retrieving thread detail: {str(e)}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Error retrieving thread detail: {str(e)}", "source":"api_thread_detail_view", "traceback": traceback.format_exc()})
+        report_error(f"Error retrieving thread detail: {str(e)}", "api_thread_detail_view")
         return Response({'error': "Error retrieving message details"})
 
 def api_format_chat_history_from_response(response):
@@ -977,7 +975,7 @@ def stream_message(request):
             'source': 'stream_message',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         logger.error(f"DEBUG STREAM - Error checking threads: {str(e)}")
     
     assistant = MealPlanningAssistant(user_id)
@@ -1567,9 +1565,6 @@ def guest_new_conversation(request):
 @renderer_classes([EventStreamRenderer])
 def onboarding_stream_message(request):
     """Stream onboarding chat messages for guest users via SSE."""
-    import traceback
-    import requests
-    import os
     
     try:
         # Validate request method
@@ -1591,16 +1586,7 @@ def onboarding_stream_message(request):
             except Exception as post_error:
                 logger.error(f"onboarding_stream_message: Error accessing request.POST: {str(post_error)}", exc_info=True)
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={
-                        "error": f"Data access error: {str(data_error)}, POST error: {str(post_error)}", 
-                        "source": "onboarding_stream_message.data_access", 
-                        "request_method": request.method,
-                        "content_type": request.content_type,
-                        "raw_body": str(request.body),
-                        "traceback": traceback.format_exc()
-                    })
+                report_error(f"Data access error: {str(data_error)}, POST error: {str(post_error)}", "onboarding_stream_message.data_access", {"request_method": request.method, "content_type": request.content_type, "raw_body": str(request.body)})
                 return JsonResponse({
                     'status': 'error',
                     'message': 'Unable to parse request data'
@@ -1612,13 +1598,7 @@ def onboarding_stream_message(request):
         except Exception as session_error:
             logger.error(f"onboarding_stream_message: Error accessing session: {str(session_error)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(session_error), 
-                    "source": "onboarding_stream_message.session_access", 
-                    "traceback": traceback.format_exc()
-                })
+            report_error(session_error, "onboarding_stream_message.session_access")
             session_data = {}
         
         # Ensure session exists
@@ -1628,13 +1608,7 @@ def onboarding_stream_message(request):
         except Exception as session_create_error:
             logger.error(f"onboarding_stream_message: Error creating session: {str(session_create_error)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(session_create_error), 
-                    "source": "onboarding_stream_message.session_create", 
-                    "traceback": traceback.format_exc()
-                })
+            report_error(session_create_error, "onboarding_stream_message.session_create")
         
         # Extract guest_id
         try:
@@ -1656,13 +1630,7 @@ def onboarding_stream_message(request):
             except Exception as generate_error:
                 logger.error(f"onboarding_stream_message: Error generating guest_id: {str(generate_error)}", exc_info=True)
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={
-                        "error": str(generate_error), 
-                        "source": "onboarding_stream_message.generate_guest_id", 
-                        "traceback": traceback.format_exc()
-                    })
+                report_error(generate_error, "onboarding_stream_message.generate_guest_id")
                 return JsonResponse({
                     'status': 'error',
                     'message': 'Failed to generate guest ID'
@@ -1688,10 +1656,9 @@ def onboarding_stream_message(request):
         # Clear any existing conversation history to prevent context confusion
         # (In case this is the first onboarding message without calling new_conversation first)
         try:
-            from meals.meal_assistant_implementation import GLOBAL_GUEST_STATE
-            if guest_id in GLOBAL_GUEST_STATE:
-                del GLOBAL_GUEST_STATE[guest_id]
-                logger.info(f"onboarding_stream_message: Cleared existing conversation history for guest_id={guest_id}")
+            from meals.guest_state import get_guest_state_store
+            get_guest_state_store().delete(guest_id)
+            logger.info(f"onboarding_stream_message: Cleared existing conversation history for guest_id={guest_id}")
         except Exception as clear_error:
             logger.warning(f"onboarding_stream_message: Failed to clear existing history for guest_id={guest_id}: {str(clear_error)}")
             # Don't fail the request for this - just log and continue
@@ -1703,14 +1670,7 @@ def onboarding_stream_message(request):
         except Exception as assistant_error:
             logger.error(f"onboarding_stream_message: Error creating OnboardingAssistant: {str(assistant_error)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(assistant_error), 
-                    "source": "onboarding_stream_message.create_assistant", 
-                    "guest_id": guest_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(assistant_error, "onboarding_stream_message.create_assistant", {"guest_id": guest_id})
             return JsonResponse({
                 'status': 'error',
                 'message': f'Failed to create onboarding assistant: {str(assistant_error)}'
@@ -1808,16 +1768,7 @@ def onboarding_stream_message(request):
             except Exception as stream_error:
                 logger.error(f"onboarding_stream_message: Exception in event_stream for guest_id {guest_id}: {str(stream_error)}", exc_info=True)
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={
-                        "error": str(stream_error), 
-                        "source": "onboarding_stream_message.event_stream", 
-                        "guest_id": guest_id,
-                        "message": message,
-                        "thread_id": thread_id,
-                        "traceback": traceback.format_exc()
-                    })
+                report_error(stream_error, "onboarding_stream_message.event_stream", {"guest_id": guest_id, "message": message, "thread_id": thread_id})
                 yield f"data: {_sse_json({'type': 'error', 'message': str(stream_error)})}\n\n"
 
             yield 'event: close\n\n'
@@ -1831,18 +1782,7 @@ def onboarding_stream_message(request):
     except Exception as e:
         logger.error(f"onboarding_stream_message: Unhandled exception: {str(e)}", exc_info=True)
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        if n8n_traceback_url:
-            try:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "onboarding_stream_message.unhandled", 
-                    "request_method": request.method if hasattr(request, 'method') else 'unknown',
-                    "content_type": request.content_type if hasattr(request, 'content_type') else 'unknown',
-                    "traceback": traceback.format_exc()
-                })
-            except Exception as webhook_error:
-                logger.error(f"onboarding_stream_message: Failed to send error to n8n webhook: {str(webhook_error)}")
+        report_error(e, "onboarding_stream_message.unhandled", {"request_method": request.method if hasattr(request, 'method') else 'unknown', "content_type": request.content_type if hasattr(request, 'content_type') else 'unknown'})
         
         return JsonResponse({
             'status': 'error',
@@ -1854,9 +1794,6 @@ def onboarding_stream_message(request):
 @permission_classes([AllowAny])
 def onboarding_new_conversation(request):
     """Start a fresh onboarding chat."""
-    import traceback
-    import requests
-    import os
     
     try:
         # Validate request method
@@ -1878,16 +1815,7 @@ def onboarding_new_conversation(request):
             except Exception as post_error:
                 logger.error(f"onboarding_new_conversation: Error accessing request.POST: {str(post_error)}", exc_info=True)
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={
-                        "error": f"Data access error: {str(data_error)}, POST error: {str(post_error)}", 
-                        "source": "onboarding_new_conversation.data_access", 
-                        "request_method": request.method,
-                        "content_type": request.content_type,
-                        "raw_body": str(request.body),
-                        "traceback": traceback.format_exc()
-                    })
+                report_error(f"Data access error: {str(data_error)}, POST error: {str(post_error)}", "onboarding_new_conversation.data_access", {"request_method": request.method, "content_type": request.content_type, "raw_body": str(request.body)})
                 return JsonResponse({
                     'status': 'error',
                     'message': 'Unable to parse request data'
@@ -1899,13 +1827,7 @@ def onboarding_new_conversation(request):
         except Exception as session_error:
             logger.error(f"onboarding_new_conversation: Error accessing session: {str(session_error)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(session_error), 
-                    "source": "onboarding_new_conversation.session_access", 
-                    "traceback": traceback.format_exc()
-                })
+            report_error(session_error, "onboarding_new_conversation.session_access")
             session_data = {}
         
         # Ensure session exists
@@ -1915,13 +1837,7 @@ def onboarding_new_conversation(request):
         except Exception as session_create_error:
             logger.error(f"onboarding_new_conversation: Error creating session: {str(session_create_error)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(session_create_error), 
-                    "source": "onboarding_new_conversation.session_create", 
-                    "traceback": traceback.format_exc()
-                })
+            report_error(session_create_error, "onboarding_new_conversation.session_create")
         
         # Extract guest_id
         try:
@@ -1945,13 +1861,7 @@ def onboarding_new_conversation(request):
             except Exception as generate_error:
                 logger.error(f"onboarding_new_conversation: Error generating guest_id: {str(generate_error)}", exc_info=True)
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={
-                        "error": str(generate_error), 
-                        "source": "onboarding_new_conversation.generate_guest_id", 
-                        "traceback": traceback.format_exc()
-                    })
+                report_error(generate_error, "onboarding_new_conversation.generate_guest_id")
                 return JsonResponse({
                     'status': 'error',
                     'message': 'Failed to generate guest ID'
@@ -1959,10 +1869,9 @@ def onboarding_new_conversation(request):
         
         # Clear any existing conversation history to prevent context confusion
         try:
-            from meals.meal_assistant_implementation import GLOBAL_GUEST_STATE
-            if guest_id in GLOBAL_GUEST_STATE:
-                del GLOBAL_GUEST_STATE[guest_id]
-                logger.info(f"onboarding_new_conversation: Cleared existing conversation history for guest_id={guest_id}")
+            from meals.guest_state import get_guest_state_store
+            get_guest_state_store().delete(guest_id)
+            logger.info(f"onboarding_new_conversation: Cleared existing conversation history for guest_id={guest_id}")
         except Exception as clear_error:
             logger.warning(f"onboarding_new_conversation: Failed to clear existing history for guest_id={guest_id}: {str(clear_error)}")
             # Don't fail the request for this - just log and continue
@@ -1976,14 +1885,7 @@ def onboarding_new_conversation(request):
         except Exception as assistant_error:
             logger.error(f"onboarding_new_conversation: Error creating OnboardingAssistant: {str(assistant_error)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(assistant_error), 
-                    "source": "onboarding_new_conversation.create_assistant", 
-                    "guest_id": guest_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(assistant_error, "onboarding_new_conversation.create_assistant", {"guest_id": guest_id})
             return JsonResponse({
                 'status': 'error',
                 'message': f'Failed to create onboarding assistant: {str(assistant_error)}'
@@ -1997,14 +1899,7 @@ def onboarding_new_conversation(request):
         except Exception as reset_error:
             logger.error(f"onboarding_new_conversation: Error resetting conversation: {str(reset_error)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(reset_error), 
-                    "source": "onboarding_new_conversation.reset_conversation", 
-                    "guest_id": guest_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(reset_error, "onboarding_new_conversation.reset_conversation", {"guest_id": guest_id})
             return JsonResponse({
                 'status': 'error',
                 'message': f'Failed to reset conversation: {str(reset_error)}'
@@ -2021,18 +1916,7 @@ def onboarding_new_conversation(request):
     except Exception as e:
         logger.error(f"onboarding_new_conversation: Unhandled exception: {str(e)}", exc_info=True)
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        if n8n_traceback_url:
-            try:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "onboarding_new_conversation.unhandled", 
-                    "request_method": request.method if hasattr(request, 'method') else 'unknown',
-                    "content_type": request.content_type if hasattr(request, 'content_type') else 'unknown',
-                    "traceback": traceback.format_exc()
-                })
-            except Exception as webhook_error:
-                logger.error(f"onboarding_new_conversation: Failed to send error to n8n webhook: {str(webhook_error)}")
+        report_error(e, "onboarding_new_conversation.unhandled", {"request_method": request.method if hasattr(request, 'method') else 'unknown', "content_type": request.content_type if hasattr(request, 'content_type') else 'unknown'})
         
         return JsonResponse({
             'status': 'error',
@@ -15,7 +15,11 @@ const SOUS_CHEF_BASE = '/chefs/api/me/sous-chef'
  * @param {number} params.familyId - The family ID (customer or lead)
  * @param {string} params.familyType - 'customer' or 'lead'
  * @param {string} params.message - The message to send
- * @param {function} params.onText - Callback for text chunks
+ * @param {function} params.onText - Callback for the final structured response (JSON string)
+ * @param {function} params.onTextDelta - Callback for raw markdown deltas as the model writes
+ * @param {function} params.onHtmlBlock - Callback for each completed block ({ index, content } HTML)
+ * @param {function} params.onToolStart - Callback when a tool starts ({ name })
+ * @param {function} params.onToolEnd - Callback when a tool finishes ({ name, action })
  * @param {function} params.onToolCall - Callback for tool call events
  * @param {function} params.onComplete - Callback when streaming completes
  * @param {function} params.onError - Callback for errors
@@ -27,6 +31,10 @@ export async function streamSousChefMessage({
   familyType,
   message,
   onText,
+  onTextDelta,
+  onHtmlBlock,
+  onToolStart,
+  onToolEnd,
   onToolCall,
   onToolResult,
   onComplete,
@@ -87,7 +95,10 @@ export async function streamSousChefMessage({
             const data = trimmed.slice(6)
             try {
               const event = JSON.parse(data)
-              processEvent(event, { onText, onToolCall, onToolResult, onComplete, onError })
+              processEvent(event, {
+                onText, onTextDelta, onHtmlBlock, onToolStart, onToolEnd,
+                onToolCall, onToolResult, onComplete, onError
+              })
             } catch {
               // Ignore parse errors
             }
@@ -110,7 +121,10 @@ export async function streamSousChefMessage({
  * Process a streaming event.
  */
 function processEvent(event, callbacks) {
-  const { onText, onToolCall, onToolResult, onComplete, onError } = callbacks
+  const {
+    onText, onTextDelta, onHtmlBlock, onToolStart, onToolEnd,
+    onToolCall, onToolResult, onComplete, onError
+  } = callbacks
   const type = event?.type
   
   switch (type) {
@@ -120,6 +134,31 @@ function processEvent(event, callbacks) {
       }
       break
       
+    case 'text_delta':
+      if (onTextDelta && event.delta) {
+        onTextDelta(event.delta)
+      }
+      break
+      
+    case 'html_block':
+      // Rendered HTML for each markdown block as soon as it is complete
+      if (onHtmlBlock && event.content) {
+        onHtmlBlock({ index: event.index, content: event.content })
+      }
+      break
+      
+    case 'tool_start':
+      if (onToolStart) {
+        onToolStart({ name: event.name })
+      }
+      break
+      
+    case 'tool_end':
+      if (onToolEnd) {
+        onToolEnd({ name: event.name, action: event.action })
+      }
+      break
+      
     case 'response.function_call':
       if (onToolCall) {
         onToolCall({
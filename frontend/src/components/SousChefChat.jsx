@@ -9,7 +9,7 @@ import React, { useState, useEffect, useRef, useMemo, useCallback } from 'react'
 import { getRandomChefEmoji } from '../utils/emojis.js'
 import StructuredContent from './StructuredContent'
 import {
-  sendStructuredMessage,
+  streamSousChefMessage,
   getSousChefHistory,
   newSousChefConversation,
   getFamilyContext
@@ -180,29 +180,49 @@ export default function SousChefChat({
 
     setIsStreaming(true)
 
+    // Show each HTML block as it streams in; the final structured blocks
+    // (text + actions) replace them once the run completes
+    const updateAssistant = (content) => setMessages(prev => prev.map(m =>
+      m.id === assistantId ? { ...m, content, isThinking: false } : m
+    ))
+    let streamedBlocks = []
+    let streamedText = ''
+    let finalContent = null
+    let streamError = null
+
     try {
-      const result = await sendStructuredMessage({
+      await streamSousChefMessage({
         familyId: familyId || null,
         familyType: familyType || null,
-        message: text
+        message: text,
+        onHtmlBlock: ({ content }) => {
+          streamedBlocks = [...streamedBlocks, { type: 'html', content }]
+          if (finalContent === null) {
+            updateAssistant(JSON.stringify({ blocks: streamedBlocks }))
+          }
+        },
+        onText: (content) => {
+          if (isStructuredContent(content)) {
+            finalContent = content
+            updateAssistant(content)
+            return
+          }
+          // Groq-direct service streams plain text chunks instead
+          streamedText += content
+          updateAssistant(JSON.stringify({ blocks: [{ type: 'text', content: streamedText }] }))
+        },
+        onError: (err) => {
+          streamError = err
+        }
       })
 
-      if (result.status === 'success' && result.content) {
-        const contentJson = JSON.stringify(result.content)
-        setMessages(prev => prev.map(m =>
-          m.id === assistantId
-            ? { ...m, content: contentJson, finalized: true, isThinking: false }
-            : m
-        ))
-      } else {
-        const errorMsg = result.message || 'Something went wrong'
-        setError(errorMsg)
-        setMessages(prev => prev.map(m =>
-          m.id === assistantId
-            ? { ...m, content: JSON.stringify({ blocks: [{ type: 'text', content: errorMsg }] }), finalized: true, isThinking: false }
-            : m
-        ))
+      if (streamError) throw streamError
+      if (finalContent === null && streamedBlocks.length === 0 && !streamedText) {
+        throw new Error('Something went wrong')
       }
+      setMessages(prev => prev.map(m =>
+        m.id === assistantId ? { ...m, finalized: true, isThinking: false } : m
+      ))
     } catch (err) {
       const errorMsg = err.message || 'An error occurred'
       setError(errorMsg)
@@ -1008,6 +1028,15 @@ export default function SousChefChat({
 /**
  * Message bubble component with structured content rendering.
  */
+function isStructuredContent(content) {
+  try {
+    const parsed = JSON.parse(content)
+    return Boolean(parsed && Array.isArray(parsed.blocks))
+  } catch {
+    return false
+  }
+}
+
 function MessageBubble({ role, content, finalized, isThinking, onAction }) {
   const isUser = role === 'chef'
 
@@ -100,6 +100,7 @@ INSTALLED_APPS = [
     'crm',
     'memberships',
     'messaging',
+    'api',
     'rest_framework',
     'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
@@ -429,6 +430,25 @@ LOGIN_URL = 'custom_auth:login'
 # Primary AI Provider: Groq
 GROQ_API_KEY = os.getenv('GROQ_API_KEY')
 GROQ_MODEL = os.getenv('GROQ_MODEL', 'openai/gpt-oss-120b')
+# Read-only Sous Chef tool calls from one model turn run this many at a time
+SOUS_CHEF_TOOL_CONCURRENCY = int(os.getenv('SOUS_CHEF_TOOL_CONCURRENCY', '4'))
+# Warm Sous Chef agent sessions kept per worker (chefs.services.sous_chef.session_cache)
+SOUS_CHEF_SESSION_CACHE_SIZE = int(os.getenv('SOUS_CHEF_SESSION_CACHE_SIZE', '256'))
+SOUS_CHEF_SESSION_TTL = int(os.getenv('SOUS_CHEF_SESSION_TTL', '900'))
+# Sous Chef thread history: exact tail budget, and unsummarized tokens that trigger a rolling summary
+SOUS_CHEF_HISTORY_TOKEN_BUDGET = int(os.getenv('SOUS_CHEF_HISTORY_TOKEN_BUDGET', '2000'))
+SOUS_CHEF_SUMMARY_TRIGGER_TOKENS = int(os.getenv('SOUS_CHEF_SUMMARY_TRIGGER_TOKENS', '1500'))
+
+# Synchronous fallback when a weekly Groq batch fails (meals.services.meal_plan_fanout)
+MEAL_PLAN_FALLBACK_CONCURRENCY = int(os.getenv('MEAL_PLAN_FALLBACK_CONCURRENCY', '4'))
+MEAL_PLAN_FALLBACK_REQUESTS_PER_MINUTE = float(os.getenv('MEAL_PLAN_FALLBACK_REQUESTS_PER_MINUTE', '30'))
+MEAL_PLAN_FALLBACK_MAX_REQUESTS = int(os.getenv('MEAL_PLAN_FALLBACK_MAX_REQUESTS', '0')) or None
+# Uncached prep-plan ingredient estimates requested at once (chefs.resource_planning.services).
+# Each worker holds one of the GROQ_MAX_INFLIGHT slots (utils.groq_rate_limit) while its
+# request runs, so workers beyond that cap just wait; defaults to the same value.
+PREP_PLAN_ESTIMATE_CONCURRENCY = int(
+    os.getenv('PREP_PLAN_ESTIMATE_CONCURRENCY', os.getenv('GROQ_MAX_INFLIGHT', '2'))
+)
 
 # OpenAI (used only for embeddings and Whisper audio transcription)
 OPENAI_KEY = os.getenv('OPENAI_KEY')
@@ -439,6 +459,8 @@ SPOONACULAR_API_KEY = os.getenv('SPOONACULAR_API_KEY')
 STRIPE_PUBLIC_KEY = os.getenv('STRIPE_PUBLIC_KEY')
 STRIPE_SECRET_KEY = os.getenv('STRIPE_SECRET_KEY')
 STRIPE_WEBHOOK_SECRET = os.getenv('STRIPE_WEBHOOK_SECRET') #TODO: Add this to the config file
+# Stripe Connect accounts synced concurrently by meals.tasks.sync_all_chef_payments
+STRIPE_PAYMENT_SYNC_CONCURRENCY = int(os.getenv('STRIPE_PAYMENT_SYNC_CONCURRENCY', '4'))
 
 # Telegram Bot Integration
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '')
@@ -587,6 +609,21 @@ CELERY_TASK_EAGER_PROPAGATES = True  # Propagate exceptions from eager tasks
 # Get signing keys from Upstash QStash console: https://console.upstash.com/qstash
 QSTASH_CURRENT_SIGNING_KEY = os.getenv('QSTASH_CURRENT_SIGNING_KEY')
 QSTASH_NEXT_SIGNING_KEY = os.getenv('QSTASH_NEXT_SIGNING_KEY')
+# Token used to publish follow-up slices of resumable cron tasks (api.task_runner)
+QSTASH_TOKEN = os.getenv('QSTASH_TOKEN')
+# Wall-clock budget for one slice of a resumable cron task; keep below the web server timeout
+CRON_TASK_SLICE_SECONDS = int(os.getenv('CRON_TASK_SLICE_SECONDS', '240'))
+# "inline" runs cron tasks inside the QStash request; "worker" queues them for
+# `manage.py run_cron_worker` (api.job_queue)
+CRON_TASK_BACKEND = os.getenv('CRON_TASK_BACKEND', 'inline')
+CRON_WORKER_PROCESSES = int(os.getenv('CRON_WORKER_PROCESSES', '1'))
+CRON_WORKER_THREADS = int(os.getenv('CRON_WORKER_THREADS', '4'))
+CRON_JOB_LEASE_SECONDS = int(os.getenv('CRON_JOB_LEASE_SECONDS', '300'))
+# Max jobs running at once per concurrency key, across all worker processes
+CRON_JOB_CONCURRENCY = {
+    'cron': int(os.getenv('CRON_JOB_CRON_CONCURRENCY', '4')),
+    'meal_plan': int(os.getenv('CRON_JOB_MEAL_PLAN_CONCURRENCY', '8')),
+}
 
 LOGGING = {
     'version': 1,
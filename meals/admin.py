@@ -451,7 +451,7 @@ class ChefMealReviewAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at',)
 
 class StripeConnectAccountAdmin(admin.ModelAdmin):
-    list_display = ('chef', 'stripe_account_id', 'is_active', 'created_at')
+    list_display = ('chef', 'stripe_account_id', 'is_active', 'payments_synced_through', 'created_at')
     list_filter = ('is_active', 'created_at')
     search_fields = ('chef__user__username', 'stripe_account_id')
     readonly_fields = ('created_at', 'updated_at')
@@ -508,13 +508,15 @@ class MealPlanBatchJobAdmin(admin.ModelAdmin):
     change_list_template = "admin/meals/mealplanbatchjob/change_list.html"
     list_display = (
         'week_start_date', 'status', 'total_requests', 'completed_requests',
-        'fallback_requests', 'failed_requests', 'created_at', 'updated_at'
+        'fallback_requests', 'failed_requests', 'fallback_progress', 'created_at', 'updated_at'
     )
     list_filter = ('status', 'week_start_date')
     search_fields = ('batch_id', 'input_file_id', 'output_file_id')
     readonly_fields = (
         'created_at', 'updated_at', 'batch_id', 'input_file_id', 'output_file_id',
-        'error_file_id', 'failure_reason', 'completion_window', 'status'
+        'error_file_id', 'failure_reason', 'completion_window', 'status',
+        'fallback_total', 'fallback_completed', 'fallback_failed', 'fallback_skipped',
+        'fallback_started_at', 'fallback_finished_at'
     )
     inlines = [MealPlanBatchRequestInline]
 
@@ -552,6 +554,13 @@ class MealPlanBatchJobAdmin(admin.ModelAdmin):
         return getattr(obj, 'fallback_requests_count', 0) or 0
     fallback_requests.short_description = "Fallback"
 
+    def fallback_progress(self, obj):
+        if not obj.fallback_total:
+            return "-"
+        done = obj.fallback_total - obj.fallback_remaining
+        return f"{done}/{obj.fallback_total} ({obj.fallback_failed} failed)"
+    fallback_progress.short_description = "Fallback progress"
+
     def changelist_view(self, request, extra_context=None):
         response = super().changelist_view(request, extra_context=extra_context)
         batch_metrics = _get_batch_metrics()
@@ -7,9 +7,6 @@ connecting them to the existing chef connection functionality in the application
 
 import json
 import logging
-import requests
-import traceback
-import os
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Any, Union
@@ -23,10 +20,10 @@ from chefs.models import Chef
 from meals.models import Meal, Order, MealPlanMeal, ChefMealEvent, ChefMealOrder, STATUS_SCHEDULED, STATUS_OPEN
 from local_chefs.models import PostalCode, ChefPostalCode
 from django.core.exceptions import ObjectDoesNotExist
+from utils.error_reporting import report_error
 
 logger = logging.getLogger(__name__)
 
-n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
 # Tool definitions for the OpenAI Responses API
 CHEF_CONNECTION_TOOLS = [
     {
@@ -261,8 +258,7 @@ def find_local_chefs(
         }
 
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"find_local_chefs", "traceback": traceback.format_exc()})
+        report_error(e, "find_local_chefs")
         return {"status": "error", "message": str(e)}
 
 def get_chef_details(chef_id: int) -> Dict[str, Any]:
@@ -306,8 +302,7 @@ def get_chef_details(chef_id: int) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_chef_details", "traceback": traceback.format_exc()})
+        report_error(e, "get_chef_details")
         return {
             "status": "error",
             "message": f"Failed to get chef details"
@@ -434,15 +429,13 @@ def view_chef_meal_events(
         
     except Chef.DoesNotExist:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Chef with id={chef_id} does not exist", "source":"view_chef_meal_events", "traceback": traceback.format_exc()})
+        report_error(f"Chef with id={chef_id} does not exist", "view_chef_meal_events")
         return {
             "status": "error",
             "message": f"Chef with ID {chef_id} not found"
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"view_chef_meal_events", "traceback": traceback.format_exc()})
+        report_error(e, "view_chef_meal_events")
         return {
             "status": "error",
             "message": f"Failed to view chef meal events"
@@ -564,8 +557,7 @@ def place_chef_meal_event_order(
         }
         
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"place_chef_meal_event_order", "traceback": traceback.format_exc()})
+        report_error(e, "place_chef_meal_event_order")
         return {
             "status": "error",
             "message": f"Failed to place order"
@@ -627,8 +619,7 @@ def get_order_details(user_id: int, order_id: int) -> Dict[str, Any]:
     except Order.DoesNotExist:
         return { "status": "error", "message": f"Order with ID {order_id} not found for user {user_id}."}
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_order_details", "traceback": traceback.format_exc()})
+        report_error(e, "get_order_details")
         return {
             "status": "error",
             "message": f"Failed to get order details: {str(e)}"
@@ -681,8 +672,7 @@ def update_chef_meal_order(
             }
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"update_chef_meal_order", "traceback": traceback.format_exc()})
+        report_error(e, "update_chef_meal_order")
         return {"status": "error", "message": f"Failed to update chef meal order"}
 
 
@@ -826,8 +816,7 @@ def replace_meal_plan_meal(
     except Meal.DoesNotExist:
         return {"status": "error", "message": "Chef meal not found"}
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"replace_meal_plan_meal", "traceback": traceback.format_exc()})
+        report_error(e, "replace_meal_plan_meal")
         return {"status": "error", "message": f"Failed to replace meal plan meal"}
 
 # Function to get all chef connection tools
@@ -36,7 +36,6 @@ import django.db.utils
 import dateutil.parser
 import re
 import json
-import requests
 from meals.order_service import ensure_chef_meal_order
 from django.db import transaction
 from decimal import Decimal, InvalidOperation
@@ -48,6 +47,7 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 import pytz
 from zoneinfo import ZoneInfo
+from utils.error_reporting import report_error, report_payload
 
 
 logger = logging.getLogger(__name__)
@@ -200,8 +200,6 @@ def api_chef_meal_orders(request):
             # Use module-level Response import to avoid overshadowing
             from rest_framework import status
             import traceback
-            import os
-            import requests
 
             # Check for DRF ValidationError or error detail in the exception
             error_detail = getattr(e, 'detail', None)
@@ -237,7 +235,7 @@ def api_chef_meal_orders(request):
                 'source': 'api_chef_meal_orders',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return Response({"error": str(e)}, status=400)
 
 @api_view(['GET', 'PUT', 'PATCH', 'DELETE'])
@@ -279,7 +277,7 @@ def api_chef_meal_order_detail(request, order_id):
                     'source': 'api_chef_meal_order_detail',
                     'traceback': traceback.format_exc()
                 }
-                requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                report_payload(n8n_traceback)
                 pass
         else:
             try:
@@ -294,7 +292,7 @@ def api_chef_meal_order_detail(request, order_id):
                     'source': 'api_chef_meal_order_detail',
                     'traceback': traceback.format_exc()
                 }
-                requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                report_payload(n8n_traceback)
         
         # If we found a ChefMealOrder, get its parent Order
         if chef_meal_order:
@@ -311,7 +309,7 @@ def api_chef_meal_order_detail(request, order_id):
             'source': 'api_chef_meal_order_detail',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
     
     # If not found as ChefMealOrder, try as regular Order
     if not order:
@@ -331,7 +329,7 @@ def api_chef_meal_order_detail(request, order_id):
                         'source': 'api_chef_meal_order_detail',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                     return Response({"error": "Chef profile not found"}, status=404)
                 except Order.DoesNotExist:
                     # n8n traceback
@@ -340,7 +338,7 @@ def api_chef_meal_order_detail(request, order_id):
                         'source': 'api_chef_meal_order_detail',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
             else:
                 try:
                     # First check if the order exists at all
@@ -366,7 +364,7 @@ def api_chef_meal_order_detail(request, order_id):
                         'source': 'api_chef_meal_order_detail',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                 except Exception as e:
                     logger.error(f"Unexpected error looking for Order: {str(e)}")
                     # n8n traceback
@@ -375,7 +373,7 @@ def api_chef_meal_order_detail(request, order_id):
                         'source': 'api_chef_meal_order_detail',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                 
             # Check if the order has any chef meal orders
             if order and not order.chef_meal_orders.exists():
@@ -400,7 +398,7 @@ def api_chef_meal_order_detail(request, order_id):
                 'source': 'api_chef_meal_order_detail',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return Response({"error": "Order not found"}, status=404)
         except Exception as e:
             logger.error(f"Unexpected error looking for Order: {str(e)}")
@@ -410,7 +408,7 @@ def api_chef_meal_order_detail(request, order_id):
                 'source': 'api_chef_meal_order_detail',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return Response({"error": f"Unexpected error: {str(e)}"}, status=500)
     
     # At this point, we should have an Order object
@@ -446,7 +444,7 @@ def api_chef_meal_order_detail(request, order_id):
                 'source': 'api_chef_meal_order_detail',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return Response({"error": f"Error serializing order: {str(e)}"}, status=500)
     
     # Handle DELETE request - cancel the order
@@ -470,7 +468,7 @@ def api_chef_meal_order_detail(request, order_id):
                 'source': 'api_chef_meal_order_detail',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return Response({"error": f"Error cancelling order: {str(e)}"}, status=500)
     
     # Handle PUT/PATCH request - update the order
@@ -560,7 +558,7 @@ def api_chef_meal_order_detail(request, order_id):
                 'source': 'api_chef_meal_order_detail',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return Response({"error": f"Error updating order: {str(e)}"}, status=500)
 
 @api_view(['GET'])
@@ -879,7 +877,7 @@ def stripe_webhook(request):
                         'source': 'stripe_webhook',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                     return Response({"error": "Order not found"}, status=404)
                 except Exception as e:
                     logger.error(f"Error processing chef meal payment: {str(e)}", exc_info=True)
@@ -888,7 +886,7 @@ def stripe_webhook(request):
                         'source': 'stripe_webhook',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                     return Response({"error": str(e)}, status=400)
             
             # Handle regular meal plan payments
@@ -944,7 +942,7 @@ def stripe_webhook(request):
                         'source': 'stripe_webhook',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                     return Response({"error": "Order not found"}, status=404)
                 except Exception as e:
                     logger.error(f"Error processing meal plan payment: {str(e)}", exc_info=True)
@@ -954,7 +952,7 @@ def stripe_webhook(request):
                         'source': 'stripe_webhook',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                     return Response({"error": str(e)}, status=400)
         
         elif event.type == 'payment_intent.succeeded':
@@ -1040,7 +1038,7 @@ def stripe_webhook(request):
             'source': 'stripe_webhook',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         return Response({"error": str(e)}, status=400)
 
 @api_view(['GET', 'POST'])
@@ -1141,7 +1139,7 @@ def api_chef_meal_events(request):
                 'source': 'api_chef_meal_events',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return standardize_response(
                 status="error",
                 message="Unable to retrieve meal events. Please try again later.",
@@ -1159,7 +1157,7 @@ def api_chef_meal_events(request):
                 'source': 'api_chef_meal_events',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return standardize_response(
                 status="error",
                 message="You must be registered as a chef to create meal events.",
@@ -1182,7 +1180,7 @@ def api_chef_meal_events(request):
                 'source': 'api_chef_meal_events',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return standardize_response(
                 status="error",
                 message="You must complete payment setup before creating meal events.",
@@ -1218,7 +1216,7 @@ def api_chef_meal_events(request):
                 'source': 'api_chef_meal_events',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return standardize_response(
                 status="error",
                 message="Meal not found.",
@@ -1285,7 +1283,7 @@ def api_chef_meal_events(request):
                 'source': 'api_chef_meal_events',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return standardize_response(
                 status="error",
                 message="Invalid date or time format. Please use YYYY-MM-DD for dates and HH:MM for times.",
@@ -1347,7 +1345,7 @@ def api_chef_meal_events(request):
                     'source': 'api_chef_meal_events',
                     'traceback': traceback.format_exc()
                 }
-                requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                report_payload(n8n_traceback)
             
             # Your existing code to create a new event if no cancelled event was found...
             
@@ -1429,7 +1427,7 @@ def api_chef_meal_events(request):
                 'source': 'api_chef_meal_events',
                 'traceback': traceback.format_exc()
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return standardize_response(
                 status="error",
                 message="Unable to create meal event. Please try again later.",
@@ -1458,7 +1456,7 @@ def api_cancel_chef_meal_event(request, event_id):
             'source': 'api_cancel_chef_meal_event',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         return standardize_response(
             status="error",
             message="User is not a chef.",
@@ -1732,7 +1730,7 @@ def api_get_meals(request):
             'source': 'api_get_meals',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         return standardize_response(
             status="error",
             message=f"Error retrieving meals: {str(e)}",
@@ -1768,7 +1766,7 @@ def api_create_chef_meal(request):
             'source': 'api_create_chef_meal',
             'traceback': traceback.format_exc()
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         return standardize_response(
             status="error",
             message="User is not a chef.",
@@ -3497,8 +3495,7 @@ def api_get_chef_meals_by_postal_code(request):
             logger.error(f"Error retrieving chef meals: {str(e)}", exc_info=True)
         else:
             logger.error(f"Error retrieving chef meals: {str(e)}", exc_info=True)
-            n8n_webhook_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_webhook_url, json={"error": str(e), "source":"api_get_chef_meals_by_postal_code", "traceback": traceback.format_exc()})
+            report_error(e, "api_get_chef_meals_by_postal_code")
         return Response({
             'status': 'error',
             'message': f"Error retrieving chef meals: {str(e)}",
@@ -3549,10 +3546,10 @@ def api_chef_payment_analytics(request):
 def api_chef_dashboard_stats(request):
     """Get statistics for the chef dashboard"""
     logger.info(f"API chef dashboard stats requested by user {request.user.id}")
-    from meals.models import ChefMealEvent, ChefMealOrder, ChefMealReview, PaymentLog
-    from django.db.models import Avg, Sum, F, Value, DecimalField
-    from django.db.models.functions import Coalesce
+    from meals.models import ChefMealEvent, ChefMealOrder, ChefMealReview
+    from django.db.models import Avg, Count, F
     from decimal import Decimal
+    from chefs.services.dashboard_metrics import get_daily_metrics
 
     try:
         chef = Chef.objects.get(user=request.user)
@@ -3564,7 +3561,7 @@ def api_chef_dashboard_stats(request):
         )
     
     # Get counts
-    now = timezone.now()
+    now = timezone.localtime()
     this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     
     upcoming_events_count = ChefMealEvent.objects.filter(
@@ -3583,43 +3580,15 @@ def api_chef_dashboard_stats(request):
         event_date__lt=now.date()
     ).count()
     
-    # Get revenue stats (include confirmed orders, not just completed)
-    revenue_this_month = ChefMealOrder.objects.filter(
-        meal_event__chef=chef,
-        status__in=['completed', 'confirmed'],
-        updated_at__gte=this_month_start
-    ).aggregate(
-        total=Coalesce(Sum(F('price_paid') * F('quantity')), Value(Decimal('0.00')), output_field=DecimalField())
-    )['total']
-    
-    # Calculate refunds this month
-    refunds_this_month = PaymentLog.objects.filter(
-        chef=chef,
-        action='refund',
-        created_at__gte=this_month_start
-    ).aggregate(
-        total=Coalesce(Sum('amount'), Value(Decimal('0.00')), output_field=DecimalField())
-    )['total']
-    
+    # Revenue, refunds and group-pricing savings come from the daily metrics rollup
+    month_rows = get_daily_metrics(chef, this_month_start.date(), now.date())
+    revenue_this_month = sum((row.meal_revenue for row in month_rows.values()), Decimal('0.00'))
+    refunds_this_month = sum((row.refunds for row in month_rows.values()), Decimal('0.00'))
+    total_savings = sum((row.customer_savings for row in month_rows.values()), Decimal('0.00'))
+
     # Calculate net revenue
     net_revenue = revenue_this_month - refunds_this_month
     
-    # Calculate dynamic pricing savings (how much customers saved through group discounts)
-    total_savings = Decimal('0.00')
-    group_order_events = ChefMealEvent.objects.filter(
-        chef=chef,
-        status__in=['completed', 'closed', 'in_progress'],
-        current_price__lt=F('base_price'),
-        updated_at__gte=this_month_start
-    ).select_related()
-    
-    for event in group_order_events:
-        # Calculate savings per order
-        savings_per_order = event.base_price - event.current_price
-        # Multiply by number of orders
-        total_event_savings = savings_per_order * event.orders_count
-        total_savings += total_event_savings
-    
     # Check for pending price adjustments
     pending_adjustments_count = ChefMealOrder.objects.filter(
         meal_event__chef=chef,
@@ -3628,11 +3597,13 @@ def api_chef_dashboard_stats(request):
         price_paid__gt=F('meal_event__current_price')
     ).count()
     
-    # Get rating and reviews
-    review_count = ChefMealReview.objects.filter(chef=chef).count()
-    avg_rating = ChefMealReview.objects.filter(chef=chef).aggregate(
-        avg=Avg('rating')
-    )['avg'] or 0
+    # Get rating and reviews (lifetime, so read from source rather than the rollup)
+    review_totals = ChefMealReview.objects.filter(chef=chef).aggregate(
+        count=Count('id'),
+        avg=Avg('rating'),
+    )
+    review_count = review_totals['count']
+    avg_rating = review_totals['avg'] or 0
     
     return Response({
         'upcoming_events_count': upcoming_events_count,
@@ -3647,8 +3618,56 @@ def api_chef_dashboard_stats(request):
         'avg_rating': avg_rating
     })
 
+# The first sync of an account looks back this far
+PAYMENT_SYNC_LOOKBACK = timedelta(days=30)
+# Later syncs re-read a little before the high-water mark, so an intent whose
+# order row was written just after the previous sync still gets logged
+PAYMENT_SYNC_OVERLAP = timedelta(minutes=10)
+
+
+def _reconcile_payment_page(chef, payments):
+    """Bulk-create PaymentLog rows for the chef meal payments on one page that aren't logged yet."""
+    payment_ids = [payment.id for payment in payments]
+    logged = set(PaymentLog.objects.filter(stripe_id__in=payment_ids).values_list('stripe_id', flat=True))
+    new_payments = [payment for payment in payments if payment.id not in logged]
+    if not new_payments:
+        return 0
+
+    orders = {
+        order.stripe_payment_intent_id: order
+        for order in ChefMealOrder.objects.filter(
+            stripe_payment_intent_id__in=[payment.id for payment in new_payments]
+        ).only('id', 'customer_id', 'stripe_payment_intent_id')
+    }
+    # Intents without a chef meal order could be a meal plan order or other type
+    logs = [
+        PaymentLog(
+            chef_meal_order_id=orders[payment.id].id,
+            user_id=orders[payment.id].customer_id,
+            chef=chef,
+            action='charge',
+            amount=Decimal(payment.amount) / 100,
+            stripe_id=payment.id,
+            status=payment.status,
+            details=payment,
+        )
+        for payment in new_payments
+        if payment.id in orders
+    ]
+    PaymentLog.objects.bulk_create(logs)
+    return len(logs)
+
+
 def sync_recent_payments(chef):
-    """Sync recent payments from Stripe to local database"""
+    """
+    Sync new payments from Stripe to the local database.
+
+    Only PaymentIntents created since the account's high-water mark are
+    fetched (the last 30 days on the first sync). Each page is reconciled
+    with one query for existing logs and one for orders. The mark moves only
+    after every page was read, so an interrupted sync starts over from the
+    previous mark. Returns the number of payments logged.
+    """
     try:
         # Get this chef's Stripe account
         stripe_account = StripeConnectAccount.objects.get(chef=chef)
@@ -3656,92 +3675,67 @@ def sync_recent_payments(chef):
         # Set the API key for this request
         stripe.api_key = settings.STRIPE_SECRET_KEY
         
-        # Get recent payments from Stripe (last 30 days)
-        thirty_days_ago = int((timezone.now() - timedelta(days=30)).timestamp())
+        synced_through = stripe_account.payments_synced_through
+        if synced_through:
+            since = synced_through - PAYMENT_SYNC_OVERLAP
+        else:
+            since = timezone.now() - PAYMENT_SYNC_LOOKBACK
         
-        has_more = True
         starting_after = None
-        total_synced = 0
+        newest = None
+        total_seen = 0
+        total_logged = 0
         
-        while has_more:
+        while True:
             try:
-                # Get payments with pagination
                 payment_list = stripe.PaymentIntent.list(
-                    created={'gte': thirty_days_ago},
+                    created={'gte': int(since.timestamp())},
                     limit=100,
                     starting_after=starting_after,
                     stripe_account=stripe_account.stripe_account_id
                 )
-                
-                
-                # Process each payment
-                for payment in payment_list.data:
-                    try:
-                        # Check if we already have this payment logged
-                        if not PaymentLog.objects.filter(stripe_id=payment.id).exists():
-                            # Find associated order
-                            try:
-                                # For direct chef meal orders
-                                order = ChefMealOrder.objects.get(payment_intent_id=payment.id)
-                                # Log the payment
-                                PaymentLog.objects.create(
-                                    chef_meal_order=order,
-                                    user=order.customer,
-                                    chef=chef,
-                                    action='charge',
-                                    amount=payment.amount / 100,
-                                    stripe_id=payment.id,
-                                    status=payment.status,
-                                    details=payment
-                                )
-                                
-                                # Update order status if needed
-                                if payment.status == 'succeeded' and not order.is_paid:
-                                    order.is_paid = True
-                                    order.save()
-                                    
-                            except ChefMealOrder.DoesNotExist:
-                                # Could be a meal plan order or other type
-                                pass
-                            except Exception as e:
-                                logger.error(f"Error processing payment {payment.id}: {str(e)}", exc_info=True)
-                    
-                    except stripe.error.StripeError as e:
-                        logger.error(f"Stripe error processing payment: {str(e)}", exc_info=True)
-                    except Exception as e:
-                        logger.error(f"Error processing payment: {str(e)}", exc_info=True)
-                
-                total_synced += len(payment_list.data)
-                
-                # Check if there are more payments to fetch
-                has_more = payment_list.has_more
-                if has_more:
-                    # Get the ID of the last payment for pagination
-                    starting_after = payment_list.data[-1].id
-                else:
-                    break
-                    
             except stripe.error.StripeError as e:
+                # Keep the old mark; the next sync re-reads from there
                 logger.error(f"Stripe API error: {str(e)}", exc_info=True)
+                return total_logged
+            
+            if not payment_list.data:
                 break
-                
-        logger.info(f"Successfully synced {total_synced} payments total")
+            total_logged += _reconcile_payment_page(chef, payment_list.data)
+            total_seen += len(payment_list.data)
+            for payment in payment_list.data:
+                if newest is None or payment.created > newest.created:
+                    newest = payment
+            
+            if not payment_list.has_more:
+                break
+            # Get the ID of the last payment for pagination
+            starting_after = payment_list.data[-1].id
+        
+        if newest is not None:
+            newest_at = datetime.fromtimestamp(newest.created, tz=py_tz.utc)
+            if synced_through is None or newest_at > synced_through:
+                StripeConnectAccount.objects.filter(pk=stripe_account.pk).update(
+                    payments_synced_through=newest_at,
+                    last_synced_payment_id=newest.id,
+                )
+        
+        logger.info(f"Synced {total_seen} payments for chef {chef.id} ({total_logged} newly logged)")
+        return total_logged
                     
     except StripeConnectAccount.DoesNotExist:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"No Stripe account found for chef {chef.id}", "source":"sync_recent_payments", "traceback": traceback.format_exc()})
+        report_error(f"No Stripe account found for chef {chef.id}", "sync_recent_payments")
         logger.warning(f"No Stripe account found for chef {chef.id}")
     except stripe.error.StripeError as e:
         logger.error(f"Stripe error: {str(e)}", exc_info=True)
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Stripe error: {str(e)}", "source":"sync_recent_payments", "traceback": traceback.format_exc()})
+        report_error(f"Stripe error: {str(e)}", "sync_recent_payments")
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Error syncing payments: {str(e)}", "source":"sync_recent_payments", "traceback": traceback.format_exc()})
+        report_error(f"Error syncing payments: {str(e)}", "sync_recent_payments")
         logger.error(f"Error syncing payments: {str(e)}", exc_info=True)
+    return 0
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -3827,8 +3821,7 @@ def payment_success(request):
                         logger.info(f"Chef meal order {chef_order.id} was already confirmed, skipping processing")
             except ChefMealOrder.DoesNotExist:
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                requests.post(n8n_traceback_url, json={"error": f"Order {order_id} not found or doesn't belong to user {request.user.id}", "source":"payment_success", "traceback": traceback.format_exc()})
+                report_error(f"Order {order_id} not found or doesn't belong to user {request.user.id}", "payment_success")
                 return Response(
                     {"success": False, "message": "Order not found"}, 
                     status=404
@@ -3923,8 +3916,7 @@ def payment_success(request):
     except stripe.error.StripeError as e:
         logger.error(f"Stripe error in payment success redirect: {str(e)}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Stripe error in payment success redirect: {str(e)}", "source":"payment_success", "traceback": traceback.format_exc()})
+        report_error(f"Stripe error in payment success redirect: {str(e)}", "payment_success")
         return Response(
             {"success": False, "message": f"Payment processing error: {str(e)}"}, 
             status=400
@@ -3932,8 +3924,7 @@ def payment_success(request):
     except Exception as e:
         logger.error(f"Unexpected error in payment success redirect: {str(e)}", exc_info=True)
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Unexpected error in payment success redirect: {str(e)}", "source":"payment_success", "traceback": traceback.format_exc()})
+        report_error(f"Unexpected error in payment success redirect: {str(e)}", "payment_success")
         return Response(
             {"success": False, "message": "An unexpected error occurred"}, 
             status=500
@@ -4059,8 +4050,7 @@ def api_debug_order_info(request, order_id):
     except Exception as e:
         logger.error(f"Error in debug endpoint: {str(e)}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Error in debug endpoint: {str(e)}", "source":"api_debug_order_info", "traceback": traceback.format_exc()})
+        report_error(f"Error in debug endpoint: {str(e)}", "api_debug_order_info")
         return Response({"error": str(e)}, status=500)
 
 @api_view(['POST'])
@@ -4134,8 +4124,7 @@ def api_create_chef_meal_order(request, event_id):
         except Exception as e:
             # Log the error and return a generic message
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": f"Error creating chef meal order: {str(e)}", "source":"api_create_chef_meal_order", "traceback": traceback.format_exc()})
+            report_error(f"Error creating chef meal order: {str(e)}", "api_create_chef_meal_order")
             return Response(
                 {"error": "Failed to create order"},
                 status=500
@@ -4143,8 +4132,7 @@ def api_create_chef_meal_order(request, event_id):
     
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Unexpected error in api_create_chef_meal_order: {str(e)}", "source":"api_create_chef_meal_order", "traceback": traceback.format_exc()})
+        report_error(f"Unexpected error in api_create_chef_meal_order: {str(e)}", "api_create_chef_meal_order")
         return Response(
             {"error": "An unexpected error occurred"},
             status=500
@@ -4223,8 +4211,7 @@ def api_adjust_chef_meal_quantity(request, order_id):
             )
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": f"Error adjusting chef meal order quantity: {str(e)}", "source":"api_adjust_chef_meal_quantity", "traceback": traceback.format_exc()})
+            report_error(f"Error adjusting chef meal order quantity: {str(e)}", "api_adjust_chef_meal_quantity")
             return Response(
                 {"error": "Failed to adjust order quantity"},
                 status=500
@@ -4232,8 +4219,7 @@ def api_adjust_chef_meal_quantity(request, order_id):
     
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Unexpected error in api_adjust_chef_meal_quantity: {str(e)}", "source":"api_adjust_chef_meal_quantity", "traceback": traceback.format_exc()})
+        report_error(f"Unexpected error in api_adjust_chef_meal_quantity: {str(e)}", "api_adjust_chef_meal_quantity")
         return Response(
             {"error": "An unexpected error occurred"},
             status=500
@@ -4293,8 +4279,7 @@ def api_cancel_chef_meal_order(request, order_id):
             
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": f"Error cancelling chef meal order: {str(e)}", "source":"api_cancel_chef_meal_order", "traceback": traceback.format_exc()})
+            report_error(f"Error cancelling chef meal order: {str(e)}", "api_cancel_chef_meal_order")
             return Response(
                 {"error": "Failed to cancel order"},
                 status=500
@@ -4302,8 +4287,7 @@ def api_cancel_chef_meal_order(request, order_id):
     
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Unexpected error in api_cancel_chef_meal_order: {str(e)}", "source":"api_cancel_chef_meal_order", "traceback": traceback.format_exc()})
+        report_error(f"Unexpected error in api_cancel_chef_meal_order: {str(e)}", "api_cancel_chef_meal_order")
         return Response(
             {"error": "An unexpected error occurred"},
             status=500
@@ -11,9 +11,6 @@ This module implements the tools available to authenticated customer users:
 """
 
 import logging
-import requests
-import traceback
-import os
 from typing import Any, Dict, List
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -25,11 +22,11 @@ from meals.models import MealPlan, Order
 from meals.models import DietaryPreference, CustomDietaryPreference
 from meals.serializers import OrderSerializer
 from customer_dashboard.models import UserSummary
+from utils.error_reporting import report_error
 # Goal tracking removed - health tracking feature deprecated
 
 logger = logging.getLogger(__name__)
 
-n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
 
 # -----------------------------------------------------------------------------
 # Tool metadata definitions (as required by the OpenAI Responses API)
@@ -294,8 +291,7 @@ def adjust_week_shift(user_id: int, week_shift_increment: int) -> Dict[str, Any]
             "current_time": f"Understand the current time is {timezone.now().strftime('%Y-%m-%d %H:%M:%S')}"
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"adjust_week_shift", "traceback": traceback.format_exc()})
+        report_error(e, "adjust_week_shift")
         return {"status": "error", "message": str(e)}
 
 
@@ -317,8 +313,7 @@ def reset_current_week(user_id: int) -> Dict[str, Any]:
             "current_time": timezone.now().strftime("%Y-%m-%d %H:%M:%S")
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"reset_current_week", "traceback": traceback.format_exc()})
+        report_error(e, "reset_current_week")
         return {"status": "error", "message": str(e)}
 
 
@@ -374,8 +369,7 @@ def access_past_orders(user_id: int) -> Dict[str, Any]:
             "current_time": timezone.now().strftime("%Y-%m-%d %H:%M:%S")
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"access_past_orders", "traceback": traceback.format_exc()})
+        report_error(e, "access_past_orders")
         return {"status": "error", "message": str(e)}
 
 
@@ -491,8 +485,7 @@ def update_user_settings(
             "current_time": timezone.now().strftime("%Y-%m-%d %H:%M:%S")
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"update_user_settings", "traceback": traceback.format_exc()})
+        report_error(e, "update_user_settings")
         return {"status": "error", "message": f"Failed to update user settings"}
 
 
@@ -513,8 +506,7 @@ def get_user_settings(user_id: int) -> Dict[str, Any]:
             "current_time": timezone.now().strftime("%Y-%m-%d %H:%M:%S")
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_user_settings", "traceback": traceback.format_exc()})
+        report_error(e, "get_user_settings")
         return {"status": "error", "message": f"Failed to get user settings"}
 
 
@@ -7,9 +7,6 @@ connecting them to the existing dietary preference functionality in the applicat
 
 import json
 import logging
-import requests
-import traceback
-import os
 from typing import Dict, List, Optional, Any, Union
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
@@ -19,17 +16,16 @@ from meals.models import DietaryPreference, Meal, CustomDietaryPreference
 from meals.serializers import DietaryPreferenceSerializer, MealSerializer
 from meals.pydantic_models import MealCompatibility
 from django.conf import settings
-import traceback
 from shared.utils import (
     check_allergy_alert as _util_check_allergy_alert,
     get_groq_client
 )
 import re
+from utils.error_reporting import report_error
 
 
 logger = logging.getLogger(__name__)
 
-n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
 # Tool definitions for the OpenAI Responses API
 DIETARY_PREFERENCE_TOOLS = [
     {
@@ -343,8 +339,7 @@ def manage_dietary_preferences(user_id: int, action: str, preference: str = None
             }
             
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"manage_dietary_preferences", "traceback": traceback.format_exc()})
+        report_error(e, "manage_dietary_preferences")
         return {
             "status": "error",
             "message": f"Failed to manage dietary preferences"
@@ -473,8 +468,7 @@ def check_meal_compatibility(user_id: int, meal_id: int) -> dict:
         return legacy_rule_based_check(user, meal)
 
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_meal_compatibility", "traceback": traceback.format_exc()})
+        report_error(e, "check_meal_compatibility")
         return { "status": "error", "message": f"Failed to check meal compatibility" }
 
 def suggest_alternatives(user_id: int, meal_id: int, meal_type: str = None, count: int = 3) -> Dict[str, Any]:
@@ -547,8 +541,7 @@ def suggest_alternatives(user_id: int, meal_id: int, meal_type: str = None, coun
         }
         
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"suggest_alternatives", "traceback": traceback.format_exc()})
+        report_error(e, "suggest_alternatives")
         return {
             "status": "error",
             "message": f"Failed to suggest alternatives"
@@ -622,8 +615,7 @@ def legacy_rule_based_check(user_id: int, meal_id: int) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"legacy_rule_based_check", "traceback": traceback.format_exc()})
+        report_error(e, "legacy_rule_based_check")
         return {"status": "error", "message": f"Failed to check meal compatibility"}
 
 
@@ -725,8 +717,7 @@ def check_allergy_alert(user_id: int, description: str = None) -> dict:
                 "message": check
             }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_allergy_alert", "traceback": traceback.format_exc()})
+        report_error(e, "check_allergy_alert")
         return {"status": "error", "message": f"Failed to check allergy alert"}
 
 def list_dietary_preferences() -> Dict[str, Any]:
@@ -761,8 +752,7 @@ def list_dietary_preferences() -> Dict[str, Any]:
         }
         
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"list_dietary_preferences", "traceback": traceback.format_exc()})
+        report_error(e, "list_dietary_preferences")
         return {
             "status": "error",
             "message": f"Failed to list dietary preferences" 
@@ -0,0 +1,232 @@
+"""
+Conversation state for guest (not logged in) assistant users.
+
+Guests have no ChatThread, so their latest response id and message history
+live here between requests. Two backends share one interface:
+
+- RedisGuestStateStore: shared by every worker, expires idle guests after
+  GUEST_STATE_TTL seconds and stores histories as compressed JSON.
+- InMemoryGuestStateStore: a bounded LRU for local development and tests.
+
+get_guest_state_store() picks Redis when it is reachable (or when
+GUEST_STATE_BACKEND = "redis") and falls back to memory otherwise.
+"""
+
+import base64
+import json
+import logging
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from utils.redis_client import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+GUEST_STATE_TTL = getattr(settings, "GUEST_STATE_TTL", 60 * 60 * 24)
+GUEST_STATE_MAX_ENTRIES = getattr(settings, "GUEST_STATE_MAX_ENTRIES", 1000)
+GUEST_STATE_MAX_MESSAGES = getattr(settings, "GUEST_STATE_MAX_MESSAGES", 60)
+
+REDIS_KEY_PREFIX = "guest_state:v1:"
+
+
+def compact_history(history: List[Dict[str, Any]], max_messages: int = GUEST_STATE_MAX_MESSAGES) -> List[Dict[str, Any]]:
+    """
+    Keep leading system messages plus the most recent turns.
+
+    The kept tail always starts at a user message so a function call is
+    never separated from the turn that produced it.
+    """
+    if len(history) <= max_messages:
+        return history
+
+    head = []
+    for item in history:
+        if item.get("role") != "system":
+            break
+        head.append(item)
+
+    tail = history[max(len(head), len(history) - (max_messages - len(head))):]
+    for start, item in enumerate(tail):
+        if item.get("role") == "user":
+            return head + tail[start:]
+    return head + tail
+
+
+class GuestStateStore(ABC):
+    """Interface shared by guest state backends."""
+
+    backend = "base"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "writes": 0, "deletes": 0, "evictions": 0, "truncated": 0}
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def _prepare(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        history = state.get("history") or []
+        compacted = compact_history(history)
+        if len(compacted) != len(history):
+            self._count("truncated")
+        return {"response_id": state.get("response_id"), "history": compacted}
+
+    @abstractmethod
+    def get(self, guest_id: str) -> Optional[Dict[str, Any]]:
+        """Stored state for the guest, or None."""
+
+    @abstractmethod
+    def set(self, guest_id: str, state: Dict[str, Any]) -> None:
+        """Store the guest's state, compacting its history."""
+
+    @abstractmethod
+    def delete(self, guest_id: str) -> None:
+        """Forget the guest."""
+
+    @abstractmethod
+    def size(self) -> int:
+        """Number of guests currently stored."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for this process plus the current number of stored guests."""
+        with self._lock:
+            counters = dict(self._counters)
+        try:
+            counters["size"] = self.size()
+        except Exception as e:
+            logger.warning(f"Unable to size guest state store: {e}")
+            counters["size"] = None
+        counters["backend"] = self.backend
+        return counters
+
+
+class InMemoryGuestStateStore(GuestStateStore):
+    """Process-local LRU with idle expiry."""
+
+    backend = "memory"
+
+    def __init__(self, max_entries: int = GUEST_STATE_MAX_ENTRIES, ttl: int = GUEST_STATE_TTL):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, guest_id):
+        with self._lock:
+            entry = self._entries.get(guest_id)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[guest_id]
+                self._counters["evictions"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(guest_id)
+            self._counters["hits"] += 1
+            return entry[1]
+
+    def set(self, guest_id, state):
+        state = self._prepare(state)
+        with self._lock:
+            self._entries[guest_id] = (time.monotonic() + self.ttl, state)
+            self._entries.move_to_end(guest_id)
+            self._counters["writes"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def delete(self, guest_id):
+        with self._lock:
+            if self._entries.pop(guest_id, None) is not None:
+                self._counters["deletes"] += 1
+
+    def size(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class RedisGuestStateStore(GuestStateStore):
+    """Shared store; Redis expires idle guests, so evictions are not counted here."""
+
+    backend = "redis"
+
+    def __init__(self, connection, ttl: int = GUEST_STATE_TTL):
+        super().__init__()
+        self._redis = connection
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(guest_id: str) -> str:
+        return f"{REDIS_KEY_PREFIX}{guest_id}"
+
+    @staticmethod
+    def _encode(state: Dict[str, Any]) -> str:
+        raw = json.dumps(state, separators=(",", ":"), default=str).encode()
+        return base64.b85encode(zlib.compress(raw)).decode("ascii")
+
+    @staticmethod
+    def _decode(payload: str) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(base64.b85decode(payload)))
+
+    def get(self, guest_id):
+        try:
+            payload = self._redis.get(self._key(guest_id))
+            state = self._decode(payload) if payload is not None else None
+        except Exception as e:
+            logger.error(f"Failed to load guest state for {guest_id}: {e}")
+            state = None
+        self._count("hits" if state is not None else "misses")
+        return state
+
+    def set(self, guest_id, state):
+        try:
+            self._redis.setex(self._key(guest_id), self.ttl, self._encode(self._prepare(state)))
+        except Exception as e:
+            logger.error(f"Failed to store guest state for {guest_id}: {e}")
+            return
+        self._count("writes")
+
+    def delete(self, guest_id):
+        try:
+            deleted = self._redis.delete(self._key(guest_id))
+        except Exception as e:
+            logger.error(f"Failed to delete guest state for {guest_id}: {e}")
+            return
+        if deleted:
+            self._count("deletes")
+
+    def size(self):
+        return sum(1 for _ in self._redis.scan_iter(match=f"{REDIS_KEY_PREFIX}*", count=500))
+
+
+_store: Optional[GuestStateStore] = None
+_store_lock = threading.Lock()
+
+
+def _build_store() -> GuestStateStore:
+    backend = getattr(settings, "GUEST_STATE_BACKEND", None)
+    if backend is None:
+        backend = "memory" if getattr(settings, "TEST_MODE", False) else "redis"
+    if backend == "redis":
+        connection = get_redis_connection()
+        if connection is not None:
+            return RedisGuestStateStore(connection)
+        logger.warning("Redis unavailable for guest state; falling back to in-memory store")
+    return InMemoryGuestStateStore()
+
+
+def get_guest_state_store() -> GuestStateStore:
+    """Return the process-wide guest state store, creating it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = _build_store()
+    return _store
@@ -20,6 +20,7 @@ except Exception:
     Groq = None
 from django.conf import settings
 import traceback
+from utils.error_reporting import report_payload
 # Note: No OpenAI imports needed - using Groq only
 
 LEGACY_MEAL_PLAN = True
@@ -534,7 +535,7 @@ def generate_instacart_link(user_id: int, meal_plan_id: int, postal_code: str =
             'source': 'instacart_service',
             'traceback': f"{traceback.format_exc()}"
         }
-        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+        report_payload(n8n_traceback)
         return {
             "status": "error",
             "message": f"Failed to generate Instacart link: {str(e)}"
@@ -4,11 +4,9 @@ This module provides functions to fetch macro information and find YouTube cooki
 """
 import json
 import logging
-import traceback
 from typing import List, Dict, Any
 from shared.utils import get_groq_client
-import os
-import requests
+from utils.error_reporting import report_error
 logger = logging.getLogger(__name__)
 
 def get_macro_info(meal_name: str, meal_description: str, ingredients: List[str]) -> Dict[str, Any]:
@@ -80,8 +78,7 @@ def get_macro_info(meal_name: str, meal_description: str, ingredients: List[str]
     except Exception as e:
         logger.error(f"Error getting macro information for meal '{meal_name}': {e}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_macro_info", "traceback": traceback.format_exc()})
+        report_error(e, "get_macro_info")
         return {
             'calories': 0,
             'protein': 0,
@@ -162,8 +159,7 @@ def find_youtube_videos(meal_name: str, meal_description: str) -> Dict[str, Any]
     except Exception as e:
         logger.error(f"Error finding YouTube videos for meal '{meal_name}': {e}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"find_youtube_videos", "traceback": traceback.format_exc()})
+        report_error(e, "find_youtube_videos")
         return {
             'videos': []
         }
@@ -25,7 +25,9 @@ from django_countries.fields import Country
 import decimal as _decimal
 import datetime as _dt
 from pydantic import BaseModel, Field, ConfigDict, ValidationError
-from .tool_registration import get_all_tools, get_all_guest_tools, handle_tool_call
+from .tool_registration import (
+    AUDIENCE_AUTH, AUDIENCE_GUEST, get_tool_registry, handle_tool_call, summarize_tools_for_prompt,
+)
 from customer_dashboard.models import ChatThread, UserMessage, WeeklyAnnouncement, UserDailySummary, UserChatSummary, AssistantEmailToken
 from custom_auth.models import CustomUser
 from shared.utils import generate_user_context, _get_language_name
@@ -36,9 +38,10 @@ from local_chefs.models import ChefPostalCode
 from django.db.models import F
 from meals.feature_flags import is_meal_plan_template, meal_plan_notifications_enabled
 from meals.models import ChefMealEvent
+from meals import prompt_context
+from meals.guest_state import get_guest_state_store
 from dotenv import load_dotenv
 import os
-import requests # Added for n8n webhook call
 import traceback
 from django.template.loader import render_to_string # Added for rendering email templates
 from django.db import close_old_connections, connection
@@ -48,6 +51,7 @@ from django.db.utils import OperationalError, InterfaceError, DatabaseError
 from utils.translate_html import translate_paragraphs
 import unicodedata
 from enum import Enum
+from utils.error_reporting import report_error, report_payload
 
 
 load_dotenv()
@@ -196,6 +200,19 @@ class DjangoEmailBody(BaseModel):
     email_subject_suggestion: Optional[str] = Field(None, description="Suggested email subject line")
     estimated_read_time: Optional[str] = Field(None, description="Estimated reading time")
 
+# Cleaned structured-output schemas per Pydantic model; they only change with code.
+_OPENAI_SCHEMAS: Dict[type, dict] = {}
+
+
+def _openai_schema(model_cls: type, clean) -> dict:
+    """Return ``clean(model_cls.model_json_schema())``, computed once per model."""
+    schema = _OPENAI_SCHEMAS.get(model_cls)
+    if schema is None:
+        schema = clean(model_cls.model_json_schema())
+        _OPENAI_SCHEMAS[model_cls] = schema
+    return schema
+
+
 class DjangoTemplateEmailFormatter:
     """Django template-compatible enhanced email formatter"""
     
@@ -353,7 +370,7 @@ class DjangoTemplateEmailFormatter:
         using a small structured JSON schema. Falls back to raw text on error.
         """
         try:
-            schema = self._clean_schema_for_openai(ChatRender.model_json_schema())
+            schema = _openai_schema(ChatRender, self._clean_schema_for_openai)
             prompt = (
                 "Return ONLY JSON with a `markdown` field that contains valid GitHub‑Flavored Markdown (GFM). "
                 "Rules: Use headings, lists, and pipe tables when appropriate. "
@@ -483,7 +500,7 @@ class DjangoTemplateEmailFormatter:
         
         try:
             # Clean the schema to remove OpenAI incompatible constructs
-            schema = self._clean_schema_for_openai(DjangoEmailBody.model_json_schema())
+            schema = _openai_schema(DjangoEmailBody, self._clean_schema_for_openai)
             
             if getattr(self, 'groq', None):
 
@@ -869,17 +886,7 @@ class DjangoTemplateEmailFormatter:
     
     def _send_error_to_n8n(self, error: Exception, source: str):
         """Send error information to n8n webhook for tracking"""
-        try:
-            n8n_traceback_url = os.getenv('N8N_TRACEBACK_URL')
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(error),
-                    "source": source,
-                    "traceback": traceback.format_exc()
-                })
-        except Exception:
-            # Silently fail if we can't send to n8n
-            pass
+        report_error(error, source)
 
     def _protect_urls(self, text: str) -> tuple[str, dict]:
         """Protect URLs with placeholders to prevent corruption"""
@@ -895,8 +902,7 @@ class DjangoTemplateEmailFormatter:
         
         return protected_text, url_placeholders
 
-# Global dictionary to maintain guest state across request instances
-GLOBAL_GUEST_STATE: Dict[str, Dict[str, Any]] = {}
+# Guest conversation state lives in meals.guest_state (shared across workers)
 
 # Default prompt templates in case they're not available in environment variables
 DEFAULT_GUEST_PROMPT = """
@@ -1198,8 +1204,7 @@ class MealPlanningAssistant:
         else:
             self.user_id = generate_guest_id()
             
-        # Don't cache tools - load them fresh each time to pick up changes
-        # self.auth_tools and self.guest_tools are loaded in _get_tools_for_user()
+        # Tools come from the frozen registry in tool_registration (built once per process)
         
         # Initialize Django Template Email Formatter (prefers Groq when configured)
         self._django_email_formatter = DjangoTemplateEmailFormatter(self.client, groq_client=self.groq)
@@ -1268,21 +1273,17 @@ class MealPlanningAssistant:
         history so the next HTTP request can rebuild context instead of
         starting the onboarding over.
         """
-        GLOBAL_GUEST_STATE[self.user_id] = {
+        get_guest_state_store().set(self.user_id, {
             "response_id": response_id,
             "history": history,
-        }
+        })
 
     def _get_tools_for_user(self, is_guest: bool) -> List[Dict[str, Any]]:
-        """Load tools fresh each time to pick up any code changes."""
-        if is_guest:
-            tools = get_all_guest_tools()
-        else:
-            tools = [t for t in get_all_tools() if not t["name"].startswith("guest")]
-        
+        """Tools from the per-process registry (see tool_registration.reload_tool_registry for dev reloads)."""
+        return get_tool_registry().tools_for(AUDIENCE_GUEST if is_guest else AUDIENCE_AUTH)
 
-        
-        return tools
+    def _tools_summary_for_prompt(self, is_guest: bool) -> str:
+        return get_tool_registry().summary_for(AUDIENCE_GUEST if is_guest else AUDIENCE_AUTH)
 
     # ─────────────────────────────────────────  public entry points
     def send_message(
@@ -1309,9 +1310,9 @@ class MealPlanningAssistant:
         if not model:
             model = MODEL_GUEST_FALLBACK if is_guest else MODEL_AUTH_FALLBACK
 
-        # For guests, use in-memory history if available
+        # For guests, use stored guest history if available
         if is_guest:
-            guest_data = GLOBAL_GUEST_STATE.get(self.user_id, {})
+            guest_data = get_guest_state_store().get(self.user_id) or {}
             if guest_data and "history" in guest_data:
                 # Get existing history and append new message
                 history = guest_data["history"].copy()
@@ -1410,7 +1411,7 @@ class MealPlanningAssistant:
                             'source': 'tool_call',
                             'traceback': traceback.format_exc()
                         }
-                        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                        report_payload(n8n_traceback)
                         result = {"status": "error", "message": str(e)}
                     
                     # Add function result to history
@@ -1431,7 +1432,7 @@ class MealPlanningAssistant:
                     'source': 'send_message_loop',
                     'traceback': traceback.format_exc()
                 }
-                requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                report_payload(n8n_traceback)
                 return {"status": "error", "message": f"An error occurred: {str(e)}"}
         
         # Get the final response text
@@ -1489,9 +1490,9 @@ class MealPlanningAssistant:
         if not model:
             model = MODEL_GUEST_FALLBACK if is_guest else MODEL_AUTH_FALLBACK
 
-        # For guests, use in-memory history if available
+        # For guests, use stored guest history if available
         if is_guest:
-            guest_data = GLOBAL_GUEST_STATE.get(self.user_id, {})
+            guest_data = get_guest_state_store().get(self.user_id) or {}
             if guest_data and "history" in guest_data:
                 # Get existing history and append new message
                 history = guest_data["history"].copy()
@@ -1816,7 +1817,7 @@ class MealPlanningAssistant:
                         'source': 'tool_call',
                         'traceback': traceback.format_exc()
                     }
-                    requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                    report_payload(n8n_traceback)
                     result = {"status": "error", "message": str(e)}
 
                 # Emit tool_result
@@ -1898,62 +1899,76 @@ class MealPlanningAssistant:
     # ────────────────────────────────────────────────────────────────────
     def build_prompt(self, is_guest: bool) -> str:
         """
-        Build the system prompt for the assistant based on whether the user is a guest or authenticated
+        Build the system prompt for the assistant based on whether the user is a guest or authenticated.
+
+        Authenticated prompts are assembled from versioned fragments in
+        meals.prompt_context, so steady-state turns read only the cache and
+        produce byte-identical text until one of the inputs changes.
         """
-        all_tools = self._get_tools_for_user(is_guest)
+        tools_summary = self._tools_summary_for_prompt(is_guest)
         if is_guest:
-            guest_tools = self._get_tools_for_user(is_guest)
             return GUEST_PROMPT_TEMPLATE.format(
-                guest_tools=self._summarize_tools_for_prompt(guest_tools),
-                all_tools=self._summarize_tools_for_prompt(all_tools)
+                guest_tools=tools_summary,
+                all_tools=tools_summary
             )
         else:
-            user = None
+            profile = None
             try:
-                user = CustomUser.objects.get(id=self.user_id)
-                user_ctx = generate_user_context(user)
-                username = user.username
-                admin_blurb = self._current_admin_blurb(user)
+                profile = prompt_context.fragment(
+                    "profile", [prompt_context.user_scope(self.user_id)], self._build_prompt_profile
+                )
+                admin_blurb = self._admin_blurb_for_country(profile["country_code"])
                 admin_section = ""
                 if admin_blurb:
                     admin_section = f"\nWEEKLY UPDATE\n{admin_blurb}\n\n"
                     admin_section += "Make sure to subtly acknowledge this announcement information early in the conversation. Only mention once per entire conversation and only if it's natural in the context. Do not prefix with 'Weekly Update'.\n\n"
                 
-                # Get the user's chat summary if available
-                user_chat_summary = self._get_user_chat_summary(user)
-                
                 # Generate information about local chefs and meal events
-                local_chef_and_meal_events = self._local_chef_and_meal_events(user)
-                
-                # Get user's preferred language for instructions
-                user_preferred_language = _get_language_name(getattr(user, 'preferred_language', 'en'))
-                language_instruction = ""
-                if user_preferred_language and user_preferred_language.lower() != 'en':
-                    language_name = _get_language_name(user_preferred_language)
-                    language_instruction = f"\n#LANGUAGE PREFERENCE\nThis user's preferred language is {language_name}. Please respond in {language_name} unless the user specifically requests English or another language.\n\n"
+                local_chef_and_meal_events = self._cached_local_chef_and_meal_events(profile["postal_code"])
                 
                 # Ensure AUTH_PROMPT_TEMPLATE has placeholders for all these values
                 # Example: {username}, {user_ctx}, {admin_section}, {all_tools}, {user_chat_summary}, {local_chef_and_meal_events}
                 prompt = AUTH_PROMPT_TEMPLATE.format(
-                    username=username,
-                    user_ctx=user_ctx,
+                    username=profile["username"],
+                    user_ctx=profile["user_ctx"],
                     admin_section=admin_section,
-                    all_tools=self._summarize_tools_for_prompt(self._get_tools_for_user(is_guest)),
-                    user_chat_summary=user_chat_summary,
+                    all_tools=tools_summary,
+                    user_chat_summary=profile["user_chat_summary"],
                     local_chef_and_meal_events=local_chef_and_meal_events
                 )
                 
                 # Add language instruction if needed
-                return prompt + language_instruction
+                return prompt + profile["language_instruction"]
             except CustomUser.DoesNotExist:
                 logger.warning(f"User with ID {self.user_id} not found while building prompt. Using fallback.")
                 return f"You are MJ, sautai's friendly meal-planning consultant. You are currently experiencing issues with your setup and functionality. You cannot help with any of the user's requests at the moment but please let them know the sautai team has been notified and will look into it as soon as possible."
             except Exception as e:
                 logger.error(f"Error generating prompt for user {self.user_id}: {str(e)}")
                 # Return a simple fallback prompt
-                username_str = user.username if user else f"user ID {self.user_id}"
+                username_str = profile["username"] if profile else f"user ID {self.user_id}"
                 return f"You are MJ, sautai's friendly meal-planning consultant. You are currently chatting with {username_str} and experiencing issues with your setup and functionality. You cannot help with any of the user's requests at the moment but please let them know the sautai team has been notified and will look into it as soon as possible."
 
+    def _build_prompt_profile(self) -> Dict[str, str]:
+        """Load the per-user prompt fragments from the database (cache miss path)."""
+        user = CustomUser.objects.select_related('address').get(id=self.user_id)
+        address = user.address if hasattr(user, 'address') else None
+
+        # Get user's preferred language for instructions
+        user_preferred_language = _get_language_name(getattr(user, 'preferred_language', 'en'))
+        language_instruction = ""
+        if user_preferred_language and user_preferred_language.lower() != 'en':
+            language_name = _get_language_name(user_preferred_language)
+            language_instruction = f"\n#LANGUAGE PREFERENCE\nThis user's preferred language is {language_name}. Please respond in {language_name} unless the user specifically requests English or another language.\n\n"
+
+        return {
+            "username": user.username,
+            "user_ctx": generate_user_context(user),
+            "user_chat_summary": self._get_user_chat_summary(user),
+            "language_instruction": language_instruction,
+            "postal_code": (address.normalized_postalcode if address else None) or "",
+            "country_code": self._country_code(user),
+        }
+
     def _instructions(self, is_guest: bool) -> str:
         """
         Return the system‑prompt string that steers GPT for this turn.
@@ -1963,31 +1978,8 @@ class MealPlanningAssistant:
         return self.build_prompt(is_guest)
 
     def _summarize_tools_for_prompt(self, tools: List[Dict[str, Any]]) -> str:
-        """Render a concise, friendly list of available tools for the prompt.
-
-        Example output:
-          • create_meal_plan — Create a weekly meal plan for a user
-          • modify_meal_plan — Modify a specific slot in a plan
-        """
-        try:
-            lines: List[str] = []
-            for t in tools or []:
-                name = t.get("name", "unknown_tool")
-                desc = (t.get("description") or "").strip()
-                if desc:
-                    # keep it to one line, ~90 chars max
-                    if len(desc) > 90:
-                        desc = desc[:87].rstrip() + "…"
-                    lines.append(f"  • {name} — {desc}")
-                else:
-                    lines.append(f"  • {name}")
-            return "\n".join(lines) if lines else "  • (no tools registered)"
-        except Exception:
-            # Never break prompt building on summarization
-            try:
-                return "\n".join([f"  • {t.get('name','unknown_tool')}" for t in tools or []])
-            except Exception:
-                return "  • (tools unavailable)"
+        """Render a concise, friendly list of available tools for the prompt."""
+        return summarize_tools_for_prompt(tools)
 
     # ────────────────────────────────────────────────────────────────────
     #  Conversation‑reset helper
@@ -1996,13 +1988,12 @@ class MealPlanningAssistant:
         """
         Clears conversation state so the next message starts a brand‑new thread.
 
-        * Guests → removes their entry from the in‑memory dict.
+        * Guests → removes their entry from the guest state store.
         * Auth users → marks all active ChatThread rows inactive in a single
           bulk‑update (cheap DB call).
         """
         if self._is_guest(self.user_id):
-            # Safely drop the key; dict.pop(k, None) returns None if missing.
-            GLOBAL_GUEST_STATE.pop(self.user_id, None)
+            get_guest_state_store().delete(self.user_id)
             return {"status": "success", "message": "Guest context cleared."}
 
         # Authenticated user: bulk‑update threads instead of iterating row‑by‑row.
@@ -2229,46 +2220,56 @@ class MealPlanningAssistant:
                 'source': 'fix_function_args',
                 'traceback': f"Guest ID: {self.user_id} | {traceback.format_exc()}"
             }
-            requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+            report_payload(n8n_traceback)
             return args_str
 
+    @staticmethod
+    def _country_code(user) -> str:
+        try:
+            return user.address.country.code if hasattr(user, 'address') and user.address and user.address.country else ""
+        except AttributeError:
+            return ""
+
     def _current_admin_blurb(self, user) -> Optional[str]:
         """
         Return the announcement for this user's locale, if any.
         Includes both global and region-specific announcements.
         """
+        return self._admin_blurb_for_country(self._country_code(user))
+
+    def _admin_blurb_for_country(self, country_code: str) -> Optional[str]:
         today = timezone.localdate()
         iso_week = today.isocalendar()  # (year, week, weekday)
         week_start = date.fromisocalendar(iso_week[0], iso_week[1], 1)  # Monday
-        
-        # Figure out user's country (via Address model)
-        try:
-            country_code = user.address.country.code if hasattr(user, 'address') and user.address and user.address.country else ""
-        except AttributeError:
-            country_code = ""
-        
-        # Check cache first
-        cache_key = f"blurb:{week_start}:{country_code or 'GLOBAL'}"
-        cached = get(cache_key)
-        if cached is not None:  # Empty string means "none this week"
-            return cached or None
-        
+
+        # Empty string means "none this week"
+        blurb = prompt_context.fragment(
+            f"blurb:{week_start}:{country_code or 'GLOBAL'}",
+            [prompt_context.GLOBAL_SCOPE],
+            lambda: self._load_admin_blurb(week_start, country_code),
+            timeout=60 * 60,
+        )
+        return blurb or None
+
+    @staticmethod
+    def _load_admin_blurb(week_start: date, country_code: str) -> str:
         # Get global announcement
         global_qs = WeeklyAnnouncement.objects.filter(
             week_start=week_start,
             country__isnull=True
         )
-        global_blurb = global_qs.first().content.strip() if global_qs.exists() else ""
+        global_announcement = global_qs.first()
+        global_blurb = global_announcement.content.strip() if global_announcement else ""
         
         # Get country-specific announcement if applicable
         regional_blurb = ""
         if country_code:
-            regional_qs = WeeklyAnnouncement.objects.filter(
+            regional_announcement = WeeklyAnnouncement.objects.filter(
                 week_start=week_start,
                 country=country_code
-            )
-            if regional_qs.exists():
-                regional_blurb = regional_qs.first().content.strip()
+            ).first()
+            if regional_announcement:
+                regional_blurb = regional_announcement.content.strip()
         
         # Combine the announcements
         combined_blurb = ""
@@ -2282,9 +2283,7 @@ class MealPlanningAssistant:
             # Only global announcement exists
             combined_blurb = global_blurb
         
-        # Cache for an hour
-        set(cache_key, combined_blurb, 60 * 60)
-        return combined_blurb or None
+        return combined_blurb
 
     def _validate_and_clean_history(self, history: list) -> list:
         """
@@ -2467,8 +2466,7 @@ class MealPlanningAssistant:
                        
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"stream_user_summary", "traceback": traceback.format_exc()})
+            report_error(e, "stream_user_summary")
             yield {"type": "error", "message": f"An error occurred: {str(e)}"}
             return
 
@@ -2477,13 +2475,23 @@ class MealPlanningAssistant:
         Get information about local chefs and their upcoming meal events for a user.
         Returns a formatted string suitable for inclusion in the prompt.
         """
-        try:
-            # Get user's postal code from their address
-            if not hasattr(user, 'address') or not user.address or not user.address.normalized_postalcode:
-                return "No local chef information available (address not set)."
-
-            postal_code = user.address.normalized_postalcode
+        # Get user's postal code from their address
+        if not hasattr(user, 'address') or not user.address or not user.address.normalized_postalcode:
+            return "No local chef information available (address not set)."
+        return self._cached_local_chef_and_meal_events(user.address.normalized_postalcode)
+
+    def _cached_local_chef_and_meal_events(self, postal_code: str) -> str:
+        if not postal_code:
+            return "No local chef information available (address not set)."
+        return prompt_context.fragment(
+            "local_events",
+            [prompt_context.area_scope(postal_code)],
+            lambda: self._load_local_chef_and_meal_events(postal_code),
+            timeout=prompt_context.EVENTS_TTL,
+        )
 
+    def _load_local_chef_and_meal_events(self, postal_code: str) -> str:
+        try:
             # Find chefs that serve this postal code
             chef_ids = ChefPostalCode.objects.filter(
                 postal_code__code=postal_code
@@ -2523,8 +2531,7 @@ class MealPlanningAssistant:
 
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"_local_chef_and_meal_events", "traceback": traceback.format_exc()})
+            report_error(e, "_local_chef_and_meal_events")
             return "Unable to retrieve local chef information at this time."
 
     def _get_user_chat_summary(self, user: CustomUser) -> str:
@@ -2543,8 +2550,7 @@ class MealPlanningAssistant:
             return ""
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"_get_user_chat_summary", "traceback": traceback.format_exc()})
+            report_error(e, "_get_user_chat_summary")
             return ""
 
     # ────────────────────────────────────────────────────────────────────
@@ -2687,8 +2693,7 @@ class MealPlanningAssistant:
                             )
                         except Exception as retry_error:
                             # n8n traceback
-                            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                            requests.post(n8n_traceback_url, json={"error": str(retry_error), "source":"generate_email_response", "traceback": traceback.format_exc()})
+                            report_error(retry_error, "generate_email_response")
                             raise retry_error
                     else:
                         # Re-raise if it's not a context length error
@@ -2707,9 +2712,7 @@ class MealPlanningAssistant:
                         final_output_text = self._extract(resp)
                     except Exception as extract_error:
                         logger.error(f"generate_email_response: Error extracting text: {extract_error}")
-                        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-                        requests.post(n8n_traceback_url, json={"error": str(extract_error), "source":"generate_email_response", "traceback": traceback.format_exc()})
+                        report_error(extract_error, "generate_email_response")
                         final_output_text = "I'm sorry, but I encountered an issue processing your message. Please try again or contact support."
                     
                     if final_output_text:
@@ -2760,7 +2763,7 @@ class MealPlanningAssistant:
                             'source': 'tool_call',
                             'traceback': traceback.format_exc()
                         }
-                        requests.post(os.getenv('N8N_TRACEBACK_URL'), json=n8n_traceback)
+                        report_payload(n8n_traceback)
                         tool_result_data = {"status": "error", "message": f"Error executing tool {tool_call_item.name}: {str(e_tool)}"}
                         
                     # Append function_call_output to history
@@ -2797,9 +2800,7 @@ class MealPlanningAssistant:
         # 3.4. Outer Error Handling
         except Exception as e_outer:
             logger.error(f"generate_email_response: Unhandled error for user {self.user_id}: {e_outer}", exc_info=True)
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-            requests.post(n8n_traceback_url, json={"error": str(e_outer), "source":"generate_email_response", "traceback": traceback.format_exc()})
+            report_error(e_outer, "generate_email_response")
             return {
                 "status": "error", 
                 "message": f"An unexpected error occurred during email processing: {str(e_outer)}", 
@@ -2862,8 +2863,7 @@ class MealPlanningAssistant:
                 # Build a minimal, explicit instruction for structured output
                 from customer_dashboard.template_router import get_schema_for_key
                 schema_model = get_schema_for_key(template_key)
-                raw_schema = schema_model.model_json_schema()
-                schema_dict = self._clean_schema_for_openai(raw_schema)
+                schema_dict = _openai_schema(schema_model, self._clean_schema_for_openai)
 
                 # Make a second, lightweight call to shape the final output
                 shaping_prompt = [
@@ -3017,9 +3017,7 @@ class MealPlanningAssistant:
             except Exception as e:
                 logger.error(f"Error translating email content for user {self.user_id} to {_get_language_name(user_preferred_language)} ({user_preferred_language}): {e}")
                 # Continue with the original English content as fallback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"translate_email_content", "traceback": traceback.format_exc()})
+                report_error(e, "translate_email_content")
             
 
         # 4. Send email directly via Django's email framework
@@ -3165,22 +3163,11 @@ class MealPlanningAssistant:
             return result
         except CustomUser.DoesNotExist:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            try:
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={"error": f"User with ID {user_id} not found when sending notification", "source":"send_notification_via_assistant", "traceback": traceback.format_exc()}, timeout=5)
-            except Exception:
-                pass
+            report_error(f"User with ID {user_id} not found when sending notification", "send_notification_via_assistant")
             return {"status": "error", "reason": "user_not_found"}
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-            try:
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={"error": str(e), "source":"send_notification_via_assistant", "traceback": traceback.format_exc()}, timeout=5)
-            except Exception:
-                pass
+            report_error(e, "send_notification_via_assistant")
             return {"status": "error", "reason": str(e)}
 
     def _estimate_tokens(self, text: str) -> int:
@@ -3431,14 +3418,7 @@ class OnboardingAssistant(MealPlanningAssistant):
         except Exception as e:
             logger.error(f"OnboardingAssistant.__init__: Error initializing onboarding assistant for user_id={user_id}: {str(e)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "OnboardingAssistant.__init__", 
-                    "user_id": user_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(e, "OnboardingAssistant.__init__", {"user_id": user_id})
             raise
 
     def _get_tools_for_user(self, is_guest: bool) -> List[Dict[str, Any]]:
@@ -3494,29 +3474,14 @@ class OnboardingAssistant(MealPlanningAssistant):
             except Exception as session_error:
                 logger.warning(f"OnboardingAssistant._instructions: Could not load onboarding progress for user_id={self.user_id}: {session_error}", exc_info=True)
                 # n8n traceback for session loading errors
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                if n8n_traceback_url:
-                    requests.post(n8n_traceback_url, json={
-                        "error": str(session_error), 
-                        "source": "OnboardingAssistant._instructions.session_load", 
-                        "user_id": self.user_id,
-                        "traceback": traceback.format_exc()
-                    })
+                report_error(session_error, "OnboardingAssistant._instructions.session_load", {"user_id": self.user_id})
 
             return base_prompt
             
         except Exception as e:
             logger.error(f"OnboardingAssistant._instructions: Error building instructions for user_id={self.user_id}: {str(e)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "OnboardingAssistant._instructions", 
-                    "user_id": self.user_id,
-                    "is_guest": is_guest,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(e, "OnboardingAssistant._instructions", {"user_id": self.user_id, "is_guest": is_guest})
             # Return basic fallback prompt
             return self.system_message
 
@@ -3534,7 +3499,7 @@ class OnboardingAssistant(MealPlanningAssistant):
                 
                 # Get history the same way as parent class
                 if is_guest:
-                    guest_data = GLOBAL_GUEST_STATE.get(self.user_id, {})
+                    guest_data = get_guest_state_store().get(self.user_id) or {}
                     if guest_data and "history" in guest_data:
                         history = guest_data["history"].copy()
                         history.append({"role": "user", "content": message})
@@ -3561,7 +3526,7 @@ class OnboardingAssistant(MealPlanningAssistant):
                             "format": {
                                 'type': 'json_schema',
                                 'name': 'password_prompt',
-                                'schema': self._clean_schema_for_openai(PasswordPrompt.model_json_schema())
+                                'schema': _openai_schema(PasswordPrompt, self._clean_schema_for_openai)
                             }
                         }
                     )
@@ -3585,14 +3550,7 @@ class OnboardingAssistant(MealPlanningAssistant):
                 except Exception as structured_error:
                     logger.error(f"OnboardingAssistant.send_message: Error with structured password prompt for user_id={self.user_id}: {structured_error}", exc_info=True)
                     # n8n traceback
-                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                    if n8n_traceback_url:
-                        requests.post(n8n_traceback_url, json={
-                            "error": str(structured_error), 
-                            "source": "OnboardingAssistant.send_message.structured_output", 
-                            "user_id": self.user_id,
-                            "traceback": traceback.format_exc()
-                        })
+                    report_error(structured_error, "OnboardingAssistant.send_message.structured_output", {"user_id": self.user_id})
                     # Fall back to regular send_message
             
             # Use parent's proven send_message logic for all other cases
@@ -3609,16 +3567,7 @@ class OnboardingAssistant(MealPlanningAssistant):
         except Exception as e:
             logger.error(f"OnboardingAssistant.send_message: Unhandled error for user_id={self.user_id}, message='{message[:100]}...': {str(e)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "OnboardingAssistant.send_message", 
-                    "user_id": self.user_id,
-                    "message_preview": message[:100],
-                    "thread_id": thread_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(e, "OnboardingAssistant.send_message", {"user_id": self.user_id, "message_preview": message[:100], "thread_id": thread_id})
             
             return {
                 "status": "error", 
@@ -3657,30 +3606,14 @@ class OnboardingAssistant(MealPlanningAssistant):
                     except Exception as password_check_error:
                         logger.error(f"OnboardingAssistant.stream_message: Error checking password prompt for user_id={self.user_id}: {password_check_error}", exc_info=True)
                         # n8n traceback
-                        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                        if n8n_traceback_url:
-                            requests.post(n8n_traceback_url, json={
-                                "error": str(password_check_error), 
-                                "source": "OnboardingAssistant.stream_message.password_check", 
-                                "user_id": self.user_id,
-                                "traceback": traceback.format_exc()
-                            })
+                        report_error(password_check_error, "OnboardingAssistant.stream_message.password_check", {"user_id": self.user_id})
                         # Yield safe default
                         yield {"type": "password_request", "is_password_request": False}
             
         except Exception as e:
             logger.error(f"OnboardingAssistant.stream_message: Unhandled error for user_id={self.user_id}, message='{message[:100]}...': {str(e)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "OnboardingAssistant.stream_message", 
-                    "user_id": self.user_id,
-                    "message_preview": message[:100],
-                    "thread_id": thread_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(e, "OnboardingAssistant.stream_message", {"user_id": self.user_id, "message_preview": message[:100], "thread_id": thread_id})
             
             # Yield error event
             yield {"type": "error", "message": f"Stream error: {str(e)}"}
@@ -3713,14 +3646,7 @@ class OnboardingAssistant(MealPlanningAssistant):
         except Exception as e:
             logger.error(f"OnboardingAssistant._should_use_password_prompt: Error checking password prompt for user_id={self.user_id}: {str(e)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "OnboardingAssistant._should_use_password_prompt", 
-                    "user_id": self.user_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(e, "OnboardingAssistant._should_use_password_prompt", {"user_id": self.user_id})
             return False
 
     def reset_conversation(self) -> Dict[str, Any]:
@@ -3731,14 +3657,7 @@ class OnboardingAssistant(MealPlanningAssistant):
         except Exception as e:
             logger.error(f"OnboardingAssistant.reset_conversation: Error resetting conversation for user_id={self.user_id}: {str(e)}", exc_info=True)
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            if n8n_traceback_url:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e), 
-                    "source": "OnboardingAssistant.reset_conversation", 
-                    "user_id": self.user_id,
-                    "traceback": traceback.format_exc()
-                })
+            report_error(e, "OnboardingAssistant.reset_conversation", {"user_id": self.user_id})
             return {"status": "error", "message": f"Error resetting conversation: {str(e)}"}
 
     # Remove all the custom methods that duplicated parent functionality:
@@ -2,11 +2,15 @@
 Focus: All embedding and similarity logic.
 """
 import logging
+import os
+import time
 from django.conf import settings
+from django.core.cache import cache
 from rest_framework.renderers import JSONRenderer
 from meals.models import Meal, Dish, Ingredient
 from chefs.models import Chef
 from shared.utils import get_embedding
+from api.task_runner import resumable_task
 import json
 
 logger = logging.getLogger(__name__)
@@ -25,8 +29,8 @@ def prepare_meal_representation(meal: Meal) -> str:
     if meal.meal_type:
         attributes.append(f"Meal Type: {meal.meal_type}")
     
-    if meal.dishes.exists():
-        dish_names = [dish.name for dish in meal.dishes.all()]
+    dish_names = [dish.name for dish in meal.dishes.all()]
+    if dish_names:
         attributes.append(f"Dishes: {', '.join(dish_names)}")
     
     if meal.review_summary:
@@ -38,6 +42,61 @@ def prepare_meal_representation(meal: Meal) -> str:
     return " | ".join(attributes)
 
 
+# How to load and render the embedding text for each embedded model. The
+# text must stay byte-identical to what the single-object paths produce
+# (prepare_meal_representation and the models' __str__), otherwise stored
+# embeddings silently drift from freshly generated ones.
+REPRESENTATION_SPECS = {
+    Meal: {
+        "select_related": ("chef__user",),
+        "prefetch_related": ("dietary_preferences", "custom_dietary_preferences", "dishes"),
+        "build": prepare_meal_representation,
+    },
+    Dish: {
+        "select_related": (),
+        "prefetch_related": ("ingredients",),
+        "build": str,
+    },
+    Ingredient: {
+        "select_related": ("chef__user",),
+        "prefetch_related": (),
+        "build": str,
+    },
+    Chef: {
+        "select_related": ("user",),
+        "prefetch_related": (),
+        "build": str,
+    },
+}
+
+
+def representation_queryset(queryset):
+    """Attach the joins and prefetches the representation of ``queryset.model`` needs."""
+    spec = REPRESENTATION_SPECS[queryset.model]
+    if spec["select_related"]:
+        queryset = queryset.select_related(*spec["select_related"])
+    if spec["prefetch_related"]:
+        queryset = queryset.prefetch_related(*spec["prefetch_related"])
+    return queryset
+
+
+def build_representation(obj) -> str:
+    """Embedding text for a Meal, Dish, Ingredient or Chef instance."""
+    return REPRESENTATION_SPECS[type(obj)]["build"](obj)
+
+
+def iter_representations(queryset, chunk_size=500):
+    """
+    Yield ``(pk, text)`` for every object in ``queryset``.
+
+    Objects are streamed in chunks of ``chunk_size`` and each chunk costs one
+    query plus one per prefetched relation, independent of how many related
+    rows each object has.
+    """
+    for obj in representation_queryset(queryset).iterator(chunk_size=chunk_size):
+        yield obj.pk, build_representation(obj)
+
+
 def generate_meal_embedding(meal_id: int):
     try:
         meal = Meal.objects.get(id=meal_id)
@@ -58,30 +117,128 @@ def generate_meal_embedding(meal_id: int):
         logger.error(f"Failed to generate embedding for meal {meal.id}: {e}")
         # Optionally retry or handle differently.
 
-def update_model_embeddings(queryset, embedding_func, embedding_field):
-    for obj in queryset.filter(**{f"{embedding_field}__isnull": True}):
-        embedding = embedding_func(obj)
-        if embedding:
-            setattr(obj, embedding_field, embedding)
-            obj.save()
-            logger.info(f"Updated embedding for {obj}")
-        else:
-            logger.warning(f"Could not update embedding for {obj}")
+# Backfill tuning. The embeddings API accepts up to 2048 inputs per request;
+# smaller batches keep each request well under its token limit.
+BACKFILL_BATCH_SIZE = int(os.getenv("EMBEDDING_BACKFILL_BATCH_SIZE", "256"))
+BACKFILL_TIME_BUDGET_SECONDS = float(os.getenv("EMBEDDING_BACKFILL_TIME_BUDGET", "240"))
+BACKFILL_CURSOR_KEY = "embedding_backfill:cursor:{label}"
+BACKFILL_CURSOR_TTL = 7 * 24 * 3600
+
+
+def _backfill_targets():
+    """(label, model, embedding field) for every embedded model."""
+    return [
+        ("meal", Meal, "meal_embedding"),
+        ("dish", Dish, "dish_embedding"),
+        ("ingredient", Ingredient, "ingredient_embedding"),
+        ("chef", Chef, "chef_embedding"),
+    ]
+
+
+def backfill_model_embeddings(label, queryset, embedding_field, deadline=None, batch_size=None):
+    """
+    Embed every row of ``queryset`` whose ``embedding_field`` is null.
+
+    Rows are streamed in primary-key order with their representation
+    relations prefetched, embedded in batches through
+    EmbeddingService.get_embeddings_batch and written with bulk_update, so
+    model save() hooks (e.g. Dish nutrition recomputation) never run. The last
+    processed pk is checkpointed in the cache; a run that hits ``deadline``
+    resumes from there next time. A completed scan resets the cursor so rows
+    that failed to embed are retried on the following run.
+
+    Returns a dict with ``embedded``, ``failed`` and ``complete``.
+    """
+    from chefs.services.memory_service import EmbeddingService
+
+    batch_size = batch_size or BACKFILL_BATCH_SIZE
+    cursor_key = BACKFILL_CURSOR_KEY.format(label=label)
+    cursor = cache.get(cursor_key) or 0
+    pending = representation_queryset(
+        queryset.filter(**{f"{embedding_field}__isnull": True}).order_by("pk")
+    )
+    model = queryset.model
+    embedded = failed = 0
+
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            cache.set(cursor_key, cursor, timeout=BACKFILL_CURSOR_TTL)
+            logger.info(f"Embedding backfill for {label} paused at pk {cursor}")
+            return {"embedded": embedded, "failed": failed, "complete": False}
+
+        batch = list(pending.filter(pk__gt=cursor)[:batch_size])
+        if not batch:
+            break
+
+        texts = []
+        for obj in batch:
+            try:
+                texts.append(build_representation(obj))
+            except Exception as e:
+                logger.error(f"Could not build embedding text for {label} {obj.pk}: {e}")
+                texts.append("")
+
+        vectors = EmbeddingService.get_embeddings_batch(texts)
+        updated = []
+        for obj, vector in zip(batch, vectors):
+            if vector:
+                setattr(obj, embedding_field, vector)
+                updated.append(obj)
+        if updated:
+            model.objects.bulk_update(updated, [embedding_field])
+
+        embedded += len(updated)
+        failed += len(batch) - len(updated)
+        cursor = batch[-1].pk
+        cache.set(cursor_key, cursor, timeout=BACKFILL_CURSOR_TTL)
+
+    cache.delete(cursor_key)
+    logger.info(f"Embedding backfill for {label} complete: {embedded} embedded, {failed} failed")
+    return {"embedded": embedded, "failed": failed, "complete": True}
+
+
+def update_embeddings(time_budget=None, labels=None):
+    """
+    Backfill missing embeddings for meals, dishes, ingredients and chefs.
+
+    Stops once ``time_budget`` seconds have elapsed (default
+    EMBEDDING_BACKFILL_TIME_BUDGET) and checkpoints progress, so the cron
+    trigger can call it repeatedly until every target reports complete.
+    """
+    budget = BACKFILL_TIME_BUDGET_SECONDS if time_budget is None else time_budget
+    deadline = time.monotonic() + budget
+    summary = {}
+    for label, model, field in _backfill_targets():
+        if labels and label not in labels:
+            continue
+        summary[label] = backfill_model_embeddings(label, model.objects.all(), field, deadline=deadline)
+        if not summary[label]["complete"]:
+            break
+    summary["complete"] = all(v["complete"] for v in summary.values())
+    return summary
 
-def update_embeddings():
-    from meals.models import Meal, Dish, Ingredient  # Adjust the import path based on your project structure
 
-    # For meals
-    update_model_embeddings(Meal.objects, lambda m: generate_meal_embedding(m.id), 'meal_embedding')
+@resumable_task
+def update_embeddings_task(task_slice):
+    """
+    Cron entry point for update_embeddings.
 
-    # For dishes
-    update_model_embeddings(Dish.objects, lambda d: get_embedding(str(d)), 'dish_embedding')
+    The per-model pk checkpoints stay in the cache (see
+    backfill_model_embeddings); the task cursor only records which model the
+    slice stopped in, for the run history.
+    """
+    summary = update_embeddings(time_budget=task_slice.remaining())
+    processed = sum(v["embedded"] + v["failed"] for k, v in summary.items() if k != "complete")
+    stopped_at = next((k for k, v in summary.items() if k != "complete" and not v["complete"]), None)
+    task_slice.advance(stopped_at, processed=processed)
+    if summary["complete"]:
+        return task_slice.complete(summary)
+    return task_slice.pause(summary)
 
-    # For ingredients
-    update_model_embeddings(Ingredient.objects, lambda i: get_embedding(str(i)), 'ingredient_embedding')
 
-    # For chefs
-    update_model_embeddings(Chef.objects, lambda c: get_embedding(str(c)), 'chef_embedding')
+def update_chef_embeddings(time_budget=None):
+    """Backfill missing chef embeddings only."""
+    return update_embeddings(time_budget=time_budget, labels=["chef"])
 
 def serialize_data(data):
     """ Helper function to serialize data into JSON-compatible format """
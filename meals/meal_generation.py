@@ -16,13 +16,13 @@ import uuid
 import time
 import traceback
 import os
-import requests
 from custom_auth.models import CustomUser
 from meals.models import Meal, MealPlan, MealPlanMeal, PantryItem, MealPlanMealPantryUsage, MealCompatibility
 from meals.pydantic_models import SanitySchema, UsageList
 from shared.utils import (generate_user_context, create_meal,
                           get_embedding, cosine_similarity)
 from meals.pantry_management import get_expiring_pantry_items, compute_effective_available_items
+from utils.error_reporting import report_error
 
 logger = logging.getLogger(__name__)
 
@@ -852,8 +852,7 @@ def generate_meal_details(
                     logger.error(f"Error during meal generation: {e}")
                     logger.error(traceback.format_exc())
                 else:
-                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                    requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_meal_details", "traceback": traceback.format_exc()})
+                    report_error(e, "generate_meal_details")
                     continue
 
         logger.error(f"[{request_id}] Failed to generate a unique meal after {max_attempts} attempts.")
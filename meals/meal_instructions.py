@@ -6,7 +6,6 @@ import json
 import logging
 import re
 from django.shortcuts import get_object_or_404
-import requests
 import pytz
 from zoneinfo import ZoneInfo
 import textwrap
@@ -32,8 +31,8 @@ from django.template.loader import render_to_string
 from meals.feature_flags import meal_plan_notifications_enabled, legacy_meal_plan_enabled
 from meals.macro_info_retrieval import get_meal_macro_information
 # YouTube integration removed
-import traceback
 from .celery_utils import handle_task_failure
+from utils.error_reporting import report_error
 
 LEGACY_MEAL_PLAN = True
 
@@ -362,16 +361,14 @@ def generate_instructions(meal_plan_meal_ids, send_via_assistant: bool = False):
         expiring_items_str = ', '.join([item['name'] for item in expiring_pantry_items]) if expiring_pantry_items else 'None'
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "generate_instructions")
         expiring_items_str = 'None'
 
     try:
         user_context = generate_user_context(user)
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "generate_instructions")
         user_context = 'No additional user context provided.'
 
     instructions_list = []
@@ -401,8 +398,7 @@ def generate_instructions(meal_plan_meal_ids, send_via_assistant: bool = False):
                     logger.info(f"No macro info found/generated for meal {meal.id}.")
             except Exception as e:
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+                report_error(e, "generate_instructions")
 
         if metadata_updated:
             meals_to_update.append(meal) # Add meal to list for bulk update later
@@ -444,8 +440,7 @@ def generate_instructions(meal_plan_meal_ids, send_via_assistant: bool = False):
                 meal_data_json = json.dumps(meal_plan_meal_data) # Serialize specific MealPlanMeal
             except Exception as e:
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+                report_error(e, "generate_instructions")
                 continue  # Skip this meal
 
             try:
@@ -540,13 +535,11 @@ def generate_instructions(meal_plan_meal_ids, send_via_assistant: bool = False):
 
             except ValueError as e:
                 # Groq client unavailable
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+                report_error(e, "generate_instructions")
                 continue # Skip this meal
             except ValidationError as e:
                  # n8n traceback
-                 n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                 requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+                 report_error(e, "generate_instructions")
                  continue # Skip this meal
             except Exception as e:
                 logger.error(f"Unexpected error generating instructions for MealPlanMeal ID {meal_plan_meal.id}: {e}", exc_info=True)
@@ -593,12 +586,10 @@ def generate_instructions(meal_plan_meal_ids, send_via_assistant: bool = False):
             })
         except (json.JSONDecodeError, ValidationError) as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+            report_error(e, "generate_instructions")
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+            report_error(e, "generate_instructions")
 
 
     # --- Bulk update meals with new metadata ---
@@ -610,8 +601,7 @@ def generate_instructions(meal_plan_meal_ids, send_via_assistant: bool = False):
             logger.info(f"Bulk updated metadata for {len(unique_meals_to_update)} meals.")
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+            report_error(e, "generate_instructions")
     # --- End bulk update ---
 
     if not instructions_list:
@@ -699,8 +689,6 @@ def generate_bulk_prep_instructions(meal_plan_id, send_via_assistant: bool = Tru
     import uuid
     from meals.pydantic_models import BulkPrepInstructions
     import json
-    import requests
-    import os
 
     from meals.models import MealPlan, MealPlanInstruction, MealAllergenSafety, Ingredient, Meal, MealPlanMeal
     from meals.serializers import MealPlanSerializer
@@ -868,8 +856,7 @@ def generate_bulk_prep_instructions(meal_plan_id, send_via_assistant: bool = Tru
         expiring_items_str = ', '.join(item['name'] for item in expiring_pantry_items) if expiring_pantry_items else 'None'
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "generate_instructions")
         expiring_items_str = 'None'
 
     # Generate the user context
@@ -877,8 +864,7 @@ def generate_bulk_prep_instructions(meal_plan_id, send_via_assistant: bool = Tru
         user_context = generate_user_context(user)
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "generate_instructions")
         user_context = 'No additional user context provided.'
 
     # Add age safety note
@@ -1069,8 +1055,7 @@ def send_bulk_prep_instructions(meal_plan_id):
             validated_prep = BulkPrepInstructions.model_validate(instruction_data)
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"send_bulk_prep_instructions", "traceback": traceback.format_exc()})
+            report_error(e, "send_bulk_prep_instructions")
             return {"status": "error", "reason": f"invalid_instruction_format: {str(e)}"}
         
         # Format bulk prep steps
@@ -1249,13 +1234,11 @@ def send_bulk_prep_instructions(meal_plan_id):
             
     except MealPlan.DoesNotExist:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": "Meal plan with ID {meal_plan_id} not found", "source":"send_bulk_prep_instructions", "traceback": traceback.format_exc()})
+        report_error("Meal plan with ID {meal_plan_id} not found", "send_bulk_prep_instructions")
         return {"status": "error", "reason": "meal_plan_not_found"}
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"send_bulk_prep_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "send_bulk_prep_instructions")
         return {"status": "error", "reason": str(e)}
 
 def format_follow_up_instructions(daily_task: DailyTask, user_name: str):
@@ -1409,8 +1392,7 @@ def send_follow_up_instructions(meal_plan_id):
             
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"send_follow_up_instructions", "traceback": traceback.format_exc()})
+            report_error(e, "send_follow_up_instructions")
             continue
 
 def build_metadata_prompt_part(meal_plan_meals):
@@ -2,8 +2,6 @@ import json
 import textwrap
 import logging
 import os
-import requests
-import traceback
 from typing import List
 try:
     from groq import Groq  # Groq client for inference
@@ -13,6 +11,7 @@ from django.conf import settings
 from meals.models import MealPlan, MealPlanMeal
 from meals.pydantic_models import MealPlanModificationRequest
 from shared.utils import get_groq_client
+from utils.error_reporting import report_error
 logger = logging.getLogger(__name__)
 
 def _get_groq_client():
@@ -113,8 +112,7 @@ def parse_modification_request(
                 raw_json = groq_resp.choices[0].message.content or "{}"
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"parse_modification_request", "traceback": traceback.format_exc()})
+            report_error(e, "parse_modification_request")
             raise
 
         # 4. Validate & return
@@ -129,12 +127,10 @@ def parse_modification_request(
             return parsed
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"parse_modification_request", "traceback": traceback.format_exc()})
+            report_error(e, "parse_modification_request")
             raise
             
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"parse_modification_request", "traceback": traceback.format_exc()})
+        report_error(e, "parse_modification_request")
         raise 
@@ -5,7 +5,6 @@ import json
 import logging
 import os
 import random
-import requests
 import pytz
 from zoneinfo import ZoneInfo
 import traceback
@@ -33,11 +32,14 @@ from meals.pydantic_models import (MealsToReplaceSchema, BulkPrepInstructions,
                                   MealPlanModificationRequest, PromptMealMap, ModifiedMealSchema,
                                   AllergenAnalysis, IngredientSubstitution)
 from meals.meal_modification_parser import parse_modification_request
+from meals.services.dietary_compatibility import DietaryCompatibilityEngine
+from meals.services.meal_diversity import filter_diverse_meals
 from shared.utils import (generate_user_context, get_embedding, cosine_similarity, replace_meal_in_plan,
                           remove_meal_from_plan)
 from django.db import transaction
 from pydantic import BaseModel, Field, ConfigDict
-from utils.groq_rate_limit import groq_call_with_retry
+from utils.groq_rate_limit import GroqRateLimited, groq_call_with_retry
+from utils.error_reporting import report_error
 
 LEGACY_MEAL_PLAN = True
 
@@ -82,8 +84,7 @@ def is_saturday_in_timezone(user_timezone_str):
         return user_local_time.weekday() == 5
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"is_saturday_in_timezone", "traceback": traceback.format_exc()})
+        report_error(e, "is_saturday_in_timezone")
         # Default to server's timezone if there's an error
         return timezone.now().weekday() == 5
 
@@ -242,8 +243,7 @@ def analyze_meal_compatibility(meal, dietary_preference):
         
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"analyze_meal_compatibility", "traceback": traceback.format_exc()})
+        report_error(e, "analyze_meal_compatibility")
         return {
             "is_compatible": False, 
             "confidence": 0.0,
@@ -252,117 +252,19 @@ def analyze_meal_compatibility(meal, dietary_preference):
 
 def get_compatible_meals_for_user(user, meal_pool=None):
     """
-    Find meals compatible with user's dietary preferences using AI analysis
+    Find meals compatible with user's dietary preferences using AI analysis.
+
+    Explicit tags and cached analyses are resolved in bulk; only cache misses
+    reach the LLM, and those are analyzed concurrently.
     """
-    # Get both regular and custom dietary preferences
-    regular_preferences = user.profile.dietary_preferences.all()
-    custom_preferences = user.profile.custom_dietary_preferences.all()
-    
-    # Skip analysis if user has no preferences at all
-    if not regular_preferences.exists() and not custom_preferences.exists():
-        # If no preferences at all, all meals are compatible
-        return meal_pool or Meal.objects.filter(is_active=True)
-    
-    # Check if user has "Everything" in their regular preferences
-    has_everything_pref = regular_preferences.filter(name="Everything").exists()
-    
-    # Determine if "Everything" is the ONLY preference (both regular and custom)
-    has_only_everything_pref = (
-        has_everything_pref and 
-        regular_preferences.count() == 1 and 
-        not custom_preferences.exists()
-    )
-    
-    # Only if "Everything" is the ONLY preference (regular or custom), all meals are compatible
-    if has_only_everything_pref:
-        # For users with ONLY the "Everything" preference and no custom preferences,
-        # all meals are compatible
-        meals = meal_pool or Meal.objects.filter(is_active=True)
-        for meal in meals:
-            meal.compatibility_analyses.reasoning = ["Compatible with 'Everything' preference"]
-            meal.compatibility_analyses.is_compatible = True
-            meal.compatibility_analyses.confidence = 1.0
-            meal.compatibility_analyses.save()
-        return meals
-    
-    # Combine all preferences for analysis
-    all_preferences = list(regular_preferences)
-    if has_everything_pref and (regular_preferences.count() > 1 or custom_preferences.exists()):
-        # If user has "Everything" but also has other preferences, ignore "Everything"
-        all_preferences = [pref for pref in all_preferences if pref.name != "Everything"]
-    
-    # Add custom preferences to the list
-    all_preferences.extend(list(custom_preferences))
-    
-    # Start with all available meals or the provided pool
-    available_meals = meal_pool or Meal.objects.filter(is_active=True)
-    compatible_meals = []
-    
-    for meal in available_meals:
-        # Check compatibility with all user preferences
-        is_compatible = True
-        compatibility_reasons = []
-        
-        for preference in all_preferences:
-            # First check if explicitly tagged (faster than API call)
-            if hasattr(preference, 'name') and meal.dietary_preferences.filter(name=preference.name).exists():
-                compatibility_reasons.append(f"Explicitly tagged as {preference.name}")
-                continue
-            
-            # For custom preferences, check custom dietary preferences
-            if hasattr(preference, 'custom_name') and meal.custom_dietary_preferences.filter(custom_name=preference.custom_name).exists():
-                compatibility_reasons.append(f"Explicitly tagged as {preference.custom_name}")
-                continue
-                
-            # Get the preference name (handle both regular and custom)
-            pref_name = preference.name if hasattr(preference, 'name') else preference.custom_name
-            
-            # Check if we have a cached compatibility analysis for this meal and preference
-            from meals.models import MealCompatibility
-            cached_analysis = MealCompatibility.objects.filter(
-                meal=meal,
-                preference_name=pref_name
-            ).first()
-            
-            if cached_analysis:
-                # Use the cached result
-                if not cached_analysis.is_compatible or cached_analysis.confidence < 0.7:
-                    is_compatible = False
-                    break
-                compatibility_reasons.append(cached_analysis.reasoning)
-            else:
-                # If not cached, perform new analysis
-                result = analyze_meal_compatibility(meal, pref_name)
-                
-                # Cache the result for future use
-                try:
-                    MealCompatibility.objects.create(
-                        meal=meal,
-                        preference_name=pref_name,
-                        is_compatible=result.get("is_compatible", False),
-                        confidence=result.get("confidence", 0.0),
-                        reasoning=result.get("reasoning", "")
-                    )
-                except Exception as e:
-                    # n8n traceback
-                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                    requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_compatible_meals_for_user", "traceback": traceback.format_exc()})
-                
-                if not result["is_compatible"] or result["confidence"] < 0.7:
-                    is_compatible = False
-                    break
-                
-                compatibility_reasons.append(result["reasoning"])
-        
-        if is_compatible:
-            # Add compatibility reasons to the meal for explanation
-            meal.compatibility_analyses.reasoning = compatibility_reasons
-            meal.compatibility_analyses.is_compatible = True
-            meal.compatibility_analyses.confidence = 1.0
-            meal.compatibility_analyses.save()
-            compatible_meals.append(meal)
-    
-    return compatible_meals
+    available_meals = meal_pool if meal_pool is not None else Meal.objects.filter(is_active=True)
+    engine = DietaryCompatibilityEngine(user)
+
+    # No preferences, or only "Everything": all meals are compatible
+    if not engine.has_restrictions:
+        return available_meals
+
+    return engine.compatible_meals(available_meals)
 
 @handle_task_failure
 def create_meal_plan_for_new_user(user_id):
@@ -389,8 +291,7 @@ def create_meal_plan_for_new_user(user_id):
             
     except CustomUser.DoesNotExist:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": "User with id {user_id} does not exist.", "source":"create_meal_plan_for_new_user", "traceback": traceback.format_exc()})
+        report_error("User with id {user_id} does not exist.", "create_meal_plan_for_new_user")
 
 @handle_task_failure
 def create_meal_plan_for_all_users():
@@ -537,8 +438,7 @@ def create_meal_plan_for_user(
                     
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"create_meal_plan_for_user", "traceback": traceback.format_exc()})
+            report_error(e, "create_meal_plan_for_user")
             logger.error(f"[{request_id}] Exception during meal plan creation/retrieval: {e}")
             return None
 
@@ -576,26 +476,30 @@ def create_meal_plan_for_user(
             raw_create = getattr(getattr(groq_client.chat, 'completions', None), 'with_raw_response', None)
             if raw_create:
                 raw_create = groq_client.chat.completions.with_raw_response.create
-            groq_resp = groq_call_with_retry(
-                raw_create_fn=raw_create,
-                create_fn=groq_client.chat.completions.create,
-                desc='meal_plan_service.parse_prompt',
-                model=getattr(settings, 'GROQ_MODEL', 'openai/gpt-oss-120b'),
-                messages=groq_messages,
-                temperature=0.2,
-                top_p=1,
-                stream=False,
-                response_format={
-                    "type": "json_schema",
-                    "json_schema": {
-                        "name": "meal_map",
-                        "schema": PromptMealMap.model_json_schema(),
+            try:
+                groq_resp = groq_call_with_retry(
+                    raw_create_fn=raw_create,
+                    create_fn=groq_client.chat.completions.create,
+                    desc='meal_plan_service.parse_prompt',
+                    model=getattr(settings, 'GROQ_MODEL', 'openai/gpt-oss-120b'),
+                    messages=groq_messages,
+                    temperature=0.2,
+                    top_p=1,
+                    stream=False,
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "meal_map",
+                            "schema": PromptMealMap.model_json_schema(),
+                        },
                     },
-                },
-            )
-            raw_json = groq_resp.choices[0].message.content or "{}"
-            parsed = PromptMealMap.model_validate_json(raw_json)
-            allowed_map = {(s.day, s.meal_type.value): True for s in parsed.slots}
+                )
+                raw_json = groq_resp.choices[0].message.content or "{}"
+                parsed = PromptMealMap.model_validate_json(raw_json)
+                allowed_map = {(s.day, s.meal_type.value): True for s in parsed.slots}
+            except GroqRateLimited as e:
+                # The prompt only narrows the days and meal types; plan the default slots instead
+                logger.warning(f"[{request_id}] Skipping prompt parsing, Groq budget unavailable: {e}")
                 
         existing_meals = MealPlanMeal.objects.filter(meal_plan=meal_plan).select_related('meal')
         existing_meal_names = set(existing_meals.values_list('meal__name', flat=True))
@@ -823,8 +727,7 @@ def create_meal_plan_for_user(
                                             r_prog = conn.publish(channel, json.dumps({"event": "progress", "data": {"pct": pct}}))
                             except Exception as e:
                                 # n8n traceback
-                                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                                requests.post(n8n_traceback_url, json={"error": str(e), "source":"create_meal_plan_for_user", "traceback": traceback.format_exc()})
+                                report_error(e, "create_meal_plan_for_user")
                             
                             # If that meal used pantry items, keep track of it
                             if result.get('used_pantry_item'):
@@ -932,12 +835,10 @@ def create_meal_plan_for_user(
                                             r_prog = conn.publish(channel, json.dumps({"event": "progress", "data": {"pct": pct}}))
                                 except Exception as e:
                                     # n8n traceback
-                                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                                    requests.post(n8n_traceback_url, json={"error": str(e), "source":"create_meal_plan_for_user", "traceback": traceback.format_exc()})
+                                    report_error(e, "create_meal_plan_for_user")
                             except Exception as e:
                                 # n8n traceback
-                                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                                requests.post(n8n_traceback_url, json={"error": str(e), "source":"create_meal_plan_for_user", "traceback": traceback.format_exc()})
+                                report_error(e, "create_meal_plan_for_user")
                                 skipped_meal_ids.add(meal_found.id)
                         else:
                              # Log reason for skipping
@@ -1006,12 +907,7 @@ def create_meal_plan_for_user(
             logger.warning(f"[{request_id}] Redis connection object missing 'publish' method, skipping stream update")
     except Exception as e:
         # Only send to n8n if URL is configured
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        if n8n_traceback_url:
-            try:
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"create_meal_plan_for_user", "traceback": traceback.format_exc()})
-            except Exception:
-                pass  # Don't fail if n8n webhook fails
+        report_error(e, "create_meal_plan_for_user")
 
     return meal_plan
 
@@ -1177,8 +1073,7 @@ def modify_existing_meal_plan(
                         logger.error(f"{log_ctx} failed after {MAX_ATTEMPTS} attempts")
     except MealPlan.DoesNotExist:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": "MealPlan does not exist or is not owned by user.", "source":"modify_existing_meal_plan", "traceback": traceback.format_exc()})
+        report_error("MealPlan does not exist or is not owned by user.", "modify_existing_meal_plan")
         logger.error(f"{log_prefix} MealPlan {meal_plan_id} does not exist or is not owned by user.")
         return None
 
@@ -1365,8 +1260,7 @@ def analyze_and_replace_meals(user, meal_plan, meal_types, request_id=None):
             meals_to_replace = MealsToReplaceSchema.model_validate(parsed_response)
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"analyze_and_replace_meals", "traceback": traceback.format_exc()})
+            report_error(e, "analyze_and_replace_meals")
             return
 
         # Initialize existing_meal_ids before replacements
@@ -1466,8 +1360,7 @@ def analyze_and_replace_meals(user, meal_plan, meal_types, request_id=None):
 
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"analyze_and_replace_meals", "traceback": traceback.format_exc()})
+        report_error(e, "analyze_and_replace_meals")
         return
 
 
@@ -1527,7 +1420,6 @@ def find_existing_meal(
     # Identify meals with bad reviews from this user
     from reviews.models import Review
     from django.contrib.contenttypes.models import ContentType
-    from meals.models import MealCompatibility
     meal_ct = ContentType.objects.get(app_label="meals", model="meal")
     badly_reviewed_meal_ids = Review.objects.filter(
         user=user,
@@ -1628,11 +1520,6 @@ def find_existing_meal(
             # Apply the same dietary filters for chef meals (unless "Everything" preference)
             chef_meals = all_chef_meals
             if not (everything_pref and len(regular_dietary_prefs) == 1 and not custom_dietary_prefs):
-                # Log each meal's dietary preferences before filtering
-                for meal in all_chef_meals:
-                    meal_prefs = [pref.name for pref in meal.dietary_preferences.all()]
-                    meal_custom_prefs = [pref.custom_name for pref in meal.custom_dietary_preferences.all()]
-                
                 chef_meals = all_chef_meals.filter(combined_filter)
             
             # Check each meal to see why it might be excluded
@@ -1684,23 +1571,7 @@ def find_existing_meal(
     meals_for_analysis = prioritized_meals
     
     # For embedding similarity check
-    filtered_meals = []
-    for meal in meals_for_analysis:
-        if existing_meal_embeddings and meal.meal_embedding is not None:
-            is_unique = True
-            for existing_embedding in existing_meal_embeddings:
-                try:
-                    similarity = cosine_similarity(meal.meal_embedding, existing_embedding)
-                    if similarity >= min_similarity:
-                        is_unique = False
-                        break
-                except Exception:
-                    is_unique = False
-                    break
-            if is_unique:
-                filtered_meals.append(meal)
-        else:
-            filtered_meals.append(meal)
+    filtered_meals = filter_diverse_meals(meals_for_analysis, existing_meal_embeddings, min_similarity)
     
     # Limit the number of meals for AI analysis to avoid too many API calls
     filtered_meals = filtered_meals[:max_meals_to_analyze]
@@ -1720,58 +1591,21 @@ def find_existing_meal(
         logger.info(f"No allergen-safe meals found for user {user.username} after allergy checking.")
         return None
     
-    # Continue with the rest of the compatibility checks on the allergen-safe meals
+    # Continue with the rest of the compatibility checks on the allergen-safe meals.
+    # Cached and tagged results resolve in bulk; misses are analyzed concurrently.
+    try:
+        verdicts = DietaryCompatibilityEngine(user, min_confidence=min_confidence).evaluate(allergen_safe_meals)
+    except Exception as e:
+        # n8n traceback
+        report_error(e, "analyze_meal_compatibility")
+        return None
+
     for meal in allergen_safe_meals:
-        try:
-            is_compatible = True
-            for pref in regular_dietary_prefs + custom_dietary_prefs:
-                pref_name = pref.name if hasattr(pref, 'name') else pref.custom_name
-                
-                # First check if we have cached compatibility results
-                cached_result = MealCompatibility.objects.filter(
-                    meal=meal,
-                    preference_name=pref_name
-                ).first()
-                
-                if cached_result:
-                    # Use cached results
-                    result = {
-                        "is_compatible": cached_result.is_compatible,
-                        "confidence": cached_result.confidence,
-                        "reasoning": cached_result.reasoning
-                    }
-                else:
-                    # Perform new analysis
-                    result = analyze_meal_compatibility(meal, pref_name)
-                    
-                    # Cache the results for future use
-                    try:
-                        MealCompatibility.objects.create(
-                            meal=meal,
-                            preference_name=pref_name,
-                            is_compatible=result.get("is_compatible", False),
-                            confidence=result.get("confidence", 0.0),
-                            reasoning=result.get("reasoning", "")
-                        )
-                    except Exception as e:
-                        # n8n traceback
-                        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                        requests.post(n8n_traceback_url, json={"error": str(e), "source":"analyze_meal_compatibility", "traceback": traceback.format_exc()})
-                
-                if not result.get("is_compatible", False) or result.get("confidence", 0.0) < min_confidence:
-                    is_compatible = False
-                    logger.info(f"Meal '{meal.name}' is not compatible with {pref_name} diet: {result.get('reasoning', 'No reason provided')}")
-                    break
-            
-            if is_compatible:
-                logger.info(f"Found compatible meal '{meal.name}' for user {user.username}")
-                return meal
-                
-        except Exception as e:
-            # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"analyze_meal_compatibility", "traceback": traceback.format_exc()})
-            continue
+        verdict = verdicts[meal.id]
+        if verdict.is_compatible:
+            logger.info(f"Found compatible meal '{meal.name}' for user {user.username}")
+            return meal
+        logger.info(f"Meal '{meal.name}' is not compatible with {verdict.failed_preference} diet: {verdict.reasons[0] if verdict.reasons else 'No reason provided'}")
     
     # If no meal passes all checks
     return None
@@ -1907,8 +1741,7 @@ def guess_meal_ingredients_gpt(meal_name: str, meal_description: str) -> List[st
         return data.get("likely_ingredients", [])
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"guess_meal_ingredients_gpt", "traceback": traceback.format_exc()})
+        report_error(e, "guess_meal_ingredients_gpt")
         return []
 
 def is_chef_meal(meal):
@@ -1998,8 +1831,7 @@ def check_meal_for_allergens_gpt(meal, user) -> Tuple[bool, List[str], Dict[str,
             )
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_meal_for_allergens_gpt", "traceback": traceback.format_exc()})
+            report_error(e, "check_meal_for_allergens_gpt")
         
         return False, ["No ingredients found to analyze"], {}
     
@@ -2024,8 +1856,7 @@ def check_meal_for_allergens_gpt(meal, user) -> Tuple[bool, List[str], Dict[str,
                 substitutions = get_substitution_suggestions(flagged_ingredients, user_allergies, meal.name)
             except Exception as e:
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_meal_for_allergens_gpt", "traceback": traceback.format_exc()})
+                report_error(e, "check_meal_for_allergens_gpt")
         else:
             logger.info(f"Meal '{meal.name}' is chef-created, not offering substitutions")
             
@@ -2046,8 +1877,7 @@ def check_meal_for_allergens_gpt(meal, user) -> Tuple[bool, List[str], Dict[str,
             )
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_meal_for_allergens_gpt", "traceback": traceback.format_exc()})
+            report_error(e, "check_meal_for_allergens_gpt")
             
         return False, flagged_ingredients, substitutions
     
@@ -2215,16 +2045,14 @@ def check_meal_for_allergens_gpt(meal, user) -> Tuple[bool, List[str], Dict[str,
             )
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_meal_for_allergens_gpt", "traceback": traceback.format_exc()})
+            report_error(e, "check_meal_for_allergens_gpt")
             logger.error(f"Error caching allergy safety result: {e}")
         
         return is_safe, gpt_flagged, substitutions
     
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_meal_for_allergens_gpt", "traceback": traceback.format_exc()})
+        report_error(e, "check_meal_for_allergens_gpt")
         logger.error(f"Error in GPT allergen check for meal '{meal.name}': {e}")
         
         # Cache the error result
@@ -2241,8 +2069,7 @@ def check_meal_for_allergens_gpt(meal, user) -> Tuple[bool, List[str], Dict[str,
             )
         except Exception as cache_error:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(cache_error), "source":"check_meal_for_allergens_gpt", "traceback": traceback.format_exc()})
+            report_error(cache_error, "check_meal_for_allergens_gpt")
             logger.error(f"Error caching allergy safety error result: {cache_error}")
         
         # If API call fails, fall back to being cautious - flag as unsafe
@@ -2380,8 +2207,7 @@ def get_substitution_suggestions(flagged_ingredients, user_allergies, meal_name)
     except Exception as e:
         logger.error(f"Error generating substitution suggestions: {e}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_substitution_suggestions", "traceback": traceback.format_exc()})
+        report_error(e, "get_substitution_suggestions")
         return {}
 
 def get_similar_meal(user_id, name, description, meal_type):
@@ -2748,8 +2574,7 @@ def apply_substitutions_to_meal(meal, substitutions, user):
                 data = candidate or {}
         except json.JSONDecodeError as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_substitutions_to_meal", "traceback": traceback.format_exc()})
+            report_error(e, "apply_substitutions_to_meal")
             return None
         
         # Validate that required fields are present
@@ -2822,8 +2647,7 @@ def apply_substitutions_to_meal(meal, substitutions, user):
                                 logger.warning(f"Invalid ingredient change format: {change}")
                     except (KeyError, TypeError) as e:
                         # n8n traceback
-                        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                        requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_substitutions_to_meal", "traceback": traceback.format_exc()})
+                        report_error(e, "apply_substitutions_to_meal")
                         logger.error(f"Error processing ingredient changes: {e}")
                         continue  # Skip this dish if ingredient changes are malformed
                     
@@ -2850,8 +2674,7 @@ def apply_substitutions_to_meal(meal, substitutions, user):
                                 ingredients_added += 1
                             except Exception as e:
                                 # n8n traceback
-                                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                                requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_substitutions_to_meal", "traceback": traceback.format_exc()})
+                                report_error(e, "apply_substitutions_to_meal")
                                 # Fall back to using the original ingredient
                                 new_dish.ingredients.add(original_ingredient)
                                 ingredients_added += 1
@@ -2887,8 +2710,7 @@ def apply_substitutions_to_meal(meal, substitutions, user):
                             logger.warning(f"Invalid ingredient change format: {change}")
                 except (KeyError, TypeError) as e:
                     # n8n traceback
-                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                    requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_substitutions_to_meal", "traceback": traceback.format_exc()})
+                    report_error(e, "apply_substitutions_to_meal")
                     logger.error(f"Error processing ingredient changes for notes: {e}")
                 
                 if substitution_notes:
@@ -2927,8 +2749,7 @@ def apply_substitutions_to_meal(meal, substitutions, user):
                 logger.info(f"Meal embedding module not available - embedding will be generated by batch process")
             except Exception as e:
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_substitutions_to_meal", "traceback": traceback.format_exc()})
+                report_error(e, "apply_substitutions_to_meal")
                 logger.error(f"Error generating embedding for modified meal '{modified_meal.name}': {e}")
                 # Continue without embedding - it will be generated by the batch process
             
@@ -2939,13 +2760,11 @@ def apply_substitutions_to_meal(meal, substitutions, user):
             
     except json.JSONDecodeError as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_substitutions_to_meal", "traceback": traceback.format_exc()})
+        report_error(e, "apply_substitutions_to_meal")
         return None
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_substitutions_to_meal", "traceback": traceback.format_exc()})
+        report_error(e, "apply_substitutions_to_meal")
         return None
 
 def regenerate_replaced_meal(original_meal_id, user, meal_type, meal_plan, request_id=None):
@@ -2976,8 +2795,7 @@ def regenerate_replaced_meal(original_meal_id, user, meal_type, meal_plan, reque
             return False
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"regenerate_replaced_meal", "traceback": traceback.format_exc()})
+        report_error(e, "regenerate_replaced_meal")
         logger.error(f"[{request_id}] Exception regenerating meal: {e}")
         return False
 
@@ -3014,8 +2832,7 @@ def apply_modifications(
             pass
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_modifications", "traceback": traceback.format_exc()})
+        report_error(e, "apply_modifications")
         raise
 
     # Map slot IDs to DB rows once to avoid repetitive queries
@@ -3027,8 +2844,7 @@ def apply_modifications(
         }
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_modifications", "traceback": traceback.format_exc()})
+        report_error(e, "apply_modifications")
         raise
 
     num_changes = 0
@@ -3088,8 +2904,7 @@ def apply_modifications(
             num_changes += 1
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_modifications", "traceback": traceback.format_exc()})
+            report_error(e, "apply_modifications")
             raise
 
     # Re-analyse plan only once
@@ -3098,8 +2913,7 @@ def apply_modifications(
             analyze_and_replace_meals(user, meal_plan, ["Breakfast", "Lunch", "Dinner"], request_id)
         except Exception as e:
             # n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"apply_modifications", "traceback": traceback.format_exc()})
+            report_error(e, "apply_modifications")
             raise
             
         logger.info("[%s] Applied %d slot change(s) for MealPlan %s", request_id, num_changes, meal_plan.id)
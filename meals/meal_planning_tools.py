@@ -6,8 +6,6 @@ connecting them to the existing meal planning functionality in the application.
 """
 
 import json
-import requests
-import os
 import logging
 from datetime import date
 from datetime import datetime, timedelta
@@ -42,7 +40,7 @@ from meals.pydantic_models import MealMacroInfo  # schema validation
 from pydantic import ValidationError
 from django.conf import settings
 # Removed: YouTube and Instacart integrations deprecated
-import traceback
+from utils.error_reporting import report_error
 
 LEGACY_MEAL_PLAN = True
 
@@ -463,9 +461,7 @@ def get_user_info(user_id: int) -> dict:
         return _util_get_user_info(req)
     except Exception as e:
         logger.error(f"get_user_info error for user {user_id}: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_user_info", "traceback": traceback.format_exc()})
+        report_error(e, "get_user_info")
         return {"status": "error", "message": str(e)}
 
 def update_user_info(
@@ -510,9 +506,7 @@ def update_user_info(
         return _util_update_user_info(req)
     except Exception as e:
         logger.error(f"update_user_info error for user {user_id}: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"update_user_info", "traceback": traceback.format_exc()})
+        report_error(e, "update_user_info")
         return {"status": "error", "message": str(e)}
 
 # @deprecated Legacy meal-plan helper guarded by LEGACY_MEAL_PLAN.
@@ -574,9 +568,7 @@ def create_meal_plan(
             return {"status": "success", "meal_plan": data}
     except Exception as e:
         logger.error(f"create_meal_plan error for user {user_id}: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"create_meal_plan", "traceback": traceback.format_exc()})
+        report_error(e, "create_meal_plan")
         return {"status": "error", "message": str(e)}
 
 # @deprecated Legacy meal-plan helper guarded by LEGACY_MEAL_PLAN.
@@ -662,10 +654,7 @@ def modify_meal_plan(user_id: int, meal_plan_id: int, day: str = None, meal_type
                 }
                 
         except Exception as e:
-            import traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"modify_meal_plan", "traceback": traceback.format_exc()})
+            report_error(e, "modify_meal_plan")
             return {
                 "status": "error",
                 "message": f"Failed to modify meal plan"
@@ -692,9 +681,7 @@ def modify_meal_plan(user_id: int, meal_plan_id: int, day: str = None, meal_type
                 })
             except Exception as e:
                 # n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"modify_meal_plan", "traceback": traceback.format_exc()})
+                report_error(e, "modify_meal_plan")
         
         return {
             "status": "success",
@@ -706,9 +693,7 @@ def modify_meal_plan(user_id: int, meal_plan_id: int, day: str = None, meal_type
         }
         
     except Exception as e:
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"modify_meal_plan", "traceback": traceback.format_exc()})
+        report_error(e, "modify_meal_plan")
         logger.error(f"Error modifying meal plan {meal_plan_id} for user {user_id}: {str(e)}")
         return {
             "status": "error",
@@ -749,9 +734,7 @@ def get_meal_details(meal_id: int) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Error getting meal details: {str(e)}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_meal_details", "traceback": traceback.format_exc()})
+        report_error(e, "get_meal_details")
         return {
             "status": "error",
             "message": f"Failed to get meal details"
@@ -786,9 +769,7 @@ def get_meal_plan_meals_info(user_id: int, meal_plan_id: int) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"Error getting meal plan meals info: {str(e)}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_meal_plan_meals_info", "traceback": traceback.format_exc()})
+        report_error(e, "get_meal_plan_meals_info")
         return {
             "status": "error",
             "message": f"Failed to get meal plan meals info"
@@ -812,9 +793,7 @@ def get_meal_plan(user_id: int, meal_plan_id: int = None) -> Dict[str, Any]:
         return _util_get_meal_plan(req)
     except Exception as e:
         logger.error(f"get_meal_plan error for user {user_id}: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_meal_plan", "traceback": traceback.format_exc()})
+        report_error(e, "get_meal_plan")
         return {"status": "error", "message": f"Failed to get meal plan"}
 
 # @deprecated Legacy meal-plan helper guarded by LEGACY_MEAL_PLAN.
@@ -850,9 +829,7 @@ def list_user_meal_plans(user_id: int) -> Dict[str, Any]:
         }
     except Exception as e:
         logger.error(f"list_user_meal_plans error for user {user_id}: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"list_user_meal_plans", "traceback": traceback.format_exc()})
+        report_error(e, "list_user_meal_plans")
         return {"status": "error", "message": f"Failed to list user meal plans"}
 
 # @deprecated Legacy meal-plan helper guarded by LEGACY_MEAL_PLAN.
@@ -908,9 +885,7 @@ def email_generate_meal_instructions(user_id: int, meal_plan_id: int, day: str =
         
     except Exception as e:
         logger.error(f"Error generating instructions for meal plan {meal_plan_id}: {str(e)}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"email_generate_meal_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "email_generate_meal_instructions")
         return {
             "status": "error",
             "message": f"Failed to generate instructions"
@@ -932,9 +907,7 @@ def list_upcoming_meals(user_id: int) -> dict:
         return _util_list_upcoming_meals(req)
     except Exception as e:
         logger.error(f"list_upcoming_meals error for user {user_id}: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"list_upcoming_meals", "traceback": traceback.format_exc()})
+        report_error(e, "list_upcoming_meals")
         return {"status": "error", "message": f"Failed to list upcoming meals"}
 
 def find_nearby_supermarkets(user_id: int) -> dict:
@@ -948,9 +921,7 @@ def find_nearby_supermarkets(user_id: int) -> dict:
         return _util_find_nearby_supermarkets(req)
     except Exception as e:
         logger.error(f"find_nearby_supermarkets error for user_id {user_id}: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"find_nearby_supermarkets", "traceback": traceback.format_exc()})
+        report_error(e, "find_nearby_supermarkets")
         return {"status": "error", "message": f"Failed to find nearby supermarkets"}
 
 def stream_meal_instructions(
@@ -980,9 +951,7 @@ def stream_meal_instructions(
         )
     except Exception as e:
         logger.error(f"Error in stream_meal_instructions for meal plan {meal_plan_id}: {str(e)}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"stream_meal_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "stream_meal_instructions")
         return {
             "status": "error",
             "message": f"Failed to generate streaming instructions"
@@ -1012,9 +981,7 @@ def stream_bulk_prep_instructions(
         }
     except Exception as e:
         logger.error(f"Error generating bulk prep instructions: {str(e)}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"stream_bulk_prep_instructions", "traceback": traceback.format_exc()})
+        report_error(e, "stream_bulk_prep_instructions")
         return {
             "status": "error",
             "message": f"Failed to generate bulk prep instructions"
@@ -1066,9 +1033,7 @@ def get_meal_macro_info(meal_id: int) -> Dict[str, Any]:
         return {"status": "error", "message": f"Meal {meal_id} not found."}
     except Exception as e:
         logger.error(f"get_meal_macro_info error: {e}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_meal_macro_info", "traceback": traceback.format_exc()})
+        report_error(e, "get_meal_macro_info")
         return {"status": "error", "message": f"Failed to get meal macro info"}
 
 def find_related_youtube_videos(meal_id: int, max_results: int = 5) -> Dict[str, Any]:
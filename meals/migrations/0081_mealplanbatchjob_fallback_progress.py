@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-16 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meals', '0080_add_lead_to_chef_meal_plan'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mealplanbatchjob',
+            name='fallback_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mealplanbatchjob',
+            name='fallback_completed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mealplanbatchjob',
+            name='fallback_failed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mealplanbatchjob',
+            name='fallback_skipped',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='mealplanbatchjob',
+            name='fallback_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mealplanbatchjob',
+            name='fallback_finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-16 18:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meals', '0081_mealplanbatchjob_fallback_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stripeconnectaccount',
+            name='payments_synced_through',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='stripeconnectaccount',
+            name='last_synced_payment_id',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
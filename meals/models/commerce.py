@@ -175,6 +175,10 @@ class StripeConnectAccount(models.Model):
     chef = models.OneToOneField('chefs.Chef', on_delete=models.CASCADE, related_name='stripe_account')
     stripe_account_id = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
+    # High-water mark for sync_recent_payments: creation time and id of the
+    # newest PaymentIntent already reconciled for this account
+    payments_synced_through = models.DateTimeField(null=True, blank=True)
+    last_synced_payment_id = models.CharField(max_length=255, blank=True, default='')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
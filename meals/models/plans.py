@@ -318,6 +318,13 @@ class MealPlanBatchJob(models.Model):
     output_file_id = models.CharField(max_length=100, blank=True, null=True)
     error_file_id = models.CharField(max_length=100, blank=True, null=True)
     failure_reason = models.TextField(blank=True, null=True)
+    # Synchronous fallback progress (meals.services.meal_plan_fanout)
+    fallback_total = models.PositiveIntegerField(default=0)
+    fallback_completed = models.PositiveIntegerField(default=0)
+    fallback_failed = models.PositiveIntegerField(default=0)
+    fallback_skipped = models.PositiveIntegerField(default=0)
+    fallback_started_at = models.DateTimeField(blank=True, null=True)
+    fallback_finished_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -366,6 +373,11 @@ class MealPlanBatchJob(models.Model):
             self.failure_reason = reason
         self.save(update_fields=["status", "failure_reason", "updated_at"])
 
+    @property
+    def fallback_remaining(self) -> int:
+        done = self.fallback_completed + self.fallback_failed + self.fallback_skipped
+        return max(0, self.fallback_total - done)
+
     def pending_user_ids(self):
         return list(
             self.requests.filter(status=MealPlanBatchRequest.STATUS_PENDING).values_list("user_id", flat=True)
@@ -8,8 +8,6 @@ connecting them to the existing pantry management functionality in the applicati
 import json
 import logging
 import os
-import requests
-import traceback
 from datetime import datetime, timedelta, timezone as py_tz
 from typing import Dict, List, Optional, Any, Union
 from shared.utils import generate_user_context
@@ -31,9 +29,9 @@ except Exception:
 from django.conf import settings
 from pydantic import ValidationError
 from meals.serializers import PantryItemSerializer
+from utils.error_reporting import report_error
 
 logger = logging.getLogger(__name__)
-n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
 
 # Lazy Groq client factory
 def _get_groq_client():
@@ -221,8 +219,7 @@ def check_pantry_items(user_id: int, item_type: str = None) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_pantry_items", "traceback": traceback.format_exc()})
+        report_error(e, "check_pantry_items")
         return {
             "status": "error",
             "message": f"Failed to check pantry items"
@@ -299,8 +296,7 @@ def add_pantry_item(user_id: int, item_name: str, quantity: float, item_type: st
             }
             
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"add_pantry_item", "traceback": traceback.format_exc()})
+        report_error(e, "add_pantry_item")
         return {
             "status": "error",
             "message": f"Failed to add pantry item"
@@ -343,8 +339,7 @@ def get_expiring_items(user_id: int, days: int = 7) -> Dict[str, Any]:
         }
         
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"get_expiring_items", "traceback": traceback.format_exc()})
+        report_error(e, "get_expiring_items")
         return {
             "status": "error",
             "message": f"Failed to get expiring items"
@@ -608,9 +603,7 @@ def generate_shopping_list(user_id: int, meal_plan_id: int):
             )
             shopping_list_raw = groq_resp.choices[0].message.content or "{}"
     except Exception as e:
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_shopping_list", "traceback": traceback.format_exc()})
+        report_error(e, "generate_shopping_list")
         raise ValueError("Failed to generate shopping list.") from e
 
     # --- 3. Validate & persist ----------------------------------------------
@@ -619,8 +612,7 @@ def generate_shopping_list(user_id: int, meal_plan_id: int):
         # validate with Pydantic (raises if invalid)
         ShoppingListSchema(**shopping_list_dict)
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_shopping_list", "traceback": traceback.format_exc()})
+        report_error(e, "generate_shopping_list")
         raise ValueError("OpenAI returned invalid shopping list JSON.") from e
 
     # Store (creates or updates) but do *not* email
@@ -749,8 +741,7 @@ def determine_items_to_replenish(user_id: int):
             )
             raw = groq_resp.choices[0].message.content or "{}"
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"determine_items_to_replenish", "traceback": traceback.format_exc()})
+        report_error(e, "determine_items_to_replenish")
         return {"status": "error", "message": "Failed to generate recommendations."}
 
     # Validate
@@ -828,8 +819,7 @@ def set_emergency_supply_goal(user_id: int, days: int, household_member_count: i
             "household_member_count": servings_int
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"set_emergency_supply_goal", "traceback": traceback.format_exc()})
+        report_error(e, "set_emergency_supply_goal")
         return {
             "status": "error",
             "message": "Failed to update emergency supply goal."
@@ -8,8 +8,6 @@ connecting them to the existing payment processing functionality in the applicat
 import json
 import logging
 import uuid
-import requests
-import traceback
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Union
@@ -32,11 +30,11 @@ from meals.utils.stripe_utils import (
 )
 from meals.pydantic_models import PaymentInfoSchema
 from decimal import Decimal
+from utils.error_reporting import report_error
 # Set the Stripe API key
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
 logger = logging.getLogger(__name__)
-n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
 # Helper function to convert Decimal values to float
 def decimal_to_float(obj):
     if isinstance(obj, Decimal):
@@ -358,12 +356,11 @@ def generate_payment_link(user_id: int, order_id: int) -> Dict[str, Any]:
 
     except stripe.error.StripeError as se:
         # n8n traceback
-        requests.post(n8n_traceback_url, json={"error": str(se), "source":"generate_payment_link", "traceback": traceback.format_exc()})
+        report_error(se, "generate_payment_link")
         logger.error(f"Stripe error (order {order_id}): {se}", exc_info=True)
         return {"status": "error", "message": f"Stripe error: {se}"}
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"generate_payment_link", "traceback": traceback.format_exc()})
+        report_error(e, "generate_payment_link")
         return {"status": "error", "message": f"Failed to generate payment link"}
     
 def cancel_order(user_id: int, order_id: int, reason: str = None) -> Dict[str, Any]:
@@ -463,8 +460,7 @@ def cancel_order(user_id: int, order_id: int, reason: str = None) -> Dict[str, A
     except Order.DoesNotExist:
         return { "status": "error", "message": f"Order with ID {order_id} not found for user {user_id}."}
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"cancel_order", "traceback": traceback.format_exc()})
+        report_error(e, "cancel_order")
         return {
             "status": "error",
             "message": f"Failed to cancel order"
@@ -527,8 +523,7 @@ def check_payment_status(user_id: int, order_id: int) -> Dict[str, Any]:
             "message": f"Stripe error: {str(e)}"
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"check_payment_status", "traceback": traceback.format_exc()})
+        report_error(e, "check_payment_status")
         return {
             "status": "error",
             "message": f"Failed to check payment status: {str(e)}"
@@ -623,8 +618,7 @@ def process_refund(user_id: int, order_id: int, reason: str, amount: float = Non
             "message": f"Stripe error: {str(e)}"
         }
     except Exception as e:
-        # Send traceback to N8N via webhook at N8N_TRACEBACK_URL 
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"process_refund", "traceback": traceback.format_exc()})
+        report_error(e, "process_refund")
         return {
             "status": "error",
             "message": f"Failed to process refund"
@@ -0,0 +1,105 @@
+"""
+Versioned cache for the fragments that make up the assistant system prompt.
+
+Each fragment (user context, chat summary, weekly announcement, local chef
+events) is stored under a key that embeds the current version of every
+scope it depends on. Signal handlers bump a scope's version when the rows
+behind it change, so stale fragments are never read again and simply age
+out; nothing has to enumerate or delete keys.
+
+Scopes:
+    user:<id>      profile, address, dietary preferences (and the definitions of
+                   the user's custom ones), household, chat summary
+    area:<postal>  chef meal events served to a postal code
+    global         weekly announcements and system updates
+
+Because fragments only change when their inputs do, the assembled prompt is
+byte-for-byte identical across turns, which keeps the provider's prompt
+prefix cache warm.
+"""
+
+import hashlib
+import logging
+import time
+from typing import Any, Callable, Iterable, Sequence
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "prompt_ctx:v1"
+
+# Fragments are invalidated by version bumps; the TTL only bounds memory.
+FRAGMENT_TTL = getattr(settings, "PROMPT_CONTEXT_TTL", 60 * 60 * 24)
+# Upcoming events also drop out as order cutoffs pass, so keep them short-lived.
+EVENTS_TTL = getattr(settings, "PROMPT_CONTEXT_EVENTS_TTL", 60 * 15)
+
+GLOBAL_SCOPE = "global"
+
+
+def user_scope(user_id) -> str:
+    return f"user:{user_id}"
+
+
+def area_scope(postal_code: str) -> str:
+    return f"area:{postal_code}"
+
+
+def _version_key(scope: str) -> str:
+    return f"{KEY_PREFIX}:ver:{scope}"
+
+
+def _versions(scopes: Sequence[str]) -> list[int]:
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        if version is None:
+            # Seed from the clock rather than 0 so that a version key evicted
+            # from the cache can never resurrect fragments built under an
+            # earlier version.
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        versions.append(version)
+    return versions
+
+
+def bump(*scopes: str) -> None:
+    """Invalidate every fragment that depends on any of ``scopes``."""
+    for scope in scopes:
+        key = _version_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+        except Exception as e:
+            logger.warning(f"Failed to bump prompt context version for {scope}: {e}")
+
+
+def bump_areas(postal_codes: Iterable[str]) -> None:
+    bump(*(area_scope(code) for code in postal_codes if code))
+
+
+def fragment(name: str, scopes: Sequence[str], build: Callable[[], Any], timeout: int = FRAGMENT_TTL) -> Any:
+    """
+    Return the cached value of a prompt fragment, building it on a miss.
+
+    ``name`` identifies the fragment within its scopes (e.g. "user_ctx");
+    values must be picklable. Cache failures fall back to building the
+    fragment directly.
+    """
+    try:
+        versions = _versions(scopes)
+    except Exception as e:
+        logger.warning(f"Prompt context cache unavailable for {name}: {e}")
+        return build()
+
+    raw = ":".join(f"{scope}={version}" for scope, version in zip(scopes, versions))
+    key = f"{KEY_PREFIX}:{name}:{hashlib.sha1(raw.encode()).hexdigest()}"
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
@@ -0,0 +1,196 @@
+"""Batched dietary compatibility evaluation for meal selection.
+
+Resolves (meal, preference) compatibility for a whole candidate pool with a
+bounded number of queries:
+
+1. Explicit tags are read from a prefetched in-memory map.
+2. Cached ``MealCompatibility`` rows for every candidate are loaded in one query.
+3. Cache misses are sent to the LLM concurrently and bulk-inserted.
+
+Usage::
+
+    engine = DietaryCompatibilityEngine(user)
+    verdicts = engine.evaluate(meals)
+    compatible = [m for m in meals if verdicts[m.id].is_compatible]
+"""
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.db.models import prefetch_related_objects
+
+from meals.models import Meal, MealCompatibility
+
+logger = logging.getLogger(__name__)
+
+EVERYTHING_PREFERENCE = "Everything"
+DEFAULT_MIN_CONFIDENCE = 0.7
+
+# Upper bound on concurrent LLM compatibility calls. The shared Groq budget in
+# utils.groq_rate_limit still applies on top of this.
+MAX_ANALYSIS_WORKERS = int(os.getenv("COMPATIBILITY_MAX_WORKERS", "8"))
+
+
+@dataclass
+class CompatibilityVerdict:
+    """Aggregated result for one meal across all of a user's preferences."""
+
+    is_compatible: bool = True
+    reasons: List[str] = field(default_factory=list)
+    failed_preference: Optional[str] = None
+
+
+class DietaryCompatibilityEngine:
+    """Evaluate a pool of meals against one user's dietary preferences."""
+
+    def __init__(
+        self,
+        user,
+        *,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        analyzer: Optional[Callable[[Meal, str], Dict]] = None,
+        max_workers: int = MAX_ANALYSIS_WORKERS,
+    ):
+        self.user = user
+        self.min_confidence = min_confidence
+        self.max_workers = max(1, max_workers)
+        self._analyzer = analyzer
+
+        regular = list(user.dietary_preferences.all())
+        custom = list(user.custom_dietary_preferences.all())
+        self.accepts_everything = (
+            len(regular) == 1 and regular[0].name == EVERYTHING_PREFERENCE and not custom
+        )
+        # "Everything" is ignored as soon as the user has anything more specific
+        self.regular_names = [p.name for p in regular if p.name != EVERYTHING_PREFERENCE]
+        self.custom_names = [p.name for p in custom]
+
+    @property
+    def preference_names(self) -> List[str]:
+        return self.regular_names + self.custom_names
+
+    @property
+    def has_restrictions(self) -> bool:
+        return not self.accepts_everything and bool(self.preference_names)
+
+    def evaluate(self, meals: Iterable[Meal]) -> Dict[int, CompatibilityVerdict]:
+        """Return a verdict per meal id for every meal in ``meals``."""
+        meals = list(meals)
+        if not meals:
+            return {}
+        if not self.has_restrictions:
+            reason = f"Compatible with '{EVERYTHING_PREFERENCE}' preference"
+            return {m.id: CompatibilityVerdict(reasons=[reason]) for m in meals}
+
+        prefetch_related_objects(meals, "dietary_preferences", "custom_dietary_preferences")
+        results = self._load_cached(meals)
+
+        misses: List[Tuple[Meal, str]] = []
+        for meal in meals:
+            regular_tags = {p.name for p in meal.dietary_preferences.all()}
+            custom_tags = {p.name for p in meal.custom_dietary_preferences.all()}
+            for name in self.regular_names:
+                if name in regular_tags:
+                    results[(meal.id, name)] = self._tagged(name)
+            for name in self.custom_names:
+                if name in custom_tags:
+                    results[(meal.id, name)] = self._tagged(name)
+            misses.extend(
+                (meal, name) for name in self.preference_names if (meal.id, name) not in results
+            )
+
+        if misses:
+            results.update(self._analyze_misses(misses))
+
+        return {meal.id: self._verdict(meal, results) for meal in meals}
+
+    def compatible_meals(self, meals: Iterable[Meal]) -> List[Meal]:
+        """Filter ``meals`` down to the compatible ones, preserving order.
+
+        Each returned meal carries its reasons on ``meal.compatibility_reasons``.
+        """
+        meals = list(meals)
+        verdicts = self.evaluate(meals)
+        compatible = []
+        for meal in meals:
+            verdict = verdicts[meal.id]
+            if verdict.is_compatible:
+                meal.compatibility_reasons = verdict.reasons
+                compatible.append(meal)
+        return compatible
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _tagged(name: str) -> Dict:
+        return {
+            "is_compatible": True,
+            "confidence": 1.0,
+            "reasoning": f"Explicitly tagged as {name}",
+        }
+
+    def _load_cached(self, meals: Sequence[Meal]) -> Dict[Tuple[int, str], Dict]:
+        rows = MealCompatibility.objects.filter(
+            meal_id__in=[m.id for m in meals],
+            preference_name__in=self.preference_names,
+        ).values_list("meal_id", "preference_name", "is_compatible", "confidence", "reasoning")
+        return {
+            (meal_id, name): {
+                "is_compatible": is_compatible,
+                "confidence": confidence,
+                "reasoning": reasoning,
+            }
+            for meal_id, name, is_compatible, confidence, reasoning in rows
+        }
+
+    def _analyze_misses(self, misses: Sequence[Tuple[Meal, str]]) -> Dict[Tuple[int, str], Dict]:
+        analyzer = self._analyzer
+        if analyzer is None:
+            from meals.meal_plan_service import analyze_meal_compatibility
+
+            analyzer = analyze_meal_compatibility
+
+        # The analyzer walks dishes and ingredients; load them here so worker
+        # threads never touch the database.
+        prefetch_related_objects(list({m.id: m for m, _ in misses}.values()), "dishes__ingredients")
+
+        workers = min(self.max_workers, len(misses))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(lambda item: analyzer(item[0], item[1]), misses))
+
+        analyzed: Dict[Tuple[int, str], Dict] = {}
+        rows = []
+        for (meal, name), result in zip(misses, outcomes):
+            result = result or {}
+            analyzed[(meal.id, name)] = result
+            rows.append(
+                MealCompatibility(
+                    meal=meal,
+                    preference_name=name,
+                    is_compatible=result.get("is_compatible", False),
+                    confidence=result.get("confidence", 0.0),
+                    reasoning=result.get("reasoning", ""),
+                )
+            )
+        try:
+            MealCompatibility.objects.bulk_create(rows, ignore_conflicts=True)
+        except Exception as exc:
+            logger.error("Failed to cache %s compatibility analyses: %s", len(rows), exc)
+        return analyzed
+
+    def _verdict(self, meal: Meal, results: Dict[Tuple[int, str], Dict]) -> CompatibilityVerdict:
+        verdict = CompatibilityVerdict()
+        for name in self.preference_names:
+            result = results.get((meal.id, name), {})
+            if not result.get("is_compatible", False) or result.get("confidence", 0.0) < self.min_confidence:
+                verdict.is_compatible = False
+                verdict.failed_preference = name
+                verdict.reasons = [result.get("reasoning", "No reason provided")]
+                return verdict
+            verdict.reasons.append(result.get("reasoning", ""))
+        return verdict
@@ -0,0 +1,77 @@
+"""Embedding-based diversity filtering for meal candidates.
+
+Keeps candidate meals that are not too similar to meals already in a plan.
+Candidate and existing embeddings are stacked into L2-normalized matrices
+once, so the whole similarity check is a single matrix product instead of a
+Python loop over (candidate, existing) pairs.
+"""
+from __future__ import annotations
+
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_SIMILARITY = 0.8
+
+
+def _normalized_matrix(vectors: Sequence, dims: Optional[int] = None):
+    """Stack ``vectors`` into a row-normalized float32 matrix.
+
+    Returns ``(matrix, valid_mask)``. Rows that are missing or whose length
+    does not match ``dims`` are marked invalid and left as zeros. Zero-norm
+    rows stay zero, so they score 0.0 against everything.
+    """
+    if dims is None:
+        dims = next((len(v) for v in vectors if v is not None), 0)
+    matrix = np.zeros((len(vectors), dims), dtype=np.float32)
+    valid = np.zeros(len(vectors), dtype=bool)
+    for i, vec in enumerate(vectors):
+        if vec is None or len(vec) != dims:
+            continue
+        matrix[i] = np.asarray(vec, dtype=np.float32)
+        valid[i] = True
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix, valid
+
+
+def filter_diverse_meals(
+    meals: Sequence,
+    existing_embeddings: Sequence,
+    min_similarity: float = DEFAULT_MIN_SIMILARITY,
+) -> List:
+    """Return the meals from ``meals`` that are dissimilar to every existing embedding.
+
+    Order of ``meals`` is preserved, so callers can pass them in priority
+    order. Meals without an embedding are always kept; meals whose embedding
+    has the wrong dimensionality are dropped.
+    """
+    meals = list(meals)
+    existing = [e for e in (existing_embeddings or []) if e is not None and len(e) > 0]
+    if not meals or not existing:
+        return meals
+
+    existing_matrix, existing_valid = _normalized_matrix(existing)
+    existing_matrix = existing_matrix[existing_valid]
+    if existing_matrix.shape[0] == 0:
+        return meals
+
+    with_embedding = [i for i, m in enumerate(meals) if m.meal_embedding is not None]
+    if not with_embedding:
+        return meals
+
+    candidate_matrix, candidate_valid = _normalized_matrix(
+        [meals[i].meal_embedding for i in with_embedding],
+        dims=existing_matrix.shape[1],
+    )
+    max_similarity = (candidate_matrix @ existing_matrix.T).max(axis=1)
+    rejected = {
+        with_embedding[row]
+        for row in np.flatnonzero(~candidate_valid | (max_similarity >= min_similarity))
+    }
+    if rejected:
+        logger.debug("Diversity filter rejected %s of %s candidate meals", len(rejected), len(meals))
+    return [meal for i, meal in enumerate(meals) if i not in rejected]
@@ -27,6 +27,7 @@ from meals.models import (
 )
 from meals.meal_generation import determine_usage_for_meal
 from meals.services.meal_plan_batching import MealPlanBatchRequestBuilder, generate_batch_entries
+from meals.services.meal_plan_fanout import generate_plans_concurrently
 from pydantic import BaseModel, Field, ValidationError, ConfigDict
 
 logger = logging.getLogger(__name__)
@@ -98,10 +99,13 @@ def submit_weekly_batch(
     week_end: date,
     completion_window: str = "24h",
     request_id: Optional[str] = None,
+    defer_fallback: bool = False,
 ) -> Optional[MealPlanBatchJob]:
     """Submit a Groq batch covering all auto-enabled users.
 
     Returns the persisted job or ``None`` when we fall back to synchronous generation.
+    With ``defer_fallback`` the fallback is left to the caller instead of
+    generating every user's plan inline.
     """
     # Check if a batch job already exists for this week to prevent duplicates
     existing_job = MealPlanBatchJob.objects.filter(
@@ -137,7 +141,8 @@ def submit_weekly_batch(
     groq_client = _get_groq_client()
     if not groq_client:
         logger.warning("Groq client unavailable; falling back to synchronous weekly generation")
-        _schedule_synchronous_generation(users, week_start, week_end)
+        if not defer_fallback:
+            _schedule_synchronous_generation(users, week_start, week_end)
         return None
 
     try:
@@ -166,7 +171,8 @@ def submit_weekly_batch(
             raise RuntimeError("Groq batches.create response missing id")
     except Exception as exc:
         logger.exception("Failed to submit Groq batch: %s", exc)
-        _schedule_synchronous_generation(users, week_start, week_end)
+        if not defer_fallback:
+            _schedule_synchronous_generation(users, week_start, week_end)
         return None
     finally:
         try:
@@ -266,19 +272,62 @@ def _eligible_users() -> Iterable[CustomUser]:
     return CustomUser.objects.filter(auto_meal_plans_enabled=True, is_active=True)
 
 
+def users_missing_weekly_plan(week_start: date, after_user_id: int = 0):
+    """Eligible users, in id order past ``after_user_id``, with no plan for the week yet."""
+    return (
+        _eligible_users()
+        .filter(id__gt=after_user_id)
+        .exclude(mealplan__week_start_date=week_start)
+        .order_by("id")
+    )
+
+
 def _schedule_synchronous_generation(
     users: Sequence[CustomUser],
     week_start: date,
     week_end: date,
+    job: Optional[MealPlanBatchJob] = None,
 ) -> None:
-    from meals.meal_plan_service import create_meal_plan_for_user
+    from api import job_queue
+
+    user_ids = [user.id for user in users]
+    if job_queue.worker_backend_enabled():
+        enqueue_weekly_generation(user_ids, week_start, week_end)
+        return
+
+    result = generate_plans_concurrently(user_ids, week_start, week_end, job=job)
+    if result.deferred:
+        logger.warning(
+            "Fallback request budget exhausted; %d users left without a plan for week %s",
+            len(result.deferred),
+            week_start,
+        )
+
 
-    for user in users:
-        create_meal_plan_for_user(
-            user_id=user.id,
-            start_of_week=week_start,
-            end_of_week=week_end,
+def enqueue_weekly_generation(user_ids: Sequence[int], week_start: date, week_end: date) -> int:
+    """Queue one worker-pool job per user; users already queued for the week are skipped."""
+    from api import job_queue
+
+    for user_id in user_ids:
+        job_queue.enqueue(
+            "meals.services.meal_plan_batch_service.generate_weekly_plan_job",
+            {"user_id": user_id, "week_start": week_start.isoformat(), "week_end": week_end.isoformat()},
+            concurrency_key="meal_plan",
+            dedupe_key=f"meal_plan:{user_id}:{week_start.isoformat()}",
         )
+    logger.info("Queued weekly meal plan generation for %d users (week %s-%s)", len(user_ids), week_start, week_end)
+    return len(user_ids)
+
+
+def generate_weekly_plan_job(user_id: int, week_start: str, week_end: str) -> None:
+    """Worker-pool entry point for one user's fallback weekly plan."""
+    from meals.meal_plan_service import create_meal_plan_for_user
+
+    create_meal_plan_for_user(
+        user_id=user_id,
+        start_of_week=date.fromisoformat(week_start),
+        end_of_week=date.fromisoformat(week_end),
+    )
 
 
 def _schedule_fallback_for_requests(job: MealPlanBatchJob, user_ids: Optional[Sequence[int]] = None) -> None:
@@ -289,7 +338,7 @@ def _schedule_fallback_for_requests(job: MealPlanBatchJob, user_ids: Optional[Se
         completed_at=timezone.now(),
     )
     users = CustomUser.objects.filter(id__in=user_ids)
-    _schedule_synchronous_generation(list(users), job.week_start_date, job.week_end_date)
+    _schedule_synchronous_generation(list(users), job.week_start_date, job.week_end_date, job=job)
 
 
 def _mark_job_failed_and_fallback(job: MealPlanBatchJob, reason: str) -> None:
@@ -0,0 +1,220 @@
+"""Bounded-concurrency fan-out for fallback weekly meal plan generation.
+
+When a Groq batch fails or leaves users behind, each affected user's plan is
+generated synchronously with ``create_meal_plan_for_user``. Doing that one
+user at a time turns a single failed batch into hours of serial LLM calls,
+so ``generate_plans_concurrently`` runs them on a thread pool instead:
+
+- at most ``max_workers`` generations run at once;
+- a shared ``RequestBudget`` paces how many generations may start per minute
+  and optionally caps the total, so throughput follows the provider's rate
+  limit rather than the pool size;
+- each user is claimed with the same ``meal_plan_generation_lock_*`` Redis
+  key the API views use, so a plan already being generated elsewhere is
+  skipped instead of duplicated;
+- progress is counted on the ``MealPlanBatchJob`` when one is given.
+
+Worker threads open their own database connection and close it when the
+user is done.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Callable, List, Optional, Sequence
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from meals.models import MealPlanBatchJob
+from utils.redis_client import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_CONCURRENCY = getattr(settings, "MEAL_PLAN_FALLBACK_CONCURRENCY", 4)
+FALLBACK_REQUESTS_PER_MINUTE = getattr(settings, "MEAL_PLAN_FALLBACK_REQUESTS_PER_MINUTE", 30)
+FALLBACK_MAX_REQUESTS = getattr(settings, "MEAL_PLAN_FALLBACK_MAX_REQUESTS", None)
+# Matches the lock lifetime used by the streaming generation endpoint
+GENERATION_LOCK_TTL = 7200
+
+
+def generation_lock_key(user_id: int, week_start: date) -> str:
+    return f"meal_plan_generation_lock_{user_id}_{week_start.strftime('%Y_%m_%d')}"
+
+
+class RequestBudget:
+    """Token bucket shared by the fan-out threads.
+
+    ``per_minute`` generations may start each minute (bursting up to
+    ``burst``), and no more than ``total`` over the bucket's lifetime.
+    """
+
+    def __init__(
+        self,
+        per_minute: float,
+        total: Optional[int] = None,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, min(per_minute, FALLBACK_CONCURRENCY))
+        self.total = total
+        self.used = 0
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """Block until a generation may start; False once the budget or deadline is spent."""
+        while True:
+            with self._lock:
+                if self.total is not None and self.used >= self.total:
+                    return False
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self.used += 1
+                    return True
+                wait = (1 - self._tokens) / self.rate if self.rate > 0 else None
+            if wait is None or (deadline is not None and self._clock() + wait > deadline):
+                return False
+            self._sleep(wait)
+
+
+def default_budget() -> RequestBudget:
+    return RequestBudget(FALLBACK_REQUESTS_PER_MINUTE, total=FALLBACK_MAX_REQUESTS)
+
+
+@dataclass
+class FanOutResult:
+    completed: List[int] = field(default_factory=list)
+    failed: List[int] = field(default_factory=list)
+    # Another request already holds the user's generation lock
+    skipped: List[int] = field(default_factory=list)
+    # Not started because the budget or deadline ran out; safe to retry later
+    deferred: List[int] = field(default_factory=list)
+
+
+def _claim_user(user_id: int, week_start: date) -> Optional[bool]:
+    """Take the user's generation lock. None means Redis is unavailable."""
+    conn = get_redis_connection()
+    if conn is None:
+        return None
+    return bool(conn.set(
+        generation_lock_key(user_id, week_start),
+        f"meal_plan_generation_{user_id}_{week_start.strftime('%Y_%m_%d')}",
+        nx=True,
+        ex=GENERATION_LOCK_TTL,
+    ))
+
+
+def _release_user(user_id: int, week_start: date) -> None:
+    try:
+        from utils.redis_client import delete
+
+        delete(generation_lock_key(user_id, week_start))
+    except Exception as exc:
+        logger.warning("Failed to release generation lock for user %s: %s", user_id, exc)
+
+
+def _record_progress(job_id: Optional[int], **increments: int) -> None:
+    if job_id is None:
+        return
+    MealPlanBatchJob.objects.filter(pk=job_id).update(
+        **{name: F(name) + n for name, n in increments.items()},
+        updated_at=timezone.now(),
+    )
+
+
+def generate_plans_concurrently(
+    user_ids: Sequence[int],
+    week_start: date,
+    week_end: date,
+    *,
+    job: Optional[MealPlanBatchJob] = None,
+    max_workers: Optional[int] = None,
+    budget: Optional[RequestBudget] = None,
+    deadline: Optional[float] = None,
+) -> FanOutResult:
+    """Generate each user's weekly plan on a bounded thread pool.
+
+    ``deadline`` is a ``time.monotonic()`` value; users not started by then
+    are returned as deferred, as are users beyond the budget's total.
+    """
+    from meals.meal_plan_service import create_meal_plan_for_user
+
+    user_ids = list(dict.fromkeys(user_ids))
+    result = FanOutResult()
+    if not user_ids:
+        return result
+
+    budget = budget or default_budget()
+    job_id = job.pk if job is not None else None
+    result_lock = threading.Lock()
+
+    if job_id is not None:
+        MealPlanBatchJob.objects.filter(pk=job_id, fallback_started_at__isnull=True).update(
+            fallback_started_at=timezone.now()
+        )
+        _record_progress(job_id, fallback_total=len(user_ids))
+
+    def finish(user_id: int, outcome: str) -> None:
+        with result_lock:
+            getattr(result, outcome).append(user_id)
+        if outcome != "deferred":
+            _record_progress(job_id, **{f"fallback_{outcome}": 1})
+
+    def generate(user_id: int) -> None:
+        if deadline is not None and time.monotonic() >= deadline:
+            return finish(user_id, "deferred")
+        if not budget.acquire(deadline):
+            return finish(user_id, "deferred")
+
+        close_old_connections()
+        try:
+            claimed = _claim_user(user_id, week_start)
+            if claimed is False:
+                logger.info("Skipping fallback plan for user %s: generation already in progress", user_id)
+                return finish(user_id, "skipped")
+            try:
+                plan = create_meal_plan_for_user(
+                    user_id=user_id,
+                    start_of_week=week_start,
+                    end_of_week=week_end,
+                )
+            finally:
+                _release_user(user_id, week_start)
+            finish(user_id, "completed" if plan is not None else "failed")
+        except Exception as exc:
+            logger.exception("Fallback plan generation failed for user %s: %s", user_id, exc)
+            finish(user_id, "failed")
+        finally:
+            connection.close()
+
+    workers = max(1, min(max_workers or FALLBACK_CONCURRENCY, len(user_ids)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="meal-plan-fallback") as pool:
+        list(pool.map(generate, user_ids))
+
+    if job_id is not None and not result.deferred:
+        MealPlanBatchJob.objects.filter(pk=job_id).update(fallback_finished_at=timezone.now())
+
+    logger.info(
+        "Fallback generation for week %s: %d completed, %d failed, %d skipped, %d deferred",
+        week_start,
+        len(result.completed),
+        len(result.failed),
+        len(result.skipped),
+        len(result.deferred),
+    )
+    return result
@@ -0,0 +1,287 @@
+"""Bulk refunds for chef meal price adjustments.
+
+When more customers order a meal share its price drops, and everyone who paid
+more than the final price is refunded the difference once the event is
+completed. The engine runs in three steps:
+
+1. ``pending_adjustments`` computes the refund for every unprocessed order in
+   one annotated query;
+2. ``issue_refunds`` calls Stripe for each refund on a bounded thread pool.
+   Every call carries a deterministic idempotency key derived from the order
+   and the final price, so a run that times out and is retried gets the
+   original refund back from Stripe instead of refunding twice;
+3. ``record_outcomes`` marks the orders with ``bulk_update`` and writes the
+   ``PaymentLog`` rows with ``bulk_create``. Bulk writes skip the dashboard
+   metrics signals, so it refreshes the affected chef-days itself.
+
+``refund_create`` defaults to ``stripe.Refund.create``; tests pass a local
+stand-in with the same signature.
+"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import stripe
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, F
+from django.utils import timezone
+
+from meals.models import STATUS_COMPLETED, ChefMealOrder, PaymentLog
+
+logger = logging.getLogger(__name__)
+
+# Refunds below this aren't worth the transaction fees
+MIN_REFUND_AMOUNT = Decimal("0.50")
+REFUND_CONCURRENCY = getattr(settings, "PRICE_ADJUSTMENT_REFUND_CONCURRENCY", 8)
+# Refunds issued per round; each round is recorded before the next starts
+REFUND_CHUNK_SIZE = 100
+ELIGIBLE_ORDER_STATUSES = ["placed", "confirmed", "completed"]
+REFUND_REASON = "chef_meal_price_adjustment"
+
+
+@dataclass
+class RefundPlan:
+    order_id: int
+    event_id: int
+    customer_id: int
+    chef_id: int
+    payment_intent_id: str
+    price_paid: Decimal
+    final_price: Decimal
+    amount: Decimal
+
+    @property
+    def amount_cents(self) -> int:
+        return int(self.amount * 100)
+
+    @property
+    def idempotency_key(self) -> str:
+        # Stable across retries of the same adjustment; a different final
+        # price is a different refund and gets a different key.
+        return f"chef-meal-price-adjustment-{self.order_id}-{int(self.final_price * 100)}"
+
+
+@dataclass
+class RefundOutcome:
+    plan: RefundPlan
+    refund_id: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.refund_id is not None
+
+
+def pending_adjustments(since: datetime) -> List[Dict[str, Any]]:
+    """Unprocessed orders on discounted events completed since ``since``, with their refund amount."""
+    return list(
+        ChefMealOrder.objects.filter(
+            meal_event__status=STATUS_COMPLETED,
+            meal_event__updated_at__gte=since,
+            meal_event__base_price__gt=F("meal_event__min_price"),
+            meal_event__current_price__lt=F("meal_event__base_price"),
+            status__in=ELIGIBLE_ORDER_STATUSES,
+            price_adjustment_processed=False,
+        )
+        .annotate(
+            final_price=F("meal_event__current_price"),
+            event_chef_id=F("meal_event__chef_id"),
+            refund_amount=ExpressionWrapper(
+                (F("price_paid") - F("meal_event__current_price")) * F("quantity"),
+                output_field=DecimalField(max_digits=10, decimal_places=2),
+            ),
+        )
+        .order_by("id")
+        .values(
+            "id",
+            "meal_event_id",
+            "customer_id",
+            "event_chef_id",
+            "stripe_payment_intent_id",
+            "price_paid",
+            "final_price",
+            "refund_amount",
+        )
+    )
+
+
+def plan_refunds(rows: Iterable[Dict[str, Any]]) -> Tuple[List[RefundPlan], List[int], List[int]]:
+    """
+    Split annotated order rows into refunds to issue, orders that need no
+    refund (already at or below the final price, or under MIN_REFUND_AMOUNT)
+    and orders that can't be refunded (no payment record).
+    """
+    plans, settled, skipped = [], [], []
+    for row in rows:
+        order_id = row["id"]
+        if not row["stripe_payment_intent_id"] or row["price_paid"] is None:
+            logger.warning(f"Order {order_id} has no payment record, skipping")
+            skipped.append(order_id)
+            continue
+        amount = row["refund_amount"]
+        if amount is None or amount <= 0:
+            settled.append(order_id)
+            continue
+        if amount < MIN_REFUND_AMOUNT:
+            logger.info(f"Skipping small refund of ${amount} for order {order_id}")
+            settled.append(order_id)
+            continue
+        plans.append(RefundPlan(
+            order_id=order_id,
+            event_id=row["meal_event_id"],
+            customer_id=row["customer_id"],
+            chef_id=row["event_chef_id"],
+            payment_intent_id=row["stripe_payment_intent_id"],
+            price_paid=row["price_paid"],
+            final_price=row["final_price"],
+            amount=amount,
+        ))
+    return plans, settled, skipped
+
+
+def _issue(plan: RefundPlan, refund_create: Callable[..., Any]) -> RefundOutcome:
+    try:
+        refund = refund_create(
+            payment_intent=plan.payment_intent_id,
+            amount=plan.amount_cents,
+            reason="duplicate",  # Using "duplicate" as proxy for price adjustment
+            metadata={
+                "reason": REFUND_REASON,
+                "event_id": str(plan.event_id),
+                "order_id": str(plan.order_id),
+                "original_price": str(plan.price_paid),
+                "final_price": str(plan.final_price),
+            },
+            idempotency_key=plan.idempotency_key,
+        )
+        return RefundOutcome(plan, refund_id=refund.id)
+    except stripe.error.StripeError as e:
+        logger.error(f"Stripe error processing refund for order {plan.order_id}: {str(e)}")
+        return RefundOutcome(plan, error=str(e))
+    except Exception as e:
+        logger.error(f"Error processing refund for order {plan.order_id}: {str(e)}", exc_info=True)
+        return RefundOutcome(plan, error=str(e))
+
+
+def issue_refunds(
+    plans: List[RefundPlan],
+    refund_create: Optional[Callable[..., Any]] = None,
+    max_workers: Optional[int] = None,
+) -> List[RefundOutcome]:
+    """Create the Stripe refunds concurrently; outcomes are returned in plan order."""
+    if not plans:
+        return []
+    refund_create = refund_create or stripe.Refund.create
+    workers = max(1, min(max_workers or REFUND_CONCURRENCY, len(plans)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="price-adjustment-refund") as pool:
+        return list(pool.map(lambda plan: _issue(plan, refund_create), plans))
+
+
+def _payment_log(outcome: RefundOutcome) -> PaymentLog:
+    plan = outcome.plan
+    return PaymentLog(
+        chef_meal_order_id=plan.order_id,
+        user_id=plan.customer_id,
+        chef_id=plan.chef_id,
+        action="refund",
+        amount=plan.amount,
+        stripe_id=outcome.refund_id,
+        status="succeeded",
+        details={
+            "refund": outcome.refund_id,
+            "reason": REFUND_REASON,
+            "original_price": str(plan.price_paid),
+            "final_price": str(plan.final_price),
+            "difference": str(plan.amount),
+        },
+    )
+
+
+def record_outcomes(outcomes: List[RefundOutcome], settled_ids: Iterable[int] = ()) -> int:
+    """
+    Persist successful refunds and mark settled orders processed.
+
+    Orders another run already recorded are left alone, so replaying the
+    same outcomes doesn't duplicate PaymentLog rows. Returns the number of
+    refunds recorded.
+    """
+    now = timezone.now()
+    refunded = {outcome.plan.order_id: outcome for outcome in outcomes if outcome.succeeded}
+    with transaction.atomic():
+        if settled_ids:
+            ChefMealOrder.objects.filter(pk__in=list(settled_ids), price_adjustment_processed=False).update(
+                price_adjustment_processed=True,
+                updated_at=now,
+            )
+        if not refunded:
+            return 0
+
+        orders = list(
+            ChefMealOrder.objects.select_for_update()
+            .filter(pk__in=list(refunded), price_adjustment_processed=False)
+        )
+        for order in orders:
+            order.stripe_refund_id = refunded[order.pk].refund_id
+            order.price_adjustment_processed = True
+            order.updated_at = now
+        ChefMealOrder.objects.bulk_update(orders, ["stripe_refund_id", "price_adjustment_processed", "updated_at"])
+
+        logs = PaymentLog.objects.bulk_create([_payment_log(refunded[order.pk]) for order in orders])
+
+    _refresh_metrics(orders, logs)
+    return len(orders)
+
+
+def _refresh_metrics(orders: List[ChefMealOrder], logs: List[PaymentLog]) -> None:
+    """Rebuild the dashboard rollup days the per-row signals would have touched."""
+    from chefs.services.dashboard_metrics import local_day, refresh_chef_day
+
+    chef_ids = {log.chef_meal_order_id: log.chef_id for log in logs}
+    days = {(chef_ids[order.pk], local_day(order.created_at)) for order in orders}
+    days.update((log.chef_id, local_day(log.created_at)) for log in logs)
+    for chef_id, day in sorted(days):
+        refresh_chef_day(chef_id, day)
+
+
+def process_price_adjustments(
+    since: datetime,
+    refund_create: Optional[Callable[..., Any]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Refund every pending price adjustment since ``since``; failed refunds stay pending for the next run."""
+    plans, settled, skipped = plan_refunds(pending_adjustments(since))
+    logger.info(
+        f"Price adjustments: {len(plans)} refunds to issue, {len(settled)} orders need none, "
+        f"{len(skipped)} without payment"
+    )
+    record_outcomes([], settled)
+
+    processed = 0
+    failed = 0
+    total_refunded = Decimal("0.00")
+    for start in range(0, len(plans), REFUND_CHUNK_SIZE):
+        outcomes = issue_refunds(plans[start:start + REFUND_CHUNK_SIZE], refund_create, max_workers)
+        record_outcomes(outcomes)
+        for outcome in outcomes:
+            if outcome.succeeded:
+                logger.info(
+                    f"Processed refund of ${outcome.plan.amount} for order {outcome.plan.order_id} "
+                    f"- Refund ID: {outcome.refund_id}"
+                )
+                processed += 1
+                total_refunded += outcome.plan.amount
+            else:
+                failed += 1
+
+    return {
+        "processed": processed,
+        "total_refunded": str(total_refunded),
+        "failed": failed,
+        "skipped": len(skipped),
+    }
@@ -1,12 +1,13 @@
 # meals/signals.py
-from django.db.models.signals import post_save, m2m_changed, post_delete, pre_save
+from django.db.models.signals import post_save, m2m_changed, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
-from .models import Meal, MealPlan, ChefMealOrder, ChefMealEvent
+from .models import Meal, MealPlan, ChefMealOrder, ChefMealEvent, CustomDietaryPreference, SystemUpdate
 from django.db import transaction
-from customer_dashboard.models import ChatThread, WeeklyAnnouncement, UserMessage
-from custom_auth.models import CustomUser
+from customer_dashboard.models import ChatThread, WeeklyAnnouncement, UserMessage, UserChatSummary
+from custom_auth.models import CustomUser, Address, HouseholdMember
+from local_chefs.models import ChefPostalCode, PostalCode
+from meals import prompt_context
 from django.db import transaction
-import requests
 from django.core.files.base import ContentFile
 try:
     from groq import Groq
@@ -22,9 +23,8 @@ from meals.pantry_management import assign_pantry_tags
 from django.utils import timezone
 import logging
 from datetime import timedelta, date
-import traceback
-import os
 from utils.redis_client import redis_client
+from utils.error_reporting import report_error
 logger = logging.getLogger(__name__)
 
 def trigger_assign_pantry_tags(sender, instance, created, **kwargs):
@@ -455,16 +455,7 @@ def send_chef_event_notification(user_id, message, subject, event_id, changes):
             
     except Exception as e:
         logger.error(f"Error sending chef event notification to user {user_id}: {str(e)}")
-        n8n_traceback_url = os.getenv('N8N_TRACEBACK_URL', '')
-        if n8n_traceback_url:
-            try:
-                requests.post(n8n_traceback_url, json={
-                    "error": str(e),
-                    "source": f"chef_event_notification_{user_id}",
-                    "traceback": traceback.format_exc()
-                })
-            except Exception as webhook_error:
-                logger.error(f"Failed to send error to N8N webhook: {str(webhook_error)}")
+        report_error(e, f"chef_event_notification_{user_id}")
 
 # Weekly conversation reset feature
 def create_weekly_chat_threads():
@@ -553,3 +544,81 @@ def create_weekly_chat_threads():
                 message="",  # Empty user message since this is assistant-initiated
                 response=formatted_announcement
             )
+
+
+# ────────────────────────────────────────────────────────────────────
+#  Assistant prompt-context invalidation (see meals/prompt_context.py)
+# ────────────────────────────────────────────────────────────────────
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_prompt_context_for_user(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    prompt_context.bump(prompt_context.user_scope(instance.pk))
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+@receiver(post_save, sender=HouseholdMember)
+@receiver(post_delete, sender=HouseholdMember)
+@receiver(post_save, sender=UserChatSummary)
+@receiver(post_delete, sender=UserChatSummary)
+def invalidate_prompt_context_for_owner(sender, instance, **kwargs):
+    prompt_context.bump(prompt_context.user_scope(instance.user_id))
+
+
+@receiver(m2m_changed, sender=CustomUser.dietary_preferences.through)
+@receiver(m2m_changed, sender=CustomUser.custom_dietary_preferences.through)
+@receiver(m2m_changed, sender=HouseholdMember.dietary_preferences.through)
+def invalidate_prompt_context_for_preferences(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if isinstance(instance, HouseholdMember):
+        user_ids = [instance.user_id]
+    elif isinstance(instance, CustomUser):
+        user_ids = [instance.pk]
+    elif sender is HouseholdMember.dietary_preferences.through:
+        user_ids = HouseholdMember.objects.filter(pk__in=pk_set or ()).values_list('user_id', flat=True)
+    else:
+        # Reverse side (preference.users.add(...)); pk_set holds user ids.
+        # A reverse clear() has no pk_set - the owning users are unknown,
+        # so fall back to the fragment TTL.
+        user_ids = pk_set or ()
+    prompt_context.bump(*(prompt_context.user_scope(user_id) for user_id in user_ids))
+
+
+@receiver(post_save, sender=WeeklyAnnouncement)
+@receiver(post_delete, sender=WeeklyAnnouncement)
+@receiver(post_save, sender=SystemUpdate)
+@receiver(post_delete, sender=SystemUpdate)
+def invalidate_prompt_context_globally(sender, instance, **kwargs):
+    prompt_context.bump(prompt_context.GLOBAL_SCOPE)
+
+
+@receiver(post_save, sender=CustomDietaryPreference)
+@receiver(pre_delete, sender=CustomDietaryPreference)
+def invalidate_prompt_context_for_custom_preference(sender, instance, **kwargs):
+    # The definition is rendered into every holder's profile. Deletes are
+    # handled pre_delete, while the user links still exist.
+    user_ids = instance.users.values_list('pk', flat=True)
+    prompt_context.bump(*(prompt_context.user_scope(user_id) for user_id in user_ids))
+
+
+@receiver(post_save, sender=ChefMealEvent)
+@receiver(post_delete, sender=ChefMealEvent)
+def invalidate_prompt_context_for_event_area(sender, instance, **kwargs):
+    postal_codes = ChefPostalCode.objects.filter(chef_id=instance.chef_id).values_list('postal_code__code', flat=True)
+    prompt_context.bump_areas(postal_codes)
+
+
+@receiver(post_save, sender=ChefPostalCode)
+@receiver(post_delete, sender=ChefPostalCode)
+def invalidate_prompt_context_for_chef_area(sender, instance, **kwargs):
+    try:
+        code = instance.postal_code.code
+    except PostalCode.DoesNotExist:
+        return
+    prompt_context.bump_areas([code])
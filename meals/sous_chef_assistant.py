@@ -16,7 +16,6 @@ from typing import Dict, Any, List, Generator, Optional, Union, Literal
 from decimal import Decimal
 
 from django.conf import settings
-from django.utils import timezone
 from pydantic import BaseModel, Field
 
 
@@ -75,7 +74,6 @@ from custom_auth.models import CustomUser
 from crm.models import Lead
 from shared.utils import generate_family_context_for_chef, _get_language_name
 from utils.model_selection import choose_model
-from utils.groq_rate_limit import groq_call_with_retry
 
 logger = logging.getLogger(__name__)
 
@@ -861,86 +859,19 @@ class SousChefAssistant:
         
         return truncated_history
 
-    def _generate_conversation_summary(self, messages_to_summarize: List[Dict]) -> str:
-        """
-        Generate AI summary of older messages using Groq OSS model (free, fast).
-        Falls back to OpenAI if Groq is unavailable.
-        
-        Args:
-            messages_to_summarize: List of message dicts to summarize
-            
-        Returns:
-            Summary string
-        """
-        # Build conversation text from messages
-        conversation_text = "\n".join([
-            f"{m.get('role', 'unknown')}: {m.get('content', '')[:500]}"
-            for m in messages_to_summarize
-            if m.get('role') not in ('system',) and m.get('content')
-        ])
-        
-        if not conversation_text.strip():
-            return ""
-        
-        system_prompt = "You are a concise summarizer. Create brief summaries focusing on key decisions and preferences."
-        user_prompt = f"""Summarize this chef/Sous Chef conversation about a client family.
-Focus on: dietary decisions, menu preferences, important notes, issues raised.
-Max 200 words.
-
-Conversation:
-{conversation_text}"""
-        
-        # Use Groq OSS model (free, fast) - already initialized as self.groq in __init__
-        if self.groq:
-            try:
-                raw_create = getattr(getattr(self.groq.chat, 'completions', None), 'with_raw_response', None)
-                if raw_create:
-                    raw_create = self.groq.chat.completions.with_raw_response.create
-                groq_resp = groq_call_with_retry(
-                    raw_create_fn=raw_create,
-                    create_fn=self.groq.chat.completions.create,
-                    desc='sous_chef.conversation_summary',
-                    model=getattr(settings, 'GROQ_MODEL', 'openai/gpt-oss-120b'),
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt},
-                    ],
-                    temperature=0.3,
-                    stream=False,
-                )
-                return groq_resp.choices[0].message.content
-            except Exception as e:
-                logger.warning(f"Groq summarization failed, falling back to OpenAI: {e}")
-        
-        # Fallback to OpenAI only if Groq unavailable
-        try:
-            resp = self.client.chat.completions.create(
-                model="gpt-5.1-mini",
-                messages=[
-                    {"role": "system", "content": system_prompt}, 
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=300
-            )
-            return resp.choices[0].message.content
-        except Exception as e:
-            logger.error(f"Failed to generate conversation summary: {e}")
-            return ""
-
     def _truncate_with_summarization(self, history: List[Dict], thread: SousChefThread, 
                                       max_messages: int = 30, max_tokens: int = 25000) -> List[Dict]:
         """
-        Truncate history with intelligent summarization of dropped messages.
+        Truncate history, keeping older context through the thread summary.
         
-        Instead of simply dropping old messages, this method:
-        1. Identifies messages that would be dropped
-        2. Generates an AI summary of those messages
-        3. Stores the summary in the thread
-        4. Injects the summary into the returned history
+        The summary itself is owned by chefs.services.sous_chef.history:
+        this method only reads thread.conversation_summary and, when older
+        messages are dropped, schedules the same background compaction the
+        Sous Chef agent uses, so the two never write competing summaries.
         
         Args:
             history: The conversation history list
-            thread: The SousChefThread to store the summary
+            thread: The SousChefThread whose summary is injected
             max_messages: Maximum number of messages to keep (default 30)
             max_tokens: Maximum estimated tokens to keep (default 25000)
             
@@ -967,36 +898,16 @@ Conversation:
                 return self._inject_summary_into_history(history, thread.conversation_summary)
             return history
         
-        # Messages to be dropped (excluding recent ones we're keeping)
-        messages_to_drop = other_msgs[:-keep_recent]
-        messages_to_keep = other_msgs[-keep_recent:]
-        
-        # Generate summary if we're dropping significant content (at least 6 messages = 3 exchanges)
-        if len(messages_to_drop) >= 6:
-            try:
-                new_summary = self._generate_conversation_summary(messages_to_drop)
-                if new_summary:
-                    # Combine with existing summary if present
-                    if thread.conversation_summary:
-                        combined_summary = f"{thread.conversation_summary}\n\n[More recent context]: {new_summary}"
-                        # Truncate combined summary if it gets too long
-                        if len(combined_summary) > 2000:
-                            combined_summary = new_summary  # Use only new summary
-                    else:
-                        combined_summary = new_summary
-                    
-                    # Save to thread
-                    thread.conversation_summary = combined_summary
-                    thread.summary_generated_at = timezone.now()
-                    thread.messages_summarized_count += len(messages_to_drop)
-                    thread.save(update_fields=['conversation_summary', 'summary_generated_at', 'messages_summarized_count'])
-                    
-                    logger.info(f"Generated conversation summary for thread {thread.id}, summarized {len(messages_to_drop)} messages")
-            except Exception as e:
-                logger.error(f"Failed to generate/save conversation summary: {e}")
+        # Dropped messages are folded into the summary by history compaction
+        from chefs.services.sous_chef.history import build_window, schedule_compaction
+        try:
+            if build_window(thread).needs_compaction:
+                schedule_compaction(thread.id)
+        except Exception as e:
+            logger.error(f"Failed to schedule conversation summary for thread {thread.id}: {e}")
         
         # Build truncated history: system + recent messages
-        truncated_history = system_msgs + messages_to_keep
+        truncated_history = system_msgs + other_msgs[-keep_recent:]
         
         # Inject summary if available
         if thread.conversation_summary:
@@ -2907,11 +2907,11 @@ def _recall_chef_memories(
                 min_score=0.05,  # Lower threshold to be inclusive
             )
             
+            ChefMemory.mark_accessed_bulk([memory for memory, _ in search_results])
+            
             # Format results with relevance scores
             results = []
             for memory, score in search_results:
-                memory.mark_accessed()
-                
                 family_info = None
                 if memory.customer:
                     family_info = f"{memory.customer.first_name} {memory.customer.last_name}".strip() or memory.customer.username
@@ -2970,11 +2970,10 @@ def _recall_chef_memories(
         queryset = queryset.filter(customer__isnull=True, lead__isnull=True)
     
     # Order and limit
-    memories = queryset.order_by('-importance', '-updated_at')[:limit]
+    memories = list(queryset.order_by('-importance', '-updated_at')[:limit])
     
     # Mark as accessed
-    for memory in memories:
-        memory.mark_accessed()
+    ChefMemory.mark_accessed_bulk(memories)
     
     # Format results
     results = []
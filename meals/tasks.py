@@ -8,14 +8,11 @@ from .models import MealPlan, MealPlanMeal, Meal
 from chefs.models import Chef
 from .chef_meals_views import sync_recent_payments
 import logging
-from datetime import timedelta
+from datetime import date, timedelta
 from django.utils import timezone
 from django.conf import settings
-from django.db.models import F
-from django.db import transaction
-from decimal import Decimal
+from django.db import connection, transaction
 import stripe
-from .models import ChefMealEvent, ChefMealOrder, PaymentLog, STATUS_COMPLETED
 import pytz
 from zoneinfo import ZoneInfo
 from customer_dashboard.models import CustomUser
@@ -24,14 +21,18 @@ try:
 except ImportError:
     Groq = None
 import time
+from itertools import takewhile
+from concurrent.futures import ThreadPoolExecutor
 from .celery_utils import handle_task_failure
-import requests
 from django.core.cache import cache
 import os
 from typing import Any, Dict, Optional
 import traceback
-from meals.services import meal_plan_batch_service
+from meals.services import meal_plan_batch_service, meal_plan_fanout, price_adjustment_refunds
 from meals.models import MealPlanBatchJob
+from utils.error_reporting import report_payload
+from api import job_queue
+from api.task_runner import resumable_task
 
 LEGACY_MEAL_PLAN = True
 
@@ -65,10 +66,6 @@ def _should_send_alert(now_ts: float) -> bool:
 
 
 def _send_n8n_traceback(message: str, source: str, extra: Optional[Dict[str, Any]] = None) -> None:
-    url = getattr(settings, "N8N_TRACEBACK_URL", None) or os.getenv("N8N_TRACEBACK_URL")
-    if not url:
-        logger.warning("N8N_TRACEBACK_URL not configured; skipping alert: %s", message)
-        return
     payload: Dict[str, Any] = {
         "error": message,
         "source": source,
@@ -76,10 +73,7 @@ def _send_n8n_traceback(message: str, source: str, extra: Optional[Dict[str, Any
     }
     if extra:
         payload.update(extra)
-    try:
-        requests.post(url, json=payload, timeout=10)
-    except Exception as post_error:
-        logger.error("Failed to POST traceback to n8n: %s", post_error, exc_info=True)
+    report_payload(payload)
 
 
 def celery_beat_heartbeat() -> bool:
@@ -184,14 +178,39 @@ def queue_system_update_email(system_update_id, test_mode=False, admin_id=None):
         print(f"System update email sent to all users!")
     return True
 
-def sync_all_chef_payments():
-    """Daily task to sync all chef payments with Stripe"""
-    for chef in Chef.objects.all():
-        try:
-            print(f"Syncing payments for chef {chef.user.username}")
-            sync_recent_payments(chef)
-        except Exception as e:
-            logger.error(f"Error syncing payments for chef {chef.id}: {str(e)}")
+# Stripe accounts synced at once by sync_all_chef_payments
+PAYMENT_SYNC_CONCURRENCY = getattr(settings, 'STRIPE_PAYMENT_SYNC_CONCURRENCY', 4)
+
+
+def _sync_chef_payments(chef):
+    try:
+        return sync_recent_payments(chef)
+    except Exception as e:
+        logger.error(f"Error syncing payments for chef {chef.id}: {str(e)}")
+    finally:
+        # Worker threads each hold their own database connection
+        connection.close()
+
+
+@resumable_task
+def sync_all_chef_payments(task_slice):
+    """
+    Daily task to sync all chef payments with Stripe, resuming by chef id.
+
+    Accounts are synced PAYMENT_SYNC_CONCURRENCY at a time; the cursor moves
+    past a chunk once every chef in it is done.
+    """
+    chunk_size = PAYMENT_SYNC_CONCURRENCY * 2
+    chefs = Chef.objects.filter(stripe_account__isnull=False).select_related('user').order_by('pk')
+    with ThreadPoolExecutor(max_workers=PAYMENT_SYNC_CONCURRENCY, thread_name_prefix="chef-payment-sync") as pool:
+        while not task_slice.expired():
+            chunk = list(chefs.filter(pk__gt=task_slice.cursor or 0)[:chunk_size])
+            if not chunk:
+                return task_slice.complete()
+            logger.info(f"Syncing payments for chefs {chunk[0].pk}..{chunk[-1].pk}")
+            list(pool.map(_sync_chef_payments, chunk))
+            task_slice.advance(chunk[-1].pk, processed=len(chunk))
+    return task_slice.pause()
 
 def process_chef_meal_price_adjustments():
     """
@@ -200,119 +219,23 @@ def process_chef_meal_price_adjustments():
     When more people order a chef meal, the price decreases for everyone.
     This task ensures everyone pays the same final (lowest) price by 
     refunding the difference to those who paid more.
+
+    Refunds are computed in one query, issued to Stripe concurrently with
+    idempotency keys and recorded in bulk; see
+    meals.services.price_adjustment_refunds. Failed refunds stay pending and
+    are retried on the next run.
     """
     # Look at events completed in the past 7 days
     # (adjust timeframe as needed for your business)
     seven_days_ago = timezone.now() - timedelta(days=7)
-    
-    # Find completed events that need price reconciliation
-    completed_events = ChefMealEvent.objects.filter(
-        status=STATUS_COMPLETED,
-        updated_at__gte=seven_days_ago,
-        # Only look at events that have adjustable pricing
-        base_price__gt=F('min_price')
-    )
-    
-    logger.info(f"Processing price adjustments for {completed_events.count()} completed chef meal events")
 
-    total_processed = 0
-    total_refunded = Decimal('0.00')
-    
-    for event in completed_events:
-        # Skip if final price equals base price (no discount was applied)
-        if event.current_price >= event.base_price:
-            continue
-            
-        # Get all orders for this event
-        orders = ChefMealOrder.objects.filter(
-            meal_event=event,
-            status__in=['placed', 'confirmed', 'completed'],
-            # Skip already refunded orders
-            price_adjustment_processed=False
-        )
-        
-        logger.info(f"Processing {orders.count()} orders for event '{event}' (ID: {event.id})")
-        
-        for order in orders:
-            # Skip orders with no payment record
-            if not order.stripe_payment_intent_id:
-                logger.warning(f"Order {order.id} has no payment record, skipping")
-                continue
-                
-            # Calculate price difference
-            price_paid = order.price_paid
-            final_price = event.current_price
-            
-            # Only process if customer paid more than final price
-            if price_paid > final_price:
-                difference = (price_paid - final_price) * order.quantity
-                
-                # Skip tiny amounts (often not worth the transaction fees)
-                if difference < Decimal('0.50'):
-                    logger.info(f"Skipping small refund of ${difference} for order {order.id}")
-                    order.price_adjustment_processed = True
-                    order.save()
-                    continue
-                
-                # Convert to cents for Stripe
-                refund_amount_cents = int(difference * 100)
-                
-                try:
-                    # Process refund through Stripe
-                    refund = stripe.Refund.create(
-                        payment_intent=order.stripe_payment_intent_id,
-                        amount=refund_amount_cents,
-                        reason="duplicate",  # Using "duplicate" as proxy for price adjustment
-                        metadata={
-                            'reason': 'chef_meal_price_adjustment',
-                            'event_id': str(event.id),
-                            'order_id': str(order.id),
-                            'original_price': str(price_paid),
-                            'final_price': str(final_price)
-                        }
-                    )
-                    
-                    # Record the refund
-                    order.stripe_refund_id = refund.id
-                    order.price_adjustment_processed = True
-                    order.save()
-                    
-                    # Log the payment
-                    PaymentLog.objects.create(
-                        chef_meal_order=order,
-                        user=order.customer,
-                        chef=event.chef,
-                        action='refund',
-                        amount=difference,
-                        stripe_id=refund.id,
-                        status='succeeded',
-                        details={
-                            'refund': refund.id,
-                            'reason': 'chef_meal_price_adjustment',
-                            'original_price': str(price_paid),
-                            'final_price': str(final_price),
-                            'difference': str(difference)
-                        }
-                    )
-                    
-                    logger.info(f"Processed refund of ${difference} for order {order.id} - Refund ID: {refund.id}")
-                    total_processed += 1
-                    total_refunded += difference
-                    
-                    # TODO: Send email notification to customer about the refund
-                    # You can implement this using your n8n webhook or Django's email system
-                    
-                except stripe.error.StripeError as e:
-                    logger.error(f"Stripe error processing refund for order {order.id}: {str(e)}")
-                except Exception as e:
-                    logger.error(f"Error processing refund for order {order.id}: {str(e)}", exc_info=True)
-            else:
-                # Mark as processed even if no refund needed
-                order.price_adjustment_processed = True
-                order.save()
-    
-    logger.info(f"Price adjustment task completed. Processed {total_processed} refunds totaling ${total_refunded}")
-    return {'processed': total_processed, 'total_refunded': str(total_refunded)}
+    result = price_adjustment_refunds.process_price_adjustments(since=seven_days_ago)
+
+    logger.info(
+        f"Price adjustment task completed. Processed {result['processed']} refunds totaling "
+        f"${result['total_refunded']} ({result['failed']} failed)"
+    )
+    return result
 
 @handle_task_failure
 def generate_daily_user_summaries():
@@ -825,8 +748,12 @@ def generate_chat_session_summaries():
 
 
 
+CLEANUP_CHUNK_SIZE = 200
+
+
 # @deprecated Legacy meal-plan maintenance task guarded by LEGACY_MEAL_PLAN.
-def cleanup_old_meal_plans_and_meals(dry_run: bool = False):
+@resumable_task
+def cleanup_old_meal_plans_and_meals(task_slice, dry_run: bool = False):
     """
     Delete meal plans whose week_end_date is older than 3 weeks and delete any
     meals tied exclusively to those old plans, provided those meals:
@@ -834,11 +761,16 @@ def cleanup_old_meal_plans_and_meals(dry_run: bool = False):
       - have never been ordered (to preserve order history), and
       - are NOT chef-created meals (i.e., only delete user-created meals).
 
+    Old plans are deleted in id order, CLEANUP_CHUNK_SIZE at a time, each
+    chunk in its own transaction together with the meals only it referenced.
+    The cursor is the last deleted plan id, so a slice that runs out of time
+    resumes with the next chunk.
+
     Args:
         dry_run: If True, perform no deletions and return counts only.
 
     Returns:
-        Dict with counts of items identified and deleted.
+        SliceResult whose detail holds counts of items identified and deleted.
     """
     logger = logging.getLogger(__name__)
 
@@ -852,69 +784,81 @@ def cleanup_old_meal_plans_and_meals(dry_run: bool = False):
         .values_list('meal_id', flat=True)
         .distinct()
     )
-    recent_meal_ids = set(recent_meal_ids_qs)
+
+    def deletable_meal_ids(plans_qs):
+        # Meals tied to these plans which are NOT used in recent plans,
+        # restricted to user-created meals only (chef__isnull=True)
+        candidate_ids = (
+            MealPlanMeal.objects
+            .filter(meal_plan__in=plans_qs)
+            .exclude(meal_id__in=recent_meal_ids_qs)
+            .values_list('meal_id', flat=True)
+        )
+        return list(
+            Meal.objects
+            .filter(id__in=candidate_ids, chef__isnull=True)
+            .values_list('id', flat=True)
+        )
 
     # Old meal plans to delete
     old_meal_plans_qs = MealPlan.objects.filter(week_end_date__lt=cutoff_date)
 
-    # Meals tied to those old plans which are NOT used in recent plans
-    candidate_old_meal_ids_qs = (
-        MealPlanMeal.objects
-        .filter(meal_plan__in=old_meal_plans_qs)
-        .exclude(meal_id__in=recent_meal_ids)
-        .values_list('meal_id', flat=True)
-        .distinct()
-    )
-    # Restrict to user-created meals only (chef__isnull=True)
-    deletable_user_meal_ids_qs = (
-        Meal.objects
-        .filter(id__in=candidate_old_meal_ids_qs, chef__isnull=True)
-        .values_list('id', flat=True)
-    )
-    deletable_user_meal_ids = list(deletable_user_meal_ids_qs)
-
-    identified_old_plans = old_meal_plans_qs.count()
-    identified_old_only_meals = len(deletable_user_meal_ids)
-
     if dry_run:
+        identified_old_plans = old_meal_plans_qs.count()
+        identified_old_only_meals = len(deletable_meal_ids(old_meal_plans_qs))
         logger.info(
             f"[DRY RUN] Identified {identified_old_plans} old meal plans and "
             f"{identified_old_only_meals} meals eligible for deletion."
         )
-        return {
+        return task_slice.complete({
             "old_meal_plans_found": identified_old_plans,
             "meals_eligible_for_deletion": identified_old_only_meals,
             "deleted_meal_plans": 0,
             "deleted_meals": 0,
-        }
+        })
 
     deleted_plans = 0
     deleted_meals = 0
 
-    with transaction.atomic():
-        # Delete the old meal plans (cascades remove MealPlanMeal, instructions, etc.)
-        deleted_plans = old_meal_plans_qs.count()
-        if deleted_plans:
-            logger.info(f"Deleting {deleted_plans} meal plans older than {cutoff_date}")
-            old_meal_plans_qs.delete()
-
-        # Now delete the meals that were only tied to those old plans and not used recently
-        if deletable_user_meal_ids:
-            meals_qs = Meal.objects.filter(id__in=deletable_user_meal_ids, chef__isnull=True)
-            deleted_meals = meals_qs.count()
-            if deleted_meals:
-                logger.info(f"Deleting {deleted_meals} meals no longer referenced by recent meal plans")
-                meals_qs.delete()
+    while True:
+        if task_slice.expired():
+            logger.info(
+                f"Cleanup paused after plan {task_slice.cursor}: deleted {deleted_plans} meal plans "
+                f"and {deleted_meals} meals in this slice."
+            )
+            return task_slice.pause({"deleted_meal_plans": deleted_plans, "deleted_meals": deleted_meals})
+
+        plan_ids = list(
+            old_meal_plans_qs
+            .filter(pk__gt=task_slice.cursor or 0)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:CLEANUP_CHUNK_SIZE]
+        )
+        if not plan_ids:
+            break
+
+        with transaction.atomic():
+            chunk_qs = MealPlan.objects.filter(pk__in=plan_ids)
+            meal_ids = deletable_meal_ids(chunk_qs)
+
+            # Delete the old meal plans (cascades remove MealPlanMeal, instructions, etc.)
+            chunk_qs.delete()
+            deleted_plans += len(plan_ids)
+
+            # Now delete the meals that were only tied to those old plans and not used recently
+            if meal_ids:
+                deleted_meals += Meal.objects.filter(id__in=meal_ids, chef__isnull=True).delete()[1].get(Meal._meta.label, 0)
+
+        task_slice.advance(plan_ids[-1], processed=len(plan_ids))
 
     logger.info(
-        f"Cleanup complete. Deleted {deleted_plans} meal plans and {deleted_meals} meals."
+        f"Cleanup complete. Deleted {deleted_plans} meal plans and {deleted_meals} meals "
+        f"older than {cutoff_date} in this slice."
     )
-    return {
-        "old_meal_plans_found": identified_old_plans,
-        "meals_eligible_for_deletion": identified_old_only_meals,
+    return task_slice.complete({
         "deleted_meal_plans": deleted_plans,
         "deleted_meals": deleted_meals,
-    }
+    })
 
 
 def _next_week_range_from_today(today=None):
@@ -929,20 +873,63 @@ def _next_week_range_from_today(today=None):
     return week_start, week_end
 
 
-@handle_task_failure
 # @deprecated Legacy meal-plan task guarded by LEGACY_MEAL_PLAN.
-def submit_weekly_meal_plan_batch(request_id=None):
-    """Submit a Groq batch for all auto-enabled users for the upcoming week."""
-    week_start, week_end = _next_week_range_from_today()
-    job = meal_plan_batch_service.submit_weekly_batch(
-        week_start=week_start,
-        week_end=week_end,
-        request_id=request_id or f"batch-{week_start.isoformat()}",
-    )
-    if job:
-        logger.info("Submitted meal plan batch job %s for week %s-%s", job.id, week_start, week_end)
-    else:
+@resumable_task
+@handle_task_failure
+def submit_weekly_meal_plan_batch(task_slice, request_id=None):
+    """
+    Submit a Groq batch for all auto-enabled users for the upcoming week.
+
+    If the batch can't be submitted, the synchronous fallback runs here in
+    slices: the cursor remembers the week and the last user generated, and
+    users who already have a plan for the week are skipped.
+    """
+    cursor = task_slice.cursor
+    if cursor is None:
+        week_start, week_end = _next_week_range_from_today()
+        job = meal_plan_batch_service.submit_weekly_batch(
+            week_start=week_start,
+            week_end=week_end,
+            request_id=request_id or f"batch-{week_start.isoformat()}",
+            defer_fallback=True,
+        )
+        if job:
+            logger.info("Submitted meal plan batch job %s for week %s-%s", job.id, week_start, week_end)
+            return task_slice.complete(f"batch job {job.id}")
         logger.info("Meal plan batch submission fell back to synchronous generation")
+        cursor = {"week_start": week_start.isoformat(), "week_end": week_end.isoformat(), "after_user": 0}
+        task_slice.advance(cursor, processed=0)
+
+    week_start = date.fromisoformat(cursor["week_start"])
+    week_end = date.fromisoformat(cursor["week_end"])
+    if job_queue.worker_backend_enabled():
+        users = meal_plan_batch_service.users_missing_weekly_plan(week_start, cursor["after_user"])
+        queued = meal_plan_batch_service.enqueue_weekly_generation(
+            list(users.values_list("id", flat=True)), week_start, week_end
+        )
+        return task_slice.complete(f"queued {queued} fallback jobs")
+
+    # Generate a few pool-widths of users at a time so the cursor can move
+    # past every user the chunk finished before the slice runs out
+    chunk_size = meal_plan_fanout.FALLBACK_CONCURRENCY * 2
+    budget = meal_plan_fanout.default_budget()
+    while not task_slice.expired():
+        user_ids = list(
+            meal_plan_batch_service.users_missing_weekly_plan(week_start, task_slice.cursor["after_user"])
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not user_ids:
+            return task_slice.complete("synchronous fallback")
+        result = meal_plan_fanout.generate_plans_concurrently(
+            user_ids, week_start, week_end, budget=budget, deadline=task_slice.deadline,
+        )
+        deferred = set(result.deferred)
+        finished = list(takewhile(lambda uid: uid not in deferred, user_ids))
+        if finished:
+            task_slice.advance({**cursor, "after_user": finished[-1]}, processed=len(finished))
+        if deferred:
+            break
+    return task_slice.pause()
 
 
 @handle_task_failure
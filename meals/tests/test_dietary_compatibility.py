@@ -0,0 +1,70 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from custom_auth.models import CustomUser
+from meals.models import DietaryPreference, Meal, MealCompatibility
+from meals.services.dietary_compatibility import DietaryCompatibilityEngine
+
+
+def _make_user(*pref_names):
+    user = CustomUser.objects.create_user(
+        username="compatuser",
+        password="pass1234",
+        email="compat@example.com",
+    )
+    for name in pref_names:
+        pref, _ = DietaryPreference.objects.get_or_create(name=name)
+        user.dietary_preferences.add(pref)
+    return user
+
+
+@pytest.mark.django_db
+def test_everything_only_user_skips_analysis():
+    user = _make_user("Everything")
+    meal = Meal.objects.create(name="Anything", meal_type="Dinner", creator=user)
+
+    calls = []
+    engine = DietaryCompatibilityEngine(user, analyzer=lambda m, p: calls.append((m, p)))
+    verdicts = engine.evaluate([meal])
+
+    assert verdicts[meal.id].is_compatible
+    assert calls == []
+
+
+@pytest.mark.django_db
+def test_tags_cache_and_misses_resolved_in_bulk():
+    user = _make_user("Vegan", "Gluten-Free")
+    vegan = DietaryPreference.objects.get(name="Vegan")
+
+    tagged = Meal.objects.create(name="Tagged", meal_type="Dinner", creator=user)
+    tagged.dietary_preferences.add(vegan)
+    MealCompatibility.objects.create(
+        meal=tagged, preference_name="Gluten-Free", is_compatible=True, confidence=0.9, reasoning="cached"
+    )
+    untagged = [
+        Meal.objects.create(name=f"Plain {i}", meal_type="Dinner", creator=user) for i in range(5)
+    ]
+
+    calls = []
+
+    def analyzer(meal, pref_name):
+        calls.append((meal.id, pref_name))
+        return {"is_compatible": pref_name == "Vegan", "confidence": 0.95, "reasoning": "stub"}
+
+    engine = DietaryCompatibilityEngine(user, analyzer=analyzer)
+    verdicts = engine.evaluate([tagged] + untagged)
+
+    assert verdicts[tagged.id].is_compatible
+    assert all(not verdicts[m.id].is_compatible for m in untagged)
+    # Only misses hit the analyzer: both preferences for each untagged meal
+    assert sorted(calls) == sorted((m.id, p) for m in untagged for p in ("Vegan", "Gluten-Free"))
+    assert MealCompatibility.objects.filter(meal__in=untagged).count() == 10
+
+    # Second pass is served entirely from cache with a bounded query count
+    calls.clear()
+    fresh = list(Meal.objects.filter(id__in=[tagged.id] + [m.id for m in untagged]))
+    with CaptureQueriesContext(connection) as ctx:
+        engine.evaluate(fresh)
+    assert calls == []
+    assert len(ctx.captured_queries) <= 3
@@ -0,0 +1,65 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+
+from custom_auth.models import CustomUser
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from meals.meal_embedding import (
+    BACKFILL_CURSOR_KEY,
+    backfill_model_embeddings,
+    iter_representations,
+    prepare_meal_representation,
+)
+from meals.models import DietaryPreference, Meal
+
+
+def _fake_batch(texts):
+    return [[0.1] * 1536 if text else None for text in texts]
+
+
+@pytest.fixture
+def meals(db):
+    cache.clear()
+    user = CustomUser.objects.create_user(username="embedder", password="pass1234", email="embed@example.com")
+    return [Meal.objects.create(name=f"Meal {i}", meal_type="Dinner", creator=user) for i in range(3)]
+
+
+@pytest.mark.django_db
+def test_backfill_embeds_in_batches_and_clears_cursor(meals):
+    with patch("chefs.services.memory_service.EmbeddingService.get_embeddings_batch", side_effect=_fake_batch) as batch:
+        result = backfill_model_embeddings("meal", Meal.objects.all(), "meal_embedding", batch_size=2)
+
+    assert result == {"embedded": 3, "failed": 0, "complete": True}
+    assert batch.call_count == 2
+    assert not Meal.objects.filter(meal_embedding__isnull=True).exists()
+    assert cache.get(BACKFILL_CURSOR_KEY.format(label="meal")) is None
+
+
+@pytest.mark.django_db
+def test_backfill_checkpoints_when_out_of_time(meals):
+    with patch("chefs.services.memory_service.EmbeddingService.get_embeddings_batch", side_effect=_fake_batch):
+        result = backfill_model_embeddings(
+            "meal", Meal.objects.all(), "meal_embedding", deadline=time.monotonic() - 1
+        )
+
+    assert result["complete"] is False
+    assert Meal.objects.filter(meal_embedding__isnull=True).count() == 3
+
+
+@pytest.mark.django_db
+def test_iter_representations_matches_single_object_text_with_constant_queries(meals):
+    vegan, _ = DietaryPreference.objects.get_or_create(name="Vegan")
+    for meal in meals:
+        meal.dietary_preferences.add(vegan)
+    expected = {meal.id: prepare_meal_representation(Meal.objects.get(id=meal.id)) for meal in meals}
+
+    with CaptureQueriesContext(connection) as ctx:
+        built = dict(iter_representations(Meal.objects.filter(id__in=expected)))
+
+    assert built == expected
+    # One query for the meals plus one per prefetched relation
+    assert len(ctx.captured_queries) == 4
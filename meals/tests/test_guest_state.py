@@ -0,0 +1,92 @@
+"""
+Tests for the guest conversation state store.
+"""
+from django.test import SimpleTestCase
+
+from meals.guest_state import GuestStateStore, InMemoryGuestStateStore, RedisGuestStateStore, compact_history
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return (k for k in list(self.data) if k.startswith(prefix))
+
+
+def _history(turns):
+    history = [{"role": "system", "content": "sys"}]
+    for i in range(turns):
+        history.append({"role": "user", "content": f"q{i}"})
+        history.append({"role": "assistant", "content": f"a{i}"})
+    return history
+
+
+class GuestStateStoreTests(SimpleTestCase):
+
+    def test_memory_store_evicts_least_recently_used(self):
+        store = InMemoryGuestStateStore(max_entries=2)
+        store.set("guest_a", {"response_id": "r1", "history": []})
+        store.set("guest_b", {"response_id": "r2", "history": []})
+        store.get("guest_a")
+        store.set("guest_c", {"response_id": "r3", "history": []})
+
+        self.assertIsNone(store.get("guest_b"))
+        self.assertEqual(store.get("guest_a")["response_id"], "r1")
+        stats = store.stats()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["evictions"], 1)
+
+    def test_memory_store_expires_idle_guests(self):
+        store = InMemoryGuestStateStore(ttl=-1)
+        store.set("guest_a", {"response_id": "r1", "history": []})
+
+        self.assertIsNone(store.get("guest_a"))
+        self.assertEqual(store.stats()["size"], 0)
+
+    def test_redis_store_round_trips_compressed_state_with_ttl(self):
+        redis = _FakeRedis()
+        store = RedisGuestStateStore(redis, ttl=120)
+        state = {"response_id": "resp_1", "history": _history(3)}
+
+        store.set("guest_x", state)
+
+        self.assertEqual(store.get("guest_x"), state)
+        self.assertEqual(list(redis.ttls.values()), [120])
+        self.assertEqual(store.stats()["size"], 1)
+        store.delete("guest_x")
+        self.assertIsNone(store.get("guest_x"))
+
+    def test_incomplete_backend_fails_at_instantiation(self):
+        class NoSizeStore(GuestStateStore):
+            def get(self, guest_id):
+                return None
+
+            def set(self, guest_id, state):
+                pass
+
+            def delete(self, guest_id):
+                pass
+
+        with self.assertRaises(TypeError):
+            NoSizeStore()
+
+    def test_compact_history_keeps_system_prompt_and_starts_at_user_turn(self):
+        compacted = compact_history(_history(10), max_messages=6)
+
+        self.assertEqual(compacted[0]["role"], "system")
+        self.assertEqual(compacted[1]["role"], "user")
+        self.assertEqual(compacted[-1]["content"], "a9")
+        self.assertLessEqual(len(compacted), 6)
@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from meals.services.meal_diversity import filter_diverse_meals
+
+
+def _meal(name, embedding):
+    return SimpleNamespace(name=name, meal_embedding=embedding)
+
+
+def test_filters_similar_meals_and_preserves_order():
+    existing = [[1.0, 0.0, 0.0]]
+    meals = [
+        _meal("near-duplicate", [0.9, 0.1, 0.0]),
+        _meal("orthogonal", [0.0, 1.0, 0.0]),
+        _meal("no-embedding", None),
+        _meal("opposite", [-1.0, 0.0, 0.0]),
+    ]
+
+    result = filter_diverse_meals(meals, existing, min_similarity=0.8)
+
+    assert [m.name for m in result] == ["orthogonal", "no-embedding", "opposite"]
+
+
+def test_wrong_dimension_and_zero_vectors():
+    existing = [[0.0, 1.0], [1.0, 0.0]]
+    meals = [
+        _meal("bad-dims", [1.0, 0.0, 0.0]),
+        _meal("zero", [0.0, 0.0]),
+        _meal("diagonal", [1.0, 1.0]),
+    ]
+
+    result = filter_diverse_meals(meals, existing, min_similarity=0.8)
+
+    assert [m.name for m in result] == ["zero", "diagonal"]
+
+
+def test_no_existing_embeddings_keeps_everything():
+    meals = [_meal("a", [1.0, 0.0]), _meal("b", None)]
+    assert filter_diverse_meals(meals, [], min_similarity=0.8) == meals
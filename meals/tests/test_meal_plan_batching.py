@@ -174,7 +174,7 @@ def test_submit_weekly_batch_without_client_triggers_fallback(monkeypatch):
     monkeypatch.setattr(meal_plan_batch_service, "_get_groq_client", lambda: None)
     triggered = []
 
-    def fake_schedule(users, week_start, week_end):
+    def fake_schedule(users, week_start, week_end, job=None):
         triggered.extend([user.id for user in users])
 
     monkeypatch.setattr(
@@ -292,7 +292,7 @@ def test_process_batch_job_handles_completed_output(monkeypatch):
 
     fallback_called = []
 
-    def fake_schedule(users, week_start, week_end):
+    def fake_schedule(users, week_start, week_end, job=None):
         fallback_called.extend([user.id for user in users])
 
     monkeypatch.setattr(
@@ -363,7 +363,7 @@ def test_process_batch_job_failure_triggers_fallback(monkeypatch):
 
     fallback_called = []
 
-    def fake_schedule(users, week_start, week_end):
+    def fake_schedule(users, week_start, week_end, job=None):
         fallback_called.extend([user.id for user in users])
 
     monkeypatch.setattr(
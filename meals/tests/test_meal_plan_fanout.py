@@ -0,0 +1,94 @@
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from meals import meal_plan_service
+from meals.services import meal_plan_fanout
+from meals.services.meal_plan_fanout import RequestBudget, generate_plans_concurrently
+
+WEEK_START = date(2026, 10, 19)
+WEEK_END = date(2026, 10, 25)
+
+
+@pytest.fixture
+def locks(monkeypatch):
+    held = set()
+    released = []
+    monkeypatch.setattr(meal_plan_fanout, "_claim_user", lambda user_id, week_start: user_id not in held)
+    monkeypatch.setattr(meal_plan_fanout, "_release_user", lambda user_id, week_start: released.append(user_id))
+    return held, released
+
+
+def _unlimited():
+    return RequestBudget(per_minute=60_000, burst=100)
+
+
+def test_generations_run_concurrently_up_to_max_workers(monkeypatch, locks):
+    active = 0
+    peak = 0
+    guard = threading.Lock()
+
+    def fake_create(user_id, start_of_week, end_of_week):
+        nonlocal active, peak
+        with guard:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with guard:
+            active -= 1
+        return object()
+
+    monkeypatch.setattr(meal_plan_service, "create_meal_plan_for_user", fake_create)
+
+    result = generate_plans_concurrently(range(1, 7), WEEK_START, WEEK_END, max_workers=3, budget=_unlimited())
+
+    assert sorted(result.completed) == [1, 2, 3, 4, 5, 6]
+    assert 1 < peak <= 3
+    assert sorted(locks[1]) == [1, 2, 3, 4, 5, 6]
+
+
+def test_locked_users_are_skipped_and_failures_reported(monkeypatch, locks):
+    held, released = locks
+    held.add(2)
+
+    def fake_create(user_id, start_of_week, end_of_week):
+        if user_id == 3:
+            raise RuntimeError("llm down")
+        return None if user_id == 4 else object()
+
+    monkeypatch.setattr(meal_plan_service, "create_meal_plan_for_user", fake_create)
+
+    result = generate_plans_concurrently([1, 2, 3, 4], WEEK_START, WEEK_END, budget=_unlimited())
+
+    assert result.completed == [1]
+    assert result.skipped == [2]
+    assert sorted(result.failed) == [3, 4]
+    assert 2 not in released
+
+
+def test_users_beyond_the_request_budget_are_deferred(monkeypatch, locks):
+    monkeypatch.setattr(meal_plan_service, "create_meal_plan_for_user", lambda **kwargs: object())
+    budget = RequestBudget(per_minute=60_000, total=2, burst=100)
+
+    result = generate_plans_concurrently([1, 2, 3, 4], WEEK_START, WEEK_END, max_workers=1, budget=budget)
+
+    assert result.completed == [1, 2]
+    assert result.deferred == [3, 4]
+
+
+def test_request_budget_paces_starts_per_minute():
+    now = [0.0]
+    sleeps = []
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    budget = RequestBudget(per_minute=30, burst=1, clock=lambda: now[0], sleep=fake_sleep)
+
+    assert budget.acquire()
+    assert budget.acquire()
+    assert sleeps == [pytest.approx(2.0)]
+    assert not budget.acquire(deadline=now[0] + 1)
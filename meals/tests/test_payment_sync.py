@@ -0,0 +1,122 @@
+from datetime import date, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+import stripe
+from django.utils import timezone
+
+from chefs.models import Chef
+from custom_auth.models import CustomUser
+from meals import chef_meals_views
+from meals.chef_meals_views import sync_recent_payments
+from meals.models import ChefMealEvent, ChefMealOrder, Meal, Order, PaymentLog, StripeConnectAccount
+
+
+class FakePaymentIntents:
+    """Serves PaymentIntent.list pages newest first, like Stripe does."""
+
+    def __init__(self, intents, page_size=2):
+        self.intents = sorted(intents, key=lambda intent: intent.created, reverse=True)
+        self.page_size = page_size
+        self.calls = []
+
+    def list(self, created, limit, starting_after=None, stripe_account=None):
+        self.calls.append({"gte": created["gte"], "starting_after": starting_after})
+        matching = [intent for intent in self.intents if intent.created >= created["gte"]]
+        if starting_after is not None:
+            ids = [intent.id for intent in matching]
+            matching = matching[ids.index(starting_after) + 1:]
+        page = matching[:self.page_size]
+        return SimpleNamespace(data=page, has_more=len(matching) > len(page))
+
+
+def _intent(intent_id, created, amount=2500, status="succeeded"):
+    return stripe.PaymentIntent.construct_from(
+        {"id": intent_id, "created": int(created.timestamp()), "amount": amount, "status": status},
+        "sk_test",
+    )
+
+
+@pytest.fixture
+def chef_with_orders(db):
+    chef_user = CustomUser.objects.create_user(username="syncchef", password="pass1234", email="chef@example.com")
+    customer = CustomUser.objects.create_user(username="synccustomer", password="pass1234", email="c@example.com")
+    chef = Chef.objects.create(user=chef_user)
+    StripeConnectAccount.objects.create(chef=chef, stripe_account_id="acct_1")
+    meal = Meal.objects.create(name="Lasagna", creator=chef_user)
+    event = ChefMealEvent.objects.create(
+        chef=chef,
+        meal=meal,
+        event_date=date(2026, 10, 23),
+        event_time=time(18, 0),
+        order_cutoff_time=timezone.now() + timedelta(days=5),
+        max_orders=10,
+        base_price=Decimal("20.00"),
+        current_price=Decimal("20.00"),
+        min_price=Decimal("15.00"),
+    )
+    order = Order.objects.create(customer=customer)
+    for intent_id in ("pi_1", "pi_2", "pi_3"):
+        ChefMealOrder.objects.create(
+            order=order,
+            meal_event=event,
+            customer=customer,
+            status="completed",
+            price_paid=Decimal("25.00"),
+            stripe_payment_intent_id=intent_id,
+        )
+    return chef
+
+
+def test_first_sync_logs_new_chef_meal_payments_and_sets_the_mark(chef_with_orders, monkeypatch):
+    now = timezone.now()
+    fake = FakePaymentIntents([
+        _intent("pi_1", now - timedelta(days=2)),
+        _intent("pi_2", now - timedelta(days=1)),
+        _intent("pi_other", now - timedelta(hours=5)),
+        _intent("pi_3", now - timedelta(hours=1)),
+    ])
+    monkeypatch.setattr(chef_meals_views.stripe.PaymentIntent, "list", fake.list)
+    PaymentLog.objects.create(action="charge", amount=Decimal("25.00"), stripe_id="pi_1", status="succeeded")
+
+    logged = sync_recent_payments(chef_with_orders)
+
+    assert logged == 2
+    assert sorted(PaymentLog.objects.values_list("stripe_id", flat=True)) == ["pi_1", "pi_2", "pi_3"]
+    assert PaymentLog.objects.get(stripe_id="pi_2").amount == Decimal("25.00")
+    account = StripeConnectAccount.objects.get(chef=chef_with_orders)
+    assert account.last_synced_payment_id == "pi_3"
+    assert int(account.payments_synced_through.timestamp()) == int((now - timedelta(hours=1)).timestamp())
+
+
+def test_next_sync_starts_at_the_mark(chef_with_orders, monkeypatch):
+    now = timezone.now()
+    StripeConnectAccount.objects.filter(chef=chef_with_orders).update(
+        payments_synced_through=now - timedelta(hours=1),
+        last_synced_payment_id="pi_2",
+    )
+    fake = FakePaymentIntents([
+        _intent("pi_1", now - timedelta(days=3)),
+        _intent("pi_2", now - timedelta(hours=1)),
+        _intent("pi_3", now - timedelta(minutes=5)),
+    ])
+    monkeypatch.setattr(chef_meals_views.stripe.PaymentIntent, "list", fake.list)
+
+    assert sync_recent_payments(chef_with_orders) == 2
+    assert sync_recent_payments(chef_with_orders) == 0
+
+    expected_gte = int((now - timedelta(hours=1) - chef_meals_views.PAYMENT_SYNC_OVERLAP).timestamp())
+    assert fake.calls[0]["gte"] == expected_gte
+    assert not PaymentLog.objects.filter(stripe_id="pi_1").exists()
+    assert StripeConnectAccount.objects.get(chef=chef_with_orders).last_synced_payment_id == "pi_3"
+
+
+def test_stripe_error_keeps_the_previous_mark(chef_with_orders, monkeypatch):
+    def failing_list(**kwargs):
+        raise stripe.error.APIConnectionError("network down")
+
+    monkeypatch.setattr(chef_meals_views.stripe.PaymentIntent, "list", failing_list)
+
+    assert sync_recent_payments(chef_with_orders) == 0
+    assert StripeConnectAccount.objects.get(chef=chef_with_orders).payments_synced_through is None
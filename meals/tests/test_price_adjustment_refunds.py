@@ -0,0 +1,210 @@
+import threading
+from datetime import date, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+import stripe
+from django.utils import timezone
+
+from chefs.models import Chef, ChefDailyMetrics
+from custom_auth.models import CustomUser
+from meals.models import STATUS_COMPLETED, ChefMealEvent, ChefMealOrder, Meal, Order, PaymentLog
+from meals.services.price_adjustment_refunds import (
+    RefundPlan,
+    issue_refunds,
+    pending_adjustments,
+    plan_refunds,
+    process_price_adjustments,
+    record_outcomes,
+)
+
+
+class FakeStripeRefunds:
+    """Local stand-in for stripe.Refund.create that honours idempotency keys."""
+
+    def __init__(self, failing_intents=()):
+        self.failing_intents = set(failing_intents)
+        self.by_key = {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def create(self, *, payment_intent, amount, idempotency_key, **params):
+        with self._lock:
+            self.calls.append({"payment_intent": payment_intent, "amount": amount, **params})
+            if payment_intent in self.failing_intents:
+                raise stripe.error.InvalidRequestError("charge already refunded", param="payment_intent")
+            if idempotency_key not in self.by_key:
+                self.by_key[idempotency_key] = SimpleNamespace(id=f"re_{len(self.by_key) + 1}", amount=amount)
+            return self.by_key[idempotency_key]
+
+
+def _row(order_id, price_paid, final_price, quantity=1, intent="pi_1"):
+    paid = None if price_paid is None else Decimal(price_paid)
+    final = Decimal(final_price)
+    return {
+        "id": order_id,
+        "meal_event_id": 10,
+        "customer_id": 100 + order_id,
+        "event_chef_id": 7,
+        "stripe_payment_intent_id": intent,
+        "price_paid": paid,
+        "final_price": final,
+        "refund_amount": None if paid is None else (paid - final) * quantity,
+    }
+
+
+def _plan(order_id, intent):
+    return RefundPlan(
+        order_id=order_id,
+        event_id=10,
+        customer_id=100 + order_id,
+        chef_id=7,
+        payment_intent_id=intent,
+        price_paid=Decimal("20.00"),
+        final_price=Decimal("15.00"),
+        amount=Decimal("5.00"),
+    )
+
+
+def test_rows_are_split_into_refunds_settled_and_skipped():
+    rows = [
+        _row(1, "20.00", "15.00", quantity=2),
+        _row(2, "15.00", "15.00"),
+        _row(3, "15.30", "15.00"),
+        _row(4, "20.00", "15.00", intent=None),
+        _row(5, None, "15.00"),
+    ]
+
+    plans, settled, skipped = plan_refunds(rows)
+
+    assert [(plan.order_id, plan.amount_cents) for plan in plans] == [(1, 1000)]
+    assert settled == [2, 3]
+    assert skipped == [4, 5]
+
+
+def test_idempotency_key_is_stable_per_order_and_final_price():
+    first = _plan(1, "pi_1")
+    again = _plan(1, "pi_1")
+    repriced = RefundPlan(**{**first.__dict__, "final_price": Decimal("14.00")})
+
+    assert first.idempotency_key == again.idempotency_key
+    assert first.idempotency_key != repriced.idempotency_key
+    assert first.idempotency_key != _plan(2, "pi_1").idempotency_key
+
+
+def test_retried_run_gets_the_original_refund_back():
+    stripe_refunds = FakeStripeRefunds()
+    plans = [_plan(i, f"pi_{i}") for i in range(1, 6)]
+
+    first = issue_refunds(plans, refund_create=stripe_refunds.create, max_workers=3)
+    retry = issue_refunds(plans, refund_create=stripe_refunds.create, max_workers=3)
+
+    assert [o.refund_id for o in first] == [o.refund_id for o in retry]
+    assert len(stripe_refunds.by_key) == 5
+    assert all(call["amount"] == 500 for call in stripe_refunds.calls)
+
+
+def test_stripe_errors_are_reported_per_order():
+    stripe_refunds = FakeStripeRefunds(failing_intents={"pi_2"})
+
+    outcomes = issue_refunds([_plan(1, "pi_1"), _plan(2, "pi_2")], refund_create=stripe_refunds.create)
+
+    assert [o.succeeded for o in outcomes] == [True, False]
+    assert "already refunded" in outcomes[1].error
+
+
+@pytest.fixture
+def discounted_event(db):
+    chef_user = CustomUser.objects.create_user(username="refundchef", password="pass1234", email="chef@example.com")
+    chef = Chef.objects.create(user=chef_user)
+    meal = Meal.objects.create(name="Paella", creator=chef_user)
+    event = ChefMealEvent.objects.create(
+        chef=chef,
+        meal=meal,
+        event_date=date(2026, 10, 10),
+        event_time=time(18, 0),
+        order_cutoff_time=timezone.now() - timedelta(days=7),
+        max_orders=10,
+        base_price=Decimal("20.00"),
+        current_price=Decimal("20.00"),
+        min_price=Decimal("15.00"),
+    )
+
+    def order(name, price_paid, intent, quantity=1, processed=False):
+        customer = CustomUser.objects.create_user(username=name, password="pass1234", email=f"{name}@example.com")
+        return ChefMealOrder.objects.create(
+            order=Order.objects.create(customer=customer),
+            meal_event=event,
+            customer=customer,
+            status="confirmed",
+            quantity=quantity,
+            price_paid=Decimal(price_paid),
+            stripe_payment_intent_id=intent,
+            price_adjustment_processed=processed,
+        )
+
+    event.orders_by_name = {
+        "refund": order("refund", "20.00", "pi_refund", quantity=2),
+        "settled": order("settled", "15.00", "pi_settled"),
+        "unpaid": order("unpaid", "20.00", None),
+        "done": order("done", "20.00", "pi_done", processed=True),
+    }
+    # Close out the event at the discounted price (save() pins prices once orders exist)
+    ChefMealEvent.objects.filter(pk=event.pk).update(status=STATUS_COMPLETED, current_price=Decimal("15.00"))
+    return event
+
+
+def test_pending_adjustments_annotates_unprocessed_orders(discounted_event):
+    orders = discounted_event.orders_by_name
+
+    rows = {row["id"]: row for row in pending_adjustments(timezone.now() - timedelta(days=7))}
+
+    assert set(rows) == {orders["refund"].id, orders["settled"].id, orders["unpaid"].id}
+    refund = rows[orders["refund"].id]
+    assert refund["refund_amount"] == Decimal("10.00")
+    assert refund["final_price"] == Decimal("15.00")
+    assert refund["event_chef_id"] == discounted_event.chef_id
+    assert rows[orders["settled"].id]["refund_amount"] == Decimal("0.00")
+    assert pending_adjustments(timezone.now() + timedelta(minutes=1)) == []
+
+
+def test_record_outcomes_marks_orders_and_logs_each_refund_once(discounted_event):
+    orders = discounted_event.orders_by_name
+    plans, settled, _ = plan_refunds(pending_adjustments(timezone.now() - timedelta(days=7)))
+    outcomes = issue_refunds(plans, refund_create=FakeStripeRefunds().create)
+
+    assert record_outcomes(outcomes, settled) == 1
+    assert record_outcomes(outcomes, settled) == 0
+
+    refunded = ChefMealOrder.objects.get(pk=orders["refund"].pk)
+    assert refunded.price_adjustment_processed
+    assert refunded.stripe_refund_id == "re_1"
+    assert ChefMealOrder.objects.get(pk=orders["settled"].pk).price_adjustment_processed
+    assert not ChefMealOrder.objects.get(pk=orders["unpaid"].pk).price_adjustment_processed
+
+    log = PaymentLog.objects.get(action="refund")
+    assert (log.chef_meal_order_id, log.stripe_id, log.amount) == (refunded.pk, "re_1", Decimal("10.00"))
+
+
+def test_recorded_refunds_reach_the_dashboard_rollup(discounted_event):
+    process_price_adjustments(
+        since=timezone.now() - timedelta(days=7),
+        refund_create=FakeStripeRefunds().create,
+    )
+
+    row = ChefDailyMetrics.objects.get(chef_id=discounted_event.chef_id, date=timezone.localdate())
+    assert row.refunds == Decimal("10.00")
+
+
+def test_rerun_after_recording_issues_nothing(discounted_event):
+    stripe_refunds = FakeStripeRefunds()
+    since = timezone.now() - timedelta(days=7)
+
+    first = process_price_adjustments(since=since, refund_create=stripe_refunds.create)
+    again = process_price_adjustments(since=since, refund_create=stripe_refunds.create)
+
+    assert first["processed"] == 1
+    assert again["processed"] == 0
+    assert len(stripe_refunds.calls) == 1
+    assert PaymentLog.objects.filter(action="refund").count() == 1
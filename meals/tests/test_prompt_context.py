@@ -0,0 +1,121 @@
+"""
+Tests for the versioned assistant prompt-context cache.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from custom_auth.models import CustomUser
+from meals import prompt_context
+from meals.meal_assistant_implementation import MealPlanningAssistant
+from meals.models import CustomDietaryPreference
+
+
+class PromptContextCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.builds = 0
+
+    def _build(self):
+        self.builds += 1
+        return f"context #{self.builds}"
+
+    def _fragment(self, *scopes):
+        return prompt_context.fragment("user_ctx", list(scopes), self._build)
+
+    def test_fragment_is_built_once_until_scope_is_bumped(self):
+        scope = prompt_context.user_scope(7)
+
+        self.assertEqual(self._fragment(scope), "context #1")
+        self.assertEqual(self._fragment(scope), "context #1")
+
+        prompt_context.bump(scope)
+
+        self.assertEqual(self._fragment(scope), "context #2")
+        self.assertEqual(self.builds, 2)
+
+    def test_bumping_one_scope_leaves_others_cached(self):
+        self._fragment(prompt_context.user_scope(1))
+        self._fragment(prompt_context.user_scope(2))
+
+        prompt_context.bump(prompt_context.user_scope(1))
+        self._fragment(prompt_context.user_scope(2))
+
+        self.assertEqual(self.builds, 2)
+
+    def test_fragment_depends_on_every_scope(self):
+        user = prompt_context.user_scope(3)
+        self._fragment(user, prompt_context.GLOBAL_SCOPE)
+
+        prompt_context.bump(prompt_context.GLOBAL_SCOPE)
+
+        self.assertEqual(self._fragment(user, prompt_context.GLOBAL_SCOPE), "context #2")
+
+    def test_evicted_version_does_not_resurrect_old_fragment(self):
+        scope = prompt_context.area_scope("10001")
+        self._fragment(scope)
+        cache.delete(prompt_context._version_key(scope))
+
+        self._fragment(scope)
+
+        self.assertEqual(self.builds, 2)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+)
+class BuildPromptInvalidationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            username="promptuser", email="prompt@example.com", password="testpass123",
+        )
+        self.preference = CustomDietaryPreference.objects.create(
+            name="Low-FODMAP", description="Avoids fermentable carbohydrates",
+        )
+        self.user.custom_dietary_preferences.add(self.preference)
+        # Skip client setup; build_prompt only needs the user id
+        self.assistant = MealPlanningAssistant.__new__(MealPlanningAssistant)
+        self.assistant.user_id = self.user.id
+
+    def _prompt(self):
+        with mock.patch.object(MealPlanningAssistant, "_tools_summary_for_prompt", return_value=""), \
+                mock.patch.object(MealPlanningAssistant, "_admin_blurb_for_country", return_value=None), \
+                mock.patch.object(MealPlanningAssistant, "_cached_local_chef_and_meal_events", return_value=""), \
+                mock.patch.object(MealPlanningAssistant, "_get_user_chat_summary", return_value=""), \
+                mock.patch.object(MealPlanningAssistant, "_country_code", return_value=""):
+            return self.assistant.build_prompt(is_guest=False)
+
+    def test_editing_custom_preference_rebuilds_holders_profile(self):
+        self.assertIn("Avoids fermentable carbohydrates", self._prompt())
+
+        self.preference.description = "Limits onions, garlic and wheat"
+        self.preference.save()
+
+        prompt = self._prompt()
+        self.assertIn("Limits onions, garlic and wheat", prompt)
+        self.assertNotIn("Avoids fermentable carbohydrates", prompt)
+
+    def test_deleting_custom_preference_rebuilds_holders_profile(self):
+        self.assertIn("Low-FODMAP", self._prompt())
+
+        self.preference.delete()
+
+        self.assertNotIn("Low-FODMAP", self._prompt())
+
+    def test_login_keeps_cached_profile(self):
+        scope = prompt_context.user_scope(self.user.id)
+        before = prompt_context._versions([scope])
+
+        self.user.last_login = timezone.now()
+        self.user.save(update_fields=["last_login"])
+        self.assertEqual(prompt_context._versions([scope]), before)
+
+        self.user.first_name = "Renamed"
+        self.user.save(update_fields=["first_name"])
+        self.assertNotEqual(prompt_context._versions([scope]), before)
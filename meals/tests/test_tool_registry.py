@@ -0,0 +1,59 @@
+"""
+Tests for the per-process tool registry.
+"""
+import json
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from meals import tool_registration
+from meals.tool_registration import (
+    AUDIENCE_AUTH,
+    AUDIENCE_GUEST,
+    execute_tool,
+    get_tool_registry,
+    reload_tool_registry,
+)
+
+
+class ToolRegistryTests(SimpleTestCase):
+
+    def tearDown(self):
+        reload_tool_registry()
+
+    def test_registry_is_built_once(self):
+        reload_tool_registry()
+        with patch.object(tool_registration, "get_all_tools", side_effect=AssertionError("rebuilt")):
+            first = get_tool_registry()
+            second = get_tool_registry()
+
+        self.assertIs(first, second)
+        self.assertTrue(first.tools_for(AUDIENCE_AUTH))
+        self.assertEqual(first.tools_for(AUDIENCE_GUEST), [])
+
+    def test_precomputed_views_match_tool_definitions(self):
+        registry = get_tool_registry()
+        tools = registry.tools_for(AUDIENCE_AUTH)
+
+        self.assertEqual(json.loads(registry.schemas_json[AUDIENCE_AUTH]), tools)
+        self.assertEqual(
+            registry.summary_for(AUDIENCE_AUTH),
+            tool_registration.summarize_tools_for_prompt(tools),
+        )
+        for tool in tools:
+            self.assertIn(tool["name"], registry.dispatch)
+        with self.assertRaises(TypeError):
+            registry.dispatch["new_tool"] = print
+
+    def test_reload_picks_up_new_definitions(self):
+        extra = {"name": "debug_tool", "description": "Only in dev", "parameters": {"type": "object", "properties": {}}}
+        original = tool_registration.get_all_tools()
+        with patch.object(tool_registration, "get_all_tools", return_value=[*original, extra]):
+            registry = reload_tool_registry()
+
+        self.assertIn("debug_tool", registry.summary_for(AUDIENCE_AUTH))
+
+    def test_execute_tool_dispatches_through_registry(self):
+        result = execute_tool("definitely_not_a_tool")
+
+        self.assertEqual(result["status"], "error")
@@ -5,8 +5,14 @@ This module brings together all the tools implemented for the meal planning assi
 and provides a unified interface for registering and accessing them.
 """
 
+import importlib
+import json
 import logging
-from typing import Dict, List, Optional, Any, Union, Tuple
+import sys
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Any, Union, Tuple
 
 # Import all tool modules
 from .meal_planning_tools import get_meal_planning_tools
@@ -90,39 +96,11 @@ def get_guest_tools():
 
 logger = logging.getLogger(__name__)
 
-# Build a lookup of tool schemas (required args) from the tool metadata
-def _build_tool_schema_index() -> Dict[str, Dict[str, Any]]:
-    index: Dict[str, Dict[str, Any]] = {}
-    try:
-        # Concatenate all tool metadata lists
-        tool_lists: List[List[Dict[str, Any]]] = [
-            get_meal_planning_tools(),
-            get_pantry_management_tools(),
-            get_chef_connection_tools(),
-            get_payment_processing_tools(),
-            get_dietary_preference_tools(),
-            get_customer_dashboard_tools(),
-            get_guest_tools(),
-        ]
-        for tools in tool_lists:
-            for t in tools:
-                name = t.get("name")
-                params = (t.get("parameters") or {})
-                required = params.get("required") or []
-                properties = params.get("properties") or {}
-                if name:
-                    index[name] = {"required": required, "properties": properties}
-    except Exception as e:
-        logger.warning(f"Failed building tool schema index: {e}")
-    return index
-
-_TOOL_SCHEMAS = _build_tool_schema_index()
-
 def _coerce_types(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
     """Best‑effort type coercion for simple scalar fields (e.g., ids).
     Converts numeric strings to ints when the schema declares type integer.
     """
-    schema = _TOOL_SCHEMAS.get(name) or {}
+    schema = get_tool_registry().arg_schemas.get(name) or {}
     props: Dict[str, Any] = schema.get("properties", {})
     out = dict(args)
     for key, prop in props.items():
@@ -135,7 +113,7 @@ def _coerce_types(name: str, args: Dict[str, Any]) -> Dict[str, Any]:
     return out
 
 def _validate_required(name: str, args: Dict[str, Any]) -> Tuple[bool, List[str]]:
-    schema = _TOOL_SCHEMAS.get(name) or {}
+    schema = get_tool_registry().arg_schemas.get(name) or {}
     required: List[str] = schema.get("required", [])
     missing = [k for k in required if args.get(k) in (None, "", [])]
     return (len(missing) == 0), missing
@@ -236,6 +214,153 @@ def get_all_guest_tools():
     """Legacy stub - guest tools have been removed."""
     return []
 
+# ────────────────────────────────────────────────────────────────────
+#  Frozen per-process registry
+# ────────────────────────────────────────────────────────────────────
+
+AUDIENCE_AUTH = "auth"
+AUDIENCE_GUEST = "guest"
+
+# Modules that define tool metadata; reloaded by reload_tool_registry(reload_modules=True)
+_TOOL_DEFINITION_MODULES = (
+    "meals.meal_planning_tools",
+    "meals.pantry_management_tools",
+    "meals.chef_connection_tools",
+    "meals.payment_processing_tools",
+    "meals.dietary_preference_tools",
+    "meals.customer_dashboard_tools",
+)
+
+
+def summarize_tools_for_prompt(tools: List[Dict[str, Any]]) -> str:
+    """Render a concise, friendly list of available tools for the prompt.
+
+    Example output:
+      • create_meal_plan — Create a weekly meal plan for a user
+      • modify_meal_plan — Modify a specific slot in a plan
+    """
+    try:
+        lines: List[str] = []
+        for t in tools or []:
+            name = t.get("name", "unknown_tool")
+            desc = (t.get("description") or "").strip()
+            if desc:
+                # keep it to one line, ~90 chars max
+                if len(desc) > 90:
+                    desc = desc[:87].rstrip() + "…"
+                lines.append(f"  • {name} — {desc}")
+            else:
+                lines.append(f"  • {name}")
+        return "\n".join(lines) if lines else "  • (no tools registered)"
+    except Exception:
+        # Never break prompt building on summarization
+        try:
+            return "\n".join([f"  • {t.get('name','unknown_tool')}" for t in tools or []])
+        except Exception:
+            return "  • (tools unavailable)"
+
+
+@dataclass(frozen=True)
+class ToolRegistry:
+    """Everything the assistant needs about its tools, computed once.
+
+    Tool definitions are shared between requests and must be treated as
+    read-only by callers.
+    """
+    tools: Mapping[str, Tuple[Dict[str, Any], ...]]
+    schemas_json: Mapping[str, str]
+    summaries: Mapping[str, str]
+    dispatch: Mapping[str, Callable[..., Any]]
+    arg_schemas: Mapping[str, Dict[str, Any]]
+
+    def tools_for(self, audience: str) -> List[Dict[str, Any]]:
+        return list(self.tools.get(audience, ()))
+
+    def summary_for(self, audience: str) -> str:
+        return self.summaries.get(audience) or summarize_tools_for_prompt([])
+
+
+def _build_tool_registry() -> ToolRegistry:
+    all_tools = get_all_tools()
+    audiences = {
+        AUDIENCE_AUTH: [t for t in all_tools if not t["name"].startswith("guest")],
+        AUDIENCE_GUEST: get_all_guest_tools(),
+    }
+
+    tools: Dict[str, Tuple[Dict[str, Any], ...]] = {}
+    schemas_json: Dict[str, str] = {}
+    for audience, definitions in audiences.items():
+        # Serialize once, and hand out copies decoded from that payload so the
+        # registry does not alias the dicts owned by the tool modules.
+        payload = json.dumps(definitions, ensure_ascii=False, separators=(",", ":"))
+        schemas_json[audience] = payload
+        tools[audience] = tuple(json.loads(payload))
+
+    arg_schemas: Dict[str, Dict[str, Any]] = {}
+    for t in all_tools:
+        name = t.get("name")
+        params = t.get("parameters") or {}
+        if name:
+            arg_schemas[name] = {
+                "required": params.get("required") or [],
+                "properties": params.get("properties") or {},
+            }
+
+    return ToolRegistry(
+        tools=MappingProxyType(tools),
+        schemas_json=MappingProxyType(schemas_json),
+        summaries=MappingProxyType({a: summarize_tools_for_prompt(list(t)) for a, t in tools.items()}),
+        dispatch=MappingProxyType(dict(TOOL_FUNCTION_MAP)),
+        arg_schemas=MappingProxyType(arg_schemas),
+    )
+
+
+_registry: Optional[ToolRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Return the process-wide tool registry, building it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = _build_tool_registry()
+    return _registry
+
+
+def reload_tool_registry(reload_modules: bool = False) -> ToolRegistry:
+    """
+    Rebuild the registry, e.g. after editing tool definitions in development.
+
+    With ``reload_modules`` the tool definition modules and the modules that
+    own each handler are re-imported first, so edited descriptions, schemas
+    and handler code are picked up without restarting the process.
+    """
+    global _registry, get_meal_planning_tools, get_pantry_management_tools
+    global get_chef_connection_tools, get_payment_processing_tools, get_dietary_preference_tools
+    global get_customer_dashboard_tools
+    with _registry_lock:
+        if reload_modules:
+            handler_modules = {fn.__module__ for fn in TOOL_FUNCTION_MAP.values()}
+            for name in (*_TOOL_DEFINITION_MODULES, *sorted(handler_modules)):
+                module = sys.modules.get(name)
+                if module is not None:
+                    importlib.reload(module)
+            TOOL_FUNCTION_MAP.update({
+                tool: getattr(sys.modules[fn.__module__], fn.__name__, fn)
+                for tool, fn in TOOL_FUNCTION_MAP.items()
+            })
+            get_meal_planning_tools = sys.modules["meals.meal_planning_tools"].get_meal_planning_tools
+            get_pantry_management_tools = sys.modules["meals.pantry_management_tools"].get_pantry_management_tools
+            get_chef_connection_tools = sys.modules["meals.chef_connection_tools"].get_chef_connection_tools
+            get_payment_processing_tools = sys.modules["meals.payment_processing_tools"].get_payment_processing_tools
+            get_dietary_preference_tools = sys.modules["meals.dietary_preference_tools"].get_dietary_preference_tools
+            get_customer_dashboard_tools = sys.modules["meals.customer_dashboard_tools"].get_customer_dashboard_tools
+        _registry = _build_tool_registry()
+        return _registry
+
+
 def get_tools_by_category(category: str):
     """
     Get tools by category for the OpenAI Responses API.
@@ -274,7 +399,8 @@ def execute_tool(tool_name: str, **kwargs):
     Returns:
         The result of the tool function execution
     """
-    if tool_name not in TOOL_FUNCTION_MAP:
+    dispatch = get_tool_registry().dispatch
+    if tool_name not in dispatch:
         logger.error(f"Unknown tool: {tool_name}")
         return {
             "status": "error",
@@ -283,7 +409,7 @@ def execute_tool(tool_name: str, **kwargs):
         
     try:
         # Get the tool function
-        tool_function = TOOL_FUNCTION_MAP[tool_name]
+        tool_function = dispatch[tool_name]
         # Coerce types and validate required args from schema
         coerced = _coerce_types(tool_name, kwargs)
         # Debug prints removed
@@ -77,6 +77,7 @@ from django.views.decorators.csrf import csrf_exempt
 from zoneinfo import ZoneInfo
 from django.http import HttpResponseForbidden
 from meals.feature_flags import legacy_meal_plan_enabled, require_legacy_meal_plan_enabled
+from utils.error_reporting import report_error
 
 
 LEGACY_MEAL_PLAN = True
@@ -1619,8 +1620,7 @@ def api_update_meals_with_prompt(request):
     except Exception as e:
         logger.error(f"Error in api_update_meals_with_prompt: {str(e)}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": f"Error in api_update_meals_with_prompt: {str(e)}", "source":"api_update_meals_with_prompt", "traceback": traceback.format_exc()})
+        report_error(f"Error in api_update_meals_with_prompt: {str(e)}", "api_update_meals_with_prompt")
         logger.error(f"Full traceback: {traceback.format_exc()}")
         return Response({
             "error": f"An error occurred: {str(e)}"
@@ -1785,11 +1785,7 @@ def api_suggest_meal_alternatives(request):
 
     except Exception as e:
         logger.error(f"Error in api_suggest_meal_alternatives: {str(e)}")
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        try:
-            requests.post(n8n_traceback_url, json={"error": f"Error in api_suggest_meal_alternatives: {str(e)}", "source":"api_suggest_meal_alternatives", "traceback": traceback.format_exc()})
-        except Exception:
-            pass
+        report_error(f"Error in api_suggest_meal_alternatives: {str(e)}", "api_suggest_meal_alternatives")
         logger.error(f"Full traceback: {traceback.format_exc()}")
         return Response({
             "error": f"An error occurred: {str(e)}"
@@ -1844,11 +1840,7 @@ def get_available_meals_count(user_id):
             set(cache_key, count, 900)
         except Exception as e:
             # N8N traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            try:
-                requests.post(n8n_traceback_url, json={"error": f"Error in get_available_meals_count: {str(e)}", "source":"get_available_meals_count", "traceback": traceback.format_exc()})
-            except Exception:
-                pass
+            report_error(f"Error in get_available_meals_count: {str(e)}", "get_available_meals_count")
             count = 0
     
     return count
@@ -2205,15 +2197,13 @@ def api_stream_meal_plan_generation(request):
                             last_heartbeat = now_ts
             except GeneratorExit:
                 #n8n traceback
-                n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                requests.post(n8n_traceback_url, json={"error": str(e), "source":"api_stream_meal_plan_generation", "traceback": traceback.format_exc()})
+                report_error(e, "api_stream_meal_plan_generation")
             finally:
                 try:
                     pubsub.unsubscribe(channel)
                 except Exception:
                     #n8n traceback
-                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                    requests.post(n8n_traceback_url, json={"error": str(e), "source":"api_stream_meal_plan_generation", "traceback": traceback.format_exc()})
+                    report_error(e, "api_stream_meal_plan_generation")
             yield 'event: close\n\n'
 
         response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
@@ -2224,8 +2214,7 @@ def api_stream_meal_plan_generation(request):
     except Exception as e:
         logger.error(f"Error in api_stream_meal_plan_generation: {str(e)}")
         #n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"api_stream_meal_plan_generation", "traceback": traceback.format_exc()})
+        report_error(e, "api_stream_meal_plan_generation")
         def err_stream4():
             yield f"event: error\n"
             yield f"data: {json.dumps({'message': str(e)})}\n\n"
@@ -2282,8 +2271,7 @@ def api_cleanup_meal_plan_locks(request):
         }, status=400)
     except Exception as e:
         #n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"api_cleanup_meal_plan_locks", "traceback": traceback.format_exc()})
+        report_error(e, "api_cleanup_meal_plan_locks")
         logger.error(f"Error in manual lock cleanup: {str(e)}")
         return Response({
             "status": "error",
@@ -2352,8 +2340,7 @@ def api_meal_plan_status(request, task_id):
     
     except Exception as e:
         #n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"api_meal_plan_status", "traceback": traceback.format_exc()})
+        report_error(e, "api_meal_plan_status")
         logger.error(f"Error checking task status {task_id}: {str(e)}")
         return Response({
             "status": "error",
@@ -3827,12 +3814,10 @@ def api_process_meal_payment(request, order_id):
             # Log error but don't fail the payment process
             logger.error(f"Error triggering n8n webhook for order {order_id} email: {webhook_error}", exc_info=True)
             #n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"api_process_meal_payment", "traceback": traceback.format_exc()})
+            report_error(e, "api_process_meal_payment")
         except Exception as general_error: # Catch any other unexpected errors
             #n8n traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            requests.post(n8n_traceback_url, json={"error": str(e), "source":"api_process_meal_payment", "traceback": traceback.format_exc()})
+            report_error(e, "api_process_meal_payment")
             logger.error(f"Unexpected error during n8n trigger for order {order_id} email: {general_error}", exc_info=True)
         # --- End: Trigger n8n Webhook --- 
 
@@ -5404,11 +5389,7 @@ def api_modify_meal_plan(request, meal_plan_id):
             )
         except Exception as e:
             # N8N traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            try:
-                requests.post(n8n_traceback_url, json={"error": f"Error in api_modify_meal_plan: {str(e)}", "source":"api_modify_meal_plan", "traceback": traceback.format_exc()})
-            except Exception:
-                pass
+            report_error(f"Error in api_modify_meal_plan: {str(e)}", "api_modify_meal_plan")
             raise
         try:
             # Fetch the updated meal plan meals to return in the response
@@ -5429,11 +5410,7 @@ def api_modify_meal_plan(request, meal_plan_id):
                     })
                 except Exception as meal_err:
                     # N8N traceback
-                    n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-                    try:
-                        requests.post(n8n_traceback_url, json={"error": f"Error in api_modify_meal_plan: {str(meal_err)}", "source":"api_modify_meal_plan", "traceback": traceback.format_exc()})
-                    except Exception:
-                        pass
+                    report_error(f"Error in api_modify_meal_plan: {str(meal_err)}", "api_modify_meal_plan")
                     raise
             
             response_data = {
@@ -5446,11 +5423,7 @@ def api_modify_meal_plan(request, meal_plan_id):
             return Response(response_data, status=status.HTTP_200_OK)
         except Exception as format_err:
             # N8N traceback
-            n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-            try:
-                requests.post(n8n_traceback_url, json={"error": f"Error in api_modify_meal_plan: {str(format_err)}", "source":"api_modify_meal_plan", "traceback": traceback.format_exc()})
-            except Exception:
-                pass
+            report_error(f"Error in api_modify_meal_plan: {str(format_err)}", "api_modify_meal_plan")
             raise
     
     except MealPlan.DoesNotExist:
@@ -5460,11 +5433,7 @@ def api_modify_meal_plan(request, meal_plan_id):
         )
     except Exception as e:
         # N8N traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        try:
-            requests.post(n8n_traceback_url, json={"error": f"Error in api_modify_meal_plan: {str(e)}", "source":"api_modify_meal_plan", "traceback": traceback.format_exc()})
-        except Exception:
-            pass
+        report_error(f"Error in api_modify_meal_plan: {str(e)}", "api_modify_meal_plan")
         logger.error(f"Error modifying meal plan: {str(e)}")
         return Response(
             {"error": f"Failed to modify meal plan: {str(e)}"}, 
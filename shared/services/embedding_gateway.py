@@ -0,0 +1,280 @@
+"""
+EmbeddingGateway - Single entry point for OpenAI embedding calls.
+
+Embeddings are content-addressed by (model, dimensions, normalized text hash)
+and cached in two tiers:
+
+- an in-process LRU front (per worker, no I/O)
+- the shared Django cache (Redis in production, LocMem in tests)
+
+Only texts missing from both tiers reach the API, and those are sent in
+batches. Vectors are stored as float32 bytes, which is the precision the API
+returns them in.
+
+Usage:
+    from shared.services.embedding_gateway import embedding_gateway
+
+    vector = embedding_gateway.embed("chicken thighs")
+    vectors = embedding_gateway.embed_many(["rice", "beans"], dimensions=1536)
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "text-embedding-3-small"
+MODEL_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+# OpenAI accepts at most 2048 inputs per embeddings request
+MAX_BATCH_INPUTS = 2048
+MAX_INPUT_CHARS = 8000
+
+CACHE_KEY_PREFIX = "emb:v1"
+SHARED_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", str(30 * 24 * 3600)))
+LOCAL_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_LOCAL_SIZE", "2048"))
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace (including newlines) and trim, mirroring what we send to the API."""
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def cache_key(text: str, model: str = DEFAULT_MODEL, dimensions: Optional[int] = None) -> str:
+    """Content-addressed cache key for an already-normalized text."""
+    dims = dimensions or MODEL_DIMENSIONS.get(model, 0)
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{model}:{dims}:{digest}"
+
+
+def _default_client():
+    from shared.utils import get_openai_client
+
+    return get_openai_client()
+
+
+class _LRU:
+    """Small thread-safe LRU map for the in-process tier."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: List[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class EmbeddingGateway:
+    """Cached, batched access to the OpenAI embeddings API."""
+
+    def __init__(
+        self,
+        client_factory: Callable = _default_client,
+        local_size: int = LOCAL_CACHE_SIZE,
+        shared_ttl: int = SHARED_CACHE_TTL,
+    ):
+        self._client_factory = client_factory
+        self._local = _LRU(local_size)
+        self._shared_ttl = shared_ttl
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "local_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "api_calls": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def embed(
+        self,
+        text: str,
+        model: str = DEFAULT_MODEL,
+        dimensions: Optional[int] = None,
+        client_factory: Optional[Callable] = None,
+    ) -> Optional[List[float]]:
+        """Embed a single text. Returns None for empty input or on API failure."""
+        return self.embed_many([text], model=model, dimensions=dimensions, client_factory=client_factory)[0]
+
+    def embed_many(
+        self,
+        texts: Sequence[str],
+        model: str = DEFAULT_MODEL,
+        dimensions: Optional[int] = None,
+        client_factory: Optional[Callable] = None,
+    ) -> List[Optional[List[float]]]:
+        """Embed many texts, preserving order.
+
+        Cached texts cost nothing; duplicates within ``texts`` are sent once.
+        Entries that are empty or fail to embed come back as None.
+        """
+        normalized = [normalize_text(t)[:MAX_INPUT_CHARS] for t in texts]
+        keys = [cache_key(t, model, dimensions) if t else None for t in normalized]
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        pending: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            if key is None:
+                continue
+            cached = self._local.get(key)
+            if cached is not None:
+                self._bump("local_hits")
+                results[i] = cached
+            else:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            for key, vector in self._shared_get_many(list(pending)).items():
+                self._bump("shared_hits", len(pending[key]))
+                self._local.set(key, vector)
+                for i in pending.pop(key):
+                    results[i] = vector
+
+        if pending:
+            miss_keys = list(pending)
+            self._bump("misses", sum(len(v) for v in pending.values()))
+            fetched = self._fetch(
+                [normalized[pending[k][0]] for k in miss_keys],
+                model=model,
+                dimensions=dimensions,
+                client_factory=client_factory or self._client_factory,
+            )
+            to_store = {}
+            for key, vector in zip(miss_keys, fetched):
+                if vector is None:
+                    continue
+                self._local.set(key, vector)
+                to_store[key] = vector
+                for i in pending[key]:
+                    results[i] = vector
+            self._shared_set_many(to_store)
+
+        return results
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for this process plus derived hit rate."""
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        lookups = snapshot["local_hits"] + snapshot["shared_hits"] + snapshot["misses"]
+        snapshot["hit_rate"] = (
+            (snapshot["local_hits"] + snapshot["shared_hits"]) / lookups if lookups else 0.0
+        )
+        snapshot["local_size"] = len(self._local)
+        return snapshot
+
+    def clear_local(self) -> None:
+        """Drop the in-process tier (the shared tier is left intact)."""
+        self._local.clear()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    def _bump(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    @staticmethod
+    def _encode(vector: List[float]) -> bytes:
+        return np.asarray(vector, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> List[float]:
+        return np.frombuffer(blob, dtype=np.float32).tolist()
+
+    def _shared_get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        try:
+            from django.core.cache import cache
+
+            found = cache.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return {}
+        decoded = {}
+        for key, blob in found.items():
+            try:
+                decoded[key] = self._decode(blob)
+            except Exception:
+                continue
+        return decoded
+
+    def _shared_set_many(self, vectors: Dict[str, List[float]]) -> None:
+        if not vectors:
+            return
+        try:
+            from django.core.cache import cache
+
+            cache.set_many({k: self._encode(v) for k, v in vectors.items()}, timeout=self._shared_ttl)
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def _fetch(
+        self,
+        texts: List[str],
+        model: str,
+        dimensions: Optional[int],
+        client_factory: Callable,
+    ) -> List[Optional[List[float]]]:
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        try:
+            client = client_factory()
+        except Exception as e:
+            self._bump("errors")
+            logger.error(f"Embedding client unavailable: {e}")
+            return vectors
+
+        extra = {"dimensions": dimensions} if dimensions else {}
+        for start in range(0, len(texts), MAX_BATCH_INPUTS):
+            chunk = texts[start:start + MAX_BATCH_INPUTS]
+            try:
+                self._bump("api_calls")
+                response = client.embeddings.create(model=model, input=chunk, **extra)
+                for position, item in enumerate(response.data):
+                    index = getattr(item, "index", position)
+                    embedding = item.embedding
+                    if isinstance(embedding, np.ndarray):
+                        embedding = embedding.tolist()
+                    vectors[start + (index if isinstance(index, int) else position)] = embedding
+            except Exception as e:
+                self._bump("errors")
+                logger.error(f"Embedding request failed for {len(chunk)} inputs: {e}")
+        return vectors
+
+
+# Global instance for application use
+embedding_gateway = EmbeddingGateway()
@@ -0,0 +1,69 @@
+"""
+Tests for EmbeddingGateway - the cached embedding entry point.
+"""
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from shared.services.embedding_gateway import EmbeddingGateway, cache_key
+
+
+class _FakeClient:
+    """Records embedding calls and returns a deterministic vector per input."""
+
+    def __init__(self):
+        self.calls = []
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _create(self, model, input, **kwargs):
+        self.calls.append(list(input))
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[float(len(text)), 1.0, 0.5])
+            for i, text in enumerate(input)
+        ])
+
+
+class EmbeddingGatewayTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client = _FakeClient()
+        self.gateway = EmbeddingGateway(client_factory=lambda: self.client, local_size=16)
+
+    def test_repeated_text_hits_cache(self):
+        first = self.gateway.embed("garlic  butter\nshrimp")
+        second = self.gateway.embed("garlic butter shrimp")
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(self.client.calls), 1)
+        stats = self.gateway.stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['local_hits'], 1)
+
+    def test_shared_tier_survives_local_eviction(self):
+        self.gateway.embed("tofu")
+        self.gateway.clear_local()
+
+        self.gateway.embed("tofu")
+
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertEqual(self.gateway.stats()['shared_hits'], 1)
+
+    def test_embed_many_dedupes_and_preserves_order(self):
+        vectors = self.gateway.embed_many(["rice", "", "beans", "rice"])
+
+        self.assertEqual(self.client.calls, [["rice", "beans"]])
+        self.assertIsNone(vectors[1])
+        self.assertEqual(vectors[0], vectors[3])
+        self.assertEqual(vectors[2][0], 5.0)
+
+    def test_key_depends_on_model_and_dimensions(self):
+        self.assertNotEqual(
+            cache_key("x", "text-embedding-3-small", 512),
+            cache_key("x", "text-embedding-3-small", 1536),
+        )
+        self.assertEqual(
+            cache_key("x", "text-embedding-3-small"),
+            cache_key("x", "text-embedding-3-small", 1536),
+        )
@@ -28,7 +28,6 @@ from .google_places import nearby_supermarkets
 import os
 import openai
 from openai import OpenAI
-from openai import OpenAIError
 try:
     from groq import Groq
 except ImportError:
@@ -230,47 +229,21 @@ def append_custom_dietary_preference(request, preference_name):
         return {"status": "error", "message": f"An unexpected error occurred: {str(e)}"}
 
 def get_embedding(text, model="text-embedding-3-small"):
-    text = text.replace("\n", " ")
-    logger.info(f"Generating embedding with model: {model}, text length: {len(text)}")
+    """Embed ``text`` through the shared, content-addressed embedding cache."""
+    from shared.services.embedding_gateway import embedding_gateway
+
     try:
-        # Fetch the response from the embedding API
-        response = get_openai_client().embeddings.create(input=[text], model=model)
-        
-        # Enable detailed logging when troubleshooting
-        logger.info(f"Embedding API response received, type: {type(response)}")
-        
-        # Access the embedding data safely
-        if hasattr(response, 'data') and len(response.data) > 0:
-            embedding_data = response.data[0]
-            logger.info(f"Successfully extracted embedding_data from response")
-            
-            
-            if hasattr(embedding_data, 'embedding'):
-                embedding = embedding_data.embedding
-                logger.info(f"Successfully extracted embedding from embedding_data")
-                
-                # Convert numpy arrays to lists if necessary
-                if isinstance(embedding, np.ndarray):
-                    embedding = embedding.tolist()
-                    logger.info("Converted numpy array to list")
-                
-                # Validate the embedding
-                if is_valid_embedding(embedding):
-                    logger.info(f"Valid embedding generated with length: {len(embedding)}")
-                    return embedding
-                else:
-                    logger.error(f"Invalid embedding format or length: {len(embedding) if embedding else 'None'}")
-                    return None
-            else:
-                logger.error("No 'embedding' attribute found in response.data[0]")
-                return None
-        else:
-            logger.error(f"No data in embedding response: {response}")
+        embedding = embedding_gateway.embed(text, model=model, client_factory=get_openai_client)
+        if embedding is None:
+            logger.error(f"No embedding returned for text length: {len(text or '')}")
             return None
-            
-    except OpenAIError as e:
-        logger.error(f"OpenAI Error generating embedding: {e}")
+
+        # Validate the embedding
+        if is_valid_embedding(embedding):
+            return embedding
+        logger.error(f"Invalid embedding format or length: {len(embedding) if embedding else 'None'}")
         return None
+
     except Exception as e:
         logger.error(f"Unexpected error generating embedding: {str(e)}")
         logger.error(f"Error traceback: {traceback.format_exc()}")
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from api import job_queue
+from api.models import CronJob
+
+CALLS = []
+RECORD = f"{__name__}.record_call"
+FAIL = f"{__name__}.always_fail"
+
+
+def record_call(**kwargs):
+    CALLS.append(kwargs)
+    return "ok"
+
+
+def always_fail():
+    raise RuntimeError("provider down")
+
+
+@pytest.fixture(autouse=True)
+def _reset_calls():
+    CALLS.clear()
+
+
+@pytest.mark.django_db
+def test_enqueue_reuses_active_job_with_same_dedupe_key():
+    first = job_queue.enqueue(RECORD, {"n": 1}, dedupe_key="user:1")
+    second = job_queue.enqueue(RECORD, {"n": 2}, dedupe_key="user:1")
+
+    assert first.pk == second.pk
+
+    CronJob.objects.filter(pk=first.pk).update(status=CronJob.STATUS_SUCCEEDED)
+    third = job_queue.enqueue(RECORD, {"n": 3}, dedupe_key="user:1")
+
+    assert third.pk != first.pk
+
+
+@pytest.mark.django_db
+def test_claim_respects_concurrency_cap(settings):
+    settings.CRON_JOB_CONCURRENCY = {"meal_plan": 2}
+    for i in range(3):
+        job_queue.enqueue(RECORD, {"n": i}, concurrency_key="meal_plan")
+    other = job_queue.enqueue(RECORD, {"n": "other"})
+
+    claimed = [job_queue.claim_job("w1") for _ in range(4)]
+
+    assert [job.pk for job in claimed[:3]] == [claimed[0].pk, claimed[1].pk, other.pk]
+    assert claimed[3] is None
+
+
+@pytest.mark.django_db
+def test_successful_job_runs_with_its_kwargs():
+    job_queue.enqueue(RECORD, {"user_id": 7})
+
+    job = job_queue.claim_job("w1")
+    job_queue.complete_job(job, job_queue.execute_job(job))
+
+    job.refresh_from_db()
+    assert CALLS == [{"user_id": 7}]
+    assert job.status == CronJob.STATUS_SUCCEEDED
+    assert job.result == "ok"
+
+
+@pytest.mark.django_db
+def test_failed_job_backs_off_then_fails_after_max_attempts():
+    job_queue.enqueue(FAIL, max_attempts=2)
+
+    job = job_queue.claim_job("w1")
+    job_queue.fail_job(job, "provider down")
+    job.refresh_from_db()
+
+    assert job.status == CronJob.STATUS_QUEUED
+    assert job.run_after > timezone.now()
+    assert job_queue.claim_job("w1") is None
+
+    CronJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    job = job_queue.claim_job("w1")
+    job_queue.fail_job(job, "provider down")
+    job.refresh_from_db()
+
+    assert job.attempts == 2
+    assert job.status == CronJob.STATUS_FAILED
+
+
+@pytest.mark.django_db
+def test_expired_lease_is_reclaimed_by_another_worker():
+    job_queue.enqueue(RECORD)
+    job = job_queue.claim_job("dead-worker")
+    CronJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+    reclaimed = job_queue.claim_job("w2")
+
+    assert reclaimed.pk == job.pk
+    assert reclaimed.lease_owner == "w2"
+    assert reclaimed.attempts == 2
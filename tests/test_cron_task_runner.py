@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from api.models import CronTaskRun, CronTaskState
+from api.task_runner import SliceResult, resumable_task, run_task
+from meals.celery_utils import handle_task_failure
+
+ITEMS = list(range(1, 8))
+
+
+def _make_task(seen, per_slice=3, fail_on=None):
+    @resumable_task
+    @handle_task_failure
+    def task(task_slice):
+        for item in [i for i in ITEMS if i > (task_slice.cursor or 0)]:
+            if task_slice.processed >= per_slice:
+                return task_slice.pause()
+            if item == fail_on:
+                raise RuntimeError(f"boom at {item}")
+            seen.append(item)
+            task_slice.advance(item)
+        return task_slice.complete("done")
+
+    return task
+
+
+@pytest.mark.django_db
+def test_resumable_task_runs_in_slices_and_records_history():
+    seen = []
+    task = _make_task(seen)
+
+    statuses = [run_task("demo", task, execution_id=f"e{i}").status for i in range(3)]
+
+    assert statuses == ["continue", "continue", "completed"]
+    assert seen == ITEMS
+    runs = list(CronTaskRun.objects.filter(task_name="demo").order_by("slice_number"))
+    assert [r.items_processed for r in runs] == [3, 3, 1]
+    assert [r.slice_number for r in runs] == [1, 2, 3]
+    assert len({r.run_id for r in runs}) == 1
+
+    state = CronTaskState.objects.get(task_name="demo")
+    assert state.cursor is None and state.run_id is None
+    assert state.items_processed == 7
+    assert state.lease_expires_at is None
+
+
+@pytest.mark.django_db
+def test_failed_slice_keeps_checkpoint_for_the_retry():
+    seen = []
+    with pytest.raises(RuntimeError):
+        run_task("demo", _make_task(seen, per_slice=10, fail_on=3))
+
+    state = CronTaskState.objects.get(task_name="demo")
+    assert state.cursor == 2
+    assert CronTaskRun.objects.get(task_name="demo").status == CronTaskRun.STATUS_ERROR
+
+    run = run_task("demo", _make_task(seen, per_slice=10))
+
+    assert run.status == CronTaskRun.STATUS_COMPLETED
+    assert run.slice_number == 2
+    assert seen == ITEMS
+
+
+@pytest.mark.django_db
+def test_failed_slice_after_pause_resumes_from_saved_cursor():
+    seen = []
+    assert run_task("demo", _make_task(seen)).status == CronTaskRun.STATUS_CONTINUE
+
+    with pytest.raises(RuntimeError):
+        run_task("demo", _make_task(seen, fail_on=5))
+
+    failed = CronTaskRun.objects.get(task_name="demo", slice_number=2)
+    assert failed.status == CronTaskRun.STATUS_ERROR
+    assert failed.cursor == 4
+    assert CronTaskState.objects.get(task_name="demo").cursor == 4
+
+    run = run_task("demo", _make_task(seen))
+
+    assert run.status == CronTaskRun.STATUS_COMPLETED
+    assert run.slice_number == 3
+    assert seen == ITEMS
+
+
+@pytest.mark.django_db
+def test_resumable_task_without_slice_result_is_an_error():
+    @resumable_task
+    def task(task_slice):
+        task_slice.advance(1)
+
+    with pytest.raises(TypeError):
+        run_task("demo", task)
+
+    assert CronTaskRun.objects.get(task_name="demo").status == CronTaskRun.STATUS_ERROR
+    assert CronTaskState.objects.get(task_name="demo").cursor == 1
+
+
+@pytest.mark.django_db
+def test_active_lease_skips_overlapping_invocation():
+    CronTaskState.objects.create(
+        task_name="demo",
+        lease_expires_at=timezone.now() + timedelta(minutes=5),
+    )
+
+    assert run_task("demo", _make_task([])) is None
+    assert not CronTaskRun.objects.exists()
+
+
+@pytest.mark.django_db
+def test_plain_task_runs_once_as_a_completed_slice():
+    run = run_task("plain", lambda: {"deleted": 4})
+
+    assert run.status == CronTaskRun.STATUS_COMPLETED
+    assert "deleted" in run.result
+
+
+def test_direct_call_runs_resumable_task_to_completion():
+    seen = []
+    result = _make_task(seen, per_slice=100)()
+
+    assert isinstance(result, SliceResult)
+    assert result.done
+    assert seen == ITEMS
+
+
+@pytest.mark.django_db
+def test_debug_trigger_schedules_continuation_like_the_signed_trigger(settings, monkeypatch, rf):
+    from api import cron_triggers
+
+    settings.DEBUG = True
+    scheduled = []
+    monkeypatch.setitem(cron_triggers.TASK_MAP, "demo", f"{__name__}.paused_task")
+    monkeypatch.setattr(
+        cron_triggers, "schedule_continuation",
+        lambda request, task_name, execution_id: scheduled.append(task_name) or True,
+    )
+
+    response = cron_triggers.trigger_task_debug(rf.post("/api/cron/trigger-debug/demo/"), "demo")
+
+    assert response.status_code == 202
+    assert scheduled == ["demo"]
+
+
+@resumable_task
+def paused_task(task_slice):
+    task_slice.advance(1)
+    return task_slice.pause()
@@ -0,0 +1,110 @@
+import threading
+
+from utils.error_reporting import ErrorReporter, FileSink
+
+
+class _RecordingSink:
+    def __init__(self, gate=None, fail=False):
+        self.batches = []
+        self.gate = gate
+        self.fail = fail
+        self.entered = threading.Event()
+
+    def send(self, batch):
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("webhook down")
+        self.batches.append(list(batch))
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _payload(source="task", error="boom", traceback=""):
+    return {"error": error, "source": source, "traceback": traceback}
+
+
+def test_submit_returns_before_the_sink_finishes():
+    gate = threading.Event()
+    sink = _RecordingSink(gate=gate)
+    reporter = ErrorReporter(sink=sink, dedup_window=0)
+
+    assert reporter.submit(_payload())
+    assert sink.entered.wait(5)
+    # The sink is still blocked on the gate, so submit didn't wait for it
+    assert sink.batches == []
+
+    gate.set()
+    assert reporter.flush(timeout=5)
+    assert reporter.stats()["sent"] == 1
+
+
+def test_reports_are_shipped_in_batches():
+    gate = threading.Event()
+    sink = _RecordingSink(gate=gate)
+    reporter = ErrorReporter(sink=sink, batch_size=10, dedup_window=0)
+
+    # The first report occupies the worker; the rest pile up behind it.
+    reporter.submit(_payload(error="first"))
+    assert sink.entered.wait(5)
+    for i in range(15):
+        reporter.submit(_payload(error=f"e{i}"))
+    gate.set()
+
+    assert reporter.flush(timeout=5)
+    assert [len(b) for b in sink.batches] == [1, 10, 5]
+
+
+def test_duplicate_errors_are_collapsed_with_repeat_count():
+    sink = _RecordingSink()
+    clock = _FakeClock()
+    reporter = ErrorReporter(sink=sink, dedup_window=60, clock=clock)
+
+    for _ in range(4):
+        reporter.submit(_payload())
+    reporter.submit(_payload(source="other_task"))
+    clock.now += 61
+    reporter.submit(_payload())
+    assert reporter.flush(timeout=5)
+
+    shipped = [p for batch in sink.batches for p in batch]
+    assert len(shipped) == 3
+    assert shipped[-1]["repeat_count"] == 3
+    assert reporter.stats()["deduplicated"] == 3
+
+
+def test_full_queue_drops_instead_of_blocking():
+    gate = threading.Event()
+    sink = _RecordingSink(gate=gate)
+    reporter = ErrorReporter(sink=sink, queue_size=2, batch_size=1, dedup_window=0)
+
+    reporter.submit(_payload(error="in flight"))
+    assert sink.entered.wait(5)
+    results = [reporter.submit(_payload(error=f"e{i}")) for i in range(4)]
+    gate.set()
+    assert reporter.flush(timeout=5)
+
+    assert results == [True, True, False, False]
+    assert reporter.stats()["dropped"] == 2
+
+
+def test_sink_failures_are_counted(tmp_path):
+    reporter = ErrorReporter(sink=_RecordingSink(fail=True), dedup_window=0)
+    reporter.submit(_payload())
+    assert reporter.flush(timeout=5)
+
+    assert reporter.stats()["failed"] == 1
+
+    path = tmp_path / "errors.jsonl"
+    file_reporter = ErrorReporter(sink=FileSink(str(path)), dedup_window=0)
+    file_reporter.submit(_payload(error="to disk"))
+    assert file_reporter.flush(timeout=5)
+
+    assert "to disk" in path.read_text()
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from utils import groq_rate_limit
+from utils.groq_rate_limit import GroqRateLimited, GroqRateLimiter, LocalBucketStore, budget_from_headers
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _Raw:
+    def __init__(self, status_code, headers, body="ok"):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+
+    def parse(self):
+        return self.body
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    clock = _Clock()
+    limiter = GroqRateLimiter(store=LocalBucketStore(), clock=clock, sleep=clock.sleep)
+    monkeypatch.setattr(groq_rate_limit, "_limiter", limiter)
+    monkeypatch.setattr(groq_rate_limit.random, "uniform", lambda a, b: 0.0)
+    limiter.clock = clock
+    return limiter
+
+
+def _headers(remaining_requests, remaining_tokens=10_000, reset_requests="10s"):
+    return {
+        "x-ratelimit-limit-requests": "10",
+        "x-ratelimit-remaining-requests": str(remaining_requests),
+        "x-ratelimit-reset-requests": reset_requests,
+        "x-ratelimit-limit-tokens": "10000",
+        "x-ratelimit-remaining-tokens": str(remaining_tokens),
+        "x-ratelimit-reset-tokens": "1s",
+    }
+
+
+def test_budget_is_parsed_from_headers():
+    budget = budget_from_headers(_headers(4, reset_requests="1m30s"))
+
+    assert budget["requests"] == {"limit": 10, "remaining": 4, "reset": 90.0}
+    assert budget["tokens"]["remaining"] == 10_000
+
+
+def test_unseeded_model_is_not_throttled(limiter):
+    assert limiter.acquire("m", tokens=500) == 0
+    assert limiter.clock.sleeps == []
+
+
+def test_exhausted_bucket_waits_for_refill(limiter):
+    # 0 of 10 left, full again in 10s -> one request per second
+    limiter.observe("m", _headers(0))
+
+    waited = limiter.acquire("m")
+
+    assert waited == pytest.approx(1.0)
+    assert limiter.stats()["waits"] == 1
+    assert limiter.stats()["utilization"]["m"]["requests"] == 1.0
+
+
+def test_budget_that_cannot_free_up_in_time_raises(limiter):
+    limiter.max_wait = 5
+    limiter.observe("m", _headers(0, reset_requests="1h"))
+
+    with pytest.raises(GroqRateLimited):
+        limiter.acquire("m")
+    assert limiter.stats()["budget_timeouts"] == 1
+
+
+def test_429_blocks_the_model_and_retries_after_the_header_delay(limiter):
+    responses = [
+        _Raw(429, {"retry-after": "3"}),
+        _Raw(200, _headers(9), body="plan"),
+    ]
+
+    result = groq_rate_limit.groq_call_with_retry(
+        raw_create_fn=lambda **kwargs: responses.pop(0),
+        create_fn=lambda **kwargs: pytest.fail("raw path should be used"),
+        desc="test",
+        model="m",
+        messages=[{"role": "user", "content": "hi"}],
+    )
+
+    assert result == "plan"
+    assert sum(limiter.clock.sleeps) == pytest.approx(3.0)
+    stats = groq_rate_limit.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["succeeded"] == 1
+    assert stats["rate_limited_ratio"] == 0.5
+
+
+def test_async_wrapper_shares_the_budget(limiter, monkeypatch):
+    async def raw_create(**kwargs):
+        return _Raw(200, _headers(0), body="summary")
+
+    async def create(**kwargs):
+        raise AssertionError("raw path should be used")
+
+    async def sleep(seconds):
+        limiter.clock.sleep(seconds)
+
+    async def run():
+        first = await groq_rate_limit.async_groq_call_with_retry(raw_create, create, "test", model="m")
+        second = await groq_rate_limit.async_groq_call_with_retry(raw_create, create, "test", model="m")
+        return first, second
+
+    monkeypatch.setattr(groq_rate_limit.asyncio, "sleep", sleep)
+
+    assert asyncio.run(run()) == ("summary", "summary")
+    # The first response left 0 requests, so the second had to wait for a refill
+    assert sum(limiter.clock.sleeps) == pytest.approx(1.0)
+
+
+def test_exhausted_budget_fails_fast_without_calling_groq(limiter):
+    limiter.max_wait = 5
+    limiter.observe("m", _headers(0, reset_requests="1h"))
+
+    def create(**kwargs):
+        pytest.fail("no request should be sent")
+
+    with pytest.raises(GroqRateLimited):
+        groq_rate_limit.groq_call_with_retry(
+            raw_create_fn=create,
+            create_fn=create,
+            desc="test",
+            model="m",
+            messages=[{"role": "user", "content": "hi"}],
+        )
+    assert limiter.clock.sleeps == []
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+import pytest
+
+from custom_auth.models import CustomUser
+from utils import quotas
+
+
+class _FakeRedis:
+    """Just enough of redis-py for the quota helpers."""
+
+    def __init__(self):
+        self.store = {}
+        self.expiries = {}
+        self.round_trips = 0
+
+    def register_script(self, _source):
+        def run(keys, args, client=None):
+            self.round_trips += 1
+            key = keys[0]
+            self.store[key] = self.store.get(key, 0) + 1
+            if self.store[key] == 1:
+                self.expiries[key] = int(args[0])
+            return self.store[key]
+
+        return run
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.store.get(k) for k in keys]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = _FakeRedis()
+    monkeypatch.setattr(quotas, "_get_redis", lambda: fake)
+    monkeypatch.setattr(quotas, "_incr_script", None)
+    quotas._timezone_cache.clear()
+    return fake
+
+
+def test_hit_quota_with_loaded_user_skips_database(fake_redis, django_assert_num_queries):
+    user = SimpleNamespace(timezone="Asia/Tokyo")
+
+    with django_assert_num_queries(0):
+        assert quotas.hit_quota("42", "gpt4", limit=2, user=user) is False
+        assert quotas.hit_quota("42", "gpt4", limit=2) is False
+        assert quotas.hit_quota("42", "gpt4", limit=2) is True
+
+    assert fake_redis.round_trips == 3
+    assert all(ttl > 0 for ttl in fake_redis.expiries.values())
+
+
+def test_remaining_quotas_reads_all_models_in_one_call(fake_redis):
+    quotas.hit_quota("guest:abc", "gpt4_mini_guest", limit=5)
+
+    remaining = quotas.remaining_quotas("guest:abc", {"gpt4_mini_guest": 5, "gpt4": 0})
+
+    assert remaining == {"gpt4_mini_guest": 4, "gpt4": 0}
+    assert fake_redis.round_trips == 2
+
+
+def test_remaining_quotas_uses_cached_timezone(fake_redis, django_assert_num_queries):
+    quotas.hit_quota("42", "gpt4", limit=5, user=SimpleNamespace(timezone="Asia/Tokyo"))
+
+    with django_assert_num_queries(0):
+        remaining = quotas.remaining_quotas("42", {"gpt4": 5, "gpt4_mini": 3})
+
+    assert remaining == {"gpt4": 4, "gpt4_mini": 3}
+
+
+@pytest.mark.django_db
+def test_changing_profile_timezone_invalidates_cached_zone(fake_redis):
+    user = CustomUser.objects.create_user(
+        username="quotatz", email="quotatz@example.com", password="testpass123", timezone="Asia/Tokyo",
+    )
+    quotas.hit_quota(str(user.id), "gpt4", limit=5)
+    assert str(quotas._user_timezone(str(user.id))) == "Asia/Tokyo"
+
+    user.timezone = "America/New_York"
+    user.save(update_fields=["timezone"])
+
+    assert str(quotas._user_timezone(str(user.id))) == "America/New_York"
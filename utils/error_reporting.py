@@ -1,7 +1,20 @@
 """
 Centralized error reporting utility.
 
-Currently uses Python logging. Designed for easy Sentry integration.
+Errors are logged immediately and shipped to the N8N traceback webhook
+(N8N_TRACEBACK_URL) asynchronously: report_error() only enqueues, and a
+background thread drains the queue in batches. A slow or dead webhook can
+therefore never stall the request or cron job that hit the error.
+
+The pipeline:
+- bounded queue (ERROR_REPORT_QUEUE_SIZE); reports that don't fit are dropped
+  and counted rather than blocking the caller
+- identical reports (same source, error and failing frame) are shipped at
+  most once per ERROR_REPORT_DEDUP_WINDOW seconds; the next shipped copy
+  carries a "repeat_count"
+- sinks: the webhook, or a JSON-lines file when ERROR_REPORT_FILE is set
+  (used by tests and local debugging)
+- stats() exposes queued/sent/failed/dropped/deduplicated counters
 
 TODO: Integrate Sentry for production error tracking
 - pip install sentry-sdk
@@ -23,31 +36,246 @@ Example Sentry setup (add to settings.py when ready):
             send_default_pii=False,
         )
 """
+import atexit
+import hashlib
+import json
 import logging
+import os
+import queue
+import sys
+import threading
+import time
 import traceback as tb
-from typing import Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import requests
+
+try:
+    from django.conf import settings as dj_settings
+except Exception:
+    dj_settings = None
 
 logger = logging.getLogger(__name__)
 
 
+def _setting(name: str, default):
+    try:
+        return getattr(dj_settings, name, default) if dj_settings is not None else default
+    except Exception:
+        # Settings not configured (e.g. scripts importing utils directly)
+        return default
+
+
+class WebhookSink:
+    """POST each report to the traceback webhook over a kept-alive session."""
+
+    def __init__(self, url: str, timeout: float = 5):
+        self.url = url
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def send(self, batch: List[Dict[str, Any]]) -> None:
+        if _setting("ERROR_REPORT_BATCH_POST", False):
+            self._session.post(self.url, json={"errors": batch}, timeout=self.timeout).raise_for_status()
+            return
+        for payload in batch:
+            self._session.post(self.url, json=payload, timeout=self.timeout).raise_for_status()
+
+
+class FileSink:
+    """Append reports as JSON lines; used by tests and local debugging."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, batch: List[Dict[str, Any]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as fh:
+            for payload in batch:
+                fh.write(json.dumps(payload, default=str) + "\n")
+
+
+class ErrorReporter:
+    """Bounded queue + background shipper for error reports."""
+
+    def __init__(
+        self,
+        sink=None,
+        queue_size: int = 1000,
+        batch_size: int = 20,
+        dedup_window: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._sink = sink
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.dedup_window = dedup_window
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._seen: Dict[str, List[float]] = {}  # fingerprint -> [window_start, suppressed]
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._counters = {"queued": 0, "sent": 0, "failed": 0, "dropped": 0, "deduplicated": 0}
+
+    # ── producer side
+    def submit(self, payload: Dict[str, Any]) -> bool:
+        """Queue a payload for shipping. Never blocks; returns False if not queued."""
+        if self._sink is None:
+            return False
+        payload = self._apply_dedup(payload)
+        if payload is None:
+            return False
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("queued")
+        return True
+
+    def _apply_dedup(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.dedup_window <= 0:
+            return payload
+        fingerprint = _fingerprint(payload)
+        now = self._clock()
+        with self._lock:
+            entry = self._seen.get(fingerprint)
+            if entry is not None and now - entry[0] < self.dedup_window:
+                entry[1] += 1
+                self._counters["deduplicated"] += 1
+                return None
+            suppressed = int(entry[1]) if entry is not None else 0
+            self._seen[fingerprint] = [now, 0]
+            if len(self._seen) > 10000:
+                cutoff = now - self.dedup_window
+                self._seen = {k: v for k, v in self._seen.items() if v[0] >= cutoff}
+        if suppressed:
+            payload = {**payload, "repeat_count": suppressed}
+        return payload
+
+    def _count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += n
+
+    def _ensure_worker(self) -> None:
+        # Threads don't survive fork (gunicorn preload); restart in the child.
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._queue = queue.Queue(maxsize=self._queue.maxsize)
+                self._thread = None
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="error-reporter", daemon=True)
+                self._thread.start()
+
+    # ── consumer side
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._sink.send(batch)
+                self._count("sent", len(batch))
+            except Exception as e:
+                self._count("failed", len(batch))
+                logger.warning(f"Failed to ship {len(batch)} error report(s): {e}")
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far has been shipped (or failed)."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counters = dict(self._counters)
+        counters["pending"] = self._queue.qsize()
+        return counters
+
+
+def _fingerprint(payload: Dict[str, Any]) -> str:
+    """Source + error + the innermost frame of the traceback, if any."""
+    trace = str(payload.get("traceback") or "")
+    frames = [line for line in trace.splitlines() if line.lstrip().startswith("File ")]
+    basis = "|".join([
+        str(payload.get("source", "")),
+        str(payload.get("error", ""))[:500],
+        frames[-1].strip() if frames else "",
+    ])
+    return hashlib.sha1(basis.encode("utf-8", "replace")).hexdigest()
+
+
+def _build_sink():
+    path = _setting("ERROR_REPORT_FILE", None) or os.getenv("ERROR_REPORT_FILE")
+    if path:
+        return FileSink(path)
+    url = _setting("N8N_TRACEBACK_URL", None) or os.getenv("N8N_TRACEBACK_URL")
+    if url:
+        return WebhookSink(url, timeout=_setting("ERROR_REPORT_TIMEOUT", 5))
+    return None
+
+
+_reporter: Optional[ErrorReporter] = None
+_reporter_lock = threading.Lock()
+
+
+def get_reporter() -> ErrorReporter:
+    """Return the process-wide reporter, configured from settings on first use."""
+    global _reporter
+    if _reporter is None:
+        with _reporter_lock:
+            if _reporter is None:
+                _reporter = ErrorReporter(
+                    sink=_build_sink(),
+                    queue_size=_setting("ERROR_REPORT_QUEUE_SIZE", 1000),
+                    batch_size=_setting("ERROR_REPORT_BATCH_SIZE", 20),
+                    dedup_window=_setting("ERROR_REPORT_DEDUP_WINDOW", 60.0),
+                )
+                atexit.register(_reporter.flush, 2.0)
+    return _reporter
+
+
+def report_payload(payload: Dict[str, Any]) -> None:
+    """Ship a pre-built webhook payload (``{"error", "source", "traceback", ...}``) asynchronously."""
+    try:
+        get_reporter().submit(dict(payload))
+    except Exception as e:
+        # Reporting must never raise into the caller's error handling
+        logger.warning(f"Unable to queue error report: {e}")
+
+
 def report_error(
-    error: Exception,
+    error: Union[Exception, str],
     source: str,
     extra_context: Optional[Dict[str, Any]] = None,
     include_traceback: bool = True
 ) -> None:
     """
     Report an error to the error tracking system.
-    
-    Currently logs to Python logger. When Sentry is integrated,
-    this will also send to Sentry with full context.
-    
+
+    Logs immediately and queues the report for the traceback webhook
+    without waiting on the network. When Sentry is integrated, this will
+    also send to Sentry with full context.
+
     Args:
-        error: The exception that occurred
+        error: The exception that occurred, or a message describing it
         source: Identifier for where the error originated (e.g., 'meal_generation', 'payment_processing')
         extra_context: Additional context (user_id, request data, etc.)
-        include_traceback: Whether to include full traceback in logs
-    
+        include_traceback: Whether to include the active exception's traceback
+
     Example:
         try:
             do_something()
@@ -55,12 +283,20 @@ def report_error(
             report_error(e, 'my_function', {'user_id': user.id, 'action': 'create'})
     """
     context_str = f" | Context: {extra_context}" if extra_context else ""
-    
-    if include_traceback:
+    has_exc = sys.exc_info()[0] is not None
+
+    if include_traceback and has_exc:
         logger.exception(f"[{source}] {error}{context_str}")
     else:
         logger.error(f"[{source}] {error}{context_str}")
-    
+
+    payload: Dict[str, Any] = {"error": str(error), "source": source}
+    if include_traceback:
+        payload["traceback"] = tb.format_exc() if has_exc else ""
+    if extra_context:
+        payload.update(extra_context)
+    report_payload(payload)
+
     # TODO: Add Sentry integration when SENTRY_DSN is configured
     # from django.conf import settings
     # if getattr(settings, 'SENTRY_DSN', ''):
@@ -80,7 +316,7 @@ def report_warning(
 ) -> None:
     """
     Report a warning (non-exception) to the tracking system.
-    
+
     Args:
         message: Warning message
         source: Identifier for where the warning originated
@@ -88,7 +324,7 @@ def report_warning(
     """
     context_str = f" | Context: {extra_context}" if extra_context else ""
     logger.warning(f"[{source}] {message}{context_str}")
-    
+
     # TODO: Add Sentry integration
     # from django.conf import settings
     # if getattr(settings, 'SENTRY_DSN', ''):
@@ -96,8 +332,6 @@ def report_warning(
     #     sentry_sdk.capture_message(f"[{source}] {message}", level="warning")
 
 
-
-
-
-
-
+def stats() -> Dict[str, int]:
+    """Counters for the process-wide reporter."""
+    return get_reporter().stats()
@@ -1,11 +1,67 @@
+"""
+Shared rate limiting for Groq chat completions.
+
+Groq enforces per-model request and token limits across the whole account,
+so every web worker, cron worker and thread draws from one budget. The
+limiter keeps that budget in Redis as two token buckets per model (requests
+and tokens):
+
+- each bucket is seeded from the x-ratelimit-limit/remaining/reset-* headers
+  of every response, so it follows what Groq actually reports rather than a
+  guessed limit; a bucket refills at the rate that brings it back to full by
+  its reset time
+- before each attempt a caller takes one request and its estimated tokens
+  from both buckets atomically (a Lua script); when either is short it is
+  told how long to wait and sleeps without holding anything
+- a 429 blocks the model for everyone until retry-after / reset elapses
+
+When Redis is unavailable the same buckets are kept in process memory.
+GROQ_MAX_INFLIGHT still caps concurrent HTTP calls per process, but the slot
+is only held while the request is in flight, never while waiting.
+
+If the budget can't be acquired within GROQ_RATE_LIMIT_MAX_WAIT seconds
+(e.g. a daily request cap is spent) the call fails fast with
+GroqRateLimited instead of sending a request that would be rejected.
+
+async_groq_call_with_retry() does the same for the AsyncGroq client: store
+calls run in a worker thread and waiting yields the event loop.
+
+Waits and 429s are logged with a structured "groq" extra. stats() exposes
+per-process metrics: calls, 429 rate, time spent waiting for budget and the
+last observed budget utilization per model.
+"""
+import asyncio
+import inspect
+import logging
 import os
-import time
 import random
 import re
-from threading import Semaphore
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Concurrent in-flight HTTP calls per process; waiting for budget doesn't count
+_GROQ_INFLIGHT = threading.BoundedSemaphore(int(os.getenv("GROQ_MAX_INFLIGHT", "2")))
+# Longest a caller waits for budget before giving up with GroqRateLimited
+MAX_BUDGET_WAIT = float(os.getenv("GROQ_RATE_LIMIT_MAX_WAIT", "120"))
+# Waits are taken in slices so a budget freed early (headers) is noticed
+WAIT_SLICE_SECONDS = 5.0
+BUCKET_TTL_SECONDS = 3600
+USE_REDIS = os.getenv("GROQ_RATE_LIMIT_REDIS", "true").lower() in ("true", "1", "yes", "on")
+REDIS_RETRY_SECONDS = 60
+KEY_PREFIX = "groq_rate_limit"
+
+BUCKETS = ("requests", "tokens")
+
 
-# Simple, process-local concurrency gate for Groq calls
-_GROQ_SEMA = Semaphore(int(os.getenv("GROQ_MAX_INFLIGHT", "2")))
+class GroqRateLimited(Exception):
+    """A 429 from Groq, or the shared budget could not be acquired in time."""
+
+    def __init__(self, message: str = "Groq rate limit exceeded", headers: Optional[Mapping[str, str]] = None):
+        super().__init__(message)
+        self.headers = dict(headers or {})
 
 
 def parse_duration(s: str) -> float:
@@ -21,85 +77,498 @@ def parse_duration(s: str) -> float:
     m2 = re.match(r"([\d.]+)s$", s)
     if m2:
         return float(m2.group(1))
+    # millisecond resets, e.g. '250ms'
+    m3 = re.match(r"([\d.]+)ms$", s)
+    if m3:
+        return float(m3.group(1)) / 1000
     return 1.0
 
 
+def _header_seconds(value: Any) -> Optional[float]:
+    if value in (None, ""):
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        return parse_duration(value)
+
+
+def _header_int(value: Any) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def budget_from_headers(headers: Mapping[str, str]) -> Dict[str, Dict[str, Optional[float]]]:
+    """Extract {bucket: {limit, remaining, reset}} from Groq rate limit headers."""
+    headers = {str(k).lower(): v for k, v in (headers or {}).items()}
+    budget = {}
+    for bucket in BUCKETS:
+        remaining = _header_int(headers.get(f"x-ratelimit-remaining-{bucket}"))
+        if remaining is None:
+            continue
+        budget[bucket] = {
+            "limit": _header_int(headers.get(f"x-ratelimit-limit-{bucket}")),
+            "remaining": remaining,
+            "reset": _header_seconds(headers.get(f"x-ratelimit-reset-{bucket}")),
+        }
+    return budget
+
+
+def retry_after_seconds(headers: Mapping[str, str], default: float) -> float:
+    """How long a 429 asks us to back off, falling back to ``default``."""
+    headers = {str(k).lower(): v for k, v in (headers or {}).items()}
+    for name in ("retry-after", "x-ratelimit-reset-tokens", "x-ratelimit-reset-requests"):
+        seconds = _header_seconds(headers.get(name))
+        if seconds is not None:
+            return max(seconds, default)
+    return default
+
+
+def estimate_tokens(kwargs: Mapping[str, Any]) -> int:
+    """Rough token cost of a chat completion: ~4 characters per prompt token plus the completion cap."""
+    chars = 0
+    for message in kwargs.get("messages") or []:
+        content = message.get("content") if isinstance(message, dict) else message
+        chars += len(content) if isinstance(content, str) else len(str(content or ""))
+    completion = kwargs.get("max_completion_tokens") or kwargs.get("max_tokens") or 0
+    return chars // 4 + int(completion) + 1
+
+
+# ---------------------------------------------------------------------------
+# Bucket stores
+# ---------------------------------------------------------------------------
+
+# KEYS[1] = model hash; ARGV = now, request cost, token cost, ttl.
+# Returns "0" when both buckets were debited, otherwise the seconds to wait.
+_ACQUIRE_LUA = """
+local now = tonumber(ARGV[1])
+local blocked = tonumber(redis.call('HGET', KEYS[1], 'blocked_until') or '0') or 0
+if blocked > now then
+  return tostring(blocked - now)
+end
+local names = {'requests', 'tokens'}
+local costs = {tonumber(ARGV[2]), tonumber(ARGV[3])}
+local levels = {}
+local wait = 0
+for i, name in ipairs(names) do
+  local state = redis.call('HMGET', KEYS[1], name .. ':cap', name .. ':level', name .. ':rate', name .. ':ts')
+  local cap = tonumber(state[1])
+  if cap then
+    local rate = tonumber(state[3]) or 0
+    local level = math.min(cap, (tonumber(state[2]) or 0) + math.max(0, now - (tonumber(state[4]) or now)) * rate)
+    local cost = math.min(costs[i], cap)
+    if level < cost then
+      local needed = 60
+      if rate > 0 then needed = (cost - level) / rate end
+      if needed > wait then wait = needed end
+    end
+    levels[name] = level - cost
+  end
+end
+if wait > 0 then
+  return tostring(wait)
+end
+for name, level in pairs(levels) do
+  redis.call('HSET', KEYS[1], name .. ':level', tostring(level), name .. ':ts', tostring(now))
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return '0'
+"""
+
+# KEYS[1] = model hash; ARGV = now, ttl, then (limit, remaining, reset) for
+# requests and tokens, '' where the header was missing.
+_OBSERVE_LUA = """
+local now = tonumber(ARGV[1])
+local names = {'requests', 'tokens'}
+for i, name in ipairs(names) do
+  local base = 2 + (i - 1) * 3
+  local limit = tonumber(ARGV[base + 1])
+  local remaining = tonumber(ARGV[base + 2])
+  local reset = tonumber(ARGV[base + 3])
+  if remaining then
+    local cap = limit or math.max(remaining, tonumber(redis.call('HGET', KEYS[1], name .. ':cap') or '0') or 0)
+    local rate = tonumber(redis.call('HGET', KEYS[1], name .. ':rate') or '') or (cap / 60)
+    if reset and reset > 0 then rate = math.max(cap - remaining, 1) / reset end
+    redis.call('HSET', KEYS[1], name .. ':cap', tostring(cap), name .. ':level', tostring(remaining),
+               name .. ':rate', tostring(rate), name .. ':ts', tostring(now))
+  end
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return 1
+"""
+
+# KEYS[1] = model hash; ARGV = blocked_until, ttl
+_BLOCK_LUA = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'blocked_until') or '0') or 0
+if tonumber(ARGV[1]) > current then
+  redis.call('HSET', KEYS[1], 'blocked_until', ARGV[1])
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return 1
+"""
+
+
+class LocalBucketStore:
+    """In-process buckets with the same semantics as the Redis scripts."""
+
+    def __init__(self):
+        self._models: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, model: str, requests: float, tokens: float, now: float) -> float:
+        with self._lock:
+            state = self._models.setdefault(model, {})
+            blocked = state.get("blocked_until", 0.0)
+            if blocked > now:
+                return blocked - now
+            wait = 0.0
+            levels = {}
+            for name, cost in zip(BUCKETS, (requests, tokens)):
+                bucket = state.get(name)
+                if bucket is None:
+                    continue
+                level = min(bucket["cap"], bucket["level"] + max(0.0, now - bucket["ts"]) * bucket["rate"])
+                cost = min(cost, bucket["cap"])
+                if level < cost:
+                    wait = max(wait, (cost - level) / bucket["rate"] if bucket["rate"] > 0 else 60.0)
+                levels[name] = level - cost
+            if wait > 0:
+                return wait
+            for name, level in levels.items():
+                state[name].update(level=level, ts=now)
+            return 0.0
+
+    def observe(self, model: str, budget: Dict[str, Dict[str, Optional[float]]], now: float) -> None:
+        with self._lock:
+            state = self._models.setdefault(model, {})
+            for name, seen in budget.items():
+                bucket = state.get(name, {})
+                cap = seen["limit"] or max(seen["remaining"], bucket.get("cap", 0))
+                rate = bucket.get("rate", cap / 60)
+                if seen["reset"]:
+                    rate = max(cap - seen["remaining"], 1) / seen["reset"]
+                state[name] = {"cap": cap, "level": seen["remaining"], "rate": rate, "ts": now}
+
+    def block(self, model: str, until: float) -> None:
+        with self._lock:
+            state = self._models.setdefault(model, {})
+            state["blocked_until"] = max(state.get("blocked_until", 0.0), until)
+
+
+class RedisBucketStore:
+    """Buckets shared by every process through one Redis hash per model."""
+
+    def __init__(self, client):
+        self._acquire = client.register_script(_ACQUIRE_LUA)
+        self._observe = client.register_script(_OBSERVE_LUA)
+        self._block = client.register_script(_BLOCK_LUA)
+
+    @staticmethod
+    def _key(model: str) -> str:
+        return f"{KEY_PREFIX}:{model or 'default'}"
+
+    def acquire(self, model: str, requests: float, tokens: float, now: float) -> float:
+        return float(self._acquire(keys=[self._key(model)], args=[now, requests, tokens, BUCKET_TTL_SECONDS]))
+
+    def observe(self, model: str, budget: Dict[str, Dict[str, Optional[float]]], now: float) -> None:
+        args = [now, BUCKET_TTL_SECONDS]
+        for name in BUCKETS:
+            seen = budget.get(name) or {}
+            args.extend("" if seen.get(field) is None else seen[field] for field in ("limit", "remaining", "reset"))
+        self._observe(keys=[self._key(model)], args=args)
+
+    def block(self, model: str, until: float) -> None:
+        self._block(keys=[self._key(model)], args=[until, BUCKET_TTL_SECONDS])
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+class GroqRateLimiter:
+    """Acquire Groq budget per model and learn the limits from response headers."""
+
+    def __init__(
+        self,
+        store=None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        max_wait: float = MAX_BUDGET_WAIT,
+    ):
+        # Bucket timestamps are wall clock so they agree across hosts
+        self._store = store
+        self._local = LocalBucketStore()
+        self._redis_checked_at: Optional[float] = None
+        self._clock = clock
+        self._sleep = sleep
+        self.max_wait = max_wait
+        self._metrics_lock = threading.Lock()
+        self._reset_metrics()
+
+    def _reset_metrics(self) -> None:
+        self._metrics = {
+            "calls": 0,
+            "succeeded": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "budget_timeouts": 0,
+        }
+        self._utilization: Dict[str, Dict[str, float]] = {}
+
+    # Store selection ------------------------------------------------------
+
+    def _get_store(self):
+        if self._store is not None:
+            return self._store
+        if not USE_REDIS:
+            return self._local
+        now = time.monotonic()
+        if self._redis_checked_at is None or now - self._redis_checked_at >= REDIS_RETRY_SECONDS:
+            self._redis_checked_at = now
+            try:
+                from utils.redis_client import get_redis_connection
+
+                client = get_redis_connection()
+                if client is not None:
+                    self._store = RedisBucketStore(client)
+                    return self._store
+            except Exception as e:
+                logger.warning(f"Groq rate limiter falling back to process-local buckets: {e}")
+        return self._local
+
+    def _call_store(self, method: str, *args):
+        store = self._get_store()
+        try:
+            return getattr(store, method)(*args)
+        except Exception as e:
+            if store is self._local:
+                raise
+            logger.warning(f"Groq rate limiter Redis {method} failed, using local buckets: {e}")
+            self._store = None
+            self._redis_checked_at = time.monotonic()
+            return getattr(self._local, method)(*args)
+
+    # Budget ---------------------------------------------------------------
+
+    def _next_wait(self, model: str, tokens: int, waited: float) -> float:
+        wait = self._call_store("acquire", model, 1, tokens, self._clock())
+        if wait <= 0:
+            return 0.0
+        if waited + wait > self.max_wait:
+            # Budget won't free up in time (e.g. a daily request cap): fail fast
+            with self._metrics_lock:
+                self._metrics["budget_timeouts"] += 1
+            raise GroqRateLimited(f"No Groq budget for {model or 'default'} within {self.max_wait:.0f}s")
+        # Jitter so waiters released together don't all retry in the same instant
+        return min(wait, WAIT_SLICE_SECONDS) * (1 + random.uniform(0, 0.1))
+
+    def _record_wait(self, model: str, waited: float, desc: str) -> None:
+        if waited <= 0:
+            return
+        with self._metrics_lock:
+            self._metrics["waits"] += 1
+            self._metrics["wait_seconds"] += waited
+            self._metrics["max_wait_seconds"] = max(self._metrics["max_wait_seconds"], waited)
+        logger.info(
+            "Groq budget wait",
+            extra={"groq": {"event": "wait", "desc": desc, "model": model, "wait_seconds": round(waited, 3)}},
+        )
+
+    def acquire(self, model: str, tokens: int = 0, desc: str = "") -> float:
+        """Block until one request and ``tokens`` tokens are available; returns seconds waited."""
+        waited = 0.0
+        while True:
+            wait = self._next_wait(model, tokens, waited)
+            if not wait:
+                break
+            self._sleep(wait)
+            waited += wait
+        self._record_wait(model, waited, desc)
+        return waited
+
+    async def acquire_async(self, model: str, tokens: int = 0, desc: str = "") -> float:
+        """acquire() for coroutines: store calls run in a thread and waiting yields the loop."""
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self._next_wait, model, tokens, waited)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        self._record_wait(model, waited, desc)
+        return waited
+
+    # Feedback from responses ---------------------------------------------
+
+    def observe(self, model: str, headers: Mapping[str, str]) -> None:
+        """Re-seed the buckets from a response's rate limit headers."""
+        budget = budget_from_headers(headers)
+        if not budget:
+            return
+        self._call_store("observe", model, budget, self._clock())
+        with self._metrics_lock:
+            usage = self._utilization.setdefault(model, {})
+            for name, seen in budget.items():
+                if seen["limit"]:
+                    usage[name] = round(1 - seen["remaining"] / seen["limit"], 4)
+
+    def rate_limited(self, model: str, headers: Mapping[str, str], default_wait: float, desc: str = "") -> float:
+        """Record a 429 and block the model for every process; returns the block length."""
+        wait = retry_after_seconds(headers, default_wait)
+        self.observe(model, headers)
+        self._call_store("block", model, self._clock() + wait)
+        with self._metrics_lock:
+            self._metrics["rate_limited"] += 1
+        logger.warning(
+            "Groq rate limited",
+            extra={"groq": {"event": "429", "desc": desc, "model": model, "retry_after": round(wait, 3)}},
+        )
+        return wait
+
+    def record_call(self, ok: bool) -> None:
+        with self._metrics_lock:
+            self._metrics["calls"] += 1
+            self._metrics["succeeded" if ok else "errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            attempts = metrics["calls"] + metrics["rate_limited"]
+            metrics["rate_limited_ratio"] = round(metrics["rate_limited"] / attempts, 4) if attempts else 0.0
+            metrics["utilization"] = {model: dict(usage) for model, usage in self._utilization.items()}
+        metrics["backend"] = "redis" if isinstance(self._store, RedisBucketStore) else "local"
+        return metrics
+
+
+_limiter: Optional[GroqRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> GroqRateLimiter:
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = GroqRateLimiter()
+    return _limiter
+
+
+def stats() -> Dict[str, Any]:
+    """Metrics for the process-wide limiter."""
+    return get_limiter().stats()
+
+
+# ---------------------------------------------------------------------------
+# Call wrappers
+# ---------------------------------------------------------------------------
+
+def _is_rate_limited(exc: Exception) -> bool:
+    return (
+        isinstance(exc, GroqRateLimited)
+        or getattr(exc, "status_code", None) == 429
+        or "429" in str(exc)
+    )
+
+
+def _error_headers(exc: Exception) -> Mapping[str, str]:
+    if isinstance(exc, GroqRateLimited):
+        return exc.headers
+    return getattr(getattr(exc, "response", None), "headers", None) or {}
+
+
+def _check_raw(raw, desc: str) -> Optional[Mapping[str, str]]:
+    """Headers of a successful raw response; raises on 429, None on other statuses."""
+    headers = getattr(raw, "headers", None) or {}
+    if raw.status_code == 200:
+        return headers
+    if raw.status_code == 429:
+        raise GroqRateLimited(headers=headers)
+    logger.warning(f"Groq {desc}: status={raw.status_code} body={getattr(raw, 'text', '')[:200]}")
+    return None
+
+
+def _backoff(base_sleep: float, attempt: int) -> float:
+    return base_sleep * (2 ** attempt) * (1.0 + random.uniform(0, 0.2))
+
+
 def groq_call_with_retry(raw_create_fn, create_fn, desc: str, max_retries=4, base_sleep=1.0, **kwargs):
     """
     Generic Groq call wrapper with:
-    - Optional with_raw_response path to read rate headers
-    - 429 handling using retry-after or x-ratelimit-reset-* headers
-    - Exponential backoff fallback with jitter
-    - Basic stdout diagnostics for testing
+    - shared per-model request/token budget, acquired before every attempt
+    - optional with_raw_response path whose rate headers re-seed the budget
+    - 429 handling using retry-after or x-ratelimit-reset-* headers, shared
+      with every other caller of the same model
+    - exponential backoff fallback with jitter when no headers are available
 
-    Returns the parsed response object (same shape as create_fn).
+    Returns the parsed response object (same shape as create_fn). Raises
+    GroqRateLimited without sending a request when the budget won't free up
+    within the limiter's max wait; once max_retries 429s are used up the
+    last error is re-raised.
     """
-    with _GROQ_SEMA:
-        for attempt in range(max_retries + 1):
-            # Prefer raw path
-            if raw_create_fn:
-                try:
-                    raw = raw_create_fn(**kwargs)
-                    if raw.status_code == 200:
-                        hdr = getattr(raw, "headers", {}) or {}
-                        try:
-                            print(
-                                f"][rate] {desc}: 200 attempt={attempt} "
-                                f"rem-req={hdr.get('x-ratelimit-remaining-requests')} rem-tok={hdr.get('x-ratelimit-remaining-tokens')} "
-                                f"reset-req={hdr.get('x-ratelimit-reset-requests')} reset-tok={hdr.get('x-ratelimit-reset-tokens')}"
-                            )
-                        except Exception:
-                            pass
-                        return raw.parse()
-                    if raw.status_code == 429:
-                        hdr = getattr(raw, "headers", {}) or {}
-                        wait = hdr.get("retry-after") or hdr.get("x-ratelimit-reset-tokens") or hdr.get("x-ratelimit-reset-requests")
-                        sleep_for = float(wait) if (wait and str(wait).isdigit()) else parse_duration(str(wait or ""))
-                        sleep_for = max(sleep_for, base_sleep)
-                        try:
-                            print(
-                                f"] {desc}: 429 attempt={attempt} sleep={sleep_for:.2f}s "
-                                f"rem-req={hdr.get('x-ratelimit-remaining-requests')} rem-tok={hdr.get('x-ratelimit-remaining-tokens')}"
-                            )
-                        except Exception:
-                            pass
-                        time.sleep(sleep_for)
-                        continue
-                    # Other errors – print and raise
+    limiter = get_limiter()
+    model = kwargs.get("model", "")
+    tokens = estimate_tokens(kwargs)
+    for attempt in range(max_retries + 1):
+        limiter.acquire(model, tokens, desc=desc)
+        try:
+            with _GROQ_INFLIGHT:
+                if raw_create_fn:
                     try:
-                        body_preview = getattr(raw, "text", "")[:200]
-                        print(f"] {desc}: status={raw.status_code} body={body_preview}")
-                    except Exception:
-                        pass
-                    raw.raise_for_status()
-                except Exception as e:
-                    # Fall back to non-raw path with backoff logic below
-                    try:
-                        print(f"] {desc}: raw path exception: {e}")
-                    except Exception:
-                        pass
-
-            # Non-raw path
-            try:
+                        raw = raw_create_fn(**kwargs)
+                        headers = _check_raw(raw, desc)
+                        if headers is not None:
+                            limiter.observe(model, headers)
+                            limiter.record_call(ok=True)
+                            return raw.parse()
+                    except Exception as e:
+                        if _is_rate_limited(e):
+                            raise
+                        logger.warning(f"Groq {desc}: raw path exception, retrying without headers: {e}")
                 resp = create_fn(**kwargs)
-                try:
-                    print(f"] {desc}: non-raw success attempt={attempt}")
-                except Exception:
-                    pass
-                return resp
-            except Exception as e:
-                msg = str(e)
-                if "429" in msg and attempt < max_retries:
-                    sleep_for = base_sleep * (2 ** attempt) * (1.0 + random.uniform(0, 0.2))
-                    try:
-                        print(f"] {desc}: exception 429 attempt={attempt} sleep={sleep_for:.2f}s")
-                    except Exception:
-                        pass
-                    time.sleep(sleep_for)
-                    continue
-                try:
-                    print(f"] {desc}: non-raw exception: {e}")
-                except Exception:
-                    pass
+        except Exception as e:
+            if not _is_rate_limited(e) or attempt >= max_retries:
+                limiter.record_call(ok=False)
                 raise
+            # Next acquire() waits out the block without holding a slot
+            limiter.rate_limited(model, _error_headers(e), max(_backoff(base_sleep, attempt), base_sleep), desc=desc)
+            continue
+        limiter.record_call(ok=True)
+        return resp
 
+
+async def async_groq_call_with_retry(raw_create_fn, create_fn, desc: str, max_retries=4, base_sleep=1.0, **kwargs):
+    """groq_call_with_retry() for the AsyncGroq client; waits yield the event loop."""
+    limiter = get_limiter()
+    model = kwargs.get("model", "")
+    tokens = estimate_tokens(kwargs)
+    for attempt in range(max_retries + 1):
+        await limiter.acquire_async(model, tokens, desc=desc)
+        try:
+            if raw_create_fn:
+                try:
+                    raw = await raw_create_fn(**kwargs)
+                    headers = _check_raw(raw, desc)
+                    if headers is not None:
+                        limiter.observe(model, headers)
+                        limiter.record_call(ok=True)
+                        parsed = raw.parse()
+                        return await parsed if inspect.isawaitable(parsed) else parsed
+                except Exception as e:
+                    if _is_rate_limited(e):
+                        raise
+                    logger.warning(f"Groq {desc}: raw path exception, retrying without headers: {e}")
+            resp = await create_fn(**kwargs)
+        except Exception as e:
+            if not _is_rate_limited(e) or attempt >= max_retries:
+                limiter.record_call(ok=False)
+                raise
+            limiter.rate_limited(model, _error_headers(e), max(_backoff(base_sleep, attempt), base_sleep), desc=desc)
+            continue
+        limiter.record_call(ok=True)
+        return resp
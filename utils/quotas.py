@@ -2,6 +2,7 @@
 Quota management utilities for limiting API usage.
 """
 import datetime
+import time
 from django.utils import timezone
 import redis
 import pytz
@@ -10,8 +11,7 @@ from django.conf import settings
 from custom_auth.models import CustomUser
 import os
 import logging
-import traceback
-import requests
+from utils.error_reporting import report_error
 
 logger = logging.getLogger(__name__)
 
@@ -72,32 +72,117 @@ def _get_redis():
         _redis_connection = get_redis_connection()
     return _redis_connection
 
-def _key(user_id: str, model: str) -> str:
+# user_id -> (ZoneInfo, expires_at). Timezones change rarely, so a short TTL
+# keeps quota checks off the database without serving stale zones for long.
+# Saving a user drops their entry in this process (custom_auth.signals);
+# other processes pick the change up when the TTL runs out.
+TIMEZONE_CACHE_TTL_SECONDS = 300
+TIMEZONE_CACHE_MAX_ENTRIES = 10000
+_timezone_cache = {}
+
+# INCR and set the expiry on first hit in one round trip
+_INCR_WITH_EXPIRY_LUA = """
+local n = redis.call('INCR', KEYS[1])
+if n == 1 then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+end
+return n
+"""
+_incr_script = None
+
+
+def _is_guest(user_id) -> bool:
+    return isinstance(user_id, str) and (
+        user_id.startswith('guest_') or user_id.startswith('guest:') or user_id == 'guest'
+    )
+
+
+def _user_timezone(user_id, user=None):
+    """
+    Resolve the quota timezone for ``user_id``.
+
+    Guests use the server timezone. For authenticated users the already-loaded
+    ``user`` is used when given; otherwise the timezone comes from a small TTL
+    cache and only falls back to the database on a miss.
+    """
+    if _is_guest(user_id):
+        return timezone.get_current_timezone()
+
+    if user is not None:
+        tz = ZoneInfo(user.timezone if user.timezone else 'UTC')
+        _remember_timezone(user_id, tz)
+        return tz
+
+    cached = _timezone_cache.get(str(user_id))
+    now = time.monotonic()
+    if cached and cached[1] > now:
+        return cached[0]
+
+    try:
+        tz_name = CustomUser.objects.filter(id=int(user_id)).values_list('timezone', flat=True).first()
+    except (ValueError, TypeError):
+        return timezone.get_current_timezone()
+    if tz_name is None:
+        # Fallback to server time if user not found
+        return timezone.get_current_timezone()
+    try:
+        tz = ZoneInfo(tz_name or 'UTC')
+    except Exception:
+        tz = ZoneInfo('UTC')
+    _remember_timezone(user_id, tz)
+    return tz
+
+
+def _remember_timezone(user_id, tz) -> None:
+    if len(_timezone_cache) >= TIMEZONE_CACHE_MAX_ENTRIES:
+        _timezone_cache.clear()
+    _timezone_cache[str(user_id)] = (tz, time.monotonic() + TIMEZONE_CACHE_TTL_SECONDS)
+
+
+def invalidate_user_timezone(user_id) -> None:
+    """Drop a cached timezone after the user changes it."""
+    _timezone_cache.pop(str(user_id), None)
+
+
+def _key(user_id: str, model: str, tz=None) -> str:
     """
     Generate a Redis key for tracking quotas.
     The key includes the date to automatically reset quotas daily.
     """
     # For guests, use a stable ID-based key instead of session-based
-    if isinstance(user_id, str) and (user_id.startswith('guest_') or user_id.startswith('guest:') or user_id == 'guest'):
+    if _is_guest(user_id):
         today = datetime.date.today().isoformat()  # server date
         return f"quota:{today}:{user_id}:{model}"  # guest-stable ID
-        
+
     # Use user's local date if it's an authenticated user
-    try:
-        user = CustomUser.objects.get(id=int(user_id))
-        user_timezone = ZoneInfo(user.timezone if user.timezone else 'UTC')
-        from django.utils import timezone
-        today = timezone.now().astimezone(user_timezone).date().isoformat()
-    except (ValueError, CustomUser.DoesNotExist):
-        # Fallback to server time if user not found
-        today = datetime.date.today().isoformat()
-    
+    tz = tz or _user_timezone(user_id)
+    today = timezone.now().astimezone(tz).date().isoformat()
     return f"quota:{today}:{user_id}:{model}"
 
-def hit_quota(user_id: str, model: str, limit: int) -> bool:
+
+def _seconds_till_midnight(tz) -> int:
+    now = timezone.now().astimezone(tz)
+    midnight = datetime.datetime.combine(
+        now.date() + datetime.timedelta(days=1),
+        datetime.time.min
+    ).replace(tzinfo=tz)
+    return max(int((midnight - now).total_seconds()), 1)
+
+
+def _incr_with_expiry(r, key: str, ttl: int) -> int:
+    global _incr_script
+    if _incr_script is None:
+        _incr_script = r.register_script(_INCR_WITH_EXPIRY_LUA)
+    return int(_incr_script(keys=[key], args=[ttl], client=r))
+
+
+def hit_quota(user_id: str, model: str, limit: int, user=None) -> bool:
     """
     Check and increment the quota for a user/model combination.
     
+    Pass ``user`` when the CustomUser is already loaded to skip the timezone
+    lookup entirely. Increment and expiry happen in one Redis round trip.
+    
     Returns True if the user has ALREADY exhausted today's limit.
     """
     r = _get_redis()
@@ -105,51 +190,12 @@ def hit_quota(user_id: str, model: str, limit: int) -> bool:
         logger.warning("Redis connection not available, allowing request")
         return False
     
-    k = _key(user_id, model)
-    
     try:
-        # Atomic increment - thread-safe and efficient
-        n = r.incr(k)
+        tz = _user_timezone(user_id, user)
+        k = _key(user_id, model, tz)
         
-        if n == 1:  # First hit today, set expiration to midnight in user's timezone
-            try:
-                # Consistent guest check: if it's a string AND starts with guest_ OR is 'guest'
-                is_guest_user = isinstance(user_id, str) and (
-                    user_id.startswith('guest_') or user_id.startswith('guest:') or user_id == 'guest'
-                )
-                
-                if not is_guest_user:
-                    # Get user's timezone
-                    user = CustomUser.objects.get(id=int(user_id))
-                    user_timezone = ZoneInfo(user.timezone if user.timezone else 'UTC')
-                    
-                    # Calculate seconds until midnight in user's timezone
-                    now = timezone.now().astimezone(user_timezone)
-                    midnight = datetime.datetime.combine(
-                        now.date() + datetime.timedelta(days=1),
-                        datetime.time.min
-                    ).replace(tzinfo=user_timezone)
-                    
-                    seconds_till_midnight = int((midnight - now).total_seconds())
-                else:
-                    # For guests, use server time (timezone-aware)
-                    # Compute seconds until next midnight in the server's current timezone
-                    server_tz = timezone.get_current_timezone()
-                    now_server = timezone.now().astimezone(server_tz)
-                    midnight_server = (now_server + datetime.timedelta(days=1)).replace(
-                        hour=0, minute=0, second=0, microsecond=0
-                    )
-                    seconds_till_midnight = int((midnight_server - now_server).total_seconds())
-            except (ValueError, CustomUser.DoesNotExist):
-                # Fallback to server time (timezone-aware)
-                server_tz = timezone.get_current_timezone()
-                now_server = timezone.now().astimezone(server_tz)
-                midnight_server = (now_server + datetime.timedelta(days=1)).replace(
-                    hour=0, minute=0, second=0, microsecond=0
-                )
-                seconds_till_midnight = int((midnight_server - now_server).total_seconds())
-            
-            r.expire(k, seconds_till_midnight)
+        # Atomic increment; expiry is set to midnight in the user's timezone on first hit
+        n = _incr_with_expiry(r, k, _seconds_till_midnight(tz))
         
         quota_exceeded = n > limit
         if quota_exceeded:
@@ -160,18 +206,53 @@ def hit_quota(user_id: str, model: str, limit: int) -> bool:
     except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
         logger.error(f"Redis connection error in quota check: {str(e)}")
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"hit_quota", "traceback": traceback.format_exc()})
+        report_error(e, "hit_quota")
         # If Redis is down, allow the request (fail open)
         return False
     except Exception as e:
         # n8n traceback
-        n8n_traceback_url = os.getenv("N8N_TRACEBACK_URL")
-        requests.post(n8n_traceback_url, json={"error": str(e), "source":"hit_quota", "traceback": traceback.format_exc()})
+        report_error(e, "hit_quota")
         logger.error(f"Unexpected error in quota check for user {user_id}, model {model}: {str(e)}")
         # For unexpected errors, also fail open
         return False
 
+
+def remaining_quotas(user_id: str, limits: dict, user=None) -> dict:
+    """
+    Remaining quota for several models in one Redis round trip.
+    
+    All per-model keys are read with a single MGET, dated with the cached
+    quota timezone, so a dashboard can show every model in one hop.
+    
+    Args:
+        user_id: Same identifier passed to hit_quota
+        limits: Mapping of model name -> daily limit
+        user: Optional already-loaded CustomUser
+    
+    Returns:
+        Mapping of model name -> remaining requests today (never negative).
+        When Redis is unavailable every model reports its full limit.
+    """
+    models = list(limits)
+    if not models:
+        return {}
+    r = _get_redis()
+    if not r:
+        return dict(limits)
+    
+    try:
+        tz = _user_timezone(user_id, user)
+        used = r.mget([_key(user_id, model, tz) for model in models])
+    except Exception as e:
+        logger.error(f"Error reading quotas for user {user_id}: {str(e)}")
+        return dict(limits)
+    
+    return {
+        model: max(limits[model] - int(count or 0), 0)
+        for model, count in zip(models, used)
+    }
+
+
 def hit_quota_request(request, model_complexity="medium", tokens_used=None, guest_id=None, is_chat=True):
     """Track quota usage for a user and determine if they've exceeded their limit."""
     user = request.user
@@ -209,4 +290,4 @@ def hit_quota_request(request, model_complexity="medium", tokens_used=None, gues
             limit = settings.GPT41_AUTH_LIMIT
     
     # Check if quota is exceeded
-    return hit_quota(user_id, model, limit) 
+    return hit_quota(user_id, model, limit, user=user if user.is_authenticated else None) 
@@ -3,12 +3,12 @@ Shared Redis client utility for the application.
 This provides a consistent Redis interface that bypasses Django's cache system.
 """
 import os
-import requests
 import redis
 import logging
 import json
 import traceback
 from typing import Any, Optional, Union
+from utils.error_reporting import report_payload
 try:
     from django.conf import settings as dj_settings
 except Exception:
@@ -58,17 +58,12 @@ def get_redis_connection():
         
     except Exception as e:
         # Send error to n8n for monitoring
-        n8n_url = os.getenv('N8N_TRACEBACK_URL')
-        if n8n_url:
-            try:
-                n8n_traceback = {
-                    'error': str(e),
-                    'source': 'get_redis_connection',
-                    'traceback': traceback.format_exc()
-                }
-                requests.post(n8n_url, json=n8n_traceback, timeout=5)
-            except Exception:
-                pass  # Don't let traceback reporting break the main flow
+        n8n_traceback = {
+            'error': str(e),
+            'source': 'get_redis_connection',
+            'traceback': traceback.format_exc()
+        }
+        report_payload(n8n_traceback)
         
         logger.error(f"Redis connection failed: {e}")
         return None
@@ -110,17 +105,12 @@ class RedisClient:
                 logger.error(f"Redis connection failed: {e}")
                 
                 # Send error to n8n for monitoring
-                n8n_url = os.getenv('N8N_TRACEBACK_URL')
-                if n8n_url:
-                    try:
-                        n8n_traceback = {
-                            'error': str(e),
-                            'source': 'RedisClient._get_connection',
-                            'traceback': traceback.format_exc()
-                        }
-                        requests.post(n8n_url, json=n8n_traceback, timeout=5)
-                    except Exception:
-                        pass  # Don't let traceback reporting break the main flow
+                n8n_traceback = {
+                    'error': str(e),
+                    'source': 'RedisClient._get_connection',
+                    'traceback': traceback.format_exc()
+                }
+                report_payload(n8n_traceback)
                 
                 logger.error("No Redis connection available - operations will be skipped")
                 return None